@@ -142,10 +142,10 @@ class BatchBuilder:
     def validate_batch_gap(self, batch_max_gap: int) -> bool:
         """Validate batch_max_gap configuration."""
         if batch_max_gap < 1:
-            logger.warning(f"batch_max_gap must be >= 1, got {batch_max_gap}")
+            logger.warning("batch_max_gap must be >= 1, got %s", batch_max_gap)
             return False
         if batch_max_gap > 10000:
-            logger.warning(f"batch_max_gap seems very large ({batch_max_gap}), may cause batches that are too large")
+            logger.warning("batch_max_gap seems very large (%s), may cause batches that are too large", batch_max_gap)
             return False
         return True
 
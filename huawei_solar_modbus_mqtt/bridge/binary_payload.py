@@ -0,0 +1,286 @@
+# huawei_solar_modbus_mqtt/bridge/binary_payload.py
+
+"""
+Binärer MessagePack-Payload für Nicht-HA-Consumer.
+
+Optionaler zweiter Output neben dem JSON-Topic: derselbe gefilterte Snapshot,
+kompakt als MessagePack kodiert. Home Assistant liest weiterhin nur das
+JSON-Topic - dieser Output ist für eigene Analytics-Services gedacht.
+
+Topics:
+    {topic}/binary          Binär-Payload (pro Cycle)
+    {topic}/binary/schema   Schema als JSON (retained, nach jedem Connect)
+
+Payload-Format (Version 1):
+    Header (8 Bytes, big endian):
+        magic      2 Bytes  b"HB"
+        version    u8       BINARY_SCHEMA_VERSION
+        format     u8       1 = MessagePack
+        schema_id  u32      CRC32 der Key-Liste
+    Body: MessagePack [values, extras]
+        values     Array in Schema-Reihenfolge (nil = Key fehlt)
+        extras     Map mit Keys außerhalb des Schemas (meist leer)
+
+Die Keys stehen nur im Schema-Topic, nicht in jedem Payload. Ändert sich die
+Key-Liste (neue Sensoren), ändert sich schema_id - Consumer erkennen veraltete
+Schemata am Header, statt Werte falschen Keys zuzuordnen.
+
+Ist das ``msgpack`` Paket installiert, wird es genutzt; sonst kodiert ein
+eingebauter Encoder die benötigte Teilmenge (nil/bool/int/float/str/array/map).
+Im Image ist msgpack nicht enthalten (kein armv7/armv6 Wheel). msgpack ist
+daher dev-Dependency: tests/test_binary_payload.py prüft den eingebauten
+Codec byte-genau gegen msgpack an den Grenzen der Spezifikation.
+"""
+
+import struct
+import zlib
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+from .payload_serializer import PayloadSerializer, get_serializer
+
+BINARY_SCHEMA_VERSION = 1
+BINARY_MAGIC = b"HB"
+FORMAT_MSGPACK = 1
+
+_HEADER = struct.Struct(">2sBBI")
+HEADER_SIZE = _HEADER.size
+
+
+# =============================================================================
+# MessagePack (Teilmenge)
+# =============================================================================
+
+
+def _pack_into(obj: Any, out: bytearray) -> None:
+    if obj is None:
+        out.append(0xC0)
+    elif obj is True:
+        out.append(0xC3)
+    elif obj is False:
+        out.append(0xC2)
+    elif isinstance(obj, int):
+        _pack_int(int(obj), out)
+    elif isinstance(obj, float):
+        out += b"\xcb" + struct.pack(">d", obj)
+    elif isinstance(obj, str):
+        _pack_str(obj, out)
+    elif isinstance(obj, Mapping):
+        _pack_len(len(obj), out, 0x80, 0xDE, 0xDF)
+        for key, value in obj.items():
+            _pack_str(str(key), out)
+            _pack_into(value, out)
+    elif isinstance(obj, list | tuple):
+        _pack_len(len(obj), out, 0x90, 0xDC, 0xDD)
+        for item in obj:
+            _pack_into(item, out)
+    else:
+        _pack_str(str(obj), out)
+
+
+def _pack_int(value: int, out: bytearray) -> None:
+    if 0 <= value <= 0x7F:
+        out.append(value)
+    elif -32 <= value < 0:
+        out.append(value & 0xFF)
+    elif value >= 0:
+        if value <= 0xFF:
+            out += struct.pack(">BB", 0xCC, value)
+        elif value <= 0xFFFF:
+            out += struct.pack(">BH", 0xCD, value)
+        elif value <= 0xFFFFFFFF:
+            out += struct.pack(">BI", 0xCE, value)
+        else:
+            out += struct.pack(">BQ", 0xCF, value)
+    elif value >= -0x80:
+        out += struct.pack(">Bb", 0xD0, value)
+    elif value >= -0x8000:
+        out += struct.pack(">Bh", 0xD1, value)
+    elif value >= -0x80000000:
+        out += struct.pack(">Bi", 0xD2, value)
+    else:
+        out += struct.pack(">Bq", 0xD3, value)
+
+
+def _pack_str(value: str, out: bytearray) -> None:
+    raw = value.encode()
+    size = len(raw)
+    if size < 32:
+        out.append(0xA0 | size)
+    elif size <= 0xFF:
+        out += struct.pack(">BB", 0xD9, size)
+    elif size <= 0xFFFF:
+        out += struct.pack(">BH", 0xDA, size)
+    else:
+        out += struct.pack(">BI", 0xDB, size)
+    out += raw
+
+
+def _pack_len(size: int, out: bytearray, fix: int, code16: int, code32: int) -> None:
+    if size < 16:
+        out.append(fix | size)
+    elif size <= 0xFFFF:
+        out += struct.pack(">BH", code16, size)
+    else:
+        out += struct.pack(">BI", code32, size)
+
+
+def packb(obj: Any) -> bytes:
+    """Encode ``obj`` as MessagePack."""
+    if msgpack is not None:
+        return bytes(msgpack.packb(obj, use_bin_type=True, default=str))
+    out = bytearray()
+    _pack_into(obj, out)
+    return bytes(out)
+
+
+class _Unpacker:
+    """Minimal MessagePack decoder (counterpart of the built-in encoder)."""
+
+    _FIXED = {
+        0xCC: ">B",
+        0xCD: ">H",
+        0xCE: ">I",
+        0xCF: ">Q",
+        0xD0: ">b",
+        0xD1: ">h",
+        0xD2: ">i",
+        0xD3: ">q",
+        0xCA: ">f",
+        0xCB: ">d",
+    }
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self.pos = 0
+
+    def _take(self, size: int) -> bytes:
+        end = self.pos + size
+        if end > len(self.raw):
+            raise ValueError("Truncated MessagePack data")
+        chunk = self.raw[self.pos : end]
+        self.pos = end
+        return chunk
+
+    def _unpack(self, fmt: str) -> Any:
+        return struct.unpack(fmt, self._take(struct.calcsize(fmt)))[0]
+
+    def read(self) -> Any:
+        code = self._take(1)[0]
+        if code <= 0x7F:
+            return code
+        if code >= 0xE0:
+            return code - 0x100
+        if 0xA0 <= code <= 0xBF:
+            return self._take(code & 0x1F).decode()
+        if 0x90 <= code <= 0x9F:
+            return [self.read() for _ in range(code & 0x0F)]
+        if 0x80 <= code <= 0x8F:
+            return self._read_map(code & 0x0F)
+        if code == 0xC0:
+            return None
+        if code in (0xC2, 0xC3):
+            return code == 0xC3
+        if code in self._FIXED:
+            return self._unpack(self._FIXED[code])
+        if code in (0xD9, 0xDA, 0xDB):
+            return self._take(self._unpack({0xD9: ">B", 0xDA: ">H", 0xDB: ">I"}[code])).decode()
+        if code in (0xC4, 0xC5, 0xC6):
+            return self._take(self._unpack({0xC4: ">B", 0xC5: ">H", 0xC6: ">I"}[code]))
+        if code in (0xDC, 0xDD):
+            return [self.read() for _ in range(self._unpack(">H" if code == 0xDC else ">I"))]
+        if code in (0xDE, 0xDF):
+            return self._read_map(self._unpack(">H" if code == 0xDE else ">I"))
+        raise ValueError(f"Unsupported MessagePack type 0x{code:02x}")
+
+    def _read_map(self, size: int) -> dict[Any, Any]:
+        result = {}
+        for _ in range(size):
+            key = self.read()
+            result[key] = self.read()
+        return result
+
+
+def unpackb(raw: bytes) -> Any:
+    """Decode a MessagePack document."""
+    if msgpack is not None:
+        return msgpack.unpackb(raw, raw=False)
+    unpacker = _Unpacker(raw)
+    value = unpacker.read()
+    if unpacker.pos != len(raw):
+        raise ValueError("Trailing data after MessagePack document")
+    return value
+
+
+# =============================================================================
+# Versionierter Payload
+# =============================================================================
+
+
+def compute_schema_id(keys: Sequence[str]) -> int:
+    """CRC32 over the ordered key list."""
+    return zlib.crc32("\n".join(keys).encode())
+
+
+class BinaryPayloadEncoder:
+    """Encodes the data snapshot as header + positional MessagePack body."""
+
+    def __init__(self, serializer: PayloadSerializer | None = None):
+        """
+        Args:
+            serializer: Provides key order and precision (default: the
+                serializer compiled from the sensor config).
+        """
+        self._serializer = serializer or get_serializer()
+        self.keys: list[str] = self._serializer.key_order
+        self.schema_id = compute_schema_id(self.keys)
+        self._header = _HEADER.pack(BINARY_MAGIC, BINARY_SCHEMA_VERSION, FORMAT_MSGPACK, self.schema_id)
+        self._known = frozenset(self.keys)
+
+    def schema(self) -> dict[str, Any]:
+        """Schema document published retained on ``{topic}/binary/schema``."""
+        return {
+            "version": BINARY_SCHEMA_VERSION,
+            "format": "msgpack",
+            "schema_id": self.schema_id,
+            "header": "magic:2s version:u8 format:u8 schema_id:u32 (big endian)",
+            "keys": self.keys,
+        }
+
+    def encode(self, data: Mapping[str, Any]) -> bytes:
+        """Encode ``data`` (same values and rounding as the JSON payload)."""
+        normalized = self._serializer.normalize(data)
+        values = [normalized.get(key) for key in self.keys]
+        extras = {key: value for key, value in normalized.items() if key not in self._known}
+        return self._header + packb([values, extras])
+
+
+def decode_binary_payload(raw: bytes, keys: Sequence[str]) -> dict[str, Any]:
+    """Decode a binary payload back into a dict (reader helper for consumers).
+
+    Args:
+        raw: Payload from ``{topic}/binary``.
+        keys: ``keys`` from the schema topic.
+
+    Raises:
+        ValueError: Wrong magic, unsupported version or schema mismatch.
+    """
+    if len(raw) < HEADER_SIZE:
+        raise ValueError("Payload shorter than header")
+    magic, version, fmt, schema_id = _HEADER.unpack_from(raw)
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"Invalid magic {magic!r}")
+    if version != BINARY_SCHEMA_VERSION or fmt != FORMAT_MSGPACK:
+        raise ValueError(f"Unsupported payload version {version} / format {fmt}")
+    if schema_id != compute_schema_id(keys):
+        raise ValueError(f"Schema mismatch (payload {schema_id:#010x})")
+
+    values, extras = unpackb(raw[HEADER_SIZE:])
+    result = {key: value for key, value in zip(keys, values, strict=True) if value is not None}
+    result.update(extras)
+    return result
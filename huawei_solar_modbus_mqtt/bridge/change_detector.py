@@ -0,0 +1,106 @@
+# huawei_solar_modbus_mqtt/bridge/change_detector.py
+
+"""
+Erkennt Cycles, in denen sich kein einziges Register geändert hat.
+
+Nachts liefern fast alle Register Cycle für Cycle identische Werte, trotzdem
+lief bisher jedes Mal Transform → Filter → Serialisierung → Publish. Der
+Detector vergleicht stattdessen die rohen Antworten jedes Batches mit denen
+des vorherigen Cycles - ein ``bytes ==`` (memcmp) pro Batch, billiger als
+ein Hash und ohne Kollisionen.
+
+Eingebunden wie das RegisterImage des Modbus-Proxys: ``attach_change_detector``
+wrappt ``client.execute`` und sieht damit jeden Holding-Register-Read,
+egal ob über get_multiple, client.get (sequentieller Fallback) oder den
+Fast Path.
+
+Ein Cycle gilt nur als unverändert, wenn exakt dieselben Requests mit exakt
+denselben Antworten kamen. Bricht ein Cycle ab (Exception, keine Daten),
+fehlt end_cycle() und der nächste Cycle wird immer voll verarbeitet. Reads
+des Modbus-Proxys während eines Cycles machen ihn im Zweifel "geändert" -
+also nur mehr Publishes, nie verlorene Werte.
+
+Was mit unveränderten Cycles passiert, entscheidet main_once() anhand der
+Option ``unchanged_cycles`` (publish / keepalive / skip).
+"""
+
+import logging
+from typing import Any, TypedDict
+
+from huawei_solar import AsyncHuaweiSolarClient
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU, ReadHoldingRegistersPDU
+
+logger = logging.getLogger("huawei.change_detector")
+
+_READ_PDUS = (RawReadHoldingRegistersPDU, ReadHoldingRegistersPDU)
+
+
+class ChangeStats(TypedDict):
+    cycles: int
+    unchanged_cycles: int
+    changed_batches: int
+    unchanged_batches: int
+
+
+class RawChangeDetector:
+    """Compares each cycle's raw batch responses with the previous cycle."""
+
+    def __init__(self) -> None:
+        self._previous: dict[tuple[int, int], Any] = {}
+        self._current: dict[tuple[int, int], Any] = {}
+        self._in_cycle = False
+        self._cycles = 0
+        self._unchanged_cycles = 0
+        self._changed_batches = 0
+        self._unchanged_batches = 0
+
+    def begin_cycle(self) -> None:
+        if self._in_cycle:
+            self._previous = {}  # vorheriger Cycle abgebrochen → nächsten voll verarbeiten
+        self._current = {}
+        self._in_cycle = True
+
+    def record(self, start: int, quantity: int, response: Any) -> None:
+        if self._in_cycle:
+            self._current[(start, quantity)] = response
+
+    def end_cycle(self) -> bool:
+        """Finish the cycle; True if every response equals the previous cycle's."""
+        previous, current = self._previous, self._current
+        unchanged_batches = sum(1 for key, response in current.items() if previous.get(key) == response)
+        unchanged = bool(current) and unchanged_batches == len(current) == len(previous)
+
+        self._cycles += 1
+        self._unchanged_batches += unchanged_batches
+        self._changed_batches += len(current) - unchanged_batches
+        if unchanged:
+            self._unchanged_cycles += 1
+
+        self._previous = current
+        self._in_cycle = False
+        return unchanged
+
+    def invalidate(self) -> None:
+        """Force the next cycle to count as changed (e.g. its data was not published)."""
+        self._previous = {}
+
+    def get_stats(self) -> ChangeStats:
+        return ChangeStats(
+            cycles=self._cycles,
+            unchanged_cycles=self._unchanged_cycles,
+            changed_batches=self._changed_batches,
+            unchanged_batches=self._unchanged_batches,
+        )
+
+
+def attach_change_detector(client: AsyncHuaweiSolarClient, detector: RawChangeDetector) -> None:
+    """Feed every holding-register response of ``client`` into ``detector``."""
+    execute = client.execute
+
+    async def detecting_execute(pdu: Any) -> Any:
+        response = await execute(pdu)
+        if isinstance(pdu, _READ_PDUS):
+            detector.record(pdu.start_address, pdu.quantity, response)
+        return response
+
+    client.execute = detecting_execute  # type: ignore[method-assign]
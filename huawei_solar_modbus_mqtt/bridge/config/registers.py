@@ -119,3 +119,86 @@ ESSENTIAL_REGISTERS = [
     "storage_unit_1_state_of_capacity",  # Nur bei Multi-Modul
     "storage_unit_2_state_of_capacity",
 ]
+
+# Register-Gruppen für den Refresh-Command (<topic>/refresh mit Gruppenname als Payload).
+# Alle Gruppen sind Teilmengen von ESSENTIAL_REGISTERS; leerer Payload oder "all" liest alles.
+REGISTER_GROUPS: dict[str, list[str]] = {
+    "power": [
+        "active_power",
+        "input_power",
+        "power_meter_active_power",
+        "storage_charge_discharge_power",
+    ],
+    "battery": [
+        "storage_state_of_capacity",
+        "storage_charge_discharge_power",
+        "storage_bus_voltage",
+        "storage_bus_current",
+        "storage_running_status",
+        "storage_maximum_charge_power",
+        "storage_maximum_discharge_power",
+        "storage_unit_1_state_of_capacity",
+        "storage_unit_2_state_of_capacity",
+    ],
+    "energy": [
+        "daily_yield_energy",
+        "accumulated_yield_energy",
+        "grid_exported_energy",
+        "grid_accumulated_energy",
+        "storage_current_day_charge_capacity",
+        "storage_current_day_discharge_capacity",
+        "storage_total_charge",
+        "storage_total_discharge",
+    ],
+    "pv": [
+        "input_power",
+        "pv_01_voltage",
+        "pv_01_current",
+        "pv_02_voltage",
+        "pv_02_current",
+        "pv_03_voltage",
+        "pv_03_current",
+        "pv_04_voltage",
+        "pv_04_current",
+    ],
+    "grid": [
+        "active_power",
+        "grid_A_voltage",
+        "grid_B_voltage",
+        "grid_C_voltage",
+        "line_voltage_A_B",
+        "line_voltage_B_C",
+        "line_voltage_C_A",
+        "grid_frequency",
+    ],
+    "meter": [
+        "meter_status",
+        "power_meter_active_power",
+        "power_meter_reactive_power",
+        "active_grid_A_current",
+        "active_grid_B_current",
+        "active_grid_C_current",
+        "active_grid_A_B_voltage",
+        "active_grid_B_C_voltage",
+        "active_grid_C_A_voltage",
+        "active_grid_A_power",
+        "active_grid_B_power",
+        "active_grid_C_power",
+        "active_grid_frequency",
+        "active_grid_power_factor",
+    ],
+    "inverter": [
+        "internal_temperature",
+        "day_active_power_peak",
+        "power_factor",
+        "efficiency",
+        "reactive_power",
+        "insulation_resistance",
+        "device_status",
+        "state_1",
+        "state_2",
+        "alarm_1",
+        "alarm_2",
+        "alarm_3",
+    ],
+}
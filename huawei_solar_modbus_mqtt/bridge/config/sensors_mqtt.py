@@ -10,6 +10,8 @@ MQTT-Payload extrahiert und in HA dargestellt werden soll.
 Sensor-Typen:
     - NUMERIC_SENSORS: Sensoren mit numerischen Werten und unit_of_measurement
     - TEXT_SENSORS: Sensoren mit String-Werten (Status, Modellname, etc.)
+    - DIAGNOSTIC_SENSORS: Selbstdiagnose der Bridge (Option diagnostics_interval),
+      State-Topic {topic}/diagnostics statt des Daten-Topics
 
 MQTT Discovery:
     Beim Start publiziert das Add-on für jeden Sensor eine Config-Message zu:
@@ -31,6 +33,7 @@ Wichtige Config-Keys:
     - icon: MDI Icon (mdi:solar-power, mdi:battery, ...)
     - enabled: Sensor standardmäßig aktiviert? (False = manuell aktivieren)
     - entity_category: Kategorie (diagnostic = unter "Diagnose", None = Haupt-Entity)
+    - topic: Unter-Topic für den State (z.B. "diagnostics"), Standard = Daten-Topic
 
 value_template mit default():
     Problem: Wenn ein Key im MQTT-Payload fehlt (Register nicht gelesen),
@@ -740,3 +743,119 @@ TEXT_SENSORS: list[dict[str, Any]] = [
         "entity_category": "diagnostic",
     },
 ]
+
+# Selbstdiagnose der Bridge (diagnostics.py), nur mit diagnostics_interval > 0
+# State kommt retained von {topic}/diagnostics, null → "unknown" in HA
+DIAGNOSTIC_SENSORS: list[dict[str, Any]] = [
+    {
+        "name": "Bridge Cycle Duration",
+        "key": "bridge_cycle_duration",
+        "topic": "diagnostics",
+        "unit_of_measurement": "s",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "icon": "mdi:timer-outline",
+        "value_template": "{{ value_json.cycle_duration }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge Modbus Read Time",
+        "key": "bridge_modbus_read",
+        "topic": "diagnostics",
+        "unit_of_measurement": "s",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "icon": "mdi:lan-pending",
+        "value_template": "{{ value_json.modbus_read }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge Batch Count",
+        "key": "bridge_batch_count",
+        "topic": "diagnostics",
+        "state_class": "measurement",
+        "icon": "mdi:package-variant",
+        "value_template": "{{ value_json.batch_count }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge Fallback Reads",
+        "key": "bridge_fallback_reads",
+        "topic": "diagnostics",
+        "state_class": "measurement",
+        "icon": "mdi:call-split",
+        "value_template": "{{ value_json.fallback_reads }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge MQTT Latency",
+        "key": "bridge_mqtt_latency",
+        "topic": "diagnostics",
+        "unit_of_measurement": "s",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "icon": "mdi:send-clock",
+        "value_template": "{{ value_json.mqtt_latency }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge Filter Events",
+        "key": "bridge_filter_events",
+        "topic": "diagnostics",
+        "unit_of_measurement": "1/h",
+        "state_class": "measurement",
+        "icon": "mdi:filter-outline",
+        "value_template": "{{ value_json.filter_events }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge Poll Jitter",
+        "key": "bridge_poll_jitter",
+        "topic": "diagnostics",
+        "unit_of_measurement": "s",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "icon": "mdi:timer-alert-outline",
+        "value_template": "{{ value_json.poll_jitter }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge Memory",
+        "key": "bridge_rss",
+        "topic": "diagnostics",
+        "unit_of_measurement": "MiB",
+        "device_class": "data_size",
+        "state_class": "measurement",
+        "icon": "mdi:memory",
+        "value_template": "{{ value_json.rss }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge CPU",
+        "key": "bridge_cpu",
+        "topic": "diagnostics",
+        "unit_of_measurement": "%",
+        "state_class": "measurement",
+        "icon": "mdi:cpu-64-bit",
+        "value_template": "{{ value_json.cpu }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge Threads",
+        "key": "bridge_threads",
+        "topic": "diagnostics",
+        "state_class": "measurement",
+        "icon": "mdi:format-list-numbered",
+        "value_template": "{{ value_json.threads }}",
+        "entity_category": "diagnostic",
+    },
+    {
+        "name": "Bridge Open Files",
+        "key": "bridge_open_fds",
+        "topic": "diagnostics",
+        "state_class": "measurement",
+        "icon": "mdi:file-multiple-outline",
+        "value_template": "{{ value_json.fds }}",
+        "entity_category": "diagnostic",
+    },
+]
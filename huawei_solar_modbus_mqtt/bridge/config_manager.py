@@ -56,7 +56,7 @@ class ConfigManager:
                     exc,
                 )
                 raise
-            logger.debug(f"✅ Loaded config keys: {list(self._config.keys())}")
+            logger.debug("✅ Loaded config keys: %s", list(self._config.keys()))
         else:
             logger.info("🔍 No config file found, loading from environment variables")
             self._config = self._load_from_env()
@@ -74,19 +74,47 @@ class ConfigManager:
             "modbus_port": self._parse_int_env("HUAWEI_MODBUS_PORT", default=502),
             "modbus_auto_detect_slave_id": self._parse_bool_env("HUAWEI_MODBUS_AUTO_DETECT_SLAVE_ID", default=True),
             "slave_id": self._parse_int_env("HUAWEI_SLAVE_ID", default=1),
+            "modbus_proxy": self._parse_bool_env("HUAWEI_MODBUS_PROXY", default=False),
+            "modbus_proxy_port": self._parse_int_env("HUAWEI_MODBUS_PROXY_PORT", default=502),
             # MQTT settings
             "mqtt_host": os.getenv("HUAWEI_MQTT_HOST", "core-mosquitto"),
             "mqtt_port": self._parse_int_env("HUAWEI_MQTT_PORT", default=1883),
             "mqtt_user": os.getenv("HUAWEI_MQTT_USER", ""),
             "mqtt_password": os.getenv("HUAWEI_MQTT_PASSWORD", ""),
             "mqtt_topic": os.getenv("HUAWEI_MQTT_TOPIC", "huawei-solar"),
+            "mqtt_data_qos": self._parse_int_env("HUAWEI_MQTT_DATA_QOS", default=1),
+            "mqtt_data_retain": self._parse_bool_env("HUAWEI_MQTT_DATA_RETAIN", default=True),
+            "mqtt_retained_snapshot_interval": self._parse_int_env("HUAWEI_MQTT_RETAINED_SNAPSHOT_INTERVAL", default=0),
+            "mqtt_status_keepalive": self._parse_int_env("HUAWEI_MQTT_STATUS_KEEPALIVE", default=0),
+            "mqtt_binary_payload": self._parse_bool_env("HUAWEI_MQTT_BINARY_PAYLOAD", default=False),
+            "mqtt_control": self._parse_bool_env("HUAWEI_MQTT_CONTROL", default=False),
+            # Output sinks
+            "output_influx": os.getenv("HUAWEI_OUTPUT_INFLUX", ""),
+            "output_ndjson_file": os.getenv("HUAWEI_OUTPUT_NDJSON_FILE", ""),
+            "output_unix_socket": os.getenv("HUAWEI_OUTPUT_UNIX_SOCKET", ""),
+            "output_shared_memory": os.getenv("HUAWEI_OUTPUT_SHARED_MEMORY", ""),
+            "output_queue_size": self._parse_int_env("HUAWEI_OUTPUT_QUEUE_SIZE", default=100),
+            "output_file_max_mb": self._parse_int_env("HUAWEI_OUTPUT_FILE_MAX_MB", default=10),
+            "http_api_port": self._parse_int_env("HUAWEI_HTTP_API_PORT", default=0),
+            "diagnostics_interval": self._parse_int_env("HUAWEI_DIAGNOSTICS_INTERVAL", default=0),
+            "tracing": self._parse_bool_env("HUAWEI_TRACING", default=False),
+            "tracing_payload": self._parse_bool_env("HUAWEI_TRACING_PAYLOAD", default=False),
+            "loop_monitor": self._parse_bool_env("HUAWEI_LOOP_MONITOR", default=False),
+            "flight_recorder_cycles": self._parse_int_env("HUAWEI_FLIGHT_RECORDER_CYCLES", default=10),
             # Advanced settings
             "log_level": os.getenv("HUAWEI_LOG_LEVEL", "INFO"),
+            "log_format": os.getenv("HUAWEI_LOG_FORMAT", "text"),
             "status_timeout": self._parse_int_env("HUAWEI_STATUS_TIMEOUT", default=180),
             "poll_interval": self._parse_int_env("HUAWEI_POLL_INTERVAL", default=30),
             # Batch settings (v1.10.0+)
             "enable_batching": self._parse_bool_env("HUAWEI_ENABLE_BATCHING", default=True),
             "batch_max_gap": self._parse_int_env("HUAWEI_BATCH_MAX_GAP", default=50),
+            "fast_decode": self._parse_bool_env("HUAWEI_FAST_DECODE", default=False),
+            "unchanged_cycles": os.getenv("HUAWEI_UNCHANGED_CYCLES", "publish"),
+            # Night mode
+            "night_poll_interval": self._parse_int_env("HUAWEI_NIGHT_POLL_INTERVAL", default=0),
+            "latitude": self._parse_float_env("HUAWEI_LATITUDE"),
+            "longitude": self._parse_float_env("HUAWEI_LONGITUDE"),
         }
 
     @staticmethod
@@ -124,9 +152,29 @@ class ConfigManager:
         try:
             return int(value)
         except ValueError:
-            logger.warning(f"❌ Invalid integer value for {key}: {value}, using default {default}")
+            logger.warning("❌ Invalid integer value for %s: %s, using default %s", key, value, default)
             return default
 
+    @staticmethod
+    def _parse_float_env(key: str) -> float | None:
+        """
+        Parse optional float environment variable.
+
+        Args:
+            key: Environment variable name
+
+        Returns:
+            Float value, or None if not set, empty or invalid
+        """
+        value = os.getenv(key)
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            logger.warning("❌ Invalid number for %s: %s, ignoring", key, value)
+            return None
+
     # === Modbus Configuration ===
 
     @property
@@ -149,6 +197,16 @@ class ConfigManager:
         """Get Modbus slave ID."""
         return cast(int, self._config.get("slave_id", 1))
 
+    @property
+    def modbus_proxy(self) -> bool:
+        """Serve FC03 reads to other Modbus TCP clients from the bridge's register cache."""
+        return cast(bool, self._config.get("modbus_proxy", False))
+
+    @property
+    def modbus_proxy_port(self) -> int:
+        """Listen port of the Modbus TCP proxy."""
+        return cast(int, self._config.get("modbus_proxy_port", 502))
+
     # === MQTT Configuration ===
 
     @property
@@ -178,6 +236,101 @@ class ConfigManager:
         """Get MQTT topic prefix."""
         return cast(str, self._config.get("mqtt_topic", "huawei-solar"))
 
+    @property
+    def mqtt_data_qos(self) -> int:
+        """QoS for the sensor data topic (0-2).
+
+        QoS 0 skips the PUBACK round trip - useful for short poll intervals.
+        """
+        return cast(int, self._config.get("mqtt_data_qos", 1))
+
+    @property
+    def mqtt_data_retain(self) -> bool:
+        """Publish the sensor data topic as retained message."""
+        return cast(bool, self._config.get("mqtt_data_retain", True))
+
+    @property
+    def mqtt_retained_snapshot_interval(self) -> int:
+        """Seconds between retained QoS 1 snapshots when data is not retained (0 = never)."""
+        return cast(int, self._config.get("mqtt_retained_snapshot_interval", 0))
+
+    @property
+    def mqtt_status_keepalive(self) -> int:
+        """Seconds between repeated status publishes (0 = only on online/offline transitions)."""
+        return cast(int, self._config.get("mqtt_status_keepalive", 0))
+
+    @property
+    def mqtt_binary_payload(self) -> bool:
+        """Additionally publish a MessagePack snapshot to ``{topic}/binary``."""
+        return cast(bool, self._config.get("mqtt_binary_payload", False))
+
+    @property
+    def mqtt_control(self) -> bool:
+        """Accept battery/inverter control writes on ``{topic}/control/<command>`` (see control.py)."""
+        return cast(bool, self._config.get("mqtt_control", False))
+
+    # === Output Sinks ===
+
+    @property
+    def output_influx(self) -> str:
+        """InfluxDB line protocol target: ``udp://host:port`` or ``file:///path`` (empty = off)."""
+        return cast(str, self._config.get("output_influx", "") or "")
+
+    @property
+    def output_ndjson_file(self) -> str:
+        """Path of the NDJSON output file (empty = off)."""
+        return cast(str, self._config.get("output_ndjson_file", "") or "")
+
+    @property
+    def output_unix_socket(self) -> str:
+        """Path of the Unix socket streaming NDJSON snapshots (empty = off)."""
+        return cast(str, self._config.get("output_unix_socket", "") or "")
+
+    @property
+    def output_shared_memory(self) -> str:
+        """Path of the memory-mapped numeric snapshot, e.g. ``/dev/shm/huabus.snapshot`` (empty = off)."""
+        return cast(str, self._config.get("output_shared_memory", "") or "")
+
+    @property
+    def output_queue_size(self) -> int:
+        """Snapshots buffered per output sink before the oldest is dropped."""
+        return cast(int, self._config.get("output_queue_size", 100))
+
+    @property
+    def output_file_max_mb(self) -> int:
+        """Size in MB at which file outputs are rotated (0 = never)."""
+        return cast(int, self._config.get("output_file_max_mb", 10))
+
+    @property
+    def http_api_port(self) -> int:
+        """Port of the embedded HTTP API (snapshot, health, SSE); 0 (default) disables it."""
+        return cast(int, self._config.get("http_api_port", 0))
+
+    @property
+    def diagnostics_interval(self) -> int:
+        """Seconds between bridge self-diagnostics publishes for HA (0 = no diagnostic entities)."""
+        return cast(int, self._config.get("diagnostics_interval", 0) or 0)
+
+    @property
+    def tracing(self) -> bool:
+        """Trace every cycle from Modbus response to PUBACK (see tracing.py)."""
+        return cast(bool, self._config.get("tracing", False))
+
+    @property
+    def tracing_payload(self) -> bool:
+        """Embed ``trace_seq`` and ``trace_read_ts`` in the data payload."""
+        return cast(bool, self._config.get("tracing_payload", False))
+
+    @property
+    def loop_monitor(self) -> bool:
+        """Sample event-loop lag and record blocking callbacks (see loop_monitor.py)."""
+        return cast(bool, self._config.get("loop_monitor", False))
+
+    @property
+    def flight_recorder_cycles(self) -> int:
+        """Cycles kept by the flight recorder (0 = off, see flight_recorder.py)."""
+        return cast(int, self._config.get("flight_recorder_cycles", 10))
+
     # === Advanced Configuration ===
 
     @property
@@ -185,6 +338,11 @@ class ConfigManager:
         """Get log level (TRACE, DEBUG, INFO, WARNING, ERROR)."""
         return cast(str, self._config.get("log_level", "INFO")).upper()
 
+    @property
+    def log_format(self) -> str:
+        """Get log output format: text (readable lines) or json (one JSON object per line)."""
+        return cast(str, self._config.get("log_format", "text")).lower()
+
     @property
     def status_timeout(self) -> int:
         """Get status timeout in seconds."""
@@ -214,6 +372,44 @@ class ConfigManager:
         """
         return cast(int, self._config.get("batch_max_gap", 50))
 
+    @property
+    def fast_decode(self) -> bool:
+        """Decode raw batch responses straight into MQTT keys (see fast_decode.py).
+
+        Always reads in batches; enable_batching is ignored.
+        """
+        return cast(bool, self._config.get("fast_decode", False))
+
+    @property
+    def unchanged_cycles(self) -> str:
+        """What to do when every raw batch response equals the previous cycle's.
+
+        publish:   full pipeline as usual (default)
+        keepalive: only refresh the status topic
+        skip:      send nothing
+        A full publish still happens at least every status_timeout.
+        """
+        return cast(str, self._config.get("unchanged_cycles", "publish"))
+
+    # === Night Mode ===
+
+    @property
+    def night_poll_interval(self) -> int:
+        """Poll interval while PV is off and the battery is idle (0 = always poll_interval)."""
+        return cast(int, self._config.get("night_poll_interval", 0) or 0)
+
+    @property
+    def latitude(self) -> float | None:
+        """Latitude for the local sunrise/sunset calculation (None = not configured)."""
+        value = self._config.get("latitude")
+        return None if value in (None, "") else float(value)
+
+    @property
+    def longitude(self) -> float | None:
+        """Longitude for the local sunrise/sunset calculation (None = not configured)."""
+        value = self._config.get("longitude")
+        return None if value in (None, "") else float(value)
+
     # === Validation ===
 
     def validate(self) -> list[str]:
@@ -235,6 +431,9 @@ class ConfigManager:
             if not (0 <= self.slave_id <= 247):
                 errors.append(f"slave_id must be 0-247, got {self.slave_id}")
 
+        if self.modbus_proxy and not (1 <= self.modbus_proxy_port <= 65535):
+            errors.append(f"modbus_proxy_port must be 1-65535, got {self.modbus_proxy_port}")
+
         # MQTT validation
         if not self.mqtt_host:
             errors.append("mqtt_host is required")
@@ -245,11 +444,54 @@ class ConfigManager:
         if not self.mqtt_topic:
             errors.append("mqtt_topic is required")
 
+        if self.mqtt_data_qos not in (0, 1, 2):
+            errors.append(f"mqtt_data_qos must be 0, 1 or 2, got {self.mqtt_data_qos}")
+
+        if not (0 <= self.mqtt_retained_snapshot_interval <= 3600):
+            errors.append(
+                f"mqtt_retained_snapshot_interval must be 0-3600 seconds, got {self.mqtt_retained_snapshot_interval}"
+            )
+
+        if not (0 <= self.mqtt_status_keepalive <= 3600):
+            errors.append(f"mqtt_status_keepalive must be 0-3600 seconds, got {self.mqtt_status_keepalive}")
+
+        # Output sink validation
+        if self.output_influx and not self.output_influx.startswith(("udp://", "file:///")):
+            errors.append(f"output_influx must be udp://host:port or file:///path, got {self.output_influx}")
+
+        for key, path in (
+            ("output_ndjson_file", self.output_ndjson_file),
+            ("output_unix_socket", self.output_unix_socket),
+            ("output_shared_memory", self.output_shared_memory),
+        ):
+            if path and not path.startswith("/"):
+                errors.append(f"{key} must be an absolute path, got {path}")
+
+        if not (1 <= self.output_queue_size <= 10000):
+            errors.append(f"output_queue_size must be 1-10000, got {self.output_queue_size}")
+
+        if not (0 <= self.output_file_max_mb <= 10000):
+            errors.append(f"output_file_max_mb must be 0-10000, got {self.output_file_max_mb}")
+
+        if not (0 <= self.http_api_port <= 65535):
+            errors.append(f"http_api_port must be 0-65535, got {self.http_api_port}")
+
+        if self.diagnostics_interval and not (60 <= self.diagnostics_interval <= 3600):
+            errors.append(f"diagnostics_interval must be 0 or 60-3600 seconds, got {self.diagnostics_interval}")
+        if not (0 <= self.flight_recorder_cycles <= 100):
+            errors.append(f"flight_recorder_cycles must be 0-100, got {self.flight_recorder_cycles}")
+        if self.tracing_payload and not self.tracing:
+            errors.append("tracing_payload requires tracing")
+
         # Advanced validation
         valid_log_levels = ["TRACE", "DEBUG", "INFO", "WARNING", "ERROR"]
         if self.log_level not in valid_log_levels:
             errors.append(f"log_level must be one of {valid_log_levels}, got {self.log_level}")
 
+        valid_log_formats = ["text", "json"]
+        if self.log_format not in valid_log_formats:
+            errors.append(f"log_format must be one of {valid_log_formats}, got {self.log_format}")
+
         if not (30 <= self.status_timeout <= 600):
             errors.append(f"status_timeout must be 30-600 seconds, got {self.status_timeout}")
 
@@ -259,6 +501,24 @@ class ConfigManager:
         if not BatchBuilder().validate_batch_gap(self.batch_max_gap):
             errors.append(f"batch_max_gap must be 1-10000, got {self.batch_max_gap}")
 
+        if self.night_poll_interval and not (self.poll_interval < self.night_poll_interval <= self.status_timeout // 2):
+            errors.append(
+                f"night_poll_interval must be 0 or between poll_interval ({self.poll_interval}) and "
+                f"status_timeout / 2 ({self.status_timeout // 2}), got {self.night_poll_interval}"
+            )
+
+        if (self.latitude is None) != (self.longitude is None):
+            errors.append("latitude and longitude must be set together")
+        elif self.latitude is not None and self.longitude is not None:
+            if not (-90 <= self.latitude <= 90):
+                errors.append(f"latitude must be -90 to 90, got {self.latitude}")
+            if not (-180 <= self.longitude <= 180):
+                errors.append(f"longitude must be -180 to 180, got {self.longitude}")
+
+        valid_unchanged_cycles = ["publish", "keepalive", "skip"]
+        if self.unchanged_cycles not in valid_unchanged_cycles:
+            errors.append(f"unchanged_cycles must be one of {valid_unchanged_cycles}, got {self.unchanged_cycles}")
+
         return errors
 
     def __repr__(self) -> str:
@@ -277,29 +537,70 @@ class ConfigManager:
 
         # Modbus
         logger.debug("Modbus:")
-        logger.debug(f"  Host: {self.modbus_host}")
-        logger.debug(f"  Port: {self.modbus_port}")
-        logger.debug(f"  Auto-detect Slave ID: {self.modbus_auto_detect_slave_id}")
+        logger.debug("  Host: %s", self.modbus_host)
+        logger.debug("  Port: %s", self.modbus_port)
+        logger.debug("  Auto-detect Slave ID: %s", self.modbus_auto_detect_slave_id)
         if not self.modbus_auto_detect_slave_id:
-            logger.debug(f"  Slave ID: {self.slave_id}")
+            logger.debug("  Slave ID: %s", self.slave_id)
+        if self.modbus_proxy:
+            logger.debug("  Proxy Port: %s", self.modbus_proxy_port)
 
         # MQTT
         logger.debug("MQTT:")
-        logger.debug(f"  Host: {self.mqtt_host}")
-        logger.debug(f"  Port: {self.mqtt_port}")
+        logger.debug("  Host: %s", self.mqtt_host)
+        logger.debug("  Port: %s", self.mqtt_port)
 
         if self.mqtt_user:
-            logger.debug(f"  User: {self.mqtt_user}")
+            logger.debug("  User: %s", self.mqtt_user)
             if self.mqtt_password:
                 # Always mask password in logs to prevent clear-text logging of sensitive data
                 logger.debug("  Password: ***")
         else:
             logger.debug("  Auth: None")
 
-        logger.debug(f"  Topic: {self.mqtt_topic}")
+        logger.debug("  Topic: %s", self.mqtt_topic)
+        logger.debug("  Data QoS/Retain: %s/%s", self.mqtt_data_qos, self.mqtt_data_retain)
+        if not self.mqtt_data_retain and self.mqtt_retained_snapshot_interval:
+            logger.debug("  Retained Snapshot: every %ss", self.mqtt_retained_snapshot_interval)
+        if self.mqtt_status_keepalive:
+            logger.debug("  Status Keepalive: %ss", self.mqtt_status_keepalive)
+        if self.mqtt_binary_payload:
+            logger.debug("  Binary Payload: %s/binary", self.mqtt_topic)
+        if self.mqtt_control:
+            logger.debug("  Control: %s/control/<command>", self.mqtt_topic)
+
+        if self.output_influx or self.output_ndjson_file or self.output_unix_socket or self.output_shared_memory:
+            logger.debug("Output Sinks:")
+            if self.output_influx:
+                logger.debug("  Influx: %s", self.output_influx)
+            if self.output_ndjson_file:
+                logger.debug("  NDJSON File: %s", self.output_ndjson_file)
+            if self.output_unix_socket:
+                logger.debug("  Unix Socket: %s", self.output_unix_socket)
+            if self.output_shared_memory:
+                logger.debug("  Shared Memory: %s", self.output_shared_memory)
+            logger.debug("  Queue Size: %s", self.output_queue_size)
+            logger.debug("  File Max Size: %s MB", self.output_file_max_mb)
+
+        logger.debug("HTTP API: %s", f"port {self.http_api_port}" if self.http_api_port else "disabled")
+        if self.diagnostics_interval:
+            logger.debug("Diagnostics: every %ss", self.diagnostics_interval)
+        if self.tracing:
+            logger.debug("Tracing: on%s", " (seq/read timestamp in payload)" if self.tracing_payload else "")
+        if self.loop_monitor:
+            logger.debug("Event Loop Monitor: on")
+        if self.flight_recorder_cycles:
+            logger.debug("Flight Recorder: last %s cycles", self.flight_recorder_cycles)
 
         # Advanced
         logger.debug("Advanced:")
-        logger.debug(f"  Log Level: {self.log_level}")
-        logger.debug(f"  Status Timeout: {self.status_timeout}s")
-        logger.debug(f"  Poll Interval: {self.poll_interval}s")
+        logger.debug("  Log Level: %s", self.log_level)
+        logger.debug("  Log Format: %s", self.log_format)
+        logger.debug("  Status Timeout: %ss", self.status_timeout)
+        logger.debug("  Poll Interval: %ss", self.poll_interval)
+        logger.debug("  Fast Decode: %s", self.fast_decode)
+        logger.debug("  Unchanged Cycles: %s", self.unchanged_cycles)
+
+        if self.night_poll_interval:
+            sun = f"{self.latitude}, {self.longitude}" if self.latitude is not None else "not configured"
+            logger.debug("Night Mode: every %ss | Sunrise/Sunset position: %s", self.night_poll_interval, sun)
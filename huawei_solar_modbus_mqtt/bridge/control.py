@@ -0,0 +1,303 @@
+# huawei_solar_modbus_mqtt/bridge/control.py
+
+"""
+Batterie-/Inverter-Steuerung über MQTT Command-Topics.
+
+Bisher war die Bridge rein lesend - für die Batterie-Steuerung lief ein
+zweiter Modbus-Client, der mit dem Polling um den Dongle konkurrierte. Mit
+``mqtt_control: true`` nimmt die Bridge Steuerbefehle selbst an:
+
+    <topic>/control/<befehl>        Befehl (Payload siehe CONTROL_COMMANDS)
+    <topic>/control/<befehl>/state  Ergebnis als JSON (ok, value | error)
+
+Befehle:
+    max_charge_power     Max. Ladeleistung in W (storage_maximum_charging_power)
+    max_discharge_power  Max. Entladeleistung in W
+    forcible_charge      Zwangsladung: "2500" oder {"power": 2500, "duration": 60}
+    forcible_discharge   Zwangsentladung, gleiche Payload
+    forcible_stop        Zwangsladung/-entladung beenden (Payload egal)
+
+Ablauf:
+    paho-Thread: notify() → submit() im Event Loop
+    asyncio:     Control-Task schreibt mit Priority.CONTROL (modbus_scheduler.py)
+                 → überholt wartende Poll-/Proxy-Reads
+                 → Register sofort zurücklesen → Ergebnis auf .../state
+
+Coalescing:
+    Kommt derselbe Befehl erneut, bevor er ausgeführt wurde, gilt nur der
+    letzte Wert (z.B. ein Slider in HA sendet 10 Zwischenwerte).
+
+Nach jedem erfolgreichen Befehl wird ein Refresh der Gruppe "battery"
+angestoßen, damit auch das Daten-Topic den neuen Zustand zeigt.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, TypedDict, cast
+
+from huawei_solar import AsyncHuaweiSolarClient, RegisterName
+from huawei_solar.exceptions import HuaweiSolarException
+from huawei_solar.register_values import StorageForcibleChargeDischarge, StorageForcibleChargeDischargeTargetMode
+from tmodbus.exceptions import TModbusError
+
+from .modbus_scheduler import Priority, modbus_priority
+from .mqtt_client import subscribe_command, unsubscribe_command
+
+logger = logging.getLogger("huawei.control")
+
+MAX_POWER_W = 100_000
+DEFAULT_FORCIBLE_DURATION = 60  # Minuten
+MAX_FORCIBLE_DURATION = 1440
+
+CONTROL_EXCEPTIONS: tuple[type[BaseException], ...] = (HuaweiSolarException, TModbusError, TimeoutError, OSError)
+
+Write = tuple[str, Any]
+
+
+def _parse_payload(payload: str) -> dict[str, Any]:
+    """Plain number ("2500") or JSON object."""
+    payload = payload.strip()
+    if payload.startswith("{"):
+        try:
+            data = json.loads(payload)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e.msg}") from e
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+        return data
+    return {"power": payload} if payload else {}
+
+
+def _int_in_range(data: dict[str, Any], key: str, low: int, high: int, default: int | None = None) -> int:
+    value = data.get(key, default)
+    if value is None:
+        raise ValueError(f"'{key}' missing")
+    try:
+        number_float = float(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"'{key}' must be a number, got {value!r}") from e
+    if not math.isfinite(number_float):
+        raise ValueError(f"'{key}' must be a finite number, got {value!r}")
+    number = int(number_float)
+    if not low <= number <= high:
+        raise ValueError(f"'{key}' must be {low}-{high}, got {number}")
+    return number
+
+
+def _power_limit(register: str) -> Callable[[str], list[Write]]:
+    def parse(payload: str) -> list[Write]:
+        return [(register, _int_in_range(_parse_payload(payload), "power", 0, MAX_POWER_W))]
+
+    return parse
+
+
+def _forcible(mode: StorageForcibleChargeDischarge, power_register: str) -> Callable[[str], list[Write]]:
+    def parse(payload: str) -> list[Write]:
+        data = _parse_payload(payload)
+        power = _int_in_range(data, "power", 1, MAX_POWER_W)
+        duration = _int_in_range(data, "duration", 1, MAX_FORCIBLE_DURATION, DEFAULT_FORCIBLE_DURATION)
+        return [
+            ("storage_forcible_charge_discharge_setting_mode", StorageForcibleChargeDischargeTargetMode.TIME),
+            ("storage_forced_charging_and_discharging_period", duration),
+            (power_register, power),
+            ("forcible_charge_discharge_write", mode),
+        ]
+
+    return parse
+
+
+def _stop(payload: str) -> list[Write]:
+    return [("forcible_charge_discharge_write", StorageForcibleChargeDischarge.STOP)]
+
+
+@dataclass(frozen=True)
+class ControlCommand:
+    """One MQTT control command: payload → register writes, then readback."""
+
+    parse: Callable[[str], list[Write]]
+    readback: str
+
+
+CONTROL_COMMANDS: dict[str, ControlCommand] = {
+    "max_charge_power": ControlCommand(
+        _power_limit("storage_maximum_charging_power"), "storage_maximum_charging_power"
+    ),
+    "max_discharge_power": ControlCommand(
+        _power_limit("storage_maximum_discharging_power"), "storage_maximum_discharging_power"
+    ),
+    "forcible_charge": ControlCommand(
+        _forcible(StorageForcibleChargeDischarge.CHARGE, "storage_forcible_charge_power"),
+        "forcible_charge_discharge_write",
+    ),
+    "forcible_discharge": ControlCommand(
+        _forcible(StorageForcibleChargeDischarge.DISCHARGE, "storage_forcible_discharge_power"),
+        "forcible_charge_discharge_write",
+    ),
+    "forcible_stop": ControlCommand(_stop, "forcible_charge_discharge_write"),
+}
+
+
+class ControlStats(TypedDict):
+    received: int
+    coalesced: int
+    executed: int
+    rejected: int
+    failed: int
+    last_latency: float | None
+    max_latency: float
+
+
+class ControlQueue:
+    """Executes MQTT control commands with write priority, coalescing repeats."""
+
+    def __init__(
+        self,
+        client: AsyncHuaweiSolarClient,
+        publish_state: Callable[[str, dict[str, Any]], Awaitable[None]],
+        on_written: Callable[[], None] | None = None,
+        commands: dict[str, ControlCommand] = CONTROL_COMMANDS,
+    ):
+        """
+        Args:
+            client: Modbus client (transport routed through the scheduler).
+            publish_state: Coroutine publishing a command result (command, JSON).
+            on_written: Called after every successful command (e.g. refresh).
+            commands: Available commands by name.
+        """
+        self.client = client
+        self.publish_state = publish_state
+        self.on_written = on_written
+        self.commands = commands
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._topic: str | None = None
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        # Befehl → (Payload, Empfangszeit der ersten noch offenen Anfrage)
+        self._pending: dict[str, tuple[str, float]] = {}
+
+        self._received = 0
+        self._coalesced = 0
+        self._executed = 0
+        self._rejected = 0
+        self._failed = 0
+        self._last_latency: float | None = None
+        self._max_latency = 0.0
+
+    def start(self, base_topic: str) -> None:
+        """Subscribe ``<base_topic>/+`` and start the control task (from the running event loop)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._topic = f"{base_topic}/+"
+        subscribe_command(self._topic, self.notify)
+        self._task = asyncio.create_task(self._run(), name="control")
+        logger.info("🎛️ MQTT control enabled: %s/<%s>", base_topic, "|".join(self.commands))
+
+    async def stop(self) -> None:
+        """Unsubscribe and stop the control task (pending commands are dropped)."""
+        if self._topic is not None:
+            unsubscribe_command(self._topic)
+            self._topic = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def notify(self, topic: str, payload: bytes) -> None:
+        """MQTT message handler. Safe to call from paho's network thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        command = topic.rsplit("/", 1)[-1]
+        self._loop.call_soon_threadsafe(self.submit, command, payload.decode("utf-8", errors="replace"))
+
+    def submit(self, command: str, payload: str) -> bool:
+        """Queue ``command``; a queued command of the same name is replaced."""
+        if command not in self.commands:
+            self._rejected += 1
+            logger.warning("⚠️ Unknown control command '%s' (known: %s)", command, ", ".join(self.commands))
+            return False
+
+        self._received += 1
+        if command in self._pending:
+            self._coalesced += 1
+            received = self._pending[command][1]
+        else:
+            received = time.monotonic()
+        self._pending[command] = (payload, received)
+        self._wake.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._pending:
+                command = next(iter(self._pending))
+                payload, received = self._pending.pop(command)
+                try:
+                    await self.execute(command, payload, received)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:  # ein fehlerhaftes Kommando darf die Queue nicht beenden
+                    self._failed += 1
+                    logger.exception("❌ Control '%s' crashed", command)
+
+    async def execute(self, command: str, payload: str, received: float | None = None) -> dict[str, Any]:
+        """Write, read back and publish the result of one command."""
+        received = time.monotonic() if received is None else received
+        try:
+            writes = self.commands[command].parse(payload)
+        except ValueError as e:
+            self._rejected += 1
+            logger.warning("⚠️ Control '%s' rejected: %s", command, e)
+            return await self._report(command, {"ok": False, "error": str(e)})
+
+        try:
+            with modbus_priority(Priority.CONTROL):
+                for register, value in writes:
+                    if not await self.client.set(cast(RegisterName, register), value):
+                        raise HuaweiSolarException(f"write to {register} not confirmed")
+                result = await self.client.get(cast(RegisterName, self.commands[command].readback))
+        except asyncio.CancelledError:
+            raise
+        except CONTROL_EXCEPTIONS as e:
+            self._failed += 1
+            logger.warning("⚠️ Control '%s' failed: %s", command, e)
+            return await self._report(command, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+
+        latency = time.monotonic() - received
+        self._executed += 1
+        self._last_latency = latency
+        self._max_latency = max(self._max_latency, latency)
+        value = result.value.name.lower() if isinstance(result.value, Enum) else result.value
+        logger.info("🎛️ Control '%s' → %s (%.2fs)", command, value, latency)
+
+        if self.on_written is not None:
+            self.on_written()
+        return await self._report(command, {"ok": True, "value": value, "latency": round(latency, 3)})
+
+    async def _report(self, command: str, state: dict[str, Any]) -> dict[str, Any]:
+        await self.publish_state(command, state)
+        return state
+
+    def get_stats(self) -> ControlStats:
+        return {
+            "received": self._received,
+            "coalesced": self._coalesced,
+            "executed": self._executed,
+            "rejected": self._rejected,
+            "failed": self._failed,
+            "last_latency": self._last_latency,
+            "max_latency": self._max_latency,
+        }
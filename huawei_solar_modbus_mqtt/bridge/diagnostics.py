@@ -0,0 +1,131 @@
+# huawei_solar_modbus_mqtt/bridge/diagnostics.py
+
+"""
+Selbstdiagnose der Bridge als Home-Assistant-Entitäten.
+
+Neben dem Connectivity-Binary-Sensor sah man in HA bisher nicht, wie es der
+Bridge selbst geht. Mit ``diagnostics_interval: N`` sammelt sie die Timings,
+die main_once ohnehin misst, und publiziert alle N Sekunden eine
+Zusammenfassung retained auf ``<topic>/diagnostics``. Die zugehörigen
+Sensoren (DIAGNOSTIC_SENSORS, ``entity_category: diagnostic``) werden per
+Discovery angelegt.
+
+Werte pro Fenster (seit dem letzten Publish):
+    cycle_duration     Mittelwert der Cycle-Dauer (s)
+    modbus_read        Mittelwert der Modbus-Lesezeit (s)
+    mqtt_latency       Mittelwert der Publish-Dauer inkl. PUBACK (s)
+    batch_count        Batches im aktuellen Read-Plan
+    fallback_reads     Einzel-Reads wegen fehlgeschlagener Batches
+    filter_events      vom Total-Increasing-Filter ersetzte Werte pro Stunde
+    poll_jitter        größte Verspätung eines Cycle-Starts gegenüber dem Plan (s)
+    rss                Resident Set Size des Prozesses (MiB)
+    cpu                CPU-Last des Prozesses im Fenster (% eines Kerns)
+    threads / fds      Threads und offene File-Deskriptoren (resources.py)
+
+Ein langsam sterbender Dongle zeigt sich so direkt im Dashboard: steigende
+Modbus-Lesezeit, Fallback-Reads, Jitter.
+
+Zähler (Fallbacks, Filter) kommen aus metrics.py bzw. dem Filter - hier wird
+nur die Differenz pro Fenster gebildet.
+"""
+
+import logging
+import time
+from collections.abc import Mapping
+from typing import TypedDict
+
+from .metrics import get_metrics
+from .resources import cpu_seconds, sample
+from .total_increasing_filter import get_filter
+
+logger = logging.getLogger("huawei.diagnostics")
+
+
+class DiagnosticsPayload(TypedDict):
+    cycle_duration: float | None
+    modbus_read: float | None
+    mqtt_latency: float | None
+    batch_count: int | None
+    fallback_reads: int
+    filter_events: float
+    poll_jitter: float | None
+    rss: float | None
+    cpu: float
+    threads: int
+    fds: int | None
+
+
+def _mean(values: list[float]) -> float | None:
+    return round(sum(values) / len(values), 3) if values else None
+
+
+class BridgeDiagnostics:
+    """Collects cycle timings and summarizes them once per interval."""
+
+    def __init__(self, interval: float):
+        """
+        Args:
+            interval: Seconds between two summaries.
+        """
+        self.interval = interval
+        self._window_start = time.monotonic()
+        self._cycle: list[float] = []
+        self._modbus: list[float] = []
+        self._mqtt: list[float] = []
+        self._lateness: list[float] = []
+        self._fallback_base = get_metrics().fallback_reads.get()
+        self._filter_base = sum(get_filter().get_totals().values())
+        self._cpu_base = cpu_seconds()
+
+    def observe_cycle(self, timings: Mapping[str, float]) -> None:
+        """Record the phase timings of one cycle (keys as in main_once)."""
+        if "total" in timings:
+            self._cycle.append(timings["total"])
+        if "modbus" in timings:
+            self._modbus.append(timings["modbus"])
+        if "mqtt" in timings:
+            self._mqtt.append(timings["mqtt"])
+
+    def observe_lateness(self, seconds: float) -> None:
+        """Record how late a cycle started compared to its schedule."""
+        self._lateness.append(max(0.0, seconds))
+
+    def due(self, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now - self._window_start >= self.interval
+
+    def collect(self, now: float | None = None) -> DiagnosticsPayload:
+        """Summarize the current window and start a new one."""
+        now = time.monotonic() if now is None else now
+        elapsed = max(now - self._window_start, 1e-9)
+        metrics = get_metrics()
+        fallback_total = metrics.fallback_reads.get()
+        filter_total = sum(get_filter().get_totals().values())
+        batches = metrics.plan_batches.get()
+        process = sample()
+        rss = process["rss"]
+        cpu_total = process["cpu_user"] + process["cpu_system"]
+
+        payload: DiagnosticsPayload = {
+            "cycle_duration": _mean(self._cycle),
+            "modbus_read": _mean(self._modbus),
+            "mqtt_latency": _mean(self._mqtt),
+            "batch_count": int(batches) if batches is not None else None,
+            "fallback_reads": int(fallback_total - self._fallback_base),
+            "filter_events": round((filter_total - self._filter_base) * 3600 / elapsed, 1),
+            "poll_jitter": round(max(self._lateness), 3) if self._lateness else None,
+            "rss": round(rss / 2**20, 1) if rss is not None else None,
+            "cpu": round((cpu_total - self._cpu_base) * 100 / elapsed, 1),
+            "threads": process["threads"],
+            "fds": process["fds"],
+        }
+
+        self._window_start = now
+        self._cycle.clear()
+        self._modbus.clear()
+        self._mqtt.clear()
+        self._lateness.clear()
+        self._fallback_base = fallback_total
+        self._filter_base = filter_total
+        self._cpu_base = cpu_total
+        return payload
@@ -172,7 +172,9 @@ class ConnectionErrorTracker:
                 "details": details,  # Details speichern
             }
             # Erster Fehler ist wichtig → ERROR-Level
-            logger.error("❌ Connection error: %s - %s", error_type, details)
+            logger.error(
+                "❌ Connection error: %s - %s", error_type, details, extra={"error_type": error_type, "count": 1}
+            )
             return True
 
         # Fehlertyp existiert bereits → Update
@@ -191,6 +193,7 @@ class ConnectionErrorTracker:
                 error_type,
                 error_info["count"],
                 int(duration),
+                extra={"error_type": error_type, "count": error_info["count"], "duration": int(duration)},
             )
             error_info["last_logged"] = now  # Timestamp aktualisieren
             return True
@@ -241,6 +244,7 @@ class ConnectionErrorTracker:
                 int(downtime),
                 total_errors,
                 len(self.errors),
+                extra={"duration": int(downtime), "count": total_errors, "error_types": sorted(self.errors)},
             )
 
             # Error-State zurücksetzen für nächsten Fehlerfall
@@ -0,0 +1,197 @@
+# huawei_solar_modbus_mqtt/bridge/fast_decode.py
+
+"""
+Schneller Decode-Pfad direkt aus den rohen Register-Wörtern.
+
+Der Standard-Pfad (read_registers → transform_data) erzeugt pro Register ein
+Result-Objekt der huawei_solar Library, sammelt sie in einem Dict nach
+Register-Namen und mappt danach Name → MQTT-Key. Der Fast Path liest jeden
+Batch als rohe 16-bit Wörter (ein FC03 Request, wie get_multiple) und
+dekodiert alle Felder in einem Durchlauf:
+
+1. Beim Start wird pro Batch einmal ein ``struct.Struct`` kompiliert
+   (Big Endian, Lücken als Pad-Bytes), dazu pro Feld Index, Gain,
+   Platzhalter und MQTT-Key - alles aus den Register-Definitionen der
+   Library, keine eigene Register-Tabelle.
+2. Pro Cycle: ``unpack_from`` über die Antwort, Platzhalter des Registertyps
+   als Rohwert verwerfen (sentinels.py, gezählt pro Register), Gain
+   anwenden, direkt unter dem MQTT-Key ablegen.
+
+Register mit Enum-/Dict-/Funktions-Einheit, Timestamps und Strings laufen
+weiterhin über ``definition.decode()`` + ``get_value()``. Das Ergebnis ist
+dasselbe wie Phase 1 von transform_data (siehe tests/test_fast_decode.py).
+
+Die Antworten laufen über ``client.execute`` und landen damit auch im
+RegisterImage des Modbus-Proxys (attach_register_image).
+
+Aktiviert per Option ``fast_decode``.
+"""
+
+import logging
+import struct
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+from huawei_solar import AsyncHuaweiSolarClient
+from huawei_solar.exceptions import ConnectionInterruptedException, DecodeError, ReadException
+from huawei_solar.register_definitions.number import I32AbsoluteValueRegister, NumberRegister
+from huawei_solar.registers import REGISTERS
+from tmodbus.exceptions import ModbusConnectionError, ModbusResponseError, TModbusError
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU
+
+from .batch_builder import BatchBuilder
+from .config.mappings import REGISTER_MAPPING
+from .sentinels import SentinelTable, get_sentinel_table
+from .transform import get_register_value
+
+if TYPE_CHECKING:
+    from huawei_solar.register_definitions.base import RegisterDefinition
+
+logger = logging.getLogger("huawei.fast_decode")
+
+# decode()-Implementierungen, die sich als "Wert → /gain" nachbilden lassen
+_PLAIN_DECODERS = (NumberRegister.decode, I32AbsoluteValueRegister.decode)
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    """One mapped register inside a compiled batch."""
+
+    name: str
+    key: str
+    index: int
+    width: int
+    gain: int
+    sentinels: frozenset[int]
+    absolute: bool
+    definition: "RegisterDefinition | None"  # gesetzt = Decode über die Library
+
+
+@dataclass(frozen=True, slots=True)
+class BatchPlan:
+    """Precompiled read and decode instructions for one batch."""
+
+    names: tuple[str, ...]
+    start: int
+    quantity: int
+    struct: struct.Struct
+    fields: tuple[Field, ...]
+
+
+def _is_plain(definition: "RegisterDefinition") -> bool:
+    if not isinstance(definition, NumberRegister):
+        return False
+    if callable(definition.unit) or isinstance(definition.unit, dict):
+        return False
+    return type(definition).decode in _PLAIN_DECODERS
+
+
+def compile_batch(
+    names: list[str],
+    registers: "Mapping[str, RegisterDefinition]",
+    sentinels: SentinelTable | None = None,
+) -> BatchPlan:
+    """Build the struct format and field table for an address-sorted batch."""
+    if sentinels is None:
+        sentinels = get_sentinel_table()
+    definitions = [registers[name] for name in names]
+    start = definitions[0].register
+    fmt = ">"
+    address = start
+    index = 0
+    fields = []
+
+    for name, definition in zip(names, definitions, strict=True):
+        gap = definition.register - address
+        if gap < 0:
+            raise ValueError(f"Registers not in increasing address order at '{name}'")
+        fmt += "x" * 2 * gap + definition.format
+
+        key = REGISTER_MAPPING.get(name)
+        if key is not None:
+            plain = _is_plain(definition)
+            fields.append(
+                Field(
+                    name=name,
+                    key=key,
+                    index=index,
+                    width=definition.format_size,
+                    gain=getattr(definition, "gain", 1),
+                    sentinels=sentinels.raw_sentinels(name),
+                    absolute=isinstance(definition, I32AbsoluteValueRegister),
+                    definition=None if plain else definition,
+                )
+            )
+
+        index += definition.format_size
+        address = definition.register + definition.length
+
+    compiled = struct.Struct(fmt)
+    return BatchPlan(tuple(names), start, compiled.size // 2, compiled, tuple(fields))
+
+
+class FastDecoder:
+    """Decodes raw batch responses straight into MQTT keys."""
+
+    def __init__(self, registers: list[str], batch_max_gap: int = 50, sentinels: SentinelTable | None = None):
+        self.batch_max_gap = batch_max_gap
+        self.sentinels = get_sentinel_table() if sentinels is None else sentinels
+        batches, self.unknown = BatchBuilder(batch_max_gap=batch_max_gap).build_batches(registers)
+        self.plans = [compile_batch(batch, cast(dict, REGISTERS), self.sentinels) for batch in batches if batch]
+
+        library = sum(1 for plan in self.plans for f in plan.fields if f.definition is not None)
+        logger.debug(
+            "⚡ Fast decode: %d batches, %d fields (%d via library decode), %d sequential",
+            len(self.plans),
+            sum(len(plan.fields) for plan in self.plans),
+            library,
+            len(self.unknown),
+        )
+
+    def decode(self, plan: BatchPlan, raw: bytes | memoryview, out: dict[str, Any]) -> None:
+        """Decode one raw batch response into ``out`` (missing values are left out)."""
+        values = plan.struct.unpack_from(raw)
+        for field in plan.fields:
+            value = values[field.index]
+            if value in field.sentinels:
+                self.sentinels.reject(field.name)
+                continue
+            if field.definition is None:
+                if field.gain != 1:
+                    value /= field.gain
+                if field.absolute:
+                    value = abs(value)
+            else:
+                try:
+                    result = field.definition.decode(values[field.index : field.index + field.width])
+                except DecodeError as e:
+                    logger.debug("Skipping '%s': %s", field.key, e)
+                    continue
+                value = get_register_value(field.name, result, self.sentinels)
+                if value is None:
+                    continue
+            out[field.key] = value
+
+    def store(self, name: str, result: Any, out: dict[str, Any]) -> None:
+        """Store a value read via the regular client API (sequential fallback)."""
+        key = REGISTER_MAPPING.get(name)
+        if key is not None and (value := get_register_value(name, result, self.sentinels)) is not None:
+            out[key] = value
+
+
+async def read_batch(client: AsyncHuaweiSolarClient, plan: BatchPlan) -> bytes:
+    """Read the raw words of one batch (errors mapped like ``get_multiple``)."""
+    try:
+        raw = await client.execute(RawReadHoldingRegistersPDU(plan.start, quantity=plan.quantity))
+    except ModbusResponseError as err:
+        msg = f"Failed to read registers {', '.join(plan.names)}: received {type(err).__name__}"
+        raise ReadException(msg, modbus_exception_code=err.error_code) from err
+    except ModbusConnectionError as err:
+        raise ConnectionInterruptedException(f"Connection failed when reading batch at {plan.start}") from err
+    except TModbusError as err:
+        raise ReadException(f"Failed to read registers {', '.join(plan.names)}: {err}") from err
+
+    if len(raw) != plan.struct.size:
+        raise ReadException(f"Batch at {plan.start}: expected {plan.struct.size} bytes, got {len(raw)}")
+    return raw
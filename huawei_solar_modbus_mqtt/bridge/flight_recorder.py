@@ -0,0 +1,265 @@
+# huawei_solar_modbus_mqtt/bridge/flight_recorder.py
+
+"""
+Flugschreiber: die letzten Poll-Cycles im Speicher, bei Fehlern als Datei.
+
+Geht die Bridge ``offline``, war bisher nur das zu sehen, was bei INFO
+geloggt wurde. Der FlightRecorder hält die letzten N Cycles in einem
+Ringpuffer (Option ``flight_recorder_cycles``, Standard 10, 0 = aus):
+
+    requests    jeder Modbus-Request: Startadresse, Anzahl, Dauer (ms),
+                Rohantwort (Hex) bzw. Exception
+    values      gelesene Werte vor der Transformation
+    payload     transformierte Werte
+    filtered    Entscheidungen des Total-Increasing-Filters
+                (``key: [transformiert, publiziert]``)
+    timings     Phasen-Timings des Cycles
+    error       Exception samt gekürztem Traceback, falls der Cycle scheiterte
+
+Eingebunden wie der RawChangeDetector: ``attach_flight_recorder`` wrappt
+``client.execute`` und sieht jeden Request. Die übrigen Felder setzt
+main_once() auf dem laufenden CycleRecord. Werte und Payload sind flache
+Kopien, weil der Read-Pfad und CompiledTransform ihre Dicts jeden Cycle
+wiederverwenden. Der Speicher ist damit fest: N Cycles, pro Cycle
+höchstens MAX_REQUESTS Requests.
+
+Dump (kompaktes JSON nach DUMP_DIR, die letzten MAX_DUMPS bleiben erhalten):
+    - automatisch, wenn der Error-Tracker einen Fehlertyp zum ersten Mal sieht
+    - auf Anfrage über ``<topic>/flight_recorder`` (Payload egal)
+
+Die Datei enthält zusätzlich den aktuellen Read-Plan (Batches mit
+Register-Namen). Serialisierung und Schreiben laufen erst beim Dump und im
+Thread-Pool - im Normalbetrieb kostet der Recorder zwei Dict-Kopien pro Cycle
+und eine Liste pro Request. Die DEBUG-Forensik ist so auch ohne
+dauerhaftes DEBUG-Logging vorhanden.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import traceback
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypedDict
+
+from huawei_solar import AsyncHuaweiSolarClient
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU, ReadHoldingRegistersPDU
+
+from .mqtt_client import subscribe_command, unsubscribe_command
+
+logger = logging.getLogger("huawei.flight_recorder")
+
+DUMP_DIR = Path("/data/flight_recorder")
+DEFAULT_CYCLES = 10
+MAX_REQUESTS = 100
+MAX_DUMPS = 10
+TRACEBACK_LIMIT = 8
+
+_READ_PDUS = (RawReadHoldingRegistersPDU, ReadHoldingRegistersPDU)
+
+PlanProvider = Callable[[], list[list[str]]]
+
+
+class FlightRecorderStats(TypedDict):
+    cycles: int
+    dumps: int
+    last_dump: str | None
+
+
+class CycleRecord:
+    """Everything the bridge saw during one poll cycle."""
+
+    __slots__ = ("seq", "started", "requests", "values", "payload", "filtered", "timings", "error")
+
+    def __init__(self, seq: int) -> None:
+        self.seq = seq
+        self.started = time.time()
+        self.requests: list[list[Any]] = []  # [start, quantity, ms, raw | None, error | None]
+        self.values: dict[str, Any] | None = None
+        self.payload: dict[str, Any] | None = None
+        self.filtered: dict[str, list[Any]] | None = None
+        self.timings: dict[str, float] | None = None
+        self.error: list[str] | None = None
+
+    def request(self, start: int, quantity: int, seconds: float, response: Any, error: BaseException | None) -> None:
+        if len(self.requests) < MAX_REQUESTS:
+            failure = f"{type(error).__name__}: {error}" if error is not None else None
+            self.requests.append([start, quantity, round(seconds * 1000, 1), response, failure])
+
+    def fail(self, exc: BaseException) -> None:
+        self.error = traceback.format_exception(exc, limit=TRACEBACK_LIMIT)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "started": round(self.started, 3),
+            "requests": [[*request[:3], _raw(request[3]), request[4]] for request in self.requests],
+            "values": self.values,
+            "payload": self.payload,
+            "filtered": self.filtered,
+            "timings": {phase: round(seconds, 4) for phase, seconds in self.timings.items()} if self.timings else None,
+            "error": self.error,
+        }
+
+
+def _raw(response: Any) -> Any:
+    if isinstance(response, (bytes, bytearray)):
+        return response.hex()
+    if response is None or isinstance(response, list):
+        return response
+    return repr(response)
+
+
+def filter_decisions(transformed: dict[str, Any], published: dict[str, Any]) -> dict[str, list[Any]]:
+    """Keys the filter replaced or filled: ``key: [transformed, published]``."""
+    return {
+        key: [transformed.get(key), value]
+        for key, value in published.items()
+        if key not in transformed or transformed[key] != value
+    }
+
+
+class FlightRecorder:
+    """Ring buffer of the last poll cycles, dumped to JSON on the first error of a kind."""
+
+    def __init__(
+        self,
+        cycles: int = DEFAULT_CYCLES,
+        directory: Path = DUMP_DIR,
+        keep: int = MAX_DUMPS,
+        plan: PlanProvider | None = None,
+    ):
+        """
+        Args:
+            cycles: Number of cycles kept in memory.
+            directory: Output directory for dumps.
+            keep: Number of dumps kept; older ones are deleted.
+            plan: Returns the current read plan (batches of register names) for the dump.
+        """
+        self.directory = directory
+        self.keep = keep
+        self.plan = plan
+        self.current: CycleRecord | None = None
+        self._records: deque[CycleRecord] = deque(maxlen=cycles)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._topic: str | None = None
+        self._pending: set[asyncio.Task[Path | None]] = set()
+        self._dumps = 0
+        self._last_dump: Path | None = None
+
+    def start(self, topic: str | None = None) -> None:
+        """Subscribe the on-demand dump topic (from the running event loop)."""
+        self._loop = asyncio.get_running_loop()
+        if topic is not None:
+            self._topic = topic
+            subscribe_command(topic, self.notify)
+            logger.debug("Flight recorder command topic: %s", topic)
+
+    async def stop(self) -> None:
+        if self._topic is not None:
+            unsubscribe_command(self._topic)
+            self._topic = None
+        self._loop = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def notify(self, topic: str, payload: bytes) -> None:
+        """MQTT message handler. Safe to call from paho's network thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self.request_dump, "request")
+
+    def request_dump(self, reason: str) -> None:
+        """Schedule dump() as a task (from the event loop)."""
+        task = asyncio.create_task(self.dump(reason), name="flight-recorder-dump")
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def begin_cycle(self, seq: int) -> CycleRecord:
+        record = self.current = CycleRecord(seq)
+        self._records.append(record)
+        return record
+
+    def end_cycle(self) -> None:
+        self.current = None
+
+    def record_request(
+        self, start: int, quantity: int, seconds: float, response: Any, error: BaseException | None
+    ) -> None:
+        if self.current is not None:
+            self.current.request(start, quantity, seconds, response, error)
+
+    def snapshot(self, reason: str) -> dict[str, Any]:
+        """The dump document: reason, read plan and all buffered cycles, oldest first."""
+        plan: list[list[str]] | None = None
+        if self.plan is not None:
+            try:
+                plan = self.plan()
+            except Exception as e:  # Dump darf nie am Plan scheitern
+                logger.debug("Flight recorder: read plan unavailable: %s", e)
+        return {
+            "reason": reason,
+            "time": round(time.time(), 3),
+            "plan": plan,
+            "cycles": [record.to_dict() for record in self._records],
+        }
+
+    async def dump(self, reason: str) -> Path | None:
+        """Write the buffer to ``<directory>/flight-<time>.json``; None if empty or on I/O errors."""
+        if not self._records:
+            return None
+        document = self.snapshot(reason)
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        path = self.directory / f"flight-{stamp}-{int(now * 1000) % 1000:03d}.json"
+        try:
+            size = await asyncio.to_thread(self._write, document, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error("❌ Flight recorder could not be written to %s: %s", self.directory, e)
+            return None
+        self._dumps += 1
+        self._last_dump = path
+        logger.info(
+            "🛩️ Flight recorder (%s): %d cycles, %.1f KiB → %s", reason, len(document["cycles"]), size / 1024, path
+        )
+        return path
+
+    def _write(self, document: dict[str, Any], path: Path) -> int:
+        data = json.dumps(document, separators=(",", ":"), default=str).encode()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        self._prune()
+        return len(data)
+
+    def _prune(self) -> None:
+        dumps = sorted(self.directory.glob("flight-*.json"))
+        for old in dumps[: max(0, len(dumps) - self.keep)]:
+            old.unlink(missing_ok=True)
+
+    def get_stats(self) -> FlightRecorderStats:
+        return {
+            "cycles": len(self._records),
+            "dumps": self._dumps,
+            "last_dump": str(self._last_dump) if self._last_dump else None,
+        }
+
+
+def attach_flight_recorder(client: AsyncHuaweiSolarClient, recorder: FlightRecorder) -> None:
+    """Record timing, raw response or exception of every holding-register request of ``client``."""
+    execute = client.execute
+
+    async def recording_execute(pdu: Any) -> Any:
+        if recorder.current is None or not isinstance(pdu, _READ_PDUS):
+            return await execute(pdu)
+        started = time.monotonic()
+        try:
+            response = await execute(pdu)
+        except BaseException as e:
+            recorder.record_request(pdu.start_address, pdu.quantity, time.monotonic() - started, None, e)
+            raise
+        recorder.record_request(pdu.start_address, pdu.quantity, time.monotonic() - started, response, None)
+        return response
+
+    client.execute = recording_execute  # type: ignore[method-assign]
@@ -0,0 +1,62 @@
+# huawei_solar_modbus_mqtt/bridge/healthcheck.py
+
+"""
+Docker HEALTHCHECK: ``python3 -m bridge.healthcheck``.
+
+Fragt ``/api/health`` der eingebetteten HTTP API ab. Die Bridge meldet dort
+503, wenn der Main-Loop keinen Cycle mehr startet (hängender Read, blockierter
+Event-Loop) - ein laufender, aber festgefahrener Prozess wird so erkannt.
+
+Der Port kommt aus der Add-on-Konfiguration (``http_api_port``, wie in
+main.py über den ConfigManager). Ist die HTTP API deaktiviert (Port 0,
+Standard) oder noch nicht gestartet (Verbindung abgelehnt), fällt der Check
+auf die frühere Prozess-Prüfung per ``pgrep`` zurück.
+
+Exit Codes: 0 = healthy, 1 = unhealthy (Docker-Konvention).
+"""
+
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+
+from .config_manager import ConfigManager
+
+HEALTH_URL = "http://127.0.0.1:{port}/api/health"
+TIMEOUT = 5.0
+
+
+def _process_running() -> bool:
+    result = subprocess.run(["pgrep", "-f", "python3.*bridge.main"], capture_output=True, check=False)
+    return result.returncode == 0
+
+
+def configured_port() -> int:
+    """``http_api_port`` from the add-on options; 0 if unreadable."""
+    try:
+        return ConfigManager().http_api_port
+    except (OSError, ValueError):
+        return 0
+
+
+def check(port: int | None = None, timeout: float = TIMEOUT) -> int:
+    """Return the HEALTHCHECK exit code (``port`` None = configured port)."""
+    if port is None:
+        port = configured_port()
+    if not port:
+        return 0 if _process_running() else 1
+    try:
+        with urllib.request.urlopen(HEALTH_URL.format(port=port), timeout=timeout) as response:
+            return 0 if response.status == 200 else 1
+    except urllib.error.HTTPError:
+        return 1
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, ConnectionRefusedError):
+            return 0 if _process_running() else 1
+        return 1
+    except TimeoutError:
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(check())
@@ -0,0 +1,220 @@
+# huawei_solar_modbus_mqtt/bridge/http_api.py
+
+"""
+Eingebettete HTTP API mit dem letzten Snapshot.
+
+Lokale Consumer bekommen die aktuellen Werte direkt aus dem Speicher der
+Bridge - ohne Broker-Roundtrip und ohne zusätzliche Modbus-Reads. Gefüttert
+wird die API von main_once mit denselben gefilterten Daten wie MQTT.
+
+Endpoints (nur GET):
+    /api/snapshot   Letzter Snapshot + Cycle-Metadaten (503 vor dem ersten Cycle)
+    /api/health     Liveness der Bridge (200 = alive, 503 = hängt)
+    /api/events     Server-Sent Events: ein ``snapshot`` Event pro Cycle,
+                    ``: keepalive`` Kommentar bei Stille
+    /metrics        OpenMetrics-Exposition für Prometheus (metrics.py)
+    /api/latency    Latenz-Histogramme pro Register/Batch (latency.py),
+                    ``/api/latency.txt`` als Text-Tabelle
+
+Das ``data`` Objekt ist byte-identisch mit dem MQTT-Payload (gleiche
+Reihenfolge und Rundung, ``last_update`` aus dem Transform-Zeitstempel wie
+in publish_data()). Langsame SSE-Clients verpassen Zwischenstände,
+bekommen aber immer den neuesten Snapshot - der Poll-Cycle wartet nie auf sie.
+
+Bewusst ohne Framework-Abhängigkeit: HTTP/1.1 auf asyncio Streams, eine
+Anfrage pro Verbindung (``Connection: close``).
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from .latency import LatencyRecorder
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .payload_serializer import get_serializer
+
+logger = logging.getLogger("huawei.http")
+
+DEFAULT_HTTP_PORT = 8099
+SSE_KEEPALIVE = 15.0
+REQUEST_TIMEOUT = 5.0
+
+HealthProvider = Callable[[], dict[str, Any]]
+MetricsProvider = Callable[[], bytes]
+LatencyProvider = Callable[[], LatencyRecorder]
+
+_REASONS = {200: "OK", 404: "Not Found", 405: "Method Not Allowed", 400: "Bad Request", 503: "Service Unavailable"}
+
+
+class HttpApi:
+    """Snapshot, health and SSE stream over plain HTTP."""
+
+    def __init__(
+        self,
+        health: HealthProvider,
+        *,
+        host: str = "0.0.0.0",
+        port: int = DEFAULT_HTTP_PORT,
+        keepalive: float = SSE_KEEPALIVE,
+        metrics: MetricsProvider | None = None,
+        latency: LatencyProvider | None = None,
+    ):
+        """
+        Args:
+            health: Returns the health document; its ``alive`` key selects 200/503.
+            host: Listen address.
+            port: Listen port (0 = any free port).
+            keepalive: Seconds of silence before an SSE keepalive comment.
+            metrics: Renders the OpenMetrics exposition for ``/metrics`` (None = 404).
+            latency: Returns the recorder behind ``/api/latency`` (None = 404).
+        """
+        self.health = health
+        self.metrics = metrics
+        self.latency = latency
+        self.host = host
+        self.keepalive = keepalive
+        self._port = port
+        self._server: asyncio.Server | None = None
+        self._meta: dict[str, Any] | None = None
+        self._payload = b""
+        self._streams: set[asyncio.Queue[bytes | None]] = set()
+
+    @property
+    def port(self) -> int:
+        """Bound port (differs from the configured one when started with port 0)."""
+        if self._server is not None and self._server.sockets:
+            return int(self._server.sockets[0].getsockname()[1])
+        return self._port
+
+    @property
+    def client_count(self) -> int:
+        """Connected SSE clients."""
+        return len(self._streams)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self._port)
+        logger.info("🌐 HTTP API listening on %s:%d", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for queue in list(self._streams):
+            _put_latest(queue, None)
+        await self._server.wait_closed()
+        self._server = None
+        logger.info("🌐 HTTP API stopped")
+
+    def update(self, data: Mapping[str, Any], cycle: int, timings: Mapping[str, float] | None = None) -> None:
+        """Store the cycle's snapshot and push it to all SSE clients."""
+        now = time.time()
+        # wie publish_data(): last_update aus den Daten, damit der Payload dem MQTT-Payload gleicht
+        self._payload = get_serializer().dumps({**data, "last_update": int(data.get("last_update") or now)})
+        self._meta = {
+            "cycle": cycle,
+            "timestamp": now,
+            "timings": {name: round(value, 4) for name, value in (timings or {}).items()},
+        }
+        event = b"event: snapshot\nid: %d\ndata: %s\n\n" % (cycle, self._payload)
+        for queue in self._streams:
+            _put_latest(queue, event)
+
+    # =========================================================================
+    # HTTP
+    # =========================================================================
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=REQUEST_TIMEOUT)
+                method, target, _version = head.split(b"\r\n", 1)[0].decode("latin-1").split(" ", 2)
+            except (TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                await self._respond(writer, 400, {"error": "bad request"})
+                return
+
+            path = target.split("?", 1)[0].rstrip("/")
+            if method != "GET":
+                await self._respond(writer, 405, {"error": "method not allowed"})
+            elif path == "/api/snapshot":
+                await self._send_snapshot(writer)
+            elif path == "/api/health":
+                health = self.health()
+                await self._respond(writer, 200 if health.get("alive") else 503, health)
+            elif path == "/api/events":
+                await self._stream_events(writer)
+            elif path == "/metrics" and self.metrics is not None:
+                await self._respond(writer, 200, self.metrics(), METRICS_CONTENT_TYPE)
+            elif path == "/api/latency" and self.latency is not None:
+                await self._respond(writer, 200, self.latency().report())
+            elif path == "/api/latency.txt" and self.latency is not None:
+                report = self.latency().format_report().encode()
+                await self._respond(writer, 200, report, "text/plain; charset=utf-8")
+            else:
+                await self._respond(writer, 404, {"error": "not found"})
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError, OSError):
+                await writer.wait_closed()
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, status: int, body: Any, content_type: str = "application/json"
+    ) -> None:
+        raw = body if isinstance(body, bytes) else json.dumps(body).encode()
+        writer.write(_head(status, content_type, len(raw)) + raw)
+        await writer.drain()
+
+    async def _send_snapshot(self, writer: asyncio.StreamWriter) -> None:
+        if self._meta is None:
+            await self._respond(writer, 503, {"error": "no data yet"})
+            return
+        meta = {**self._meta, "age": round(time.time() - self._meta["timestamp"], 3)}
+        body = json.dumps(meta)[:-1].encode() + b',"data":' + self._payload + b"}"
+        await self._respond(writer, 200, body)
+
+    async def _stream_events(self, writer: asyncio.StreamWriter) -> None:
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=1)
+        if self._meta is not None:
+            queue.put_nowait(b"event: snapshot\nid: %d\ndata: %s\n\n" % (self._meta["cycle"], self._payload))
+        writer.write(_head(200, "text/event-stream", None))
+        await writer.drain()
+
+        self._streams.add(queue)
+        logger.debug("SSE client connected (%d total)", len(self._streams))
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=self.keepalive)
+                except TimeoutError:
+                    event = b": keepalive\n\n"
+                if event is None:
+                    return
+                writer.write(event)
+                await writer.drain()
+        finally:
+            self._streams.discard(queue)
+            logger.debug("SSE client disconnected (%d total)", len(self._streams))
+
+
+def _head(status: int, content_type: str, length: int | None) -> bytes:
+    lines = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+        f"Content-Type: {content_type}",
+        "Cache-Control: no-store",
+        "Connection: close",
+    ]
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+def _put_latest(queue: asyncio.Queue[bytes | None], item: bytes | None) -> None:
+    """Replace a pending item so slow clients always get the newest one."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
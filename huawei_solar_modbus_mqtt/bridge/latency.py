@@ -0,0 +1,169 @@
+# huawei_solar_modbus_mqtt/bridge/latency.py
+
+"""
+Latenz-Histogramme pro Register und pro Batch.
+
+read_registers() hat Timings bisher nur in einer lokalen Liste gesammelt und
+bei DEBUG die 5 langsamsten Register ausgegeben - nach jedem Cycle war alles
+weg. Der LatencyRecorder hält sie dauerhaft:
+
+    register:<name>          Einzel-Reads (sequentiell, Fallback, unbekannte Register)
+    batch:<erstes>..<letztes> Batch-Reads (Library-Pfad und fast_decode)
+    trace:<stufe>            Cycle-Stufen und Ende-zu-Ende (tracing.py, nur mit ``tracing``)
+    loop:lag                 Event-Loop-Lag (loop_monitor.py, nur mit ``loop_monitor``)
+
+Pro Key ein log-skaliertes Histogramm (Faktor √2 ab 1 ms, 36 Buckets, der
+letzte ab ~2 min offen) plus Fehlerzähler. Der Speicher ist fest: 36 Integer
+pro Key, die Anzahl Keys ist durch Register-Liste und Read-Plan begrenzt.
+Perzentile sind Bucket-Obergrenzen (höchstens √2 zu hoch), gedeckelt auf das
+Maximum.
+
+Abfrage:
+    GET /api/latency        JSON-Report (HTTP API)
+    GET /api/latency.txt    Text-Tabelle, langsamste zuerst
+    DEBUG-Log               langsamste Keys in der 20-Cycle-Zusammenfassung
+
+Damit lassen sich Batch-Grenzen (batch_max_gap) mit echten Zahlen wählen und
+Register finden, die den Dongle ausbremsen.
+"""
+
+import math
+from collections.abc import Sequence
+from typing import TypedDict
+
+MIN_LATENCY = 0.001
+BUCKET_FACTOR = math.sqrt(2)
+BUCKET_COUNT = 36
+
+_LOG_FACTOR = math.log(BUCKET_FACTOR)
+
+
+class LatencySummary(TypedDict):
+    count: int
+    failures: int
+    mean: float | None
+    p50: float | None
+    p90: float | None
+    p99: float | None
+    max: float | None
+
+
+def bucket_upper_bound(index: int) -> float:
+    """Upper bound (seconds) of bucket ``index``; the last bucket is open-ended."""
+    if index >= BUCKET_COUNT - 1:
+        return math.inf
+    return MIN_LATENCY * BUCKET_FACTOR**index
+
+
+class LogHistogram:
+    """Fixed-size, log-bucketed latency histogram."""
+
+    __slots__ = ("buckets", "count", "total", "max", "failures")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.failures = 0
+
+    def observe(self, seconds: float, ok: bool = True) -> None:
+        if seconds <= MIN_LATENCY:
+            index = 0
+        else:
+            index = min(BUCKET_COUNT - 1, math.ceil(math.log(seconds / MIN_LATENCY) / _LOG_FACTOR - 1e-9))
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if not ok:
+            self.failures += 1
+
+    def percentile(self, q: float) -> float | None:
+        """Estimate of the ``q`` quantile (0-1): upper bound of its bucket, capped at the maximum."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bucket_upper_bound(index), self.max)
+        return self.max
+
+    def summary(self) -> LatencySummary:
+        def rounded(value: float | None) -> float | None:
+            return round(value, 4) if value is not None else None
+
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "mean": rounded(self.total / self.count) if self.count else None,
+            "p50": rounded(self.percentile(0.5)),
+            "p90": rounded(self.percentile(0.9)),
+            "p99": rounded(self.percentile(0.99)),
+            "max": rounded(self.max) if self.count else None,
+        }
+
+
+class LatencyRecorder:
+    """Per-register and per-batch latency histograms for the whole runtime."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[str, LogHistogram] = {}
+
+    def record(self, key: str, seconds: float, ok: bool = True) -> None:
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LogHistogram()
+        histogram.observe(seconds, ok)
+
+    def record_register(self, name: str, seconds: float, ok: bool = True) -> None:
+        self.record(f"register:{name}", seconds, ok)
+
+    def record_batch(self, names: Sequence[str], seconds: float, ok: bool = True) -> None:
+        self.record(batch_key(names), seconds, ok)
+
+    def get(self, key: str) -> LogHistogram | None:
+        return self._histograms.get(key)
+
+    def report(self, prefix: str | tuple[str, ...] = "") -> dict[str, LatencySummary]:
+        """Summary per key (optionally only keys starting with ``prefix``), slowest (p90) first."""
+        summaries = {key: h.summary() for key, h in self._histograms.items() if key.startswith(prefix)}
+        return dict(sorted(summaries.items(), key=lambda item: -(item[1]["p90"] or 0.0)))
+
+    def slowest(self, limit: int = 5, prefix: str | tuple[str, ...] = "") -> list[tuple[str, LatencySummary]]:
+        return list(self.report(prefix).items())[:limit]
+
+    def format_report(self) -> str:
+        """Plain-text table of report(), one key per line."""
+        header = f"{'key':<60} {'count':>7} {'fail':>5} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+        lines = [header, "-" * len(header)]
+        for key, s in self.report().items():
+            times = (s["mean"], s["p50"], s["p90"], s["p99"], s["max"])
+            columns = " ".join(f"{f'{v * 1000:.1f}ms' if v is not None else '-':>8}" for v in times)
+            lines.append(f"{key:<60} {s['count']:>7} {s['failures']:>5} {columns}")
+        return "\n".join(lines) + "\n"
+
+
+def batch_key(names: Sequence[str]) -> str:
+    if not names:
+        return "batch:"
+    return f"batch:{names[0]}..{names[-1]}" if len(names) > 1 else f"batch:{names[0]}"
+
+
+_recorder_instance: LatencyRecorder | None = None
+
+
+def get_latency_recorder() -> LatencyRecorder:
+    """Gibt Singleton-Instanz zurück."""
+    global _recorder_instance
+    if _recorder_instance is None:
+        _recorder_instance = LatencyRecorder()
+    return _recorder_instance
+
+
+def reset_latency_recorder() -> None:
+    """Verwirft alle Histogramme (nur für Tests)."""
+    global _recorder_instance
+    _recorder_instance = None
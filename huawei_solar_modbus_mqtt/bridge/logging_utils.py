@@ -1,10 +1,56 @@
 # huawei_solar_modbus_mqtt/bridge/logging_utils.py
 
-"""Logging utilities with TRACE support."""
+"""
+Logging utilities with TRACE support, queued output, rate limiting and JSON output.
 
+Ausgabe über Queue:
+    Der Root-Logger hat nur einen QueueHandler; ein QueueListener-Thread
+    schreibt nach stdout. Ein langsames stdout (Supervisor-Log, SD-Karte)
+    blockiert so nie den Event-Loop. Formatiert wird weiterhin beim Aufruf
+    (QueueHandler.prepare) - Log-Aufrufe übergeben deshalb Argumente statt
+    f-Strings (ruff G004), damit deaktivierte Level nichts kosten.
+
+Rate-Limit pro Schlüssel:
+    Meldungen, die sonst jeden Cycle kommen (fehlende Critical-Keys,
+    FILTERED, ...), tragen ``extra={"rate_key": "..."}``. Wie beim
+    ConnectionErrorTracker geht die erste Meldung eines Schlüssels sofort
+    raus, Wiederholungen innerhalb von RATE_LIMIT_INTERVAL werden nur gezählt
+    und an die nächste durchgelassene Meldung angehängt
+    (``... (12 similar suppressed)``, Feld ``suppressed``). Ohne ``rate_key``
+    wird nichts gefiltert.
+
+JSON-Ausgabe (``log_format: json``):
+    Eine kompakte JSON-Zeile pro Record für Loki/Elasticsearch:
+    ``ts``, ``level``, ``logger``, ``msg`` und alle ``extra=`` Felder des
+    Aufrufs, bei Exceptions zusätzlich ``exc``. Die Log-Punkte in main.py,
+    error_tracker.py und total_increasing_filter.py verwenden feste Namen:
+
+        cycle        Cycle-Nummer
+        phase        modbus, mqtt, cycle, publish, filter, refresh, heartbeat
+        duration     Sekunden (Phase, Cycle, Downtime)
+        durations    Phasen-Timings des Cycles {modbus, transform, ...}
+        error_type   timeout, connection_refused, ..., other
+        error_types  aktive Fehlertypen (Liste)
+        register     MQTT-Key eines Werts (Filter)
+        value / last aktueller bzw. letzter gültiger Wert (Filter)
+        count        Anzahl (Werte, Fehlversuche)
+        filtered / missing  gefilterte bzw. aufgefüllte Werte
+        suppressed   per Rate-Limit unterdrückte Wiederholungen
+
+    Ausgabe auswerten ohne Regex, z.B. ``| json | error_type != ""`` in Loki.
+"""
+
+import atexit
+import json
 import logging
+import queue
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Protocol, runtime_checkable
 
+RATE_LIMIT_INTERVAL = 300.0
+
 
 @runtime_checkable
 class LoggerWithTrace(Protocol):
@@ -48,3 +94,95 @@ def get_logger(name: str) -> LoggerWithTrace:
     # Logger wird zur Laufzeit um trace() erweitert (in main.py)
     # Type-Checker sieht LoggerWithTrace Protocol
     return logging.getLogger(name)  # type: ignore[return-value]
+
+
+class RateLimitFilter(logging.Filter):
+    """Drops repeats of records with the same ``rate_key`` within ``interval`` seconds."""
+
+    def __init__(self, interval: float = RATE_LIMIT_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self._last_emitted: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "rate_key", None)
+        if key is None:
+            return True
+        now = time.monotonic()
+        last = self._last_emitted.get(key)
+        if last is not None and now - last < self.interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return False
+        self._last_emitted[key] = now
+        if suppressed := self._suppressed.pop(key, 0):
+            record.msg = f"{record.msg} ({suppressed} similar suppressed)"
+            record.suppressed = suppressed
+        return True
+
+    def get_suppressed(self) -> dict[str, int]:
+        """Repeats dropped per key since the last emitted record."""
+        return dict(self._suppressed)
+
+
+# Attribute jedes LogRecords - alles andere kam über extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "rate_key",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per record: ts, level, logger, msg and the ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+_listener: QueueListener | None = None
+
+
+def start_queue_logging(
+    root: logging.Logger, handler: logging.Handler, formatter: logging.Formatter | None = None
+) -> QueueHandler:
+    """Attach a QueueHandler (with RateLimitFilter) to ``root``; ``handler`` writes in a background thread.
+
+    ``formatter`` runs in the logging thread, before exc_info and the
+    ``extra=`` fields are flattened into the queued message (JSON output).
+    """
+    global _listener
+    stop_queue_logging()
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    if formatter is not None:
+        queue_handler.setFormatter(formatter)
+    root.addHandler(queue_handler)
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return queue_handler
+
+
+def stop_queue_logging() -> None:
+    """Write all queued records and stop the background thread (idempotent, also runs at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_queue_logging)
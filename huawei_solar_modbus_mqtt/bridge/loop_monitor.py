@@ -0,0 +1,169 @@
+# huawei_solar_modbus_mqtt/bridge/loop_monitor.py
+
+"""
+Event-Loop-Monitor: Scheduling-Lag und blockierende Callbacks.
+
+Die Bridge mischt asyncio mit blockierenden Teilen (paho-Thread, Executor-
+Waits für PUBACK, synchrones Logging, Serialisierung). Bei kurzen Poll-
+Intervallen wird jeder Stall als Jitter sichtbar - bisher ohne Hinweis, wo
+er herkommt. Mit ``loop_monitor: true``:
+
+    Lag     Ein Task schläft alle SAMPLE_INTERVAL Sekunden und misst, wie viel
+            später er tatsächlich wieder läuft. Histogramm
+            ``huabus_event_loop_lag_seconds`` und Key ``loop:lag`` im
+            LatencyRecorder (Perzentile über ``GET /api/latency``).
+    Stalls  asyncio Debug-Modus mit ``slow_callback_duration``: asyncio meldet
+            jeden Callback, der länger als SLOW_CALLBACK lief, über den
+            ``asyncio`` Logger. Ein Filter fängt diese Meldungen ab, zählt sie
+            (``huabus_slow_callbacks_total``) und behält die MAX_STALLS
+            längsten samt Callback-Beschreibung.
+
+Stalls ab STALL_WARNING werden als WARNING geloggt, alle anderen als DEBUG;
+die 20-Cycle-Zusammenfassung (DEBUG) zeigt Lag-Perzentile und den längsten
+Stall. Der Debug-Modus kostet etwas CPU pro Callback - deshalb nur auf Wunsch.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import TypedDict
+
+from .latency import get_latency_recorder
+from .metrics import get_metrics
+
+logger = logging.getLogger("huawei.loop")
+
+SAMPLE_INTERVAL = 0.1
+SLOW_CALLBACK = 0.05
+STALL_WARNING = 0.5
+MAX_STALLS = 10
+
+# Meldung aus asyncio.base_events._run_once (Debug-Modus)
+_SLOW_CALLBACK_MSG = "Executing %s took %.3f seconds"
+
+
+class Stall(TypedDict):
+    duration: float
+    callback: str
+    at: float
+
+
+class LoopStats(TypedDict):
+    samples: int
+    max_lag: float
+    slow_callbacks: int
+    stalls: list[Stall]
+
+
+class _SlowCallbackFilter(logging.Filter):
+    """Diverts asyncio's slow-callback warnings to the monitor."""
+
+    def __init__(self, monitor: "LoopMonitor"):
+        super().__init__()
+        self.monitor = monitor
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.msg != _SLOW_CALLBACK_MSG or not isinstance(record.args, tuple) or len(record.args) != 2:
+            return True
+        callback, duration = record.args
+        if not isinstance(duration, (int, float)):
+            return True
+        self.monitor.observe_slow_callback(str(callback), float(duration))
+        return False
+
+
+class LoopMonitor:
+    """Samples event-loop lag and records the longest blocking callbacks."""
+
+    def __init__(
+        self,
+        interval: float = SAMPLE_INTERVAL,
+        slow_callback: float = SLOW_CALLBACK,
+        max_stalls: int = MAX_STALLS,
+    ):
+        """
+        Args:
+            interval: Seconds between two lag samples.
+            slow_callback: Callbacks running longer than this are recorded as stalls.
+            max_stalls: Number of longest stalls kept.
+        """
+        self.interval = interval
+        self.slow_callback = slow_callback
+        self.max_stalls = max_stalls
+
+        self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._previous_debug = False
+        self._filter = _SlowCallbackFilter(self)
+
+        self._samples = 0
+        self._max_lag = 0.0
+        self._slow_callbacks = 0
+        self._stalls: list[tuple[float, int, Stall]] = []  # Min-Heap nach Dauer
+
+    def start(self) -> None:
+        """Start sampling and enable slow-callback reports (must be called from the running event loop)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._previous_debug = self._loop.get_debug()
+        self._loop.set_debug(True)
+        self._loop.slow_callback_duration = self.slow_callback
+        logging.getLogger("asyncio").addFilter(self._filter)
+        self._task = asyncio.create_task(self._run(), name="loop-monitor")
+        logger.debug("Event loop monitor started (slow callbacks > %.0fms)", self.slow_callback * 1000)
+
+    async def stop(self) -> None:
+        """Stop sampling and restore the loop's debug setting."""
+        logging.getLogger("asyncio").removeFilter(self._filter)
+        if self._loop is not None:
+            self._loop.set_debug(self._previous_debug)
+            self._loop = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.observe_lag(loop.time() - expected)
+
+    def observe_lag(self, lag: float) -> None:
+        """Record how late the sampler woke up."""
+        lag = max(0.0, lag)
+        self._samples += 1
+        self._max_lag = max(self._max_lag, lag)
+        get_latency_recorder().record("loop:lag", lag)
+        get_metrics().loop_lag_seconds.observe(lag)
+
+    def observe_slow_callback(self, callback: str, duration: float) -> None:
+        """Record a callback that blocked the loop for ``duration`` seconds."""
+        self._slow_callbacks += 1
+        get_metrics().slow_callbacks.inc()
+        stall: Stall = {"duration": round(duration, 3), "callback": callback, "at": time.time()}
+        entry = (duration, self._slow_callbacks, stall)
+        if len(self._stalls) < self.max_stalls:
+            heapq.heappush(self._stalls, entry)
+        elif duration > self._stalls[0][0]:
+            heapq.heapreplace(self._stalls, entry)
+
+        if duration >= STALL_WARNING:
+            logger.warning("🐢 Event loop blocked for %.3fs by %s", duration, callback)
+        else:
+            logger.debug("🐢 Event loop blocked for %.3fs by %s", duration, callback)
+
+    def get_stats(self) -> LoopStats:
+        return {
+            "samples": self._samples,
+            "max_lag": round(self._max_lag, 4),
+            "slow_callbacks": self._slow_callbacks,
+            "stalls": [stall for _, _, stall in sorted(self._stalls, reverse=True)],
+        }
@@ -25,27 +25,52 @@ import signal
 import sys
 import time
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, cast
 
 from huawei_solar import AsyncHuaweiSolarClient, RegisterName, create_tcp_client
 from huawei_solar.exceptions import ConnectionException, ConnectionInterruptedException, ReadException
 
 from .batch_builder import BatchBuilder
+from .change_detector import RawChangeDetector, attach_change_detector
 from .config.registers import ESSENTIAL_REGISTERS
 from .config_manager import ConfigManager, ConfigurationError
+from .control import ControlQueue
+from .diagnostics import BridgeDiagnostics
 from .error_tracker import ConnectionErrorTracker, ErrorType
-from .logging_utils import get_logger
+from .fast_decode import FastDecoder, read_batch
+from .flight_recorder import CycleRecord, FlightRecorder, attach_flight_recorder, filter_decisions
+from .http_api import HttpApi
+from .latency import get_latency_recorder
+from .logging_utils import JsonFormatter, get_logger, start_queue_logging
+from .loop_monitor import LoopMonitor
+from .metrics import get_metrics
+from .modbus_proxy import DEFAULT_PROXY_PORT, ModbusProxy, attach_register_image
+from .modbus_scheduler import ModbusScheduler, Priority, attach_scheduler, modbus_priority
 from .mqtt_client import (
+    configure_publish_policy,
     connect_mqtt,
     disconnect_mqtt,
+    is_mqtt_connected,
+    publish_binary,
     publish_data,
     publish_discovery_configs,
+    publish_json,
     publish_status,
 )
+from .mqtt_supervisor import MqttSupervisor
+from .output_sinks import OutputSinks, build_output_sinks
+from .poll_policy import PollPolicy
+from .profiler import CycleProfiler
+from .publish_policy import PublishPolicy, TopicPolicy
+from .refresh import RefreshController
+from .register_image import RegisterImage
+from .resources import format_sample, get_resource_monitor
+from .sentinels import get_sentinel_table
 from .slave_detector import KNOWN_SLAVE_IDS, detect_slave_id
 from .total_increasing_filter import get_filter, reset_filter
-from .transform import transform_data
+from .tracing import CycleTrace, record_trace
+from .transform import get_compiled_transform
 
 MODBUS_EXCEPTIONS: tuple[type, ...] = (ReadException,)
 
@@ -120,8 +145,32 @@ class _BridgeState:
     """Mutable runtime state of the bridge main loop."""
 
     last_success: float = 0.0
+    last_cycle: float = 0.0
+    started_at: float = field(default_factory=time.time)
     config: "ConfigManager | None" = None
     cycle_count: int = 0
+    mqtt_supervisor: MqttSupervisor | None = None
+    output_sinks: OutputSinks | None = None
+    modbus_proxy: ModbusProxy | None = None
+    http_api: HttpApi | None = None
+    fast_decoder: FastDecoder | None = None
+    change_detector: RawChangeDetector | None = None
+    last_full_publish: float = 0.0
+    unchanged_streak: int = 0
+    poll_policy: PollPolicy | None = None
+    refresh: RefreshController | None = None
+    scheduler: ModbusScheduler | None = None
+    control: ControlQueue | None = None
+    refresh_decoders: dict[tuple[str, ...], FastDecoder] = field(default_factory=dict)
+    # Poll-Cycle und Refresh lesen nie gleichzeitig
+    read_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_read_started: float = 0.0
+    last_data: dict[str, Any] | None = None
+    diagnostics: BridgeDiagnostics | None = None
+    loop_monitor: LoopMonitor | None = None
+    profiler: CycleProfiler | None = None
+    flight_recorder: FlightRecorder | None = None
+    next_cycle_due: float = 0.0  # geplanter Start des nächsten Cycles (0 = kein Plan, z.B. nach Fehler)
 
     async def publish_status(self, status: str, topic: str) -> None:
         if self.config is not None:
@@ -142,7 +191,7 @@ def reset_state() -> None:
     _error_tracker = ConnectionErrorTracker(log_interval=60)
 
 
-def init_logging(log_level: str) -> None:
+def init_logging(log_level: str, log_format: str = "text") -> None:
     """
     Initialisiert komplettes Logging-System.
 
@@ -153,9 +202,10 @@ def init_logging(log_level: str) -> None:
 
     Args:
         log_level: Log level string (TRACE|DEBUG|INFO|WARNING|ERROR)
+        log_format: text (lesbare Zeilen) oder json (eine JSON-Zeile pro Record)
     """
     level = _parse_log_level(log_level)
-    _setup_root_logger(level)
+    _setup_root_logger(level, log_format)
     _configure_tmodbus(level)
     _configure_huawei_solar(level)
 
@@ -190,7 +240,7 @@ def _parse_log_level(level_str: str) -> int:
     return level_map.get(level_str.upper(), logging.INFO)
 
 
-def _setup_root_logger(level: int) -> None:
+def _setup_root_logger(level: int, log_format: str = "text") -> None:
     root = logging.getLogger()
     root.setLevel(level)
 
@@ -199,10 +249,16 @@ def _setup_root_logger(level: int) -> None:
         root.removeHandler(handler)
         handler.close()  # ← Handler auch schließen!
 
+    # stdout nur im Listener-Thread schreiben (logging_utils.start_queue_logging)
     handler = logging.StreamHandler(sys.stdout)
+    if log_format == "json":
+        # JSON entsteht im aufrufenden Thread, solange extra= und exc_info noch am Record hängen
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        start_queue_logging(root, handler, JsonFormatter())
+        return
     formatter = TraceFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     handler.setFormatter(formatter)
-    root.addHandler(handler)
+    start_queue_logging(root, handler)
 
 
 def _configure_tmodbus(level: int) -> None:
@@ -251,6 +307,12 @@ async def heartbeat(config: ConfigManager) -> None:
                 timeout,
                 error_status["total_failures"],
                 error_status["active_errors"],
+                extra={
+                    "phase": "heartbeat",
+                    "duration": round(offline_duration, 1),
+                    "count": error_status["total_failures"],
+                    "error_types": sorted(_error_tracker.errors),
+                },
             )
         await publish_status("offline", config.mqtt_topic)
     else:
@@ -261,11 +323,10 @@ def log_cycle_summary(cycle_num: int, _timings: dict[str, float], data: dict[str
     """Loggt Cycle-Zusammenfassung."""
     filter_stats = get_filter().get_stats()
     filter_indicator = ""
+    total_filtered = sum(filter_stats.values()) if filter_stats else 0
 
-    if filter_stats:
-        total_filtered = sum(filter_stats.values())
-        if total_filtered > 0:
-            filter_indicator = f" 🔍[{total_filtered} filtered]"
+    if total_filtered > 0:
+        filter_indicator = f" 🔍[{total_filtered} filtered]"
 
     logger.info(
         "📊 Published - PV: %dW | AC Out: %dW | Grid: %dW | Battery: %dW%s",
@@ -274,22 +335,64 @@ def log_cycle_summary(cycle_num: int, _timings: dict[str, float], data: dict[str
         data.get("meter_power_active", 0),
         data.get("battery_power", 0),
         filter_indicator,
+        extra={"cycle": cycle_num, "phase": "publish", "count": len(data), "filtered": total_filtered},
     )
 
     if cycle_num % 20 == 0:
-        total_filtered = sum(filter_stats.values()) if filter_stats else 0
-
+        fields = {"cycle": cycle_num, "phase": "filter", "filtered": total_filtered}
         if total_filtered > 0:
             logger.info(
                 "└─> 🔍 Filter summary (last 20 cycles): %d values filtered | Details: %s",
                 total_filtered,
                 dict(filter_stats),
+                extra=fields,
             )
         else:
-            logger.info("└─> 🔍 Filter summary (last 20 cycles): 0 values filtered - all data valid ✓")
+            logger.info("└─> 🔍 Filter summary (last 20 cycles): 0 values filtered - all data valid ✓", extra=fields)
 
         get_filter().reset_stats()
 
+        if logger.isEnabledFor(logging.DEBUG) and (empty := get_sentinel_table().get_stats()):
+            logger.debug("└─> 🚫 Sentinel values per register (since start): %s", empty)
+
+        latency = get_latency_recorder()
+        if logger.isEnabledFor(logging.DEBUG) and (slowest := latency.slowest(3, ("register:", "batch:"))):
+            logger.debug(
+                "└─> 🐌 Slowest reads (p90, since start): %s",
+                ", ".join(f"{key}={summary['p90']}s ({summary['failures']} failed)" for key, summary in slowest),
+            )
+
+        if logger.isEnabledFor(logging.DEBUG) and _state.loop_monitor is not None and (lag := latency.get("loop:lag")):
+            loop_stats = _state.loop_monitor.get_stats()
+            worst = loop_stats["stalls"][0] if loop_stats["stalls"] else None
+            logger.debug(
+                "└─> 🐢 Event loop lag: p99=%ss, max=%ss, %d slow callbacks%s",
+                lag.summary()["p99"],
+                loop_stats["max_lag"],
+                loop_stats["slow_callbacks"],
+                f" (worst {worst['duration']}s: {worst['callback']})" if worst else "",
+            )
+
+        if logger.isEnabledFor(logging.DEBUG) and (end_to_end := latency.get("trace:end_to_end")):
+            summary = end_to_end.summary()
+            logger.debug(
+                "└─> ⏱️ Modbus response → PUBACK: p50=%ss, p99=%ss, max=%ss",
+                summary["p50"],
+                summary["p99"],
+                summary["max"],
+            )
+
+        if logger.isEnabledFor(logging.DEBUG) and (process := get_resource_monitor().last):
+            logger.debug("└─> 💾 Resources: %s", format_sample(process))
+
+        if _state.change_detector is not None and logger.isEnabledFor(logging.DEBUG):
+            change_stats = _state.change_detector.get_stats()
+            logger.debug(
+                "└─> ⏸️ Unchanged cycles (since start): %d/%d",
+                change_stats["unchanged_cycles"],
+                change_stats["cycles"],
+            )
+
     elif filter_stats and logger.isEnabledFor(logging.DEBUG):
         logger.debug("🔍 Filter details: %s", dict(filter_stats))
 
@@ -302,18 +405,22 @@ async def _read_single_register(client: AsyncHuaweiSolarClient, name: str) -> tu
     graceful-degradation behavior: unavailable registers are silently
     skipped with a DEBUG log line instead of aborting the entire read cycle.
     """
+    start = time.time()
     try:
         value = await client.get(cast(RegisterName, name))
-        return name, value
     except READ_EXCEPTIONS:
+        get_latency_recorder().record_register(name, time.time() - start, ok=False)
         logger.debug("Skipping '%s' (not available)", name)
         return None
+    get_latency_recorder().record_register(name, time.time() - start)
+    return name, value
 
 
 async def read_registers(
     client: AsyncHuaweiSolarClient,
     batch_max_gap: int = 50,
     enable_batching: bool = True,
+    trace: CycleTrace | None = None,
 ) -> dict[str, Any]:
     """Liest Essential Registers vom Inverter mit optimalem Batching.
 
@@ -321,6 +428,7 @@ async def read_registers(
         client: AsyncHuaweiSolarClient Client
         batch_max_gap: Maximum address gap within a batch (for smart batching)
         enable_batching: Whether to use smart batching strategy
+        trace: Cycle trace that records the first Modbus response (tracing only)
 
     Strategy:
         1. Try smart batching: group registers by address proximity
@@ -359,6 +467,10 @@ async def read_registers(
                 len(batches),
                 f", {len(unknown_registers)} sequential" if unknown_registers else "",
             )
+            metrics = get_metrics()
+            latency = get_latency_recorder()
+            metrics.plan_batches.set(len(batches))
+            metrics.plan_registers.set(len(ESSENTIAL_REGISTERS))
 
             batch_start = time.time()
             batch_timings: list[tuple[int, float]] = []  # batch_num, duration
@@ -375,8 +487,12 @@ async def read_registers(
                     )
                 try:
                     values = await client.get_multiple([cast(RegisterName, n) for n in batch])
+                    if trace is not None:
+                        trace.response()
                     batch_duration = time.time() - batch_read_start
                     batch_timings.append((batch_num, batch_duration))
+                    metrics.batch_seconds.observe(batch_duration, str(batch_num))
+                    latency.record_batch(batch, batch_duration)
 
                     batch_data = dict(zip(batch, values, strict=True))
                     data.update(batch_data)
@@ -408,6 +524,9 @@ async def read_registers(
                         batch_max_gap,
                     )
                     # Fall back to sequential for this batch
+                    latency.record_batch(batch, time.time() - batch_read_start, ok=False)
+                    metrics.batch_failures.inc()
+                    metrics.fallback_reads.inc(amount=len(batch))
                     for name in batch:
                         if (result := await _read_single_register(client, name)) is not None:
                             data[result[0]] = result[1]
@@ -441,10 +560,13 @@ async def read_registers(
 
         except READ_EXCEPTIONS as e:
             logger.debug("⚠️ Smart batching failed (%s), falling back to sequential mode", e)
+            get_metrics().fallback_reads.inc(amount=len(ESSENTIAL_REGISTERS))
             data = {}  # Reset data, will retry sequentially
 
     # === SEQUENTIAL MODE (v1.9.0 behavior) ===
     successful = 0
+    get_metrics().plan_batches.set(0)
+    get_metrics().plan_registers.set(len(ESSENTIAL_REGISTERS))
 
     # Performance-Tracking für Diagnose
     register_timings: list[tuple[str, float]] = []
@@ -454,8 +576,11 @@ async def read_registers(
         register_start = time.time()
         try:
             data[name] = await client.get(cast(RegisterName, name))
+            if trace is not None:
+                trace.response()
             register_duration = time.time() - register_start
             register_timings.append((name, register_duration))
+            get_latency_recorder().record_register(name, register_duration)
             successful += 1
 
             # Warnung bei sehr langsamen einzelnen Registern
@@ -465,6 +590,7 @@ async def read_registers(
         except READ_EXCEPTIONS:
             register_duration = time.time() - register_start
             register_timings.append((name, register_duration))
+            get_latency_recorder().record_register(name, register_duration, ok=False)
             logger.debug("Skipping '%s' (not available, took %.3fs)", name, register_duration)
 
     duration = time.time() - start
@@ -510,7 +636,130 @@ def is_modbus_exception(exc: Exception) -> bool:
     return isinstance(exc, MODBUS_EXCEPTIONS)
 
 
-async def main_once(client: AsyncHuaweiSolarClient, config: ConfigManager, cycle_num: int) -> None:
+def get_fast_decoder(batch_max_gap: int) -> FastDecoder:
+    """Return the compiled FastDecoder, rebuilt when batch_max_gap changes."""
+    if _state.fast_decoder is None or _state.fast_decoder.batch_max_gap != batch_max_gap:
+        _state.fast_decoder = FastDecoder(ESSENTIAL_REGISTERS, batch_max_gap=batch_max_gap)
+    return _state.fast_decoder
+
+
+def get_poll_policy(config: ConfigManager) -> PollPolicy:
+    """Return the PollPolicy (night mode), built on first use."""
+    if _state.poll_policy is None:
+        _state.poll_policy = PollPolicy(
+            config.poll_interval,
+            night_poll_interval=config.night_poll_interval,
+            latitude=config.latitude,
+            longitude=config.longitude,
+        )
+    return _state.poll_policy
+
+
+def _flight_record() -> CycleRecord | None:
+    """Record of the running cycle, None without flight recorder (or outside run_main_cycle)."""
+    return _state.flight_recorder.current if _state.flight_recorder is not None else None
+
+
+def get_diagnostics(config: ConfigManager) -> BridgeDiagnostics | None:
+    """Return the self-diagnostics collector, None unless ``diagnostics_interval`` is set."""
+    if not config.diagnostics_interval:
+        return None
+    if _state.diagnostics is None:
+        _state.diagnostics = BridgeDiagnostics(config.diagnostics_interval)
+    return _state.diagnostics
+
+
+async def publish_diagnostics(config: ConfigManager) -> None:
+    """Publish the diagnostics summary to ``<topic>/diagnostics`` once per interval (retained)."""
+    diagnostics = get_diagnostics(config)
+    if diagnostics is None or not diagnostics.due():
+        return
+    payload = diagnostics.collect()
+    await publish_json(f"{config.mqtt_topic}/diagnostics", payload, retain=True)
+    logger.debug("🩺 Diagnostics published: %s", payload)
+
+
+async def read_registers_fast(
+    client: AsyncHuaweiSolarClient,
+    decoder: FastDecoder,
+    record_metrics: bool = True,
+    trace: CycleTrace | None = None,
+) -> dict[str, Any]:
+    """Liest alle Batches als Rohdaten und dekodiert direkt in MQTT-Keys (Option fast_decode).
+
+    Gleiche Batches und gleiche Graceful Degradation wie read_registers():
+    schlägt ein Batch fehl, werden seine Register einzeln über client.get()
+    gelesen. Das Ergebnis ist bereits MQTT-gekeyt und geht an
+    CompiledTransform.finish() statt der vollständigen Transformation.
+
+    ``record_metrics=False`` für Reads außerhalb des Cycles (Refresh), damit
+    die Batch-Histogramme nur den regulären Read-Plan beschreiben. ``trace``
+    merkt sich die erste Batch-Antwort (Option tracing).
+    """
+    start = time.time()
+    data: dict[str, Any] = {}
+    metrics = get_metrics()
+    latency = get_latency_recorder()
+    if record_metrics:
+        metrics.plan_batches.set(len(decoder.plans))
+        metrics.plan_registers.set(sum(len(plan.names) for plan in decoder.plans) + len(decoder.unknown))
+
+    for batch_num, plan in enumerate(decoder.plans, 1):
+        batch_start = time.time()
+        try:
+            raw = await read_batch(client, plan)
+            if trace is not None:
+                trace.response()
+        except READ_EXCEPTIONS as e:
+            logger.debug("⚠️ Batch at %d failed (%s), falling back to sequential", plan.start, e)
+            latency.record_batch(plan.names, time.time() - batch_start, ok=False)
+            if record_metrics:
+                metrics.batch_failures.inc()
+                metrics.fallback_reads.inc(amount=len(plan.names))
+            for name in plan.names:
+                if (result := await _read_single_register(client, name)) is not None:
+                    decoder.store(name, result[1], data)
+            continue
+        batch_duration = time.time() - batch_start
+        latency.record_batch(plan.names, batch_duration)
+        if record_metrics:
+            metrics.batch_seconds.observe(batch_duration, str(batch_num))
+        decoder.decode(plan, raw, data)
+
+    for name in decoder.unknown:
+        if (result := await _read_single_register(client, name)) is not None:
+            decoder.store(name, result[1], data)
+
+    logger.info(
+        "📖 Essential read (fast decode): %.1fs (%d values, %d batches)",
+        time.time() - start,
+        len(data),
+        len(decoder.plans),
+    )
+    return data
+
+
+async def handle_unchanged_cycle(config: ConfigManager, cycle_num: int) -> bool:
+    """Apply the ``unchanged_cycles`` policy to a cycle with byte-identical raw responses.
+
+    Returns True if the cycle is done (keepalive or nothing sent), False if it
+    should run the full pipeline anyway: policy "publish", or the last full
+    publish is older than status_timeout (periodic refresh for sinks and
+    consumers that judge staleness by message age).
+    """
+    policy = config.unchanged_cycles
+    if policy == "publish" or time.time() - _state.last_full_publish >= config.status_timeout:
+        return False
+
+    if policy == "keepalive":
+        await publish_status("online", config.mqtt_topic, force=True)
+    _state.last_success = time.time()
+    _state.unchanged_streak += 1
+    logger.debug("⏸️ Cycle %d unchanged (%s)", cycle_num, policy)
+    return True
+
+
+async def main_once(client: AsyncHuaweiSolarClient, config: ConfigManager, cycle_num: int) -> bool:
     """Execute a single read-transform-filter-publish cycle.
 
     Reads essential Modbus registers, transforms and filters the values,
@@ -521,6 +770,10 @@ async def main_once(client: AsyncHuaweiSolarClient, config: ConfigManager, cycle
         config: Active configuration instance.
         cycle_num: Sequential cycle counter for logging and filtering.
 
+    Returns:
+        True if the data was published (or deliberately held back as an
+        unchanged cycle), False if there was no data or MQTT was down.
+
      Raises:
         TimeoutError: On Modbus read timeout.
         ConnectionRefusedError: On connection failure.
@@ -529,56 +782,119 @@ async def main_once(client: AsyncHuaweiSolarClient, config: ConfigManager, cycle
     _state.cycle_count = cycle_num
     _state.config = config
 
-    start: float = time.time()
+    trace = CycleTrace(cycle_num)
+    tracing = trace if config.tracing else None  # Read-Pfad und publish_data nur mit Option
+    record = _flight_record()
     logger.debug("Starting cycle")
 
     # === PHASE 1: Modbus Read ===
-    modbus_start: float = time.time()
+    if _state.change_detector is not None:
+        _state.change_detector.begin_cycle()
     try:
-        data = await read_registers(
-            client,
-            batch_max_gap=config.batch_max_gap,
-            enable_batching=config.enable_batching,
-        )
-        modbus_duration: float = time.time() - modbus_start
+        async with _state.read_lock:
+            _state.last_read_started = time.time()
+            if config.fast_decode:
+                data = await read_registers_fast(client, get_fast_decoder(config.batch_max_gap), trace=tracing)
+            else:
+                data = await read_registers(
+                    client,
+                    batch_max_gap=config.batch_max_gap,
+                    enable_batching=config.enable_batching,
+                    trace=tracing,
+                )
+        trace.mark("modbus")
+        if record is not None:
+            record.values = dict(data)  # finish() (fast_decode) ändert data in place
     except Exception as e:
+        failure = {"cycle": cycle_num, "phase": "modbus", "duration": round(trace.elapsed(), 3)}
         if is_modbus_exception(e):
-            logger.warning("⚠️ Modbus read failed after %.1fs: %s", time.time() - start, e)
+            logger.warning("⚠️ Modbus read failed after %.1fs: %s", trace.elapsed(), e, extra=failure)
         else:
-            logger.error("❌ Read error: %s", e)
+            logger.error("❌ Read error: %s", e, extra=failure)
         raise
 
+    metrics = get_metrics()
+    modbus_duration = trace.stages()["modbus"]
+    metrics.phase_seconds.observe(modbus_duration, "modbus")
     if not data:
-        logger.warning("⚠️ No data")
-        return
+        logger.warning("⚠️ No data", extra={"cycle": cycle_num, "phase": "modbus", "count": 0})
+        metrics.cycles.inc("no_data")
+        return False
+
+    detector = _state.change_detector
+    if detector is not None:
+        if detector.end_cycle() and await handle_unchanged_cycle(config, cycle_num):
+            get_poll_policy(config).repeat()
+            if diagnostics := get_diagnostics(config):
+                diagnostics.observe_cycle({"modbus": modbus_duration})
+            metrics.cycles.inc("unchanged")
+            metrics.last_success.set(_state.last_success)
+            return True
+        if _state.unchanged_streak:
+            logger.info("▶️ Values changed after %d unchanged cycles", _state.unchanged_streak)
+            _state.unchanged_streak = 0
 
     # === PHASE 2: Transform ===
-    transform_start: float = time.time()
-    transformed = transform_data(data)
-    transform_duration: float = time.time() - transform_start
+    transform = get_compiled_transform()
+    transformed = transform.finish(data) if config.fast_decode else transform(data)
+    trace.mark("transform")
+    if record is not None:
+        record.payload = dict(transformed)  # CompiledTransform verwendet das Dict im nächsten Cycle wieder
+    get_poll_policy(config).observe(transformed)
 
     # === PHASE 3: Filter ===
-    filter_start: float = time.time()
     filter_instance = get_filter()
     mqtt_data = filter_instance.filter(transformed)
-    filter_duration = time.time() - filter_start
+    trace.mark("filter")
+    if record is not None:
+        record.filtered = filter_decisions(transformed, mqtt_data)
+    if config.tracing_payload:
+        mqtt_data["trace_seq"] = trace.seq
+        if trace.read_time is not None:
+            mqtt_data["trace_read_ts"] = round(trace.read_time, 3)
+    _state.last_data = mqtt_data
+
+    # === PHASE 4: Output ===
+    # Additional sinks are queued first so they keep receiving data during MQTT outages
+    if _state.output_sinks:
+        _state.output_sinks.submit(mqtt_data, cycle=cycle_num)
+    if _state.http_api:
+        _state.http_api.update(mqtt_data, cycle_num, trace.timings())
+    trace.mark("output")
 
-    # === PHASE 4: MQTT Publish ===
-    mqtt_start: float = time.time()
-    await publish_data(mqtt_data, config.mqtt_topic)
-    _state.last_success = time.time()
-    mqtt_duration = time.time() - mqtt_start
+    try:
+        await publish_data(mqtt_data, config.mqtt_topic, trace=tracing)
+    except BaseException as e:
+        if _state.change_detector is not None:
+            _state.change_detector.invalidate()  # nicht publizierte Werte nicht als "unverändert" behandeln
+        if not isinstance(e, ConnectionError) or is_mqtt_connected():
+            raise
+        # MqttSupervisor is reconnecting; skip instead of failing the bridge
+        logger.warning(
+            "⏸️ MQTT disconnected, skipping publish (reconnect in progress)",
+            extra={"cycle": cycle_num, "phase": "mqtt", "count": len(mqtt_data)},
+        )
+        return False
+    if config.mqtt_binary_payload:
+        await publish_binary(mqtt_data, config.mqtt_topic)
+    trace.mark("done")
+    _state.last_success = _state.last_full_publish = time.time()
 
-    cycle_duration: float = time.time() - start
+    metrics.cycles.inc("published")
+    metrics.last_success.set(_state.last_success)
 
     # === PHASE 5: Logging ===
-    timings = {
-        "modbus": modbus_duration,
-        "transform": transform_duration,
-        "filter": filter_duration,
-        "mqtt": mqtt_duration,
-        "total": cycle_duration,
-    }
+    timings = trace.timings()
+    cycle_duration = timings["total"]
+    if record is not None:
+        record.timings = timings
+
+    for phase in ("transform", "filter", "mqtt", "total"):
+        metrics.phase_seconds.observe(timings[phase], phase)
+    if tracing is not None:
+        record_trace(tracing)
+    if diagnostics := get_diagnostics(config):
+        diagnostics.observe_cycle(timings)
 
     log_cycle_summary(cycle_num, timings, mqtt_data)
 
@@ -586,14 +902,75 @@ async def main_once(client: AsyncHuaweiSolarClient, config: ConfigManager, cycle
         "Cycle: %.1fs (Modbus: %.1fs, Transform: %.3fs, Filter: %.3fs, MQTT: %.2fs)",
         cycle_duration,
         modbus_duration,
-        transform_duration,
-        filter_duration,
-        mqtt_duration,
+        timings["transform"],
+        timings["filter"],
+        timings["mqtt"],
+        extra={
+            "cycle": cycle_num,
+            "phase": "cycle",
+            "duration": round(cycle_duration, 3),
+            "durations": {phase: round(seconds, 4) for phase, seconds in timings.items()},
+        },
     )
 
     # === PHASE 7: Performance-Check ===
     if cycle_duration > config.poll_interval * 0.8:  # ← direkt config nutzen, nicht _state.config
-        logger.warning("⚠️ Cycle %.1fs > 80%% poll_interval (%ds)", cycle_duration, config.poll_interval)
+        logger.warning(
+            "⚠️ Cycle %.1fs > 80%% poll_interval (%ds)",
+            cycle_duration,
+            config.poll_interval,
+            extra={"cycle": cycle_num, "phase": "cycle", "duration": round(cycle_duration, 3)},
+        )
+    return True
+
+
+async def refresh_registers(
+    client: AsyncHuaweiSolarClient, config: ConfigManager, names: list[str], requested_at: float
+) -> None:
+    """Out-of-cycle read of ``names`` for the refresh command topic.
+
+    Waits for a running poll cycle; if a cycle read started after the
+    request, its publish already carries fresher values and nothing is read.
+    Otherwise the values are merged into the last snapshot and published
+    like a regular cycle (MQTT, HTTP API, output sinks).
+    """
+    async with _state.read_lock:
+        if _state.last_read_started >= requested_at:
+            logger.debug("Refresh coalesced with poll cycle")
+            return
+        if _state.last_data is None:
+            logger.debug("Refresh skipped: no snapshot yet")
+            return
+
+        key = tuple(names)
+        decoder = _state.refresh_decoders.get(key)
+        if decoder is None or decoder.batch_max_gap != config.batch_max_gap:
+            decoder = _state.refresh_decoders[key] = FastDecoder(names, batch_max_gap=config.batch_max_gap)
+        modbus_start = time.time()
+        with modbus_priority(Priority.REFRESH):
+            values = await read_registers_fast(client, decoder, record_metrics=False)
+        modbus_duration = time.time() - modbus_start
+
+    # Zwischenstand wurde publiziert → nächster Cycle darf nicht als "unverändert" gelten
+    if _state.change_detector is not None:
+        _state.change_detector.invalidate()
+
+    # Wie main_once: Critical-Defaults und frischer last_update vor Filter und Sinks
+    merged = get_compiled_transform().finish({**_state.last_data, **values})
+    mqtt_data = get_filter().filter(merged)
+    _state.last_data = mqtt_data
+    if _state.output_sinks:
+        _state.output_sinks.submit(mqtt_data, cycle=_state.cycle_count)
+    if _state.http_api:
+        _state.http_api.update(mqtt_data, _state.cycle_count, {"modbus": modbus_duration})
+    await publish_data(mqtt_data, config.mqtt_topic)
+    logger.info(
+        "🔄 Refresh published: %d/%d values in %.2fs",
+        len(values),
+        len(names),
+        modbus_duration,
+        extra={"phase": "refresh", "count": len(values), "duration": round(modbus_duration, 3)},
+    )
 
 
 async def determine_slave_id(config: ConfigManager) -> int:
@@ -656,6 +1033,264 @@ async def setup_mqtt(config: ConfigManager) -> bool:
     return True
 
 
+def build_publish_policy(config: ConfigManager) -> PublishPolicy:
+    """Create the per-topic publish policy from the add-on configuration."""
+    return PublishPolicy(
+        data=TopicPolicy(qos=config.mqtt_data_qos, retain=config.mqtt_data_retain),
+        status_keepalive=config.mqtt_status_keepalive,
+        retained_snapshot_interval=config.mqtt_retained_snapshot_interval,
+    )
+
+
+async def _on_mqtt_reconnected(config: ConfigManager) -> None:
+    """Restore broker-side state after MqttSupervisor re-established the connection.
+
+    The LWT may have replaced the retained status with "offline" and the
+    broker may have lost retained discovery configs, so both are re-sent.
+    """
+    await publish_discovery_configs(config.mqtt_topic, diagnostics=bool(config.diagnostics_interval))
+    healthy = _state.last_success > 0 and not _error_tracker.get_status()["active_errors"]
+    await publish_status("online" if healthy else "offline", config.mqtt_topic, force=True)
+
+
+def start_mqtt_supervisor(config: ConfigManager) -> MqttSupervisor:
+    """Start the MQTT reconnect supervisor for the running bridge."""
+    supervisor = MqttSupervisor(on_reconnect=lambda: _on_mqtt_reconnected(config))
+    supervisor.start()
+    _state.mqtt_supervisor = supervisor
+    return supervisor
+
+
+async def stop_mqtt_supervisor() -> None:
+    """Stop the MQTT reconnect supervisor if it is running."""
+    if _state.mqtt_supervisor is not None:
+        await _state.mqtt_supervisor.stop()
+        _state.mqtt_supervisor = None
+
+
+def start_output_sinks(config: ConfigManager) -> OutputSinks:
+    """Start the additional output sinks enabled in the configuration."""
+    sinks = build_output_sinks(config)
+    sinks.start()
+    _state.output_sinks = sinks
+    return sinks
+
+
+async def stop_output_sinks() -> None:
+    """Flush and close all output sinks."""
+    if _state.output_sinks is not None:
+        await _state.output_sinks.stop()
+        _state.output_sinks = None
+
+
+def start_change_detector(client: AsyncHuaweiSolarClient, config: ConfigManager) -> RawChangeDetector | None:
+    """Compare raw batch responses between cycles unless ``unchanged_cycles`` is "publish"."""
+    if config.unchanged_cycles == "publish":
+        return None
+
+    detector = RawChangeDetector()
+    attach_change_detector(client, detector)
+    _state.change_detector = detector
+    logger.info(
+        "⏸️ Unchanged cycles: %s (full publish at least every %ds)", config.unchanged_cycles, config.status_timeout
+    )
+    return detector
+
+
+async def start_modbus_proxy(client: AsyncHuaweiSolarClient, config: ConfigManager) -> ModbusProxy | None:
+    """Start the local Modbus TCP proxy if enabled.
+
+    Cached blocks are served for up to two poll intervals, so a client polling
+    at the bridge's own rate never triggers an extra inverter read.
+    A port that cannot be bound is logged; the bridge keeps running.
+    """
+    if not config.modbus_proxy:
+        return None
+
+    image = RegisterImage()
+    attach_register_image(client, image)
+    proxy = ModbusProxy(client, image, port=config.modbus_proxy_port, max_age=config.poll_interval * 2)
+    try:
+        await proxy.start()
+    except OSError as e:
+        logger.error("❌ Modbus proxy could not listen on port %d: %s", config.modbus_proxy_port, e)
+        return None
+    if config.modbus_proxy_port != DEFAULT_PROXY_PORT:
+        logger.warning(
+            "⚠️ Modbus proxy port %d is not mapped by the add-on (only %d/tcp), only reachable inside the container",
+            config.modbus_proxy_port,
+            DEFAULT_PROXY_PORT,
+        )
+    _state.modbus_proxy = proxy
+    return proxy
+
+
+async def stop_modbus_proxy() -> None:
+    """Stop the Modbus TCP proxy if it is running."""
+    if _state.modbus_proxy is not None:
+        await _state.modbus_proxy.stop()
+        _state.modbus_proxy = None
+
+
+def bridge_health(config: ConfigManager) -> dict[str, Any]:
+    """Health document for the HTTP API (``alive`` drives the Docker HEALTHCHECK).
+
+    alive: the main loop started a cycle within max(status_timeout,
+    3 × poll_interval). A stuck read or blocked event loop turns this false;
+    an unreachable inverter does not - that is reported as inverter_online.
+    """
+    now = time.time()
+    since_cycle = now - (_state.last_cycle or _state.started_at)
+    since_success = now - _state.last_success if _state.last_success else None
+    return {
+        "alive": since_cycle <= max(config.status_timeout, 3 * config.poll_interval),
+        "inverter_online": since_success is not None and since_success <= config.status_timeout,
+        "mqtt_connected": is_mqtt_connected(),
+        "cycle": _state.cycle_count,
+        "last_cycle_age": round(since_cycle, 1),
+        "last_success_age": round(since_success, 1) if since_success is not None else None,
+        "active_errors": _error_tracker.get_status()["active_errors"],
+    }
+
+
+async def start_http_api(config: ConfigManager) -> HttpApi | None:
+    """Start the embedded HTTP API unless disabled (``http_api_port`` 0)."""
+    if not config.http_api_port:
+        return None
+
+    api = HttpApi(
+        lambda: bridge_health(config),
+        port=config.http_api_port,
+        metrics=lambda: get_metrics().render(),
+        latency=get_latency_recorder,
+    )
+    try:
+        await api.start()
+    except OSError as e:
+        logger.error("❌ HTTP API could not listen on port %d: %s", config.http_api_port, e)
+        return None
+    _state.http_api = api
+    return api
+
+
+def start_refresh(client: AsyncHuaweiSolarClient, config: ConfigManager) -> RefreshController:
+    """Subscribe ``<topic>/refresh`` for on-demand out-of-cycle reads."""
+    refresh = RefreshController(lambda names, requested_at: refresh_registers(client, config, names, requested_at))
+    refresh.start(f"{config.mqtt_topic}/refresh")
+    _state.refresh = refresh
+    return refresh
+
+
+def start_modbus_scheduler(client: AsyncHuaweiSolarClient) -> ModbusScheduler:
+    """Route all Modbus transactions through the priority scheduler."""
+    scheduler = ModbusScheduler()
+    attach_scheduler(client, scheduler)
+    _state.scheduler = scheduler
+    return scheduler
+
+
+def start_control(client: AsyncHuaweiSolarClient, config: ConfigManager) -> ControlQueue | None:
+    """Accept battery/inverter control commands on ``<topic>/control/+`` (option ``mqtt_control``)."""
+    if not config.mqtt_control:
+        return None
+
+    base_topic = f"{config.mqtt_topic}/control"
+
+    async def publish_state(command: str, state: dict[str, Any]) -> None:
+        await publish_json(f"{base_topic}/{command}/state", state)
+
+    def refresh_battery() -> None:
+        if _state.refresh is not None:
+            _state.refresh.request("battery")
+
+    control = ControlQueue(client, publish_state, on_written=refresh_battery)
+    control.start(base_topic)
+    _state.control = control
+    return control
+
+
+async def stop_control() -> None:
+    """Unsubscribe the control topics and stop the control task."""
+    if _state.control is not None:
+        await _state.control.stop()
+        _state.control = None
+
+
+async def stop_refresh() -> None:
+    """Unsubscribe the refresh command topic and stop its task."""
+    if _state.refresh is not None:
+        await _state.refresh.stop()
+        _state.refresh = None
+
+
+def start_loop_monitor(config: ConfigManager) -> LoopMonitor | None:
+    """Sample event-loop lag and record blocking callbacks (option ``loop_monitor``)."""
+    if not config.loop_monitor:
+        return None
+    monitor = LoopMonitor()
+    monitor.start()
+    _state.loop_monitor = monitor
+    return monitor
+
+
+def start_profiler(config: ConfigManager) -> CycleProfiler:
+    """Profile cycles on demand: SIGUSR1 or ``<topic>/profile`` (see profiler.py)."""
+    profiler = CycleProfiler()
+    profiler.start(f"{config.mqtt_topic}/profile")
+    _state.profiler = profiler
+    return profiler
+
+
+def read_plan(config: ConfigManager) -> list[list[str]]:
+    """Register names per request of the current read plan (single reads as one-element lists)."""
+    if config.fast_decode:
+        decoder = get_fast_decoder(config.batch_max_gap)
+        return [list(plan.names) for plan in decoder.plans] + [[name] for name in decoder.unknown]
+    if not config.enable_batching:
+        return [[name] for name in ESSENTIAL_REGISTERS]
+    batches, unknown = BatchBuilder(batch_max_gap=config.batch_max_gap).build_batches(ESSENTIAL_REGISTERS)
+    return batches + [[name] for name in unknown]
+
+
+def start_flight_recorder(client: AsyncHuaweiSolarClient, config: ConfigManager) -> FlightRecorder | None:
+    """Keep the last cycles in memory, dumped on new errors or ``<topic>/flight_recorder``."""
+    if not config.flight_recorder_cycles:
+        return None
+    recorder = FlightRecorder(config.flight_recorder_cycles, plan=lambda: read_plan(config))
+    attach_flight_recorder(client, recorder)
+    recorder.start(f"{config.mqtt_topic}/flight_recorder")
+    _state.flight_recorder = recorder
+    return recorder
+
+
+async def stop_flight_recorder() -> None:
+    """Unsubscribe the dump topic and wait for running dumps."""
+    if _state.flight_recorder is not None:
+        await _state.flight_recorder.stop()
+        _state.flight_recorder = None
+
+
+async def stop_profiler() -> None:
+    """Remove the profiler triggers and write a running session."""
+    if _state.profiler is not None:
+        await _state.profiler.stop()
+        _state.profiler = None
+
+
+async def stop_loop_monitor() -> None:
+    """Stop the event-loop monitor and restore the loop's debug setting."""
+    if _state.loop_monitor is not None:
+        await _state.loop_monitor.stop()
+        _state.loop_monitor = None
+
+
+async def stop_http_api() -> None:
+    """Stop the embedded HTTP API and close SSE streams."""
+    if _state.http_api is not None:
+        await _state.http_api.stop()
+        _state.http_api = None
+
+
 async def setup_modbus(slave_id: int, config: ConfigManager) -> AsyncHuaweiSolarClient | None:
     """Create Modbus TCP connection to the inverter.
 
@@ -711,6 +1346,7 @@ async def initialize_bridge(config: ConfigManager) -> AsyncHuaweiSolarClient | N
 
     slave_id = await determine_slave_id(config)
 
+    configure_publish_policy(build_publish_policy(config))
     mqtt_connected = await setup_mqtt(config)
     if not mqtt_connected:
         return None
@@ -718,7 +1354,7 @@ async def initialize_bridge(config: ConfigManager) -> AsyncHuaweiSolarClient | N
     await publish_status("offline", config.mqtt_topic)
 
     try:
-        await publish_discovery_configs(config.mqtt_topic)
+        await publish_discovery_configs(config.mqtt_topic, diagnostics=bool(config.diagnostics_interval))
         logger.info("📢 Discovery published")
     except Exception as e:
         logger.error("❌ Discovery failed: %s", e)
@@ -728,16 +1364,37 @@ async def initialize_bridge(config: ConfigManager) -> AsyncHuaweiSolarClient | N
         await disconnect_mqtt()
         return None
 
+    start_modbus_scheduler(client)
+    start_mqtt_supervisor(config)
+    start_output_sinks(config)
+    await start_modbus_proxy(client, config)
+    await start_http_api(config)
+    start_change_detector(client, config)
+    start_flight_recorder(client, config)
+    start_refresh(client, config)
+    start_control(client, config)
+    start_loop_monitor(config)
+    start_profiler(config)
+
     get_filter()
     logger.info("🛡️ Total Increasing Filter initialized")
     logger.info("⏱️ Poll interval: %ss", config.poll_interval)
     return client
 
 
+def _track_error(error_type: ErrorType, e: BaseException) -> None:
+    """Count the error; the first error of a type dumps the flight recorder."""
+    first = error_type not in _error_tracker.errors
+    _error_tracker.track_error(error_type, str(e))
+    get_metrics().failures.inc(error_type)
+    if first and _state.flight_recorder is not None:
+        _state.flight_recorder.request_dump(f"error:{error_type}")
+
+
 async def _maybe_reset_on_error(e: BaseException, config: ConfigManager) -> bool:
     if isinstance(e, (TimeoutError, ConnectionInterruptedException)):
         error_type: ErrorType = "timeout" if isinstance(e, TimeoutError) else "connection_interrupted"
-        _error_tracker.track_error(error_type, str(e))
+        _track_error(error_type, e)
         await _state.publish_status("offline", config.mqtt_topic)
         reset_filter()
         logger.debug("Filter reset due to timeout/interruption: %s", type(e).__name__)
@@ -748,7 +1405,7 @@ async def _maybe_reset_on_error(e: BaseException, config: ConfigManager) -> bool
         conn_error_type: ErrorType = (
             "connection_refused" if isinstance(e, ConnectionRefusedError) else "connection_exception"
         )
-        _error_tracker.track_error(conn_error_type, str(e))
+        _track_error(conn_error_type, e)
         await _state.publish_status("offline", config.mqtt_topic)
         reset_filter()
         logger.debug("Filter reset due to connection error: %s", type(e).__name__)
@@ -756,7 +1413,7 @@ async def _maybe_reset_on_error(e: BaseException, config: ConfigManager) -> bool
         return True
 
     if MODBUS_EXCEPTIONS and isinstance(e, MODBUS_EXCEPTIONS):
-        _error_tracker.track_error("modbus_exception", str(e))
+        _track_error("modbus_exception", e)
         await _state.publish_status("offline", config.mqtt_topic)
         reset_filter()
         logger.debug("Filter reset due to modbus exception")
@@ -768,29 +1425,68 @@ async def _maybe_reset_on_error(e: BaseException, config: ConfigManager) -> bool
 
 async def run_main_cycle(client: AsyncHuaweiSolarClient, config: ConfigManager, cycle_count: int) -> None:
     cycle_start = time.time()
+    _state.last_cycle = cycle_start
     logger.debug("Cycle #%d", cycle_count)
+    if _state.next_cycle_due and (diagnostics := get_diagnostics(config)):
+        diagnostics.observe_lateness(cycle_start - _state.next_cycle_due)
+    _state.next_cycle_due = 0.0
+
+    profiler = _state.profiler
+    if profiler is not None and (profiler.pending or profiler.active):
+        profiler.begin_cycle()
+    else:
+        profiler = None
 
+    resources = get_resource_monitor()
+    resources.cycle_started()
+    flight = _state.flight_recorder
+    record = flight.begin_cycle(cycle_count) if flight is not None else None
     try:
-        await main_once(client, config, cycle_count)
+        try:
+            published = await main_once(client, config, cycle_count)
+        finally:
+            if profiler is not None:
+                await profiler.end_cycle()
+            if (cpu := resources.cycle_finished()) is not None:
+                get_metrics().cycle_cpu_seconds.observe(cpu)
+            if flight is not None:
+                flight.end_cycle()
     except KeyboardInterrupt as e:
         logger.info("🛑 Interrupted during cycle")
         raise KeyboardInterrupt from e
     except asyncio.CancelledError:
         raise
     except RECOVERABLE_EXCEPTIONS as e:
+        get_metrics().cycles.inc("failed")
+        if record is not None:
+            record.fail(e)
+        # Gerade während eines Ausfalls sollen die Diagnose-Sensoren weiterlaufen
+        await publish_diagnostics(config)
         if await _maybe_reset_on_error(e, config):
             return
-        logger.error("❌ Recoverable error not handled: %s", e, exc_info=True)
+        get_metrics().failures.inc("other")
+        logger.error(
+            "❌ Recoverable error not handled: %s",
+            e,
+            exc_info=True,
+            extra={"cycle": cycle_count, "error_type": "other"},
+        )
         await _state.publish_status("offline", config.mqtt_topic)
         reset_filter()
         await asyncio.sleep(10)
         return
 
-    _error_tracker.mark_success()
-    await _state.publish_status("online", config.mqtt_topic)
+    # "online" nur, wenn die Daten wirklich beim Broker sind
+    if published:
+        _error_tracker.mark_success()
+        await _state.publish_status("online", config.mqtt_topic)
+    resources.maybe_sample()
+    await publish_diagnostics(config)
 
+    interval = get_poll_policy(config).interval(cycle_start)
+    _state.next_cycle_due = cycle_start + interval
     elapsed = time.time() - cycle_start
-    wait = max(0.0, config.poll_interval - elapsed)
+    wait = max(0.0, interval - elapsed)
     if wait > 0:
         logger.debug("Waiting %.1fs until next cycle", wait)
         try:
@@ -800,6 +1496,24 @@ async def run_main_cycle(client: AsyncHuaweiSolarClient, config: ConfigManager,
             raise
 
 
+async def _shutdown(config: ConfigManager) -> None:
+    """Stop all background services, publish offline and disconnect MQTT.
+
+    Einzige Stelle für Stop-Hooks - neue Dienste hier ergänzen.
+    """
+    await stop_mqtt_supervisor()
+    await stop_control()
+    await stop_refresh()
+    await stop_modbus_proxy()
+    await stop_http_api()
+    await stop_loop_monitor()
+    await stop_profiler()
+    await stop_flight_recorder()
+    await stop_output_sinks()
+    await _state.publish_status("offline", config.mqtt_topic)
+    await disconnect_mqtt()
+
+
 async def main() -> None:
     """Haupt-Loop mit Error-Handling und automatischer Wiederverbindung."""
     loop = asyncio.get_running_loop()
@@ -816,7 +1530,7 @@ async def main() -> None:
         sys.exit(1)
 
     # Initialize logging
-    init_logging(config.log_level)
+    init_logging(config.log_level, config.log_format)
     _state.config = config
 
     try:
@@ -836,12 +1550,10 @@ async def main() -> None:
             await heartbeat(config)
     except (KeyboardInterrupt, asyncio.CancelledError):
         logger.info("🛑 Shutdown")
-        await _state.publish_status("offline", config.mqtt_topic)
-        await disconnect_mqtt()
+        await _shutdown(config)
     except Exception as e:
         logger.error("💥 Fatal: %s", e, exc_info=True)
-        await _state.publish_status("offline", config.mqtt_topic)
-        await disconnect_mqtt()
+        await _shutdown(config)
         sys.exit(1)
 
 
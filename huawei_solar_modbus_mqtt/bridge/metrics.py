@@ -0,0 +1,310 @@
+# huawei_solar_modbus_mqtt/bridge/metrics.py
+
+"""
+Metriken der Bridge im OpenMetrics-Format (``GET /metrics`` der HTTP API).
+
+Bisher landeten Cycle- und Batch-Timings nur im DEBUG-Log. Die Registry
+sammelt sie zur Laufzeit, ein Prometheus/VictoriaMetrics-Scrape auf
+``http://<host>:8099/metrics`` liefert sie für Dashboards über mehrere
+Anlagen hinweg.
+
+Metriken (Präfix ``huabus_``):
+    cycle_phase_seconds{phase}         Histogramm: modbus, transform, filter, mqtt, total
+    batch_read_seconds{batch}          Histogramm pro Batch des Read-Plans
+    cycles_total{result}               published, unchanged, no_data, failed
+    cycle_failures_total{type}         ErrorType aus error_tracker.py (+ "other")
+    batch_failures_total               Batches mit Fallback auf Einzel-Reads
+    fallback_reads_total               Einzel-Reads wegen fehlgeschlagener Batches
+    filtered_values_total{key}         vom Total-Increasing-Filter ersetzte Werte
+    sentinel_rejections_total{register} verworfene Sentinel-Werte (sentinels.py)
+    last_success_timestamp_seconds     Unix-Zeit des letzten erfolgreichen Cycles
+    read_plan_batches / read_plan_registers  Größe des aktuellen Read-Plans
+    trace_seconds{stage}               Histogramm der Trace-Stufen + end_to_end (nur mit ``tracing``)
+    event_loop_lag_seconds             Histogramm des Event-Loop-Lags (nur mit ``loop_monitor``)
+    slow_callbacks_total               Callbacks, die den Event-Loop blockiert haben (nur mit ``loop_monitor``)
+    cycle_cpu_seconds                  Histogramm der CPU-Zeit (User + System) pro Cycle
+    process_resident_memory_bytes      RSS des Prozesses (resources.py)
+    process_cpu_seconds_total{mode}    CPU-Zeit seit Start: user, system
+    process_threads / process_open_fds Threads und offene File-Deskriptoren
+    gc_collections_total               GC-Läufe über alle Generationen
+    resource_leak_suspected{resource}  1 bei monotonem Wachstum: rss, threads, fds
+
+Bewusst ohne prometheus_client: ein paar Dicts und ein Text-Renderer reichen,
+das Add-on-Image bleibt klein. Zähler, die andere Module ohnehin führen
+(Filter, Sentinels), werden erst beim Scrape per Collector übernommen -
+im Cycle entstehen dafür keine Kosten.
+"""
+
+import bisect
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Sequence
+
+from .resources import LEAK_THRESHOLDS, get_resource_monitor, sample
+from .sentinels import get_sentinel_table
+from .total_increasing_filter import get_filter
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+PHASE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Labels = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)) + "}"
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Sequence[str]) -> Labels:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(label) for label in labels)
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Sample lines of this metric (without TYPE/HELP)."""
+
+    def render(self) -> Iterator[str]:
+        yield f"# TYPE {self.name} {self.kind}"
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield from self.samples()
+
+
+class Counter(_Metric):
+    """Monotonic counter; rendered as ``<name>_total``."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, *labels: str) -> None:
+        """Take over a count maintained elsewhere (collectors only)."""
+        self._values[self._key(labels)] = value
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}_total{_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def get(self, *labels: str) -> float | None:
+        return self._values.get(self._key(labels))
+
+    def samples(self) -> Iterator[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram (bucket counts cumulated on render)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = PHASE_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Labels → (Zähler pro Bucket inkl. +Inf, Summe)
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> Iterator[str]:
+        bounds = [*map(_format_value, self.buckets), "+Inf"]
+        for key, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                labels = _labels((*self.labelnames, "le"), (*key, bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _labels(self.labelnames, key)
+            yield f"{self.name}_count{labels} {cumulative}"
+            yield f"{self.name}_sum{labels} {_format_value(total[0])}"
+
+
+class MetricsRegistry:
+    """Holds metrics in registration order and renders the OpenMetrics exposition."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self._register(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = PHASE_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._register(metric)
+        return metric
+
+    def add_collector(self, collect: Callable[[], None]) -> None:
+        """Run ``collect`` before every render (to sync counts kept elsewhere)."""
+        self._collectors.append(collect)
+
+    def render(self) -> bytes:
+        for collect in self._collectors:
+            collect()
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        lines.append("# EOF\n")
+        return "\n".join(lines).encode()
+
+
+class BridgeMetrics:
+    """The bridge's metric set (see module docstring)."""
+
+    def __init__(self) -> None:
+        registry = self.registry = MetricsRegistry()
+        self.phase_seconds = registry.histogram(
+            "huabus_cycle_phase_seconds", "Duration of the poll cycle phases.", ["phase"]
+        )
+        self.batch_seconds = registry.histogram(
+            "huabus_batch_read_seconds", "Duration of one batch read of the read plan.", ["batch"], BATCH_BUCKETS
+        )
+        self.cycles = registry.counter("huabus_cycles", "Poll cycles by result.", ["result"])
+        self.failures = registry.counter("huabus_cycle_failures", "Failed poll cycles by error type.", ["type"])
+        self.batch_failures = registry.counter(
+            "huabus_batch_failures", "Batch reads that fell back to single-register reads."
+        )
+        self.fallback_reads = registry.counter(
+            "huabus_fallback_reads", "Single-register reads caused by failed batch reads."
+        )
+        self.filtered = registry.counter(
+            "huabus_filtered_values", "Values replaced by the total_increasing filter.", ["key"]
+        )
+        self.sentinels = registry.counter(
+            "huabus_sentinel_rejections", "Register values rejected as 'not available' sentinels.", ["register"]
+        )
+        self.last_success = registry.gauge(
+            "huabus_last_success_timestamp_seconds", "Unix time of the last successful cycle."
+        )
+        self.plan_batches = registry.gauge("huabus_read_plan_batches", "Batches in the current read plan.")
+        self.plan_registers = registry.gauge("huabus_read_plan_registers", "Registers in the current read plan.")
+        self.trace_seconds = registry.histogram(
+            "huabus_trace_seconds", "Poll cycle trace stages and Modbus response to PUBACK.", ["stage"]
+        )
+        self.loop_lag_seconds = registry.histogram(
+            "huabus_event_loop_lag_seconds", "Delay of the event loop behind its schedule.", buckets=LAG_BUCKETS
+        )
+        self.slow_callbacks = registry.counter(
+            "huabus_slow_callbacks", "Callbacks that blocked the event loop longer than the threshold."
+        )
+        self.cycle_cpu_seconds = registry.histogram(
+            "huabus_cycle_cpu_seconds", "CPU time (user + system) of the process per poll cycle."
+        )
+        self.process_rss = registry.gauge("huabus_process_resident_memory_bytes", "Resident set size of the bridge.")
+        self.process_cpu = registry.counter("huabus_process_cpu_seconds", "CPU time since start.", ["mode"])
+        self.process_threads = registry.gauge("huabus_process_threads", "Threads of the bridge process.")
+        self.process_fds = registry.gauge("huabus_process_open_fds", "Open file descriptors.")
+        self.gc_collections = registry.counter("huabus_gc_collections", "Garbage collector runs (all generations).")
+        self.leak_suspected = registry.gauge(
+            "huabus_resource_leak_suspected", "1 if the resource grew monotonically over the leak window.", ["resource"]
+        )
+        registry.add_collector(self._collect)
+
+    def _collect(self) -> None:
+        for key, count in get_filter().get_totals().items():
+            self.filtered.set_total(count, key)
+        for register, count in get_sentinel_table().get_stats().items():
+            self.sentinels.set_total(count, register)
+
+        current = sample()
+        if current["rss"] is not None:
+            self.process_rss.set(current["rss"])
+        self.process_cpu.set_total(current["cpu_user"], "user")
+        self.process_cpu.set_total(current["cpu_system"], "system")
+        self.process_threads.set(current["threads"])
+        if current["fds"] is not None:
+            self.process_fds.set(current["fds"])
+        self.gc_collections.set_total(current["gc_collections"])
+        suspected = get_resource_monitor().suspected
+        for resource in LEAK_THRESHOLDS:
+            self.leak_suspected.set(int(resource in suspected), resource)
+
+    def render(self) -> bytes:
+        return self.registry.render()
+
+
+_metrics_instance: BridgeMetrics | None = None
+
+
+def get_metrics() -> BridgeMetrics:
+    """Gibt Singleton-Instanz zurück."""
+    global _metrics_instance
+    if _metrics_instance is None:
+        _metrics_instance = BridgeMetrics()
+    return _metrics_instance
+
+
+def reset_metrics() -> None:
+    """Verwirft alle Messwerte (nur für Tests)."""
+    global _metrics_instance
+    _metrics_instance = None
@@ -0,0 +1,177 @@
+# huawei_solar_modbus_mqtt/bridge/modbus_proxy.py
+
+"""
+Lokaler Modbus TCP Proxy für weitere Clients (evcc, Skripte, ...).
+
+Huawei Dongles akzeptieren nur sehr wenige gleichzeitige Modbus TCP Clients.
+Mit aktiviertem Proxy bleibt die Bridge der einzige Client des Inverters;
+andere Tools verbinden sich stattdessen mit dem Proxy.
+
+Ablauf einer FC03 Anfrage (Read Holding Registers):
+    1. Unit ID der Bridge und Bereich vollständig im RegisterImage und
+       jünger als ``max_age``  → Antwort direkt aus dem Speicher
+    2. Sonst → Weiterleitung über die Modbus-Verbindung der Bridge; das
+       Ergebnis landet ebenfalls im RegisterImage
+    3. Inverter antwortet nicht → Gateway Target Device Failed To Respond
+
+Alle anderen Function Codes (insbesondere Schreibzugriffe) werden mit
+Illegal Function abgelehnt.
+
+Serialisierung:
+    Weitergeleitete Anfragen laufen über denselben Client wie das Polling.
+    Der ModbusScheduler (modbus_scheduler.py) vergibt die Verbindung pro
+    Transaktion - Proxy-Anfragen (Priority.PROXY) kommen vor wartenden
+    Poll-Reads, aber nach Steuer-Writes; der Inverter sieht nie zwei
+    parallele Requests.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, TypedDict
+
+from huawei_solar import AsyncHuaweiSolarClient
+from tmodbus.exceptions import GatewayTargetDeviceFailedToRespondError, ModbusResponseError, TModbusError
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU, ReadHoldingRegistersPDU
+from tmodbus.server import AsyncTcpServer, ModbusRequestRouter
+
+from .modbus_scheduler import Priority, modbus_priority
+from .register_image import RegisterImage
+
+logger = logging.getLogger("huawei.proxy")
+
+DEFAULT_PROXY_PORT = 502
+
+_READ_PDUS = (RawReadHoldingRegistersPDU, ReadHoldingRegistersPDU)
+
+
+class ProxyStats(TypedDict):
+    cache_hits: int
+    forwarded: int
+    failed: int
+    cached_registers: int
+
+
+def attach_register_image(client: AsyncHuaweiSolarClient, image: RegisterImage) -> None:
+    """Record every holding-register response of ``client`` into ``image``.
+
+    Wraps ``client.execute`` - the single entry point for all reads of
+    huawei_solar (``get``/``get_multiple``) and tmodbus
+    (``read_holding_registers``). Other unit ids (``for_unit_id``) use a
+    separate client instance and are not recorded.
+    """
+    execute = client.execute
+
+    async def recording_execute(pdu: Any) -> Any:
+        response = await execute(pdu)
+        if isinstance(pdu, _READ_PDUS):
+            image.record(pdu.start_address, response)
+        return response
+
+    client.execute = recording_execute  # type: ignore[method-assign]
+
+
+class ModbusProxy:
+    """Modbus TCP server answering FC03 from the register image."""
+
+    def __init__(
+        self,
+        client: AsyncHuaweiSolarClient,
+        image: RegisterImage,
+        *,
+        host: str = "0.0.0.0",
+        port: int = DEFAULT_PROXY_PORT,
+        max_age: float = 60.0,
+    ):
+        """
+        Args:
+            client: Connected bridge client (image already attached).
+            image: Register image filled by the poll cycle.
+            host: Listen address.
+            port: Listen port.
+            max_age: Cached blocks older than this (seconds) are re-read.
+        """
+        self.client = client
+        self.image = image
+        self.max_age = max_age
+        self.router = ModbusRequestRouter()
+        self.router.register(ReadHoldingRegistersPDU)(self.read_holding_registers)
+        # tmodbus liefert Framing und Dispatch (handle_client), den Listener
+        # öffnen wir selbst - so ist der gebundene Port über Server.sockets lesbar
+        self._modbus = AsyncTcpServer(host, self.router, port=port)
+        self._listener: asyncio.Server | None = None
+        self._cache_hits = 0
+        self._forwarded = 0
+        self._failed = 0
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = await asyncio.start_server(
+                self._modbus.handle_client, self._modbus.host, self._modbus.port
+            )
+        logger.info("🔀 Modbus proxy listening on %s:%d", self._modbus.host, self.port)
+
+    async def stop(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+            await listener.wait_closed()
+        stats = self.get_stats()
+        logger.info(
+            "🔀 Modbus proxy stopped (hits: %d, forwarded: %d, failed: %d)",
+            stats["cache_hits"],
+            stats["forwarded"],
+            stats["failed"],
+        )
+
+    @property
+    def port(self) -> int:
+        """Bound port (differs from the configured one when started with port 0)."""
+        if self._listener is not None and self._listener.sockets:
+            return int(self._listener.sockets[0].getsockname()[1])
+        return self._modbus.port
+
+    async def read_holding_registers(self, unit_id: int, request: ReadHoldingRegistersPDU) -> list[int]:
+        """FC03 handler: serve from cache, otherwise forward to the inverter."""
+        if unit_id == self.client.unit_id:
+            cached = self.image.read(request.start_address, request.quantity, max_age=self.max_age)
+            if cached is not None:
+                self._cache_hits += 1
+                return cached
+            target = self.client
+        else:
+            target = self.client.for_unit_id(unit_id)
+
+        start = time.monotonic()
+        try:
+            with modbus_priority(Priority.PROXY):
+                registers: list[int] = await target.execute(
+                    ReadHoldingRegistersPDU(request.start_address, request.quantity)
+                )
+        except ModbusResponseError:
+            self._failed += 1
+            raise
+        except (TModbusError, OSError, TimeoutError) as e:
+            self._failed += 1
+            logger.debug(
+                "Proxy forward %d+%d (unit %d) failed: %s", request.start_address, request.quantity, unit_id, e
+            )
+            raise GatewayTargetDeviceFailedToRespondError(request.function_code) from e
+
+        self._forwarded += 1
+        logger.debug(
+            "Proxy forwarded %d+%d (unit %d) in %.3fs",
+            request.start_address,
+            request.quantity,
+            unit_id,
+            time.monotonic() - start,
+        )
+        return registers
+
+    def get_stats(self) -> ProxyStats:
+        return ProxyStats(
+            cache_hits=self._cache_hits,
+            forwarded=self._forwarded,
+            failed=self._failed,
+            cached_registers=len(self.image),
+        )
@@ -0,0 +1,148 @@
+# huawei_solar_modbus_mqtt/bridge/modbus_scheduler.py
+
+"""
+Priorisierter Zugriff auf die eine Modbus-Verbindung.
+
+Alles, was die Bridge an den Inverter schickt - Poll-Batches, Refresh,
+weitergeleitete Proxy-Anfragen, Steuer-Writes - läuft über denselben
+Transport. Dessen Lock ist FIFO: ein Write, der während eines Poll-Cycles
+ankommt, wartet hinter allen bereits wartenden Reads.
+
+Der Scheduler sitzt davor (``attach_scheduler`` wrappt
+``transport.send_and_receive``, damit auch ``for_unit_id``-Clients des
+Proxys erfasst sind) und vergibt die Verbindung pro Transaktion an den
+wartenden Request mit der höchsten Priorität:
+
+    CONTROL  Steuer-Writes + Readback (control.py)
+    REFRESH  On-Demand Refresh (refresh.py)
+    PROXY    weitergeleitete Anfragen des Modbus-Proxys
+    POLL     regulärer Poll-Cycle (Standard)
+
+Die Priorität wird per ContextVar gesetzt (``with modbus_priority(...)``),
+Aufrufer müssen also nichts durchreichen. Eine laufende Transaktion wird nie
+abgebrochen - ein Write wartet höchstens auf den einen Request, der gerade
+auf der Leitung ist, statt auf den Rest des Cycles.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, TypedDict, TypeVar
+
+from huawei_solar import AsyncHuaweiSolarClient
+
+logger = logging.getLogger("huawei.scheduler")
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Request priority, lower value wins."""
+
+    CONTROL = 0
+    REFRESH = 1
+    PROXY = 2
+    POLL = 3
+
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar("modbus_priority", default=Priority.POLL)
+
+
+@contextmanager
+def modbus_priority(priority: Priority) -> Iterator[None]:
+    """Run all Modbus requests inside the block with ``priority``."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class PriorityStats(TypedDict):
+    requests: int
+    waited: int
+    max_wait: float
+
+
+class SchedulerStats(TypedDict):
+    preemptions: int
+    queued: int
+    priorities: dict[str, PriorityStats]
+
+
+class ModbusScheduler:
+    """Grants the Modbus transport to one request at a time, highest priority first."""
+
+    def __init__(self) -> None:
+        self._busy = False
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+        self._preemptions = 0
+        self._stats: dict[Priority, PriorityStats] = {
+            priority: {"requests": 0, "waited": 0, "max_wait": 0.0} for priority in Priority
+        }
+
+    async def run(self, call: Callable[[], Awaitable[T]], priority: Priority | None = None) -> T:
+        """Await ``call()`` once the transport is granted to this request."""
+        if priority is None:
+            priority = _priority.get()
+        await self._acquire(priority)
+        try:
+            return await call()
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority) -> None:
+        stats = self._stats[priority]
+        stats["requests"] += 1
+        if not self._busy:
+            self._busy = True
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        if any(waiting > priority for waiting, _, waiter in self._waiters if not waiter.done()):
+            self._preemptions += 1  # überholt bereits wartende Requests niedrigerer Priorität
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # Zuschlag kam gleichzeitig mit dem Cancel
+            raise
+        waited = time.monotonic() - start
+        stats["waited"] += 1
+        stats["max_wait"] = max(stats["max_wait"], waited)
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # Verbindung direkt weitergeben, _busy bleibt gesetzt
+                return
+        self._busy = False
+
+    def get_stats(self) -> SchedulerStats:
+        return {
+            "preemptions": self._preemptions,
+            "queued": sum(1 for _, _, future in self._waiters if not future.done()),
+            "priorities": {priority.name.lower(): stats.copy() for priority, stats in self._stats.items()},
+        }
+
+
+def attach_scheduler(client: AsyncHuaweiSolarClient, scheduler: ModbusScheduler) -> None:
+    """Route every transaction on ``client``'s transport through ``scheduler``."""
+    transport = client.transport
+    send_and_receive = transport.send_and_receive
+
+    async def scheduled_send_and_receive(unit_id: int, pdu: Any) -> Any:
+        return await scheduler.run(lambda: send_and_receive(unit_id, pdu))
+
+    transport.send_and_receive = scheduled_send_and_receive  # type: ignore[method-assign]
@@ -6,12 +6,16 @@ MQTT Client Manager für Home Assistant Integration.
 Verwaltet die persistente MQTT-Verbindung zum Broker und implementiert:
 - Home Assistant MQTT Discovery (automatische Entity-Erstellung)
 - Sensor-Daten Publishing (JSON-Payload mit allen Messwerten)
+- Optionaler Binär-Payload (MessagePack) für Nicht-HA-Consumer
 - Status Publishing (online/offline für Binary Sensor)
 - Last Will Testament (LWT) für automatisches offline bei Verbindungsabbruch
+- Command-Topics (z.B. <topic>/refresh), nach jedem (Re-)Connect neu abonniert
 - Connection State Tracking zur Vermeidung von "not connected" Errors
 
 Die Verbindung wird einmalig beim Start erstellt und bleibt für die gesamte
-Laufzeit bestehen (persistent), nur Modbus reconnected bei Fehlern.
+Laufzeit bestehen (persistent). Nach einem unerwarteten Verbindungsabbruch
+übernimmt der MqttSupervisor (mqtt_supervisor.py) den Reconnect; paho's
+eingebauter Auto-Reconnect ist deshalb deaktiviert.
 """
 
 import asyncio
@@ -20,12 +24,17 @@ import logging
 import os
 import threading
 import time
+from collections.abc import Callable, Mapping
 from typing import Any
 
 import paho.mqtt.client as mqtt
 from paho.mqtt.enums import CallbackAPIVersion
 
-from .config.sensors_mqtt import NUMERIC_SENSORS, TEXT_SENSORS
+from .binary_payload import BinaryPayloadEncoder
+from .config.sensors_mqtt import DIAGNOSTIC_SENSORS, NUMERIC_SENSORS, TEXT_SENSORS
+from .payload_serializer import get_serializer
+from .publish_policy import PublishPolicy
+from .tracing import CycleTrace
 
 logger = logging.getLogger("huawei.mqtt")
 
@@ -38,15 +47,44 @@ _is_connected = False
 # Thread-safe event for connection establishment (paho callbacks run in their own thread)
 _connected_event = threading.Event()
 
+# Optionaler Listener für unerwartete Disconnects (läuft im paho-Thread!)
+_disconnect_callback: Callable[[], None] | None = None
+
+MQTT_CONNECT_TIMEOUT = 10.0
+
+# QoS/Retain pro Topic-Klasse + Status-Deduplizierung (siehe publish_policy.py)
+_publish_policy = PublishPolicy()
+
+# Binär-Payload (siehe binary_payload.py) - Encoder lazy, Schema einmal pro Verbindung
+_binary_encoder: BinaryPayloadEncoder | None = None
+_binary_schema_published = False
+
+# Command-Topics → Handler (topic, payload); Aufruf im paho-Thread!
+CommandHandler = Callable[[str, bytes], None]
+_command_handlers: dict[str, CommandHandler] = {}
+
+
+def configure_publish_policy(policy: PublishPolicy) -> None:
+    """Replace the active publish policy (called once at startup)."""
+    global _publish_policy
+    _publish_policy = policy
+
+
+def get_publish_policy() -> PublishPolicy:
+    """Return the active publish policy."""
+    return _publish_policy
+
 
 def _on_connect(client, userdata, flags, rc, properties=None):
     """Callback when MQTT connection is established."""
     global _is_connected
     if rc == 0:
         _is_connected = True
+        for topic in _command_handlers:
+            client.subscribe(topic, qos=1)
         _connected_event.set()
     else:
-        logger.error(f"❌ MQTT connection failed: {rc}")
+        logger.error("❌ MQTT connection failed: %s", rc)
 
 
 def _on_disconnect(client, userdata, flags, rc=0, properties=None):
@@ -55,7 +93,51 @@ def _on_disconnect(client, userdata, flags, rc=0, properties=None):
     _is_connected = False
     _connected_event.clear()
     if rc != 0:
-        logger.warning(f"⚠️ MQTT unexpected disconnect: {rc}")
+        logger.warning("⚠️ MQTT unexpected disconnect: %s", rc)
+        if _disconnect_callback is not None:
+            _disconnect_callback()
+
+
+def _on_message(client, userdata, message):
+    """Dispatch a command message to its handler (paho thread)."""
+    for topic, handler in _command_handlers.items():
+        if mqtt.topic_matches_sub(topic, message.topic):
+            handler(message.topic, message.payload)
+            return
+
+
+def subscribe_command(topic: str, handler: CommandHandler) -> None:
+    """Subscribe ``topic`` (wildcards allowed) and route its messages to ``handler``.
+
+    The handler runs in paho's network thread and must hand work over to the
+    event loop (``loop.call_soon_threadsafe``). Subscriptions are renewed on
+    every (re)connect.
+    """
+    _command_handlers[topic] = handler
+    if _mqtt_client is not None and _is_connected:
+        _mqtt_client.subscribe(topic, qos=1)
+    logger.debug("Command topic subscribed: %s", topic)
+
+
+def unsubscribe_command(topic: str) -> None:
+    """Remove a command topic registered with subscribe_command()."""
+    if _command_handlers.pop(topic, None) is not None and _mqtt_client is not None and _is_connected:
+        _mqtt_client.unsubscribe(topic)
+
+
+def set_disconnect_callback(callback: Callable[[], None] | None) -> None:
+    """Register a listener for unexpected disconnects.
+
+    The callback is invoked from paho's network thread, so it must be
+    thread-safe (e.g. ``loop.call_soon_threadsafe``).
+    """
+    global _disconnect_callback
+    _disconnect_callback = callback
+
+
+def is_mqtt_connected() -> bool:
+    """Return True while the broker connection is established."""
+    return _is_connected
 
 
 def _get_mqtt_client() -> mqtt.Client:
@@ -64,27 +146,35 @@ def _get_mqtt_client() -> mqtt.Client:
     if _mqtt_client is not None:
         return _mqtt_client
 
-    client = mqtt.Client(CallbackAPIVersion.VERSION2)
+    # Reconnects are driven by MqttSupervisor (backoff with jitter, discovery
+    # re-publish), so paho must not reconnect on its own in the loop thread.
+    client = mqtt.Client(CallbackAPIVersion.VERSION2, reconnect_on_failure=False)
 
     client.on_connect = _on_connect
     client.on_disconnect = _on_disconnect
+    client.on_message = _on_message
 
     user = os.environ.get("HUAWEI_MQTT_USER")
     password = os.environ.get("HUAWEI_MQTT_PASSWORD")
 
     if user and password:
         client.username_pw_set(user, password)
-        logger.debug(f"MQTT auth configured for {user}")
+        logger.debug("MQTT auth configured for %s", user)
 
-    topic = os.environ.get("HUAWEI_MQTT_TOPIC")
-    if topic:
-        client.will_set(f"{topic}/status", "offline", qos=1, retain=True)
-        logger.debug(f"LWT set: {topic}/status")
+    _set_last_will(client)
 
     _mqtt_client = client
     return client
 
 
+def _set_last_will(client: mqtt.Client) -> None:
+    """Configure the LWT so the broker marks us offline on connection loss."""
+    topic = os.environ.get("HUAWEI_MQTT_TOPIC")
+    if topic:
+        client.will_set(f"{topic}/status", "offline", qos=1, retain=True)
+        logger.debug("LWT set: %s/status", topic)
+
+
 async def _wait_for_publish(result, timeout: float) -> None:
     """Offload blocking wait_for_publish to executor."""
     loop = asyncio.get_running_loop()
@@ -101,14 +191,16 @@ async def connect_mqtt() -> None:
         logger.error("🚨 MQTT broker not configured")
         raise RuntimeError("MQTT broker not configured")
 
-    logger.debug(f"Connecting MQTT to {broker}:{port}")
+    logger.debug("Connecting MQTT to %s:%s", broker, port)
     _connected_event.clear()
+    _publish_policy.reset_status()
+    _reset_binary_schema()
     client.connect(broker, port, 60)
     client.loop_start()
 
     try:
         loop = asyncio.get_event_loop()
-        connected = await loop.run_in_executor(None, _connected_event.wait, 10.0)
+        connected = await loop.run_in_executor(None, _connected_event.wait, MQTT_CONNECT_TIMEOUT)
         if not connected:
             raise ConnectionError("MQTT connection timeout after 10s")
     except asyncio.CancelledError:
@@ -118,6 +210,34 @@ async def connect_mqtt() -> None:
     logger.debug("MQTT connection stable")
 
 
+async def reconnect_mqtt() -> None:
+    """Re-establish a lost broker connection (one attempt).
+
+    The network thread has already exited after the disconnect (paho's own
+    reconnect is disabled), so it is joined, the LWT is re-applied and a new
+    loop thread is started for the fresh connection.
+
+    Raises:
+        OSError: If the TCP connection cannot be established.
+        ConnectionError: If the broker does not acknowledge within the timeout.
+    """
+    client = _get_mqtt_client()
+    loop = asyncio.get_running_loop()
+
+    _connected_event.clear()
+    # LWT may have replaced the retained status - next status must be sent
+    _publish_policy.reset_status()
+    _reset_binary_schema()
+    await loop.run_in_executor(None, client.loop_stop)
+    _set_last_will(client)
+    await loop.run_in_executor(None, client.reconnect)
+    client.loop_start()
+
+    connected = await loop.run_in_executor(None, _connected_event.wait, MQTT_CONNECT_TIMEOUT)
+    if not connected:
+        raise ConnectionError(f"MQTT reconnect timeout after {MQTT_CONNECT_TIMEOUT:.0f}s")
+
+
 async def disconnect_mqtt() -> None:
     """Disconnect MQTT client cleanly, offloading blocking calls to executor."""
     global _mqtt_client, _is_connected
@@ -126,16 +246,17 @@ async def disconnect_mqtt() -> None:
 
     try:
         topic = os.environ.get("HUAWEI_MQTT_TOPIC")
-        if topic and _is_connected:
+        if topic and _is_connected and _publish_policy.status_due("offline"):
             result = _mqtt_client.publish(f"{topic}/status", "offline", qos=1, retain=True)
             await _wait_for_publish(result, 1.0)
+            _publish_policy.mark_status("offline")
 
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(None, _mqtt_client.loop_stop)
         await loop.run_in_executor(None, _mqtt_client.disconnect)
         logger.info("🔌 MQTT disconnected")
     except Exception as e:
-        logger.error(f"❌ MQTT disconnect error: {e}")
+        logger.error("❌ MQTT disconnect error: %s", e)
     finally:
         _mqtt_client = None
         _is_connected = False
@@ -146,7 +267,7 @@ def _build_sensor_config(sensor: dict[str, Any], base_topic: str, device_config:
     config = {
         "name": sensor["name"],
         "unique_id": f"huawei_solar_{sensor['key']}",
-        "state_topic": base_topic,
+        "state_topic": f"{base_topic}/{sensor['topic']}" if "topic" in sensor else base_topic,
         "value_template": sensor.get(
             "value_template",
             f"{{{{ value_json.{sensor['key']} }}}}",
@@ -192,14 +313,18 @@ async def _publish_sensor_configs(
     for sensor in sensors:
         config = _build_sensor_config(sensor, base_topic, device_config)
         topic = f"homeassistant/sensor/huawei_solar/{sensor['key']}/config"
-        result = client.publish(topic, json.dumps(config), qos=1, retain=True)
+        policy = _publish_policy.discovery
+        result = client.publish(topic, json.dumps(config), qos=policy.qos, retain=policy.retain)
         await _wait_for_publish(result, 1.0)
         count += 1
     return count
 
 
-async def publish_discovery_configs(base_topic: str) -> None:
-    """Publish all MQTT Discovery configs (once at startup)."""
+async def publish_discovery_configs(base_topic: str, diagnostics: bool = False) -> None:
+    """Publish all MQTT Discovery configs (once at startup).
+
+    ``diagnostics`` adds the bridge self-diagnostic sensors (DIAGNOSTIC_SENSORS).
+    """
     if not _is_connected:
         logger.warning("⚠️ MQTT not connected, skipping discovery")
         return
@@ -220,8 +345,11 @@ async def publish_discovery_configs(base_topic: str) -> None:
     text_sensors = _load_text_sensors()
     text_count = await _publish_sensor_configs(client, base_topic, text_sensors, device_config)
 
+    if diagnostics:
+        text_count += await _publish_sensor_configs(client, base_topic, DIAGNOSTIC_SENSORS, device_config)
+
     await _publish_status_sensor(client, base_topic, device_config)
-    logger.info(f"✅ Discovery complete: {count + text_count + 1} entities")
+    logger.info("✅ Discovery complete: %s entities", count + text_count + 1)
 
 
 async def _publish_status_sensor(client: mqtt.Client, base_topic: str, device_config: dict[str, Any]) -> None:
@@ -235,52 +363,124 @@ async def _publish_status_sensor(client: mqtt.Client, base_topic: str, device_co
         "device_class": "connectivity",
         "device": device_config,
     }
+    policy = _publish_policy.discovery
     result = client.publish(
         "homeassistant/binary_sensor/huawei_solar/status/config",
         json.dumps(config),
-        qos=1,
-        retain=True,
+        qos=policy.qos,
+        retain=policy.retain,
     )
     await _wait_for_publish(result, 1.0)
 
 
-async def publish_data(data: dict[str, Any], topic: str) -> None:
-    """Publish sensor data to MQTT."""
+async def publish_data(data: dict[str, Any], topic: str, trace: CycleTrace | None = None) -> None:
+    """Publish sensor data to MQTT.
+
+    ``trace`` (option tracing) gets the serialize, publish and PUBACK marks.
+    """
     if not _is_connected:
         logger.warning("⚠️ MQTT not connected, cannot publish data")
         raise ConnectionError("🚨 MQTT not connected")
 
     client = _get_mqtt_client()
-    data["last_update"] = int(time.time())
+    # Zeitpunkt aus transform übernehmen - HTTP API und MQTT zeigen denselben Wert
+    data["last_update"] = int(data.get("last_update") or time.time())
 
     if logger.isEnabledFor(logging.DEBUG):
         logger.debug(
-            f"Publishing: Solar={data.get('power_active', 'N/A')}W, "
-            f"Grid={data.get('meter_power_active', 'N/A')}W, "
-            f"Battery={data.get('battery_power', 'N/A')}W"
+            "Publishing: Solar=%sW, Grid=%sW, Battery=%sW",
+            data.get("power_active", "N/A"),
+            data.get("meter_power_active", "N/A"),
+            data.get("battery_power", "N/A"),
         )
 
+    flags = _publish_policy.data_flags()
     try:
-        result = client.publish(topic, json.dumps(data), qos=1, retain=True)
-        await _wait_for_publish(result, 2.0)
-        logger.debug(f"Data published: {len(data)} keys")
+        payload = get_serializer().dumps(data)
+        if trace is not None:
+            trace.mark("serialize")
+        result = client.publish(topic, payload, qos=flags.qos, retain=flags.retain)
+        if trace is not None:
+            trace.mark("publish")
+        # QoS 0 has no PUBACK - skip the executor round trip
+        if flags.qos > 0:
+            await _wait_for_publish(result, 2.0)
+            if trace is not None:
+                trace.mark("ack")
+        logger.debug("Data published: %d keys (qos=%d, retain=%s)", len(data), flags.qos, flags.retain)
     except Exception as e:
-        logger.error(f"❌ MQTT publish failed: {e}")
+        logger.error("❌ MQTT publish failed: %s", e)
         raise
 
 
-async def publish_status(status: str, topic: str) -> None:
-    """Publish online/offline status to MQTT."""
+def _reset_binary_schema() -> None:
+    global _binary_schema_published
+    _binary_schema_published = False
+
+
+async def publish_binary(data: dict[str, Any], topic: str) -> None:
+    """Publish the data snapshot as MessagePack to ``{topic}/binary``.
+
+    Secondary output for non-HA consumers: failures are logged and never
+    affect the JSON data topic. The schema (key list) is published retained
+    to ``{topic}/binary/schema`` once per connection.
+    """
+    global _binary_encoder, _binary_schema_published
     if not _is_connected:
-        logger.debug(f"MQTT not connected, cannot publish status '{status}'")
+        return
+
+    client = _get_mqtt_client()
+    if _binary_encoder is None:
+        _binary_encoder = BinaryPayloadEncoder()
+
+    try:
+        if not _binary_schema_published:
+            client.publish(f"{topic}/binary/schema", json.dumps(_binary_encoder.schema()), qos=1, retain=True)
+            _binary_schema_published = True
+
+        payload = _binary_encoder.encode(data)
+        client.publish(f"{topic}/binary", payload, qos=_publish_policy.data.qos, retain=False)
+        logger.debug("Binary payload published: %d bytes", len(payload))
+    except Exception as e:
+        logger.warning("⚠️ Binary publish failed: %s", e)
+
+
+async def publish_json(topic: str, payload: Mapping[str, Any], retain: bool = False) -> None:
+    """Publish a small JSON message (QoS 1), e.g. command results or diagnostics.
+
+    Failures are logged and never raised - the command itself already ran.
+    """
+    if not _is_connected:
+        logger.debug("MQTT not connected, dropping message for %s", topic)
+        return
+
+    try:
+        _get_mqtt_client().publish(topic, json.dumps(payload), qos=1, retain=retain)
+    except Exception as e:
+        logger.warning("⚠️ Publish to %s failed: %s", topic, e)
+
+
+async def publish_status(status: str, topic: str, force: bool = False) -> None:
+    """Publish online/offline status to MQTT.
+
+    Only transitions (and optional keepalives) reach the broker, see
+    PublishPolicy.status_due(). ``force`` bypasses the deduplication.
+    """
+    if not _is_connected:
+        logger.debug("MQTT not connected, cannot publish status '%s'", status)
+        return
+
+    if not force and not _publish_policy.status_due(status):
         return
 
     client = _get_mqtt_client()
     status_topic = f"{topic}/status"
+    policy = _publish_policy.status
 
     try:
-        result = client.publish(status_topic, status, qos=1, retain=True)
+        result = client.publish(status_topic, status, qos=policy.qos, retain=policy.retain)
         await _wait_for_publish(result, 1.0)
-        logger.debug(f"Status: '{status}' → {status_topic}")
+        _publish_policy.mark_status(status)
+        logger.debug("Status: '%s' → %s", status, status_topic)
     except Exception as e:
-        logger.error(f"❌ Status publish failed: {e}")
+        logger.error("❌ Status publish failed: %s", e)
@@ -0,0 +1,164 @@
+# huawei_solar_modbus_mqtt/bridge/mqtt_supervisor.py
+
+"""
+MQTT Connection Supervisor.
+
+Überwacht die Broker-Verbindung und stellt sie nach einem unerwarteten
+Disconnect selbstständig wieder her - ohne Container-Neustart.
+
+Ablauf:
+    paho-Thread: _on_disconnect → notify_disconnect() (thread-safe)
+    asyncio:     Supervisor-Task wacht auf → Reconnect mit Backoff
+                 → on_reconnect() (Discovery + aktueller Status erneut senden)
+
+Backoff:
+    Exponentiell (1s, 2s, 4s, ... max 120s) mit "full jitter", damit mehrere
+    Bridges nach einem Broker-Neustart nicht gleichzeitig reconnecten.
+
+Statistik:
+    get_stats() liefert Anzahl Reconnects und Ausfalldauern für Diagnostik.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypedDict
+
+from .mqtt_client import reconnect_mqtt, set_disconnect_callback
+
+logger = logging.getLogger("huawei.mqtt.supervisor")
+
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 120.0
+
+
+class ReconnectStats(TypedDict):
+    reconnect_count: int
+    failed_attempts: int
+    last_outage_duration: float | None
+    total_outage_duration: float
+    last_reconnect: float | None
+    outage_active: bool
+
+
+def compute_backoff(
+    attempt: int, min_delay: float = RECONNECT_MIN_DELAY, max_delay: float = RECONNECT_MAX_DELAY
+) -> float:
+    """Return the jittered delay before reconnect attempt ``attempt`` (0-based).
+
+    Full jitter: uniform in [min_delay, min(max_delay, min_delay * 2**attempt)].
+    """
+    ceiling = min(max_delay, min_delay * (2 ** min(attempt, 16)))
+    return random.uniform(min_delay, ceiling)
+
+
+class MqttSupervisor:
+    """Reconnects the MQTT client after unexpected disconnects."""
+
+    def __init__(
+        self,
+        on_reconnect: Callable[[], Awaitable[None]] | None = None,
+        min_delay: float = RECONNECT_MIN_DELAY,
+        max_delay: float = RECONNECT_MAX_DELAY,
+    ):
+        """
+        Args:
+            on_reconnect: Coroutine factory called after every successful
+                reconnect (re-publish discovery and status).
+            min_delay: First backoff ceiling in seconds.
+            max_delay: Upper bound for the backoff in seconds.
+        """
+        self.on_reconnect = on_reconnect
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._disconnected = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._outage_start: float | None = None
+
+        self._reconnect_count = 0
+        self._failed_attempts = 0
+        self._last_outage_duration: float | None = None
+        self._total_outage_duration = 0.0
+        self._last_reconnect: float | None = None
+
+    def start(self) -> None:
+        """Start supervising (must be called from the running event loop)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        set_disconnect_callback(self.notify_disconnect)
+        self._task = asyncio.create_task(self._run(), name="mqtt-supervisor")
+        logger.debug("MQTT supervisor started")
+
+    async def stop(self) -> None:
+        """Stop supervising and detach from the MQTT client."""
+        set_disconnect_callback(None)
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def notify_disconnect(self) -> None:
+        """Signal an unexpected disconnect. Safe to call from any thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._mark_disconnected)
+
+    def _mark_disconnected(self) -> None:
+        if self._outage_start is None:
+            self._outage_start = time.monotonic()
+        self._disconnected.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._disconnected.wait()
+            self._disconnected.clear()
+            await self._reconnect_with_backoff()
+
+    async def _reconnect_with_backoff(self) -> None:
+        attempt = 0
+        while True:
+            delay = compute_backoff(attempt, self.min_delay, self.max_delay)
+            logger.info("🔄 MQTT reconnect attempt %d in %.1fs", attempt + 1, delay)
+            await asyncio.sleep(delay)
+            try:
+                await reconnect_mqtt()
+            except (OSError, ConnectionError) as e:
+                self._failed_attempts += 1
+                attempt += 1
+                logger.debug("MQTT reconnect attempt %d failed: %s", attempt, e)
+                continue
+            break
+
+        outage = time.monotonic() - self._outage_start if self._outage_start is not None else 0.0
+        self._outage_start = None
+        self._reconnect_count += 1
+        self._last_outage_duration = outage
+        self._total_outage_duration += outage
+        self._last_reconnect = time.time()
+        logger.info("🔌 MQTT reconnected after %.1fs (%d attempts)", outage, attempt + 1)
+
+        if self.on_reconnect is not None:
+            try:
+                await self.on_reconnect()
+            except Exception as e:
+                logger.error("❌ Post-reconnect publish failed: %s", e)
+
+    def get_stats(self) -> ReconnectStats:
+        """Return reconnect counters and outage durations (seconds)."""
+        return {
+            "reconnect_count": self._reconnect_count,
+            "failed_attempts": self._failed_attempts,
+            "last_outage_duration": self._last_outage_duration,
+            "total_outage_duration": self._total_outage_duration,
+            "last_reconnect": self._last_reconnect,
+            "outage_active": self._outage_start is not None,
+        }
@@ -0,0 +1,475 @@
+# huawei_solar_modbus_mqtt/bridge/output_sinks.py
+
+"""
+Zusätzliche Output-Sinks neben MQTT.
+
+Jeder Cycle übergibt den gefilterten Snapshot an alle konfigurierten Sinks.
+MQTT bleibt der primäre Output in main_once (Heartbeat/Status hängen am
+erfolgreichen Publish); die Sinks hier laufen daneben und unabhängig davon -
+auch während eines MQTT-Ausfalls.
+
+Built-in Sinks:
+    - InfluxLineSink:  InfluxDB Line Protocol per UDP (udp://host:port)
+                       oder als Datei (file:///pfad)
+    - NdjsonFileSink:  Ein JSON-Objekt pro Zeile (Datei, append)
+    - UnixSocketSink:  Lokaler Unix Socket, streamt NDJSON an alle
+                       verbundenen Clients
+    - SharedMemorySink: Memory-mapped Datei mit festen float64 Slots
+                       (shm_snapshot.py)
+
+Failure Isolation:
+    Jeder Sink hat eine eigene bounded Queue und einen eigenen Task. Ein
+    langsamer oder fehlerhafter Sink blockiert weder den Poll-Cycle noch die
+    anderen Sinks. Läuft eine Queue voll, wird der älteste Snapshot verworfen
+    (aktuelle Werte sind wichtiger als vollständige Historie).
+
+Datei-Ausgaben (NDJSON, Influx ``file://``) rotieren bei
+``output_file_max_mb`` (Standard 10 MB): ``data.ndjson`` → ``data.ndjson.1``
+→ ... → ``data.ndjson.<ROTATE_KEEP>``, ältere Dateien entfallen. So läuft
+``/data`` bzw. ``/share`` auch über Monate nicht voll.
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from pathlib import Path
+from typing import IO, Any, TypedDict
+from urllib.parse import urlparse
+
+from .config_manager import ConfigManager
+from .payload_serializer import get_serializer
+from .shm_snapshot import SharedMemorySnapshot
+
+logger = logging.getLogger("huawei.sinks")
+
+DEFAULT_QUEUE_SIZE = 100
+INFLUX_MEASUREMENT = "huawei_solar"
+ROTATE_KEEP = 3
+# Max. gepufferte Bytes pro Unix-Socket-Client, danach wird er getrennt
+UNIX_CLIENT_BUFFER_LIMIT = 1024 * 1024
+
+# (timestamp, cycle, data)
+Snapshot = tuple[float, int, dict[str, Any]]
+
+
+class SinkStats(TypedDict):
+    written: int
+    failed: int
+    dropped: int
+    queued: int
+    last_error: str | None
+
+
+class OutputSink(ABC):
+    """A destination for filtered data snapshots."""
+
+    name: str = "sink"
+
+    async def open(self) -> None:  # noqa: B027 - optional hook
+        """Acquire resources (called once before the first write)."""
+
+    @abstractmethod
+    async def write(self, data: Mapping[str, Any], timestamp: float, cycle: int = 0) -> None:
+        """Deliver one snapshot of bridge cycle ``cycle``. Exceptions are handled by the worker."""
+
+    async def close(self) -> None:  # noqa: B027 - optional hook
+        """Release resources."""
+
+
+# =============================================================================
+# Encoding
+# =============================================================================
+
+
+def _escape_tag(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def _escape_field_string(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_line_protocol(
+    data: Mapping[str, Any],
+    timestamp: float,
+    measurement: str = INFLUX_MEASUREMENT,
+    tags: Mapping[str, str] | None = None,
+) -> str:
+    """Encode a snapshot as one InfluxDB line protocol line (without newline).
+
+    Numbers are written as float fields so that a value arriving once as int
+    and once as float does not cause a field type conflict. ``last_update``
+    is represented by the line timestamp (nanoseconds). Returns an empty
+    string if the snapshot has no fields.
+    """
+    fields: list[str] = []
+    for key, value in get_serializer().normalize(data).items():
+        if key == "last_update" or value is None:
+            continue
+        field_key = _escape_tag(key)
+        if isinstance(value, bool):
+            fields.append(f"{field_key}={'true' if value else 'false'}")
+        elif isinstance(value, int | float):
+            if isinstance(value, float) and not math.isfinite(value):
+                continue
+            fields.append(f"{field_key}={float(value)!r}")
+        elif isinstance(value, list | tuple):
+            fields.append(f'{field_key}="{_escape_field_string(", ".join(map(str, value)))}"')
+        else:
+            fields.append(f'{field_key}="{_escape_field_string(str(value))}"')
+
+    if not fields:
+        return ""
+
+    head = _escape_tag(measurement)
+    if tags:
+        head += "".join(f",{_escape_tag(k)}={_escape_tag(v)}" for k, v in sorted(tags.items()) if v)
+    return f"{head} {','.join(fields)} {int(timestamp * 1e9)}"
+
+
+def to_ndjson(data: Mapping[str, Any], timestamp: float) -> bytes:
+    """Encode a snapshot as one JSON line (schema order, with ``last_update``)."""
+    if "last_update" not in data:
+        data = {**data, "last_update": int(timestamp)}
+    return get_serializer().dumps(data) + b"\n"
+
+
+# =============================================================================
+# Built-in Sinks
+# =============================================================================
+
+
+class _AppendFile:
+    """Append-only file opened lazily; reopened after write errors, rotated at ``max_bytes`` (0 = never)."""
+
+    def __init__(self, path: Path, max_bytes: int = 0, keep: int = ROTATE_KEEP):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self._handle: IO[bytes] | None = None
+        self._size = 0
+
+    def write(self, chunk: bytes) -> None:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._size = self.path.stat().st_size if self.path.exists() else 0
+        if self.max_bytes and self._size and self._size + len(chunk) > self.max_bytes:
+            self._rotate()
+        if self._handle is None:
+            self._handle = self.path.open("ab")
+        try:
+            self._handle.write(chunk)
+            self._handle.flush()
+        except OSError:
+            self.close()
+            raise
+        self._size += len(chunk)
+
+    def _rotate(self) -> None:
+        self.close()
+        for index in range(self.keep - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.keep:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+        self._size = 0
+        logger.debug("Rotated %s", self.path)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            with contextlib.suppress(OSError):
+                self._handle.close()
+            self._handle = None
+
+
+class NdjsonFileSink(OutputSink):
+    """Appends one JSON object per snapshot to a file."""
+
+    name = "ndjson"
+
+    def __init__(self, path: str | Path, max_bytes: int = 0):
+        self._file = _AppendFile(Path(path), max_bytes)
+
+    async def write(self, data: Mapping[str, Any], timestamp: float, cycle: int = 0) -> None:
+        await asyncio.to_thread(self._file.write, to_ndjson(data, timestamp))
+
+    async def close(self) -> None:
+        self._file.close()
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("Influx UDP error: %s", exc)
+
+
+class InfluxLineSink(OutputSink):
+    """InfluxDB line protocol over UDP (``udp://host:port``) or to a file (``file:///path``)."""
+
+    name = "influx"
+
+    def __init__(
+        self,
+        target: str,
+        tags: Mapping[str, str] | None = None,
+        measurement: str = INFLUX_MEASUREMENT,
+        max_bytes: int = 0,
+    ):
+        parsed = urlparse(target)
+        if parsed.scheme not in ("udp", "file"):
+            raise ValueError(f"Unsupported influx target '{target}' (expected udp://host:port or file:///path)")
+        if parsed.scheme == "udp" and (not parsed.hostname or not parsed.port):
+            raise ValueError(f"Influx UDP target needs host and port, got '{target}'")
+
+        self.target = target
+        self.measurement = measurement
+        self.tags = dict(tags or {})
+        self._udp_addr: tuple[str, int] | None = None
+        if parsed.scheme == "udp" and parsed.hostname and parsed.port:
+            self._udp_addr = (parsed.hostname, parsed.port)
+        self._file = _AppendFile(Path(parsed.path), max_bytes) if parsed.scheme == "file" else None
+        self._transport: asyncio.DatagramTransport | None = None
+
+    async def open(self) -> None:
+        if self._udp_addr is not None:
+            loop = asyncio.get_running_loop()
+            self._transport, _ = await loop.create_datagram_endpoint(_UdpProtocol, remote_addr=self._udp_addr)
+
+    async def write(self, data: Mapping[str, Any], timestamp: float, cycle: int = 0) -> None:
+        line = to_line_protocol(data, timestamp, self.measurement, self.tags)
+        if not line:
+            return
+        payload = (line + "\n").encode()
+        if self._file is not None:
+            await asyncio.to_thread(self._file.write, payload)
+            return
+        if self._transport is None or self._transport.is_closing():
+            await self.open()
+        assert self._transport is not None
+        self._transport.sendto(payload)
+
+    async def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._file is not None:
+            self._file.close()
+
+
+class UnixSocketSink(OutputSink):
+    """Streams NDJSON snapshots to every client connected to a Unix socket."""
+
+    name = "unix"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._server: asyncio.Server | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    async def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+        self._server = await asyncio.start_unix_server(self._on_client, path=str(self.path))
+        logger.info("🔌 Unix socket sink listening on %s", self.path)
+
+    async def _on_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._clients.add(writer)
+        logger.debug("Unix socket client connected (%d total)", len(self._clients))
+        try:
+            # Clients only read; EOF signals disconnect
+            await reader.read()
+        finally:
+            self._drop(writer)
+
+    def _drop(self, writer: asyncio.StreamWriter) -> None:
+        if writer in self._clients:
+            self._clients.discard(writer)
+            writer.close()
+            logger.debug("Unix socket client disconnected (%d left)", len(self._clients))
+
+    async def write(self, data: Mapping[str, Any], timestamp: float, cycle: int = 0) -> None:
+        if not self._clients:
+            return
+        line = to_ndjson(data, timestamp)
+        for writer in list(self._clients):
+            transport = writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > UNIX_CLIENT_BUFFER_LIMIT:
+                # Slow or dead consumer - disconnect instead of buffering unboundedly
+                self._drop(writer)
+                continue
+            writer.write(line)
+
+    async def close(self) -> None:
+        for writer in list(self._clients):
+            self._drop(writer)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+
+
+class SharedMemorySink(OutputSink):
+    """Output sink writing every snapshot to the shared-memory file."""
+
+    name = "shm"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._writer: SharedMemorySnapshot | None = None
+
+    async def open(self) -> None:
+        self._writer = SharedMemorySnapshot(self.path)
+
+    async def write(self, data: Mapping[str, Any], timestamp: float, cycle: int = 0) -> None:
+        if self._writer is None:
+            await self.open()
+        assert self._writer is not None
+        self._writer.write(data, timestamp, cycle)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+# =============================================================================
+# Worker / Manager
+# =============================================================================
+
+
+class SinkWorker:
+    """Feeds one sink from its own bounded queue."""
+
+    def __init__(self, sink: OutputSink, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.sink = sink
+        self._queue: asyncio.Queue[Snapshot] = asyncio.Queue(maxsize=queue_size)
+        self._task: asyncio.Task[None] | None = None
+        self._failing = False
+
+        self._written = 0
+        self._failed = 0
+        self._dropped = 0
+        self._last_error: str | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"sink-{self.sink.name}")
+
+    def submit(self, snapshot: Snapshot) -> None:
+        """Enqueue without blocking; drops the oldest snapshot when full."""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._dropped += 1
+        self._queue.put_nowait(snapshot)
+
+    async def _run(self) -> None:
+        try:
+            await self.sink.open()
+        except Exception as e:
+            # open() is retried implicitly by sinks that reconnect in write()
+            self._record_failure(e)
+
+        while True:
+            timestamp, cycle, data = await self._queue.get()
+            try:
+                await self.sink.write(data, timestamp, cycle)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._record_failure(e)
+            else:
+                self._written += 1
+                if self._failing:
+                    self._failing = False
+                    logger.info("✅ Output sink '%s' recovered", self.sink.name)
+            finally:
+                self._queue.task_done()
+
+    def _record_failure(self, e: Exception) -> None:
+        self._failed += 1
+        self._last_error = f"{type(e).__name__}: {e}"
+        if not self._failing:
+            self._failing = True
+            logger.warning("⚠️ Output sink '%s' failed: %s", self.sink.name, self._last_error)
+        else:
+            logger.debug("Output sink '%s' still failing: %s", self.sink.name, self._last_error)
+
+    async def stop(self, drain_timeout: float = 2.0) -> None:
+        """Flush pending snapshots (bounded by ``drain_timeout``) and close the sink."""
+        if self._task is not None:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        try:
+            await self.sink.close()
+        except Exception as e:
+            logger.debug("Closing output sink '%s' failed: %s", self.sink.name, e)
+
+    def get_stats(self) -> SinkStats:
+        return {
+            "written": self._written,
+            "failed": self._failed,
+            "dropped": self._dropped,
+            "queued": self._queue.qsize(),
+            "last_error": self._last_error,
+        }
+
+
+class OutputSinks:
+    """Fan-out of each snapshot to all configured sinks."""
+
+    def __init__(self, sinks: list[OutputSink], queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.workers = [SinkWorker(sink, queue_size) for sink in sinks]
+
+    def __bool__(self) -> bool:
+        return bool(self.workers)
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+        if self.workers:
+            logger.info("📤 Output sinks: %s", ", ".join(w.sink.name for w in self.workers))
+
+    def submit(self, data: Mapping[str, Any], timestamp: float | None = None, cycle: int = 0) -> None:
+        """Hand the snapshot of bridge cycle ``cycle`` to every sink (never blocks the poll cycle)."""
+        snapshot: Snapshot = (time.time() if timestamp is None else timestamp, cycle, dict(data))
+        for worker in self.workers:
+            worker.submit(snapshot)
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(worker.stop() for worker in self.workers))
+
+    def get_stats(self) -> dict[str, SinkStats]:
+        return {worker.sink.name: worker.get_stats() for worker in self.workers}
+
+
+def build_output_sinks(config: ConfigManager) -> OutputSinks:
+    """Create the sinks enabled in the add-on configuration."""
+    sinks: list[OutputSink] = []
+    max_bytes = config.output_file_max_mb * 2**20
+    if config.output_influx:
+        sinks.append(InfluxLineSink(config.output_influx, tags={"topic": config.mqtt_topic}, max_bytes=max_bytes))
+    if config.output_ndjson_file:
+        sinks.append(NdjsonFileSink(config.output_ndjson_file, max_bytes))
+    if config.output_unix_socket:
+        sinks.append(UnixSocketSink(config.output_unix_socket))
+    if config.output_shared_memory:
+        sinks.append(SharedMemorySink(config.output_shared_memory))
+    return OutputSinks(sinks, queue_size=config.output_queue_size)
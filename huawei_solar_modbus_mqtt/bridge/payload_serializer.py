@@ -0,0 +1,167 @@
+# huawei_solar_modbus_mqtt/bridge/payload_serializer.py
+
+"""
+Schema-kompilierter JSON-Serializer für den MQTT Daten-Payload.
+
+Aus NUMERIC_SENSORS/TEXT_SENSORS wird einmalig kompiliert:
+
+    - Feste Key-Reihenfolge (Reihenfolge der Sensor-Definitionen, dann
+      unbekannte Keys in Einfügereihenfolge) → byte-stabile Payloads
+    - Nachkommastellen pro Sensor aus der Einheit abgeleitet (UNIT_PRECISION),
+      überschreibbar per "precision" in der Sensor-Definition
+    - NaN/Infinity werden zu ``null`` - beides ist kein gültiges JSON
+
+Backend:
+    ``orjson`` ist Teil der requirements.txt und damit im Image das
+    Standard-Backend: normalize() + orjson ist rund 2x schneller als das
+    frühere nackte json.dumps() (siehe scripts/benchmark.py, das bei einer
+    Regression fehlschlägt). Nur wo kein orjson-Wheel existiert (armv6)
+    greift der json-Fallback mit kompakten Separatoren - dort kostet
+    normalize() gegenüber json.dumps() Zeit, der Payload ist aber kleiner
+    und stabil sortiert.
+
+Die Rundung betrifft ausschließlich den Payload - transform/filter arbeiten
+weiterhin mit den vollen Werten.
+"""
+
+import json
+import logging
+import math
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - kein Wheel für armv6
+    orjson = None  # type: ignore[assignment]
+
+from .config.sensors_mqtt import NUMERIC_SENSORS, TEXT_SENSORS
+
+logger = logging.getLogger("huawei.serializer")
+
+_MISSING = object()
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+# Nachkommastellen je Einheit (orientiert an den Register-Gains der Library)
+UNIT_PRECISION: dict[str, int] = {
+    "W": 0,
+    "var": 0,
+    "kWh": 2,
+    "V": 1,
+    "A": 2,
+    "Hz": 2,
+    "%": 2,
+    "°C": 1,
+    "MΩ": 3,
+    "": 3,
+}
+
+
+def _compile_precision(sensor: Mapping[str, Any]) -> int | None:
+    if "precision" in sensor:
+        return int(sensor["precision"])
+    unit = sensor.get("unit_of_measurement")
+    if unit is None:
+        return None
+    return UNIT_PRECISION.get(unit)
+
+
+class PayloadSerializer:
+    """JSON serializer compiled from a sensor schema."""
+
+    def __init__(self, sensors: Iterable[Mapping[str, Any]], trailing_keys: Iterable[str] = ("last_update",)):
+        """
+        Args:
+            sensors: Sensor definitions (``key``, optional
+                ``unit_of_measurement`` / ``precision``).
+            trailing_keys: Keys always emitted after the schema keys.
+        """
+        # (key, decimal places or None, 10**decimal places)
+        self._fields: list[tuple[str, int | None, float]] = []
+        seen: set[str] = set()
+
+        for sensor in sensors:
+            key = sensor["key"]
+            if key not in seen:
+                seen.add(key)
+                precision = _compile_precision(sensor)
+                self._fields.append((key, precision, 10.0**precision if precision else 1.0))
+
+        for key in trailing_keys:
+            if key not in seen:
+                seen.add(key)
+                self._fields.append((key, None, 1.0))
+
+        self._known = frozenset(seen)
+        self.backend = "orjson" if orjson is not None else "json"
+
+    @classmethod
+    def from_sensor_config(cls) -> "PayloadSerializer":
+        """Compile the serializer from NUMERIC_SENSORS and TEXT_SENSORS."""
+        return cls([*NUMERIC_SENSORS, *TEXT_SENSORS])
+
+    @property
+    def key_order(self) -> list[str]:
+        """Schema key order used for the payload."""
+        return [key for key, _, _ in self._fields]
+
+    def precision(self, key: str) -> int | None:
+        """Return the compiled decimal places for ``key`` (None = unrounded)."""
+        for field_key, precision, _ in self._fields:
+            if field_key == key:
+                return precision
+        return None
+
+    def dumps(self, data: Mapping[str, Any]) -> bytes:
+        """Serialize ``data`` to compact UTF-8 JSON bytes."""
+        normalized = self.normalize(data)
+        if orjson is not None:
+            return orjson.dumps(normalized, default=str)
+        return _JSON_ENCODER.encode(normalized).encode()
+
+    def normalize(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        """Return ``data`` in schema order, floats rounded to their precision, NaN/Infinity as None."""
+        out: dict[str, Any] = {}
+        get = data.get
+        for key, precision, scale in self._fields:
+            value = get(key, _MISSING)
+            if value is _MISSING:
+                continue
+            if value.__class__ is float:
+                if value - value != 0.0:  # NaN/Infinity
+                    value = None
+                elif precision:
+                    # round(value, n) geht über dtoa und kostet ein Vielfaches;
+                    # int / 10**n liefert den nächsten Float mit kurzem repr().
+                    # Nur bei binär knapp unter .5 liegenden Werten (2.675)
+                    # weicht die letzte Stelle ab - für Anzeigewerte egal.
+                    value = round(value * scale) / scale
+                elif precision is not None:
+                    value = round(value)
+            out[key] = value
+
+        if len(out) != len(data):
+            for key, value in data.items():
+                if key not in self._known:
+                    out[key] = None if value.__class__ is float and not math.isfinite(value) else value
+        return out
+
+
+_serializer: PayloadSerializer | None = None
+
+
+def get_serializer() -> PayloadSerializer:
+    """Return the serializer compiled from the sensor config (lazy singleton)."""
+    global _serializer
+    if _serializer is None:
+        _serializer = PayloadSerializer.from_sensor_config()
+        logger.debug(
+            "Payload serializer compiled: %d keys, backend=%s", len(_serializer.key_order), _serializer.backend
+        )
+    return _serializer
+
+
+def reset_serializer() -> None:
+    """Drop the compiled serializer (testing)."""
+    global _serializer
+    _serializer = None
@@ -0,0 +1,155 @@
+# huawei_solar_modbus_mqtt/bridge/poll_policy.py
+
+"""
+Adaptives Poll-Intervall (Nachtmodus).
+
+Nachts steht der Inverter in "Standby: no irradiation", PV-Leistung und
+Batterie sind 0 - trotzdem wurde bisher alle ``poll_interval`` Sekunden der
+Dongle abgefragt und nach MQTT/HA geschrieben. Mit ``night_poll_interval``
+wird in dieser Zeit langsamer gepollt:
+
+    Ruhe:      PV-Eingang und Batterie unter IDLE_POWER_W, Inverter-Status
+               Standby/Shutdown (falls gelesen) - IDLE_CYCLES Cycles in Folge,
+               damit die Dämmerung nicht hin und her schaltet
+    Aufwachen: jede Leistung über der Schwelle schaltet sofort zurück auf
+               ``poll_interval`` (Batterie entlädt, PV startet)
+
+Mit ``latitude``/``longitude`` wird zusätzlich lokal Sonnenauf- und
+-untergang berechnet (NOAA-Näherung, auf wenige Minuten genau, ohne externe
+Abhängigkeit). Zwischen Sonnenaufgang und -untergang (± SUN_MARGIN) wird nie
+langsam gepollt, und der letzte Schlaf vor Sonnenaufgang wird so gekürzt,
+dass der erste schnelle Cycle pünktlich kommt. Polartag/-nacht: nur die
+Ruhe-Erkennung entscheidet.
+
+Das lange Intervall ist auf status_timeout / 2 begrenzt (config validate),
+damit Heartbeat und /api/health auch nachts "online" bleiben.
+"""
+
+import logging
+import math
+from collections.abc import Mapping
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+logger = logging.getLogger("huawei.poll_policy")
+
+IDLE_POWER_W = 20  # darunter gelten PV-Eingang und Batterie als "aus"
+IDLE_CYCLES = 3  # so viele ruhige Cycles in Folge bis zum Nachtmodus
+SUN_MARGIN = timedelta(minutes=30)
+
+_IDLE_STATUS_PREFIXES = ("Standby", "Shutdown")
+_ZENITH = math.radians(90.833)  # Refraktion + Sonnenradius
+
+
+def sun_times(day: date, latitude: float, longitude: float) -> tuple[datetime, datetime] | None:
+    """Sunrise and sunset (UTC) of ``day`` at the given position; None during polar day/night."""
+    gamma = 2 * math.pi / 365 * (day.timetuple().tm_yday - 1)
+    eqtime = 229.18 * (
+        0.000075
+        + 0.001868 * math.cos(gamma)
+        - 0.032077 * math.sin(gamma)
+        - 0.014615 * math.cos(2 * gamma)
+        - 0.040849 * math.sin(2 * gamma)
+    )
+    decl = (
+        0.006918
+        - 0.399912 * math.cos(gamma)
+        + 0.070257 * math.sin(gamma)
+        - 0.006758 * math.cos(2 * gamma)
+        + 0.000907 * math.sin(2 * gamma)
+        - 0.002697 * math.cos(3 * gamma)
+        + 0.00148 * math.sin(3 * gamma)
+    )
+    lat = math.radians(latitude)
+    cos_ha = math.cos(_ZENITH) / (math.cos(lat) * math.cos(decl)) - math.tan(lat) * math.tan(decl)
+    if not -1.0 <= cos_ha <= 1.0:
+        return None
+
+    ha = math.degrees(math.acos(cos_ha))
+    midnight = datetime(day.year, day.month, day.day, tzinfo=UTC)
+    sunrise = midnight + timedelta(minutes=720 - 4 * (longitude + ha) - eqtime)
+    sunset = midnight + timedelta(minutes=720 - 4 * (longitude - ha) - eqtime)
+    return sunrise, sunset
+
+
+class PollPolicy:
+    """Chooses the wait between cycles from inverter state and (optionally) the sun."""
+
+    def __init__(
+        self,
+        poll_interval: int,
+        night_poll_interval: int = 0,
+        latitude: float | None = None,
+        longitude: float | None = None,
+    ):
+        self.poll_interval = poll_interval
+        self.night_poll_interval = night_poll_interval
+        self._position = (latitude, longitude) if latitude is not None and longitude is not None else None
+        self._idle_cycles = 0
+        self._last: Mapping[str, Any] | None = None
+        self.night = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.night_poll_interval > self.poll_interval
+
+    def observe(self, data: Mapping[str, Any]) -> None:
+        """Feed one cycle's values (MQTT keys)."""
+        self._last = data
+        if _is_idle(data):
+            self._idle_cycles += 1
+        else:
+            self._idle_cycles = 0
+
+    def repeat(self) -> None:
+        """Count a cycle whose values equal the last observed ones (unchanged cycle)."""
+        if self._last is not None:
+            self.observe(self._last)
+
+    def daylight(self, now: datetime) -> tuple[bool, float | None]:
+        """(sun up incl. margin, seconds until the next sunrise margin) - (False, None) without position."""
+        if self._position is None:
+            return False, None
+        latitude, longitude = self._position
+        next_sunrise: datetime | None = None
+        for offset in (-1, 0, 1):
+            times = sun_times(now.date() + timedelta(days=offset), latitude, longitude)
+            if times is None:
+                continue
+            start, end = times[0] - SUN_MARGIN, times[1] + SUN_MARGIN
+            if start <= now <= end:
+                return True, None
+            if start > now and (next_sunrise is None or start < next_sunrise):
+                next_sunrise = start
+        return False, None if next_sunrise is None else (next_sunrise - now).total_seconds()
+
+    def interval(self, now: float) -> float:
+        """Seconds between the start of this cycle and the next one."""
+        if not self.enabled:
+            return self.poll_interval
+
+        is_day, until_sunrise = self.daylight(datetime.fromtimestamp(now, UTC))
+        night = not is_day and self._idle_cycles >= IDLE_CYCLES
+        if night != self.night:
+            self.night = night
+            if night:
+                logger.info("🌙 Night mode: polling every %ds", self.night_poll_interval)
+            else:
+                logger.info("☀️ Day mode: polling every %ds (%s)", self.poll_interval, "sunrise" if is_day else "power")
+        if not night:
+            return self.poll_interval
+
+        if until_sunrise is not None:
+            return max(float(self.poll_interval), min(float(self.night_poll_interval), until_sunrise))
+        return self.night_poll_interval
+
+
+def _is_idle(data: Mapping[str, Any]) -> bool:
+    status = data.get("inverter_status")
+    if isinstance(status, str) and not status.startswith(_IDLE_STATUS_PREFIXES):
+        return False
+    for key in ("power_input", "battery_power"):
+        value = data.get(key, 0 if key == "battery_power" else None)
+        if not isinstance(value, int | float) or abs(value) >= IDLE_POWER_W:
+            return False
+    return True
@@ -0,0 +1,281 @@
+# huawei_solar_modbus_mqtt/bridge/profiler.py
+
+"""
+Profiler für die laufende Bridge - ohne Container-Neubau.
+
+Ausgelöst per Signal oder MQTT:
+
+    kill -USR1 <pid>                  → DEFAULT_CYCLES Cycles profilieren
+    <topic>/profile  Payload ""       → DEFAULT_CYCLES Cycles
+                     Payload "<N>"    → N Cycles (1 bis MAX_CYCLES)
+
+Profiliert werden nur die Cycles selbst (main_once), nicht die Wartezeit
+dazwischen. Zwei Quellen laufen parallel:
+
+    cProfile        Funktionszeiten → ``profile-<zeit>.pstats``
+                    (``python -m pstats``, snakeviz, ...)
+    Stack-Sampler   Thread, der alle SAMPLE_INTERVAL Sekunden den Stack des
+                    Event-Loop-Threads liest → ``profile-<zeit>.collapsed``
+                    (``datei:funktion;...;datei:funktion anzahl`` pro Zeile,
+                    direkt für flamegraph.pl / speedscope)
+
+Beide Dateien landen in PROFILE_DIR (``/data/profiles``), es bleiben die
+letzten MAX_PROFILES Profile erhalten. Zusätzlich werden die TOP_N
+Funktionen nach Eigenzeit geloggt. Eine Sitzung endet nach N Cycles oder
+spätestens nach MAX_DURATION Sekunden.
+
+Inaktiv kostet der Profiler nichts außer einer Attribut-Abfrage pro Cycle:
+Signal-Handler und Command-Topic warten nur auf Anfragen.
+"""
+
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import TypedDict
+
+from .mqtt_client import subscribe_command, unsubscribe_command
+
+logger = logging.getLogger("huawei.profiler")
+
+PROFILE_DIR = Path("/data/profiles")
+DEFAULT_CYCLES = 5
+MAX_CYCLES = 100
+MAX_DURATION = 600.0
+MAX_PROFILES = 10
+SAMPLE_INTERVAL = 0.005
+TOP_N = 15
+
+
+class ProfilerStats(TypedDict):
+    sessions: int
+    active: bool
+    last_profile: str | None
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{code.co_qualname}"
+
+
+class _StackSampler(threading.Thread):
+    """Samples the stack of one thread into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="profiler-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self.recording = False
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            if not self.recording:
+                continue
+            frame: FrameType | None = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join(timeout=1.0)
+
+
+class CycleProfiler:
+    """Profiles a requested number of poll cycles and writes pstats + collapsed stacks."""
+
+    def __init__(
+        self,
+        directory: Path = PROFILE_DIR,
+        keep: int = MAX_PROFILES,
+        sample_interval: float = SAMPLE_INTERVAL,
+        max_duration: float = MAX_DURATION,
+    ):
+        """
+        Args:
+            directory: Output directory for the profile files.
+            keep: Number of profiles kept; older ones are deleted.
+            sample_interval: Seconds between two stack samples.
+            max_duration: Upper bound for one session in seconds.
+        """
+        self.directory = directory
+        self.keep = keep
+        self.sample_interval = sample_interval
+        self.max_duration = max_duration
+
+        self.pending = 0  # angefragte Cycles, noch nicht gestartet
+        self._remaining = 0
+        self._cycles = 0
+        self._started = 0.0
+        self._profile: cProfile.Profile | None = None
+        self._sampler: _StackSampler | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._topic: str | None = None
+
+        self._sessions = 0
+        self._last_profile: Path | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def start(self, topic: str | None = None) -> None:
+        """Install the SIGUSR1 handler and subscribe ``topic`` (from the running event loop)."""
+        self._loop = asyncio.get_running_loop()
+        if sys.platform != "win32":
+            try:
+                self._loop.add_signal_handler(signal.SIGUSR1, self.request)
+            except (NotImplementedError, RuntimeError):
+                logger.debug("SIGUSR1 handler not registered for this event loop")
+        if topic is not None:
+            self._topic = topic
+            subscribe_command(topic, self.notify)
+            logger.debug("Profile command topic: %s", topic)
+
+    async def stop(self) -> None:
+        """Remove the triggers; a running session is written as it is."""
+        if self._topic is not None:
+            unsubscribe_command(self._topic)
+            self._topic = None
+        if self._loop is not None and sys.platform != "win32":
+            try:
+                self._loop.remove_signal_handler(signal.SIGUSR1)
+            except (NotImplementedError, RuntimeError):
+                pass
+        self._loop = None
+        self.pending = 0
+        if self.active:
+            await self._finish()
+
+    def notify(self, topic: str, payload: bytes) -> None:
+        """MQTT message handler. Safe to call from paho's network thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self.request_payload, payload.decode("utf-8", errors="replace"))
+
+    def request_payload(self, payload: str) -> bool:
+        """Parse an MQTT payload ("" or cycle count) and request a session."""
+        text = payload.strip()
+        try:
+            cycles = int(text) if text else DEFAULT_CYCLES
+        except ValueError:
+            logger.warning("⚠️ Profile: invalid cycle count %r", text)
+            return False
+        return self.request(cycles)
+
+    def request(self, cycles: int = DEFAULT_CYCLES) -> bool:
+        """Profile the next ``cycles`` poll cycles; False while a session is running."""
+        if self.active or self.pending:
+            logger.info("📈 Profile already running, request ignored")
+            return False
+        self.pending = max(1, min(MAX_CYCLES, cycles))
+        logger.info("📈 Profiling the next %d cycles", self.pending)
+        return True
+
+    def begin_cycle(self) -> None:
+        """Called before main_once; starts a session or resumes the running one."""
+        if self._profile is None or self._sampler is None:
+            if not self.pending:
+                return
+            self._profile = cProfile.Profile()
+            self._remaining, self.pending = self.pending, 0
+            self._cycles = 0
+            self._started = time.monotonic()
+            self._sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+            self._sampler.start()
+
+        try:
+            self._profile.enable()
+        except ValueError as e:  # anderer Profiler (sys.setprofile) aktiv
+            logger.warning("⚠️ Profile aborted: %s", e)
+            self._sampler.stop()
+            self._profile = self._sampler = None
+            return
+        self._sampler.recording = True
+
+    async def end_cycle(self) -> None:
+        """Called after main_once (also on errors); writes the profile when the session is over."""
+        if self._profile is None or self._sampler is None:
+            return
+        self._profile.disable()
+        self._sampler.recording = False
+        self._cycles += 1
+        self._remaining -= 1
+        if self._remaining <= 0 or time.monotonic() - self._started >= self.max_duration:
+            await self._finish()
+
+    async def _finish(self) -> None:
+        profile, sampler = self._profile, self._sampler
+        self._profile = self._sampler = None
+        if profile is None or sampler is None:
+            return
+        profile.disable()
+        sampler.stop()
+        duration = time.monotonic() - self._started
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        base = self.directory / f"profile-{stamp}-{int(now * 1000) % 1000:03d}"
+        try:
+            summary = await asyncio.to_thread(self._write, profile, sampler.counts, base)
+        except OSError as e:
+            logger.error("❌ Profile could not be written to %s: %s", self.directory, e)
+            return
+        self._sessions += 1
+        self._last_profile = base.with_suffix(".pstats")
+        logger.info(
+            "📈 Profile of %d cycles (%.1fs, %d stack samples): %s",
+            self._cycles,
+            duration,
+            sum(sampler.counts.values()),
+            self._last_profile,
+        )
+        for line in summary:
+            logger.info("   %s", line)
+
+    def _write(self, profile: cProfile.Profile, counts: Counter[str], base: Path) -> list[str]:
+        """Write both files and return the summary (runs in a worker thread, pstats sorting included)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(base.with_suffix(".pstats"))
+        with open(base.with_suffix(".collapsed"), "w", encoding="utf-8") as f:
+            for stack, count in counts.most_common():
+                f.write(f"{stack} {count}\n")
+        self._prune()
+        return summarize(profile, TOP_N)
+
+    def _prune(self) -> None:
+        profiles = sorted(self.directory.glob("profile-*.pstats"))
+        for old in profiles[: max(0, len(profiles) - self.keep)]:
+            for path in (old, old.with_suffix(".collapsed")):
+                path.unlink(missing_ok=True)
+
+    def get_stats(self) -> ProfilerStats:
+        return {
+            "sessions": self._sessions,
+            "active": self.active,
+            "last_profile": str(self._last_profile) if self._last_profile else None,
+        }
+
+
+def summarize(profile: cProfile.Profile, limit: int = TOP_N) -> list[str]:
+    """Top ``limit`` functions by own time as ``tottime  cumtime  calls  file:line(function)`` lines."""
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)  # type: ignore[attr-defined]
+    lines = []
+    for (filename, line, function), (_cc, calls, tottime, cumtime, _callers) in entries[:limit]:
+        location = f"{os.path.basename(filename)}:{line}({function})" if line else function
+        lines.append(f"{tottime:8.3f}s {cumtime:8.3f}s {calls:>7}×  {location}")
+    return lines
@@ -0,0 +1,83 @@
+# huawei_solar_modbus_mqtt/bridge/publish_policy.py
+
+"""
+Publish-Policy für MQTT Topics.
+
+Entscheidet pro Topic-Klasse, mit welcher QoS/Retain-Kombination publiziert
+wird und ob ein Publish überhaupt nötig ist.
+
+Topic-Klassen:
+    - data:      Sensor-JSON (konfigurierbar, Standard QoS 1 + retained)
+    - status:    online/offline (immer QoS 1 + retained, da HA-Availability
+                 und LWT den retained Zustand voraussetzen)
+    - discovery: HA Discovery Configs (immer QoS 1 + retained)
+
+Status-Deduplizierung:
+    Status wird nur bei Zustandswechsel publiziert (online ↔ offline),
+    optional zusätzlich als Keepalive alle N Sekunden.
+
+Retained Snapshot:
+    Mit nicht-retained Daten (z.B. QoS 0 bei hoher Poll-Rate) kann alle
+    N Sekunden ein retained QoS-1 Snapshot gesendet werden, damit HA nach
+    einem Neustart sofort Werte hat - ohne bei jedem Cycle den Retained
+    Store des Brokers zu beschreiben.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class TopicPolicy:
+    """QoS/Retain-Kombination für eine Topic-Klasse."""
+
+    qos: int = 1
+    retain: bool = True
+
+
+@dataclass
+class PublishPolicy:
+    """Per-topic-class publish decisions with status deduplication."""
+
+    data: TopicPolicy = field(default_factory=TopicPolicy)
+    status: TopicPolicy = field(default_factory=TopicPolicy)
+    discovery: TopicPolicy = field(default_factory=TopicPolicy)
+    status_keepalive: float = 0.0
+    retained_snapshot_interval: float = 0.0
+
+    _last_status: str | None = field(default=None, init=False, repr=False)
+    _last_status_time: float = field(default=0.0, init=False, repr=False)
+    _last_snapshot_time: float | None = field(default=None, init=False, repr=False)
+
+    def status_due(self, status: str) -> bool:
+        """Return True if ``status`` is a transition or the keepalive expired."""
+        if status != self._last_status:
+            return True
+        if self.status_keepalive > 0:
+            return time.monotonic() - self._last_status_time >= self.status_keepalive
+        return False
+
+    def mark_status(self, status: str) -> None:
+        """Record a successfully published status."""
+        self._last_status = status
+        self._last_status_time = time.monotonic()
+
+    def reset_status(self) -> None:
+        """Forget the last status (after (re)connect the broker state is unknown)."""
+        self._last_status = None
+        self._last_status_time = 0.0
+
+    def data_flags(self) -> TopicPolicy:
+        """Return the QoS/retain flags for the next data publish.
+
+        If data is not retained and a snapshot interval is configured, every
+        N seconds a retained QoS 1 publish is returned instead.
+        """
+        if self.data.retain or self.retained_snapshot_interval <= 0:
+            return self.data
+
+        now = time.monotonic()
+        if self._last_snapshot_time is None or now - self._last_snapshot_time >= self.retained_snapshot_interval:
+            self._last_snapshot_time = now
+            return TopicPolicy(qos=max(self.data.qos, 1), retain=True)
+        return self.data
@@ -0,0 +1,178 @@
+# huawei_solar_modbus_mqtt/bridge/refresh.py
+
+"""
+On-Demand Refresh über das Command-Topic ``<topic>/refresh``.
+
+Automationen brauchen manchmal sofort einen frischen Wert (z.B. direkt nach
+dem Ändern einer Batterie-Einstellung) statt bis zu ``poll_interval`` zu
+warten. Eine Nachricht auf ``<topic>/refresh`` löst einen Read außerhalb
+des Cycles aus:
+
+    Payload leer / "all" → alle Essential Registers
+    Payload "<gruppe>"   → nur diese Register-Gruppe (REGISTER_GROUPS)
+    mehrere Gruppen      → per Komma getrennt ("power,battery")
+
+Ablauf:
+    paho-Thread: notify() (thread-safe) → request() im Event Loop
+    asyncio:     Refresh-Task wacht auf → Rate-Limit abwarten
+                 → alle bis dahin angefragten Gruppen in EINEM Read
+
+Coalescing:
+    Anfragen, die eintreffen während ein Refresh wartet oder läuft, werden
+    gesammelt und gemeinsam im nächsten Refresh gelesen. Den Abgleich mit
+    einem gerade laufenden Poll-Cycle macht der Callback in main.py: er
+    wartet auf den Cycle und liest nur, wenn danach kein neuerer Read
+    gestartet wurde.
+
+Rate-Limit:
+    Höchstens ein Refresh pro ``min_interval`` Sekunden (Standard 5s) -
+    der Dongle bleibt für den regulären Poll frei, egal wie oft eine
+    Automation feuert. Der reguläre Zeitplan wird nicht verschoben.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import TypedDict
+
+from .config.registers import ESSENTIAL_REGISTERS, REGISTER_GROUPS
+from .mqtt_client import subscribe_command, unsubscribe_command
+
+logger = logging.getLogger("huawei.refresh")
+
+MIN_REFRESH_INTERVAL = 5.0
+ALL_GROUPS = "all"
+
+# (Register-Namen, Zeitpunkt der ältesten Anfrage) → Read + Publish
+RefreshCallback = Callable[[list[str], float], Awaitable[None]]
+
+
+class RefreshStats(TypedDict):
+    requests: int
+    rejected: int
+    coalesced: int
+    refreshes: int
+    failed: int
+
+
+class RefreshController:
+    """Coalesces and rate-limits refresh requests from the command topic."""
+
+    def __init__(
+        self,
+        refresh: RefreshCallback,
+        min_interval: float = MIN_REFRESH_INTERVAL,
+        groups: Mapping[str, list[str]] = REGISTER_GROUPS,
+    ):
+        """
+        Args:
+            refresh: Coroutine reading and publishing the given registers.
+            min_interval: Minimum seconds between two refreshes.
+            groups: Register groups selectable via the payload.
+        """
+        self.refresh = refresh
+        self.min_interval = min_interval
+        self.groups = groups
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._topic: str | None = None
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._pending: set[str] = set()
+        self._requested_at: float | None = None
+        self._last_refresh = float("-inf")
+
+        self._requests = 0
+        self._rejected = 0
+        self._coalesced = 0
+        self._refreshes = 0
+        self._failed = 0
+
+    def start(self, topic: str) -> None:
+        """Subscribe ``topic`` and start the refresh task (from the running event loop)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._topic = topic
+        subscribe_command(topic, self.notify)
+        self._task = asyncio.create_task(self._run(), name="refresh")
+        logger.debug("Refresh command topic: %s", topic)
+
+    async def stop(self) -> None:
+        """Unsubscribe and stop the refresh task."""
+        if self._topic is not None:
+            unsubscribe_command(self._topic)
+            self._topic = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def notify(self, topic: str, payload: bytes) -> None:
+        """MQTT message handler. Safe to call from paho's network thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self.request, payload.decode("utf-8", errors="replace"))
+
+    def request(self, payload: str = "") -> bool:
+        """Queue a refresh of the groups named in ``payload``; False if a group is unknown."""
+        groups = {part.strip().lower() for part in payload.split(",")} - {""} or {ALL_GROUPS}
+        unknown = sorted(groups - self.groups.keys() - {ALL_GROUPS})
+        if unknown:
+            self._rejected += 1
+            logger.warning("⚠️ Refresh: unknown register group %s (known: %s)", unknown, sorted(self.groups))
+            return False
+
+        self._requests += 1
+        if self._requested_at is None:
+            self._requested_at = time.time()
+        else:
+            self._coalesced += 1
+        self._pending |= groups
+        self._wake.set()
+        return True
+
+    def registers(self, groups: set[str]) -> list[str]:
+        """Register names of ``groups`` in ESSENTIAL_REGISTERS order."""
+        if ALL_GROUPS in groups:
+            return list(ESSENTIAL_REGISTERS)
+        wanted = {name for group in groups for name in self.groups[group]}
+        return [name for name in ESSENTIAL_REGISTERS if name in wanted]
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            delay = self._last_refresh + self.min_interval - time.monotonic()
+            if delay > 0:
+                logger.debug("Refresh rate-limited, waiting %.1fs", delay)
+                await asyncio.sleep(delay)
+
+            self._wake.clear()
+            groups, requested_at = self._pending, self._requested_at or time.time()
+            self._pending, self._requested_at = set(), None
+            self._last_refresh = time.monotonic()
+
+            logger.info("🔄 Refresh requested: %s", ", ".join(sorted(groups)))
+            try:
+                await self.refresh(self.registers(groups), requested_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                logger.warning("⚠️ Refresh failed: %s", e)
+            else:
+                self._refreshes += 1
+
+    def get_stats(self) -> RefreshStats:
+        return {
+            "requests": self._requests,
+            "rejected": self._rejected,
+            "coalesced": self._coalesced,
+            "refreshes": self._refreshes,
+            "failed": self._failed,
+        }
@@ -0,0 +1,124 @@
+# huawei_solar_modbus_mqtt/bridge/register_image.py
+
+"""
+In-Memory Abbild der zuletzt gelesenen Holding Register.
+
+Jede Modbus-Antwort (ein Batch = ein zusammenhängender Adressbereich) wird als
+Block aus rohen 16-Bit Wörtern abgelegt. Ein neuer Block ersetzt alle älteren
+Blöcke, mit denen er sich überschneidet - das Abbild enthält also pro Adresse
+genau einen, den jüngsten Wert.
+
+Lesezugriffe über mehrere aneinandergrenzende Blöcke werden zusammengesetzt,
+solange jeder beteiligte Block frisch genug ist (``max_age``). Fehlt auch nur
+ein Register oder ist ein Block zu alt, liefert ``read()`` None und der
+Aufrufer muss beim Inverter nachfragen.
+
+Zeitstempel sind ``time.monotonic()`` Werte.
+"""
+
+import bisect
+import sys
+import time
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+
+_NEEDS_BYTESWAP = sys.byteorder == "little"
+
+
+@dataclass(slots=True)
+class RegisterBlock:
+    """Contiguous range of raw register words from one Modbus response."""
+
+    start: int
+    words: array
+    timestamp: float
+
+    @property
+    def end(self) -> int:
+        """First address after the block."""
+        return self.start + len(self.words)
+
+
+def to_words(data: bytes | Sequence[int]) -> array:
+    """Convert a raw big-endian response or a list of register values to ``array('H')``."""
+    if isinstance(data, bytes | bytearray | memoryview):
+        words = array("H")
+        words.frombytes(bytes(data))
+        if _NEEDS_BYTESWAP:
+            words.byteswap()
+        return words
+    return array("H", data)
+
+
+class RegisterImage:
+    """Latest raw value of every holding register read by the bridge."""
+
+    def __init__(self) -> None:
+        self._blocks: dict[int, RegisterBlock] = {}
+        self._starts: list[int] = []
+
+    def __len__(self) -> int:
+        """Number of cached registers."""
+        return sum(len(block.words) for block in self._blocks.values())
+
+    def blocks(self) -> Iterator[RegisterBlock]:
+        """Cached blocks in address order."""
+        return (self._blocks[start] for start in self._starts)
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._starts.clear()
+
+    def record(self, start: int, data: bytes | Sequence[int], timestamp: float | None = None) -> None:
+        """Store a response, replacing every older block it overlaps.
+
+        Args:
+            start: Address of the first register.
+            data: Raw big-endian response bytes or register values.
+            timestamp: ``time.monotonic()`` of the read (default: now).
+        """
+        words = to_words(data)
+        if not words:
+            return
+        block = RegisterBlock(start, words, time.monotonic() if timestamp is None else timestamp)
+
+        index = bisect.bisect_left(self._starts, start)
+        # Vorgänger, der in den neuen Block hineinragt
+        if index > 0 and self._blocks[self._starts[index - 1]].end > start:
+            index -= 1
+        while index < len(self._starts) and self._starts[index] < block.end:
+            del self._blocks[self._starts.pop(index)]
+
+        self._starts.insert(index, start)
+        self._blocks[start] = block
+
+    def read(
+        self, start: int, quantity: int, max_age: float | None = None, now: float | None = None
+    ) -> list[int] | None:
+        """Return ``quantity`` registers from ``start`` if fully cached and fresh, else None."""
+        if quantity <= 0:
+            return []
+        if now is None:
+            now = time.monotonic()
+
+        index = bisect.bisect_right(self._starts, start) - 1
+        if index < 0:
+            return None
+
+        result: list[int] = []
+        address = start
+        end = start + quantity
+        while address < end:
+            if index >= len(self._starts):
+                return None
+            block = self._blocks[self._starts[index]]
+            if not (block.start <= address < block.end):
+                return None
+            if max_age is not None and now - block.timestamp > max_age:
+                return None
+            stop = min(end, block.end)
+            result.extend(block.words[address - block.start : stop - block.start])
+            address = stop
+            index += 1
+        return result
@@ -0,0 +1,213 @@
+# huawei_solar_modbus_mqtt/bridge/resources.py
+
+"""
+Ressourcen-Telemetrie des Bridge-Prozesses.
+
+Auf einem Pi mit 1 GB und vielen Add-ons soll der Footprint der Bridge über
+Wochen sichtbar sein. sample() liest aus /proc/self bzw. ``resource``:
+
+    rss         Resident Set Size (Bytes)
+    cpu_user    CPU-Zeit User / System seit Prozessstart (s)
+    cpu_system
+    threads     Threads des Prozesses (paho, Executor, Profiler, ...)
+    fds         offene File-Deskriptoren (None ohne /proc)
+    gc_collections / gc_uncollectable  Summen über alle GC-Generationen
+
+Ein Sample kostet ein paar Syscalls und wird nur alle SAMPLE_INTERVAL
+Sekunden nach einem Cycle genommen - dauerhaft eingeschaltet, ohne Option.
+Zusätzlich misst run_main_cycle die CPU-Zeit jedes Cycles (os.times()).
+
+Leck-Erkennung:
+    Alle LEAK_INTERVAL Sekunden wandert ein Sample in ein Fenster der Länge
+    LEAK_WINDOW (Standard: 12 × 5 min = 1 h). Steigt ein Wert über das ganze
+    Fenster monoton (nie fallend) und insgesamt um mehr als LEAK_THRESHOLDS,
+    gibt es eine WARNING und ``huabus_resource_leak_suspected{resource}`` = 1
+    (rss, threads, fds).
+    Normales Verhalten (GC gibt Speicher frei, Threads kommen und gehen)
+    unterbricht die Monotonie und löst nichts aus.
+
+Ausgabe: Metriken (Collector in metrics.py beim Scrape), Diagnose-Sensoren
+(diagnostics.py) und eine DEBUG-Zeile in der 20-Cycle-Zusammenfassung.
+"""
+
+import gc
+import logging
+import os
+import resource
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from typing import Any, TypedDict, cast
+
+logger = logging.getLogger("huawei.resources")
+
+SAMPLE_INTERVAL = 60.0
+LEAK_INTERVAL = 300.0
+LEAK_WINDOW = 12
+LEAK_THRESHOLDS: dict[str, float] = {"rss": 16 * 2**20, "threads": 4, "fds": 16}
+
+
+class ResourceSample(TypedDict):
+    rss: int | None
+    cpu_user: float
+    cpu_system: float
+    threads: int
+    fds: int | None
+    gc_collections: int
+    gc_uncollectable: int
+
+
+def rss_bytes() -> int | None:
+    """Current resident set size (Linux /proc), else the peak from getrusage."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Linux: KiB
+    except (OSError, ValueError):
+        return None
+
+
+def _count_dir(path: str) -> int | None:
+    try:
+        return len(os.listdir(path))
+    except OSError:
+        return None
+
+
+def cpu_seconds() -> float:
+    """User + system CPU time of the process so far."""
+    times = os.times()
+    return times.user + times.system
+
+
+def sample() -> ResourceSample:
+    """Read the current resource usage of the process."""
+    times = os.times()
+    gc_stats = gc.get_stats()
+    return {
+        "rss": rss_bytes(),
+        "cpu_user": times.user,
+        "cpu_system": times.system,
+        "threads": _count_dir("/proc/self/task") or threading.active_count(),
+        "fds": _count_dir("/proc/self/fd"),
+        "gc_collections": sum(generation["collections"] for generation in gc_stats),
+        "gc_uncollectable": sum(generation["uncollectable"] for generation in gc_stats),
+    }
+
+
+def monotonic_growth(values: list[float], threshold: float) -> bool:
+    """True if ``values`` never decrease and grow by more than ``threshold`` in total."""
+    if len(values) < 2:
+        return False
+    if any(later < earlier for earlier, later in zip(values, values[1:], strict=False)):
+        return False
+    return values[-1] - values[0] > threshold
+
+
+class ResourceMonitor:
+    """Periodic resource samples, per-cycle CPU time and leak detection."""
+
+    def __init__(
+        self,
+        interval: float = SAMPLE_INTERVAL,
+        leak_interval: float = LEAK_INTERVAL,
+        leak_window: int = LEAK_WINDOW,
+    ):
+        """
+        Args:
+            interval: Seconds between two samples.
+            leak_interval: Seconds between two samples of the leak window.
+            leak_window: Samples in the leak window.
+        """
+        self.interval = interval
+        self.leak_interval = leak_interval
+        self.last: ResourceSample | None = None
+        self._last_sample = float("-inf")
+        self._last_leak_sample = float("-inf")
+        self._window: deque[ResourceSample] = deque(maxlen=leak_window)
+        self._suspected: set[str] = set()
+        self._cycle_cpu_start: float | None = None
+
+    def cycle_started(self) -> None:
+        self._cycle_cpu_start = cpu_seconds()
+
+    def cycle_finished(self) -> float | None:
+        """Return the CPU time used since cycle_started()."""
+        if self._cycle_cpu_start is None:
+            return None
+        used = cpu_seconds() - self._cycle_cpu_start
+        self._cycle_cpu_start = None
+        return used
+
+    def maybe_sample(self, now: float | None = None) -> ResourceSample | None:
+        """Take a sample if SAMPLE_INTERVAL has passed; feeds the leak window."""
+        now = time.monotonic() if now is None else now
+        if now - self._last_sample < self.interval:
+            return None
+        self._last_sample = now
+        current = self.last = sample()
+        if now - self._last_leak_sample >= self.leak_interval:
+            self._last_leak_sample = now
+            self._window.append(current)
+            self._check_leaks()
+        return current
+
+    def _check_leaks(self) -> None:
+        if len(self._window) < (self._window.maxlen or 0):
+            return
+        for key, threshold in LEAK_THRESHOLDS.items():
+            values = [float(v) for s in self._window if (v := cast(Mapping[str, Any], s)[key]) is not None]
+            suspected = len(values) == len(self._window) and monotonic_growth(values, threshold)
+            if suspected and key not in self._suspected:
+                logger.warning(
+                    "📈 Possible %s leak: grew from %s to %s without ever dropping over the last %.0f min",
+                    key,
+                    _format(key, values[0]),
+                    _format(key, values[-1]),
+                    self.leak_interval * (len(values) - 1) / 60,
+                )
+            elif not suspected and key in self._suspected:
+                logger.info("✅ %s no longer growing monotonically", key)
+            if suspected:
+                self._suspected.add(key)
+            else:
+                self._suspected.discard(key)
+
+    @property
+    def suspected(self) -> set[str]:
+        return set(self._suspected)
+
+
+def _format(key: str, value: float) -> str:
+    return f"{value / 2**20:.1f} MiB" if key == "rss" else str(int(value))
+
+
+def format_sample(current: ResourceSample) -> str:
+    """One-line summary for the log."""
+    rss = f"{current['rss'] / 2**20:.1f} MiB" if current["rss"] is not None else "n/a"
+    fds = current["fds"] if current["fds"] is not None else "n/a"
+    return (
+        f"RSS {rss}, CPU {current['cpu_user']:.1f}s user / {current['cpu_system']:.1f}s system, "
+        f"{current['threads']} threads, {fds} fds, GC {current['gc_collections']} collections"
+    )
+
+
+_monitor_instance: ResourceMonitor | None = None
+
+
+def get_resource_monitor() -> ResourceMonitor:
+    """Gibt Singleton-Instanz zurück."""
+    global _monitor_instance
+    if _monitor_instance is None:
+        _monitor_instance = ResourceMonitor()
+    return _monitor_instance
+
+
+def reset_resource_monitor() -> None:
+    """Verwirft Samples und Leck-Fenster (nur für Tests)."""
+    global _monitor_instance
+    _monitor_instance = None
@@ -0,0 +1,131 @@
+# huawei_solar_modbus_mqtt/bridge/sentinels.py
+
+"""
+Typ-bewusste Erkennung von Modbus "keine Daten"-Werten.
+
+Huawei meldet fehlende Messwerte mit dem Maximum (bzw. Minimum) des
+jeweiligen Registertyps. Bisher prüfte transform.get_value() für jedes
+numerische Register dieselben drei Literale 65535, 32767, -32768 - nach der
+Skalierung. Das übersah 32-bit Platzhalter (0xFFFFFFFF, 0x7FFFFFFF) und
+verwarf legitime Werte, die skaliert zufällig 32767 ergeben (z.B. 327.67 kWh
+x 100).
+
+Stattdessen wird beim Start einmal pro Register aus den huawei_solar
+Definitionen eine Tabelle kompiliert:
+
+    raw:     Platzhalter als Rohwert des Typs (U16: 0xFFFF, I32: 0x7FFFFFFF, ...)
+             → Fast Path prüft direkt nach unpack_from, vor dem Gain
+    decoded: dieselben Werte nach Gain (und abs()) für den Library-Pfad,
+             der nur noch den dekodierten Wert sieht
+
+Register mit ``ignore_invalid`` (invalid_value=None) und Strings haben
+keine Platzhalter. Register ohne Eintrag (nicht in der Library) fallen in
+transform.get_register_value() auf die bisherigen Literale von get_value()
+zurück.
+
+Jede Verwerfung wird pro Register gezählt (auch None aus der Library, die
+den eigenen invalid_value bereits ersetzt). get_stats() zeigt damit, welche
+Register auf dieser Anlage tatsächlich leer sind (z.B. PV-String 3/4,
+fehlender Meter).
+"""
+
+import logging
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any, cast
+
+from huawei_solar.register_definitions.number import I32AbsoluteValueRegister, NumberRegister
+
+from .config.mappings import REGISTER_MAPPING
+
+if TYPE_CHECKING:
+    from huawei_solar.register_definitions.base import RegisterDefinition
+
+logger = logging.getLogger("huawei.sentinels")
+
+# Platzhalter je struct-Format: Maximum bzw. Minimum des Typs
+RAW_SENTINELS: dict[str, frozenset[int]] = {
+    "H": frozenset({0xFFFF}),
+    "h": frozenset({0x7FFF, -0x8000}),
+    "I": frozenset({0xFFFFFFFF}),
+    "i": frozenset({0x7FFFFFFF, -0x80000000}),
+    "Q": frozenset({0xFFFFFFFFFFFFFFFF}),
+    "q": frozenset({0x7FFFFFFFFFFFFFFF, -0x8000000000000000}),
+}
+
+_NO_SENTINELS: frozenset = frozenset()
+
+
+def _is_plain_number(definition: "RegisterDefinition") -> bool:
+    return not callable(definition.unit) and not isinstance(definition.unit, dict)
+
+
+class SentinelTable:
+    """Per-register sentinel sets with rejection counters."""
+
+    def __init__(
+        self,
+        registers: "Mapping[str, RegisterDefinition] | None" = None,
+        names: Iterable[str] | None = None,
+    ):
+        if registers is None:
+            from huawei_solar.registers import REGISTERS
+
+            registers = cast(dict, REGISTERS)
+        self.raw: dict[str, frozenset[int]] = {}
+        self.decoded: dict[str, frozenset[float]] = {}
+        self._rejected: dict[str, int] = {}
+
+        for name in REGISTER_MAPPING if names is None else names:
+            definition = registers.get(name)
+            if not isinstance(definition, NumberRegister) or definition.invalid_value is None:
+                continue
+            raw = RAW_SENTINELS.get(definition.format, _NO_SENTINELS)
+            self.raw[name] = raw
+            if _is_plain_number(definition):
+                gain = definition.gain
+                scaled = {value / gain if gain != 1 else value for value in raw}
+                if isinstance(definition, I32AbsoluteValueRegister):
+                    scaled = {abs(value) for value in scaled}
+                self.decoded[name] = frozenset(scaled)
+
+        logger.debug("🚫 Sentinel table: %d registers", len(self.raw))
+
+    def raw_sentinels(self, name: str) -> frozenset[int]:
+        """Raw sentinel values of a register (empty if it has none)."""
+        return self.raw.get(name, _NO_SENTINELS)
+
+    def reject(self, name: str) -> None:
+        """Count one rejected value."""
+        self._rejected[name] = self._rejected.get(name, 0) + 1
+
+    def is_sentinel(self, name: str, value: Any) -> bool:
+        """Decoded value is the register's "no data" placeholder (counted)."""
+        if isinstance(value, int | float) and value in self.decoded.get(name, _NO_SENTINELS):
+            self.reject(name)
+            return True
+        return False
+
+    def get_stats(self) -> dict[str, int]:
+        """Rejected values per register name since start (or reset_stats)."""
+        return self._rejected.copy()
+
+    def reset_stats(self) -> None:
+        self._rejected.clear()
+
+
+# Singleton-Instanz
+_table_instance: SentinelTable | None = None
+
+
+def get_sentinel_table() -> SentinelTable:
+    """Gibt Singleton-Instanz zurück (beim ersten Aufruf kompiliert)."""
+    global _table_instance
+    if _table_instance is None:
+        _table_instance = SentinelTable()
+    return _table_instance
+
+
+def reset_sentinel_table() -> None:
+    """Setzt die Zähler zurück und behält die kompilierte Tabelle."""
+    if _table_instance is not None:
+        _table_instance.reset_stats()
@@ -0,0 +1,138 @@
+# huawei_solar_modbus_mqtt/bridge/shm_reader.py
+
+"""
+Reader für den Shared-Memory Snapshot (siehe shm_snapshot.py).
+
+Bewusst nur Standardbibliothek und ohne Imports aus ``bridge`` - die Datei
+kann 1:1 in eigene Analytics-Prozesse kopiert werden.
+
+Dateiformat (Version 1, little endian):
+    Offset  Typ      Feld
+    0       4s       magic b"HBSM"
+    4       u16      version
+    6       u16      values_offset (64)
+    8       u32      count (Anzahl Werte)
+    12      u32      layout_id (CRC32 der Key-Liste)
+    16      u32      keys_offset
+    20      u32      keys_size
+    24      u64      seq (Seqlock: ungerade = Schreibvorgang läuft)
+    32      f64      timestamp (Unix-Zeit des Cycles)
+    40      u64      cycle (Cycle-Nummer der Bridge, wie HTTP API und Diagnose)
+    64      f64[n]   Werte in Key-Reihenfolge (NaN = nicht verfügbar)
+    ...     utf-8    Keys, durch "\\n" getrennt
+
+Konsistentes Lesen (Seqlock):
+    seq lesen → ungerade? erneut versuchen → Werte kopieren → seq erneut
+    lesen → unverändert? Werte gültig, sonst erneut versuchen.
+    Der Writer blockiert nie, Reader brauchen keinen Lock.
+
+Beispiel:
+    with SnapshotReader("/dev/shm/huabus.snapshot") as reader:
+        snap = reader.read()
+        print(snap.cycle, snap.values["power_active"])
+
+NumPy (zero-copy, Konsistenz über ``reader.sequence`` selbst prüfen):
+    np.frombuffer(reader.buffer, "<f8", reader.count, reader.values_offset)
+"""
+
+import math
+import mmap
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+SHM_MAGIC = b"HBSM"
+SHM_VERSION = 1
+VALUES_OFFSET = 64
+
+# magic, version, values_offset, count, layout_id, keys_offset, keys_size, seq, timestamp, cycle
+HEADER = struct.Struct("<4sHHIIIIQdQ")
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 24
+META = struct.Struct("<dQ")  # timestamp, cycle
+META_OFFSET = 32
+
+
+def layout_id(keys: list[str]) -> int:
+    """CRC32 over the ordered key list."""
+    return zlib.crc32("\n".join(keys).encode())
+
+
+@dataclass(frozen=True)
+class ShmSnapshot:
+    seq: int
+    timestamp: float
+    cycle: int
+    values: dict[str, float]
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+
+class SnapshotReader:
+    """Lock-free reader of the shared-memory snapshot file."""
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self._mmap)
+
+        magic, version, values_offset, count, layout, keys_offset, keys_size, _, _, _ = HEADER.unpack_from(self.buffer)
+        if magic != SHM_MAGIC:
+            self.close()
+            raise ValueError(f"Invalid magic {magic!r}")
+        if version != SHM_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version}")
+
+        self.count = count
+        self.values_offset = values_offset
+        self.layout_id = layout
+        self.keys = bytes(self.buffer[keys_offset : keys_offset + keys_size]).decode().split("\n") if count else []
+        self._values = struct.Struct(f"<{count}d")
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        self.close()
+
+    @property
+    def sequence(self) -> int:
+        """Current seqlock counter (odd while the bridge is writing, 0 = nothing written yet)."""
+        return int(SEQ.unpack_from(self.buffer, SEQ_OFFSET)[0])
+
+    def read(self, retries: int = 1000) -> ShmSnapshot:
+        """Consistent copy of the latest snapshot.
+
+        Raises:
+            LookupError: Nothing written yet.
+            TimeoutError: No consistent copy after ``retries`` attempts.
+        """
+        for _ in range(retries):
+            before = self.sequence
+            if before & 1:
+                time.sleep(0)
+                continue
+            values = self._values.unpack_from(self.buffer, self.values_offset)
+            timestamp, cycle = META.unpack_from(self.buffer, META_OFFSET)
+            if self.sequence == before:
+                if before == 0:
+                    raise LookupError("No snapshot written yet")
+                return ShmSnapshot(
+                    seq=before,
+                    timestamp=timestamp,
+                    cycle=cycle,
+                    values={key: value for key, value in zip(self.keys, values, strict=True) if not math.isnan(value)},
+                )
+        raise TimeoutError("Snapshot kept changing while reading")
+
+    def close(self) -> None:
+        self.buffer.release()
+        self._mmap.close()
@@ -0,0 +1,113 @@
+# huawei_solar_modbus_mqtt/bridge/shm_snapshot.py
+
+"""
+Shared-Memory Snapshot für Prozesse auf demselben Host.
+
+Schreibt die numerischen Werte jedes Cycles in eine memory-mapped Datei
+(z.B. ``/dev/shm/huabus.snapshot``). Lokale Reader mappen dieselbe Datei und
+lesen ohne Syscall, ohne Parsing und ohne Lock.
+
+Layout:
+    Feste Slots, abgeleitet aus REGISTER_MAPPING (MQTT-Keys in Mapping-
+    Reihenfolge, ohne Text-Sensoren), je ein float64. Fehlende Werte = NaN.
+    Die Key-Liste steht in der Datei selbst; ``layout_id`` (CRC32) ändert sich,
+    sobald sich das Mapping ändert. Byte-Layout und Reader: shm_reader.py.
+
+Seqlock:
+    seq wird vor dem Schreiben ungerade und danach wieder gerade. Reader
+    verwerfen Kopien, bei denen seq ungerade war oder sich geändert hat.
+
+Eingebunden als SharedMemorySink in output_sinks.py (Option
+``output_shared_memory``) - der Write besteht aus ein paar
+``struct.pack_into`` Aufrufen und läuft im Sink-Task.
+"""
+
+import logging
+import math
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from .config.mappings import REGISTER_MAPPING
+from .config.sensors_mqtt import TEXT_SENSORS
+from .shm_reader import HEADER, META, META_OFFSET, SEQ, SEQ_OFFSET, SHM_MAGIC, SHM_VERSION, VALUES_OFFSET, layout_id
+
+logger = logging.getLogger("huawei.shm")
+
+_NAN = math.nan
+
+
+def default_layout() -> list[str]:
+    """Numeric MQTT keys in REGISTER_MAPPING order."""
+    text_keys = {sensor["key"] for sensor in TEXT_SENSORS}
+    return [key for key in dict.fromkeys(REGISTER_MAPPING.values()) if key not in text_keys]
+
+
+class SharedMemorySnapshot:
+    """Writer side: fixed-layout float64 slots guarded by a seqlock."""
+
+    def __init__(self, path: str | Path, keys: list[str] | None = None):
+        self.path = Path(path)
+        self.keys = default_layout() if keys is None else list(keys)
+        self.layout_id = layout_id(self.keys)
+        self._slots = {key: index for index, key in enumerate(self.keys)}
+        self._empty = [_NAN] * len(self.keys)
+        self._values = list(self._empty)
+        self._pack_values = struct.Struct(f"<{len(self.keys)}d").pack_into
+        self._seq = 0
+
+        keys_blob = "\n".join(self.keys).encode()
+        keys_offset = VALUES_OFFSET + 8 * len(self.keys)
+        size = keys_offset + len(keys_blob)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Neu anlegen statt überschreiben: alte Reader behalten ihr (altes) Mapping
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        HEADER.pack_into(
+            self._mmap,
+            0,
+            SHM_MAGIC,
+            SHM_VERSION,
+            VALUES_OFFSET,
+            len(self.keys),
+            self.layout_id,
+            keys_offset,
+            len(keys_blob),
+            0,
+            0.0,
+            0,
+        )
+        self._mmap[keys_offset:size] = keys_blob
+        self._pack_values(self._mmap, VALUES_OFFSET, *self._values)
+        os.replace(tmp, self.path)
+        logger.info("🧠 Shared-memory snapshot: %s (%d values, layout %08x)", self.path, len(self.keys), self.layout_id)
+
+    def write(self, data: Mapping[str, Any], timestamp: float, cycle: int = 0) -> None:
+        """Publish one snapshot (non-numeric or missing values become NaN)."""
+        values = self._values
+        values[:] = self._empty
+        slots = self._slots
+        for key, value in data.items():
+            index = slots.get(key)
+            if index is not None and isinstance(value, int | float):
+                values[index] = float(value)
+
+        buf = self._mmap
+        self._seq += 1
+        SEQ.pack_into(buf, SEQ_OFFSET, self._seq)  # ungerade: Schreibvorgang läuft
+        self._pack_values(buf, VALUES_OFFSET, *values)
+        META.pack_into(buf, META_OFFSET, timestamp, cycle)
+        self._seq += 1
+        SEQ.pack_into(buf, SEQ_OFFSET, self._seq)
+
+    def close(self) -> None:
+        self._mmap.close()
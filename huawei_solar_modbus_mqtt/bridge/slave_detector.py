@@ -44,7 +44,7 @@ async def detect_slave_id(host: str, port: int = 502, timeout: int = DETECTION_T
         >>> if slave_id:
         ...     print(f"Found Slave ID: {slave_id}")
     """
-    logger.info(f"🔍 Auto-detecting Slave ID for {host}:{port}...")
+    logger.info("🔍 Auto-detecting Slave ID for %s:%s...", host, port)
 
     for i, slave_id in enumerate(KNOWN_SLAVE_IDS):
         # Wait between attempts (not before the first one) to allow
@@ -52,18 +52,18 @@ async def detect_slave_id(host: str, port: int = 502, timeout: int = DETECTION_T
         # Without this delay, the next attempt sees a half-open socket
         # and the huawei_solar library cancels the request immediately.
         if i > 0:
-            logger.debug(f"Waiting {INTER_ATTEMPT_DELAY}s before next attempt...")
+            logger.debug("Waiting %ss before next attempt...", INTER_ATTEMPT_DELAY)
             await asyncio.sleep(INTER_ATTEMPT_DELAY)
 
-        logger.debug(f"Trying Slave ID {slave_id}...")
+        logger.debug("Trying Slave ID %s...", slave_id)
 
         if await _test_slave_id(host, port, slave_id, timeout):
-            logger.info(f"🕵️‍♀️ Auto-detected Slave ID: {slave_id}")
+            logger.info("🕵️‍♀️ Auto-detected Slave ID: %s", slave_id)
             return slave_id
 
-        logger.debug(f"Slave ID {slave_id} failed")
+        logger.debug("Slave ID %s failed", slave_id)
 
-    logger.error(f"❌ Auto-detection failed! Tried: {KNOWN_SLAVE_IDS}")
+    logger.error("❌ Auto-detection failed! Tried: %s", KNOWN_SLAVE_IDS)
     return None
 
 
@@ -92,19 +92,19 @@ async def _test_slave_id(host: str, port: int, slave_id: int, timeout: int) -> b
 
         # Success if we got a value
         if result and result.value:
-            logger.debug(f"Slave ID {slave_id} works! Model: {result.value}")
+            logger.debug("Slave ID %s works! Model: %s", slave_id, result.value)
             return True
 
     except TimeoutError:
-        logger.debug(f"Slave ID {slave_id} timed out")
+        logger.debug("Slave ID %s timed out", slave_id)
     except asyncio.CancelledError:
         # Re-raise CancelledError - this is a signal to stop the task entirely,
         # not just a failed attempt. If swallowed here, the outer coroutine
         # never learns it was cancelled.
-        logger.debug(f"Slave ID {slave_id} attempt cancelled")
+        logger.debug("Slave ID %s attempt cancelled", slave_id)
         raise
     except Exception as e:
-        logger.debug(f"Slave ID {slave_id} error: {e}")
+        logger.debug("Slave ID %s error: %s", slave_id, e)
     finally:
         # Always cleanup - give stop() its own small timeout so a broken
         # client never blocks the next attempt indefinitely.
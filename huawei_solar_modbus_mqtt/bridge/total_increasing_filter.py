@@ -33,6 +33,7 @@ class TotalIncreasingFilter:
         """Initialisiert den Filter - simpel!"""
         self._last_values: dict[str, float] = {}
         self._filter_stats: dict[str, int] = {}
+        self._filter_totals: dict[str, int] = {}  # seit Start, übersteht reset() (Metriken)
 
     def filter(self, data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -56,7 +57,12 @@ class TotalIncreasingFilter:
                 if last is not None:
                     result[key] = last
                     missing_count += 1
-                    logger.warning(f"⚠️ MISSING: {key} filled with {last:.2f}")
+                    logger.warning(
+                        "⚠️ MISSING: %s filled with %.2f",
+                        key,
+                        last,
+                        extra={"rate_key": f"missing:{key}", "register": key, "last": last},
+                    )
                 continue  # Nächster Key
 
             # 2. Key ist da → Prüfen ob filtern
@@ -70,25 +76,40 @@ class TotalIncreasingFilter:
                 if last is not None:
                     result[key] = last
                     filtered_count += 1
-                    self._filter_stats[key] = self._filter_stats.get(key, 0) + 1
-                    logger.warning(f"⚠️ FILTERED: {key} {value:.2f} → {last:.2f}")
+                    self._count(key)
+                    logger.warning(
+                        "⚠️ FILTERED: %s %.2f → %.2f",
+                        key,
+                        value,
+                        last,
+                        extra={"rate_key": f"filtered:{key}", "register": key, "value": value, "last": last},
+                    )
                 else:
                     # Kein last_value vorhanden (z.B. erster Wert ist negativ)
                     # → Key komplett aus result entfernen!
                     del result[key]
                     # Optional: Als "gefiltert" zählen
                     filtered_count += 1
-                    self._filter_stats[key] = self._filter_stats.get(key, 0) + 1
+                    self._count(key)
             else:
                 # Wert ist OK → Speichern
                 self._last_values[key] = value
 
         # Zusammenfassung
         if filtered_count > 0 or missing_count > 0:
-            logger.info(f"✨ Filter: {filtered_count} filtered, {missing_count} missing")
+            logger.info(
+                "✨ Filter: %s filtered, %s missing",
+                filtered_count,
+                missing_count,
+                extra={"rate_key": "filter", "filtered": filtered_count, "missing": missing_count},
+            )
 
         return result
 
+    def _count(self, key: str) -> None:
+        self._filter_stats[key] = self._filter_stats.get(key, 0) + 1
+        self._filter_totals[key] = self._filter_totals.get(key, 0) + 1
+
     def _should_filter(self, key: str, value: float) -> bool:
         """
         Prüft ob Wert gefiltert werden muss.
@@ -134,6 +155,10 @@ class TotalIncreasingFilter:
         """Gibt Filter-Statistik zurück."""
         return self._filter_stats.copy()
 
+    def get_totals(self) -> dict[str, int]:
+        """Gefilterte Werte pro Key seit Start (wird nie zurückgesetzt)."""
+        return self._filter_totals.copy()
+
     def reset_stats(self):
         """Setzt Statistik zurück (behält last_values)."""
         self._filter_stats.clear()
@@ -0,0 +1,106 @@
+# huawei_solar_modbus_mqtt/bridge/tracing.py
+
+"""
+Ende-zu-Ende-Tracing eines Poll-Cycles: Modbus-Antwort bis Broker-PUBACK.
+
+main_once hat bisher ein halbes Dutzend ``*_start``/``*_duration`` Variablen
+gepflegt. Jetzt trägt jeder Cycle einen CycleTrace mit monotonen Zeitmarken;
+die Phasen-Timings für Log, Metriken und Diagnose werden daraus abgeleitet.
+
+Marken (in dieser Reihenfolge, jede beendet die gleichnamige Stufe):
+    start       Cycle-Beginn
+    modbus      Read fertig
+    transform   Transformation fertig
+    filter      Total-Increasing-Filter fertig
+    output      Output-Sinks und HTTP API versorgt
+    serialize   MQTT-Payload serialisiert          ┐
+    publish     an paho übergeben                  │ nur mit ``tracing: true``
+    ack         PUBACK vom Broker (nur QoS > 0)    ┘
+    done        MQTT inkl. Binary-Payload fertig
+
+Dazu merkt sich der Trace die erste Batch-Antwort (``response_at``, plus
+Wall-Clock ``read_time``) - das ist der älteste Wert im Payload. Ende-zu-Ende
+ist damit ``ack`` (bzw. ``publish`` bei QoS 0) minus ``response_at``: so alt
+ist ein Wert höchstens, wenn HA ihn sieht.
+
+Mit ``tracing: true`` landen Stufen und Ende-zu-Ende im LatencyRecorder
+(Keys ``trace:<stufe>``, ``trace:end_to_end``, Perzentile über
+``GET /api/latency``) und als Histogramm ``huabus_trace_seconds{stage}`` in
+den Metriken. ``tracing_payload: true`` schreibt zusätzlich ``trace_seq``
+(Cycle-Nummer) und ``trace_read_ts`` (Unix-Zeit der ersten Batch-Antwort)
+in den Payload - Consumer können so Alter und Lücken selbst messen.
+
+Ohne ``tracing`` bekommen Read-Pfad und publish_data keinen Trace übergeben
+und prüfen nur ``trace is not None`` - keine zusätzlichen Zeitmessungen.
+"""
+
+import time
+
+from .latency import get_latency_recorder
+from .metrics import get_metrics
+
+
+class CycleTrace:
+    """Monotonic timestamps of one poll cycle."""
+
+    __slots__ = ("seq", "marks", "response_at", "read_time")
+
+    def __init__(self, seq: int) -> None:
+        self.seq = seq
+        self.marks: dict[str, float] = {"start": time.monotonic()}
+        self.response_at: float | None = None
+        self.read_time: float | None = None
+
+    def mark(self, stage: str) -> None:
+        """Record the end of ``stage``."""
+        self.marks[stage] = time.monotonic()
+
+    def response(self) -> None:
+        """Record a Modbus response; only the first one of the cycle is kept."""
+        if self.response_at is None:
+            self.response_at = time.monotonic()
+            self.read_time = time.time()
+
+    def elapsed(self) -> float:
+        """Seconds since the cycle started."""
+        return time.monotonic() - self.marks["start"]
+
+    def stages(self) -> dict[str, float]:
+        """Duration of every recorded stage (time since the previous mark)."""
+        durations: dict[str, float] = {}
+        previous = self.marks["start"]
+        for stage, at in self.marks.items():
+            if stage != "start":
+                durations[stage] = at - previous
+                previous = at
+        return durations
+
+    def end_to_end(self) -> float | None:
+        """First Modbus response to broker acknowledgement (or hand-off for QoS 0)."""
+        delivered = self.marks.get("ack", self.marks.get("publish"))
+        if self.response_at is None or delivered is None:
+            return None
+        return delivered - self.response_at
+
+    def timings(self) -> dict[str, float]:
+        """Phase timings as used by log, metrics and diagnostics (modbus, transform, filter, mqtt, total)."""
+        stages = self.stages()
+        timings: dict[str, float] = {
+            phase: stages[phase] for phase in ("modbus", "transform", "filter") if phase in stages
+        }
+        if "done" in self.marks:
+            timings["mqtt"] = self.marks["done"] - self.marks["output"]
+            timings["total"] = self.marks["done"] - self.marks["start"]
+        return timings
+
+
+def record_trace(trace: CycleTrace) -> None:
+    """Feed a finished trace into the latency recorder and the metrics."""
+    recorder = get_latency_recorder()
+    histogram = get_metrics().trace_seconds
+    for stage, seconds in trace.stages().items():
+        recorder.record(f"trace:{stage}", seconds)
+        histogram.observe(seconds, stage)
+    if (end_to_end := trace.end_to_end()) is not None:
+        recorder.record("trace:end_to_end", end_to_end)
+        histogram.observe(end_to_end, "end_to_end")
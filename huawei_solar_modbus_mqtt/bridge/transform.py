@@ -13,7 +13,7 @@ und führt folgende Schritte aus:
    RegisterValue(value=4500, unit="W") → 4500
 
 3. Ungültige Modbus-Werte filtern
-   65535, 32767, -32768 → None (Modbus "keine Daten verfügbar")
+   Typ-bewusst pro Register (sentinels.py), z.B. I32 0x7FFFFFFF → None
 
 4. Critical Defaults anwenden
    Fehlende Pflicht-Werte mit Defaults befüllen (z.B. battery_power=0)
@@ -30,12 +30,23 @@ werden kann und von Home Assistant verstanden wird.
 
 import logging
 import time
-from typing import Any
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any, cast
+
+from huawei_solar.register_definitions.number import TimestampRegister
+from huawei_solar.registers import REGISTERS
 
 from .config.mappings import CRITICAL_DEFAULTS, REGISTER_MAPPING
+from .sentinels import SentinelTable, get_sentinel_table
+
+if TYPE_CHECKING:
+    from huawei_solar.register_definitions.base import RegisterDefinition
 
 logger = logging.getLogger("huawei.transform")
 
+# Modbus-Platzhalter für "keine Daten verfügbar" (siehe get_value)
+INVALID_MODBUS_VALUES = frozenset((65535, 32767, -32768))
+
 
 def transform_data(data: dict[str, Any]) -> dict[str, Any]:
     """
@@ -78,34 +89,53 @@ def transform_data(data: dict[str, Any]) -> dict[str, Any]:
           "last_update": 1706184000.123
         }
     """
-    logger.debug(f"Transforming {len(data)} registers")
+    logger.debug("Transforming %d registers", len(data))
     start = time.time()
 
     # === PHASE 1: Register-Mapping & Value-Extraction ===
     # Iteriert über alle Mappings aus config/mappings.py
     # - register_key: Modbus-Register-Name (aus huawei_solar Library)
     # - mqtt_key: MQTT-Key-Name (für Home Assistant)
-    # get_value() extrahiert .value und filtert ungültige Modbus-Werte
-    result = {mqtt_key: get_value(data.get(register_key)) for register_key, mqtt_key in REGISTER_MAPPING.items()}
+    # get_register_value() extrahiert .value und filtert die Platzhalter des Registertyps
+    sentinels = get_sentinel_table()
+    result = {
+        mqtt_key: get_register_value(register_key, data.get(register_key), sentinels)
+        for register_key, mqtt_key in REGISTER_MAPPING.items()
+    }
+
+    # === PHASE 2 + 3: Critical Defaults & Cleanup ===
+    result = transform_values(result)
+
+    duration = time.time() - start
+    logger.debug("Transform complete: %d values (%.3fs)", len(result), duration)
+
+    return result
+
+
+def transform_values(result: dict[str, Any]) -> dict[str, Any]:
+    """
+    Wendet Critical Defaults und Cleanup auf bereits MQTT-gekeyte Werte an.
+
+    Gemeinsamer zweiter Teil von transform_data() und dem Fast Path
+    (fast_decode.py), der die Werte direkt unter MQTT-Keys dekodiert.
 
-    # === PHASE 2: Critical Defaults ===
+    Args:
+        result: {mqtt_key: Wert}, fehlende Keys oder None = nicht verfügbar
+
+    Returns:
+        Bereinigtes Dict ohne None-Werte, mit Defaults und last_update
+    """
     # Stellt sicher dass wichtige Keys existieren, auch wenn Modbus fehlt
     # Beispiel: battery_power=0 wenn kein Batteriewert verfügbar
     # Verhindert Template-Errors in Home Assistant
     for key, default in CRITICAL_DEFAULTS.items():
         if result.get(key) is None:
-            logger.warning(f"⚠️ Critical '{key}' missing, using {default}")
+            logger.warning("⚠️ Critical '%s' missing, using %s", key, default, extra={"rate_key": f"critical:{key}"})
             result[key] = default
 
-    # === PHASE 3: Cleanup ===
     # - Entfernt None-Werte (würden in JSON als null erscheinen)
     # - Fügt last_update Timestamp hinzu
-    result = _cleanup_result(result)
-
-    duration = time.time() - start
-    logger.debug(f"Transform complete: {len(result)} values ({duration:.3f}s)")
-
-    return result
+    return _cleanup_result(result)
 
 
 def get_value(value):
@@ -173,12 +203,40 @@ def get_value(value):
     # Filter invalid Modbus values (silent - sind häufig und erwartbar)
     # Diese Werte sind Modbus-Konvention für "keine Daten verfügbar"
     if isinstance(value, (int, float)):
-        if value in (65535, 32767, -32768):
+        if value in INVALID_MODBUS_VALUES:
             return None
 
     return value
 
 
+def get_register_value(name: str, value: Any, sentinels: SentinelTable) -> Any:
+    """
+    Wie get_value(), aber mit den Platzhaltern des konkreten Registers.
+
+    Statt der globalen Literale (65535, 32767, -32768 nach Skalierung) wird
+    die aus den Library-Definitionen kompilierte Tabelle genutzt (siehe
+    sentinels.py): 32-bit Platzhalter werden erkannt, legitime Werte wie
+    327.67 kWh (Rohwert 32767, Gain 100) bleiben erhalten. Jede Verwerfung
+    wird pro Register gezählt - auch None, wenn die Library den
+    invalid_value bereits ersetzt hat.
+
+    Register ohne Tabelleneintrag (nicht in der Library) → get_value().
+    """
+    if value is None or name not in sentinels.raw:
+        return get_value(value)
+
+    if hasattr(value, "value"):
+        value = value.value
+    if value is None:
+        sentinels.reject(name)
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if sentinels.is_sentinel(name, value):
+        return None
+    return value
+
+
 def _cleanup_result(result: dict[str, Any]) -> dict[str, Any]:
     """
     Entfernt None-Werte und fügt Timestamp hinzu.
@@ -209,8 +267,8 @@ def _cleanup_result(result: dict[str, Any]) -> dict[str, Any]:
         Output: {"power_active": 4500, "battery_soc": 85.5, "last_update": 1706184000.123}
 
     Hinweis:
-        last_update wird auch in mqtt_client.publish_data() nochmal gesetzt,
-        aber mit int(time.time()). Hier float für höhere Präzision bei Debugging.
+        mqtt_client.publish_data() und die HTTP API kürzen last_update auf
+        int(). Hier float für höhere Präzision bei Debugging.
     """
     # Dictionary Comprehension: Nur Keys wo Value nicht None ist
     cleaned = {k: v for k, v in result.items() if v is not None}
@@ -219,3 +277,123 @@ def _cleanup_result(result: dict[str, Any]) -> dict[str, Any]:
     cleaned["last_update"] = time.time()
 
     return cleaned
+
+
+class CompiledTransform:
+    """
+    transform_data() als beim Start kompilierte Pipeline (Hot Path in main_once).
+
+    Pro Mapping-Eintrag wird einmal ein Extraktor passend zum Registertyp
+    gewählt, statt pro Cycle und Key hasattr/isinstance-Ketten zu durchlaufen:
+
+        Zahl (mit Platzhaltern)   .value, None/Platzhalter → gezählt verwerfen
+        Timestamp                 .value.isoformat()
+        Enum/Dict/Funktion        .value, None → gezählt verwerfen
+        String/ohne Platzhalter   .value
+        Unbekannt (nicht in Lib)  get_value()
+
+    Der Cycle selbst ist eine Schleife über vorkompilierte Tupel und schreibt
+    direkt in ein wiederverwendetes Dict - kein Zwischen-Dict mit None-Werten,
+    kein zweites Dict im Cleanup, keine Log-Formatierung ohne Anlass. Das zurückgegebene Dict gehört der Instanz
+    und ist nur bis zum nächsten Aufruf gültig (TotalIncreasingFilter.filter()
+    kopiert es ohnehin). Ergebnis identisch zu transform_data(), abgesehen von
+    der Key-Reihenfolge bei Critical Defaults.
+    """
+
+    def __init__(
+        self,
+        mapping: Mapping[str, str] | None = None,
+        defaults: Mapping[str, Any] | None = None,
+        sentinels: SentinelTable | None = None,
+        registers: "Mapping[str, RegisterDefinition] | None" = None,
+    ):
+        if registers is None:
+            registers = cast(dict, REGISTERS)
+        self.sentinels = get_sentinel_table() if sentinels is None else sentinels
+        mapping = REGISTER_MAPPING if mapping is None else mapping
+
+        self._steps: tuple[tuple[str, str, Callable[[Any], Any]], ...] = tuple(
+            (register_key, mqtt_key, self._extractor(register_key, registers.get(register_key)))
+            for register_key, mqtt_key in mapping.items()
+        )
+        self._defaults = tuple((CRITICAL_DEFAULTS if defaults is None else defaults).items())
+        self._out: dict[str, Any] = {}
+
+    def _extractor(self, name: str, definition: "RegisterDefinition | None") -> Callable[[Any], Any]:
+        if definition is None:
+            return get_value
+
+        reject = self.sentinels.reject
+
+        if isinstance(definition, TimestampRegister):
+
+            def timestamp(result: Any) -> Any:
+                value = getattr(result, "value", result)
+                if value is None:
+                    reject(name)
+                    return None
+                return value.isoformat()
+
+            return timestamp
+
+        if name in self.sentinels.decoded:
+            placeholders = self.sentinels.decoded[name]
+
+            def number(result: Any) -> Any:
+                value = getattr(result, "value", result)
+                if value is None or value in placeholders:
+                    reject(name)
+                    return None
+                return value
+
+            return number
+
+        if name in self.sentinels.raw:
+
+            def counted(result: Any) -> Any:
+                value = getattr(result, "value", result)
+                if value is None:
+                    reject(name)
+                return value
+
+            return counted
+
+        def plain(result: Any) -> Any:
+            return getattr(result, "value", result)
+
+        return plain
+
+    def __call__(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        """Transform register results (read_registers) into MQTT values."""
+        out = self._out
+        get = data.get
+        drop = out.pop
+        # Überschreiben statt clear(): die Hash-Tabelle des Dicts bleibt erhalten
+        for register_key, mqtt_key, extract in self._steps:
+            result = get(register_key)
+            if result is not None and (value := extract(result)) is not None:
+                out[mqtt_key] = value
+            else:
+                drop(mqtt_key, None)
+        return self.finish(out)
+
+    def finish(self, out: dict[str, Any]) -> dict[str, Any]:
+        """Critical defaults and last_update, in place (values already MQTT-keyed, no None)."""
+        for key, default in self._defaults:
+            if out.get(key) is None:
+                logger.warning("⚠️ Critical '%s' missing, using %s", key, default, extra={"rate_key": f"critical:{key}"})
+                out[key] = default
+        out["last_update"] = time.time()
+        return out
+
+
+# Singleton-Instanz
+_transform_instance: CompiledTransform | None = None
+
+
+def get_compiled_transform() -> CompiledTransform:
+    """Gibt die beim ersten Aufruf kompilierte Instanz zurück."""
+    global _transform_instance
+    if _transform_instance is None:
+        _transform_instance = CompiledTransform()
+    return _transform_instance
@@ -113,6 +113,99 @@ export HUAWEI_ENABLE_BATCHING
 HUAWEI_BATCH_MAX_GAP=$(get_required_config 'batch_max_gap' '50')
 export HUAWEI_BATCH_MAX_GAP
 
+# MQTT Publish Policy
+HUAWEI_MQTT_DATA_QOS=$(get_required_config 'mqtt_data_qos' '1')
+export HUAWEI_MQTT_DATA_QOS
+
+HUAWEI_MQTT_DATA_RETAIN=$(get_required_config 'mqtt_data_retain' 'true')
+export HUAWEI_MQTT_DATA_RETAIN
+
+HUAWEI_MQTT_RETAINED_SNAPSHOT_INTERVAL=$(get_required_config 'mqtt_retained_snapshot_interval' '0')
+export HUAWEI_MQTT_RETAINED_SNAPSHOT_INTERVAL
+
+HUAWEI_MQTT_STATUS_KEEPALIVE=$(get_required_config 'mqtt_status_keepalive' '0')
+export HUAWEI_MQTT_STATUS_KEEPALIVE
+
+# MQTT Binary Payload
+HUAWEI_MQTT_BINARY_PAYLOAD=$(get_required_config 'mqtt_binary_payload' 'false')
+export HUAWEI_MQTT_BINARY_PAYLOAD
+
+# Output Sinks
+HUAWEI_OUTPUT_INFLUX=$(get_required_config 'output_influx' '')
+export HUAWEI_OUTPUT_INFLUX
+
+HUAWEI_OUTPUT_NDJSON_FILE=$(get_required_config 'output_ndjson_file' '')
+export HUAWEI_OUTPUT_NDJSON_FILE
+
+HUAWEI_OUTPUT_UNIX_SOCKET=$(get_required_config 'output_unix_socket' '')
+export HUAWEI_OUTPUT_UNIX_SOCKET
+
+HUAWEI_OUTPUT_QUEUE_SIZE=$(get_required_config 'output_queue_size' '100')
+export HUAWEI_OUTPUT_QUEUE_SIZE
+
+HUAWEI_OUTPUT_FILE_MAX_MB=$(get_required_config 'output_file_max_mb' '10')
+export HUAWEI_OUTPUT_FILE_MAX_MB
+
+# Modbus proxy
+HUAWEI_MODBUS_PROXY=$(get_required_config 'modbus_proxy' 'false')
+export HUAWEI_MODBUS_PROXY
+
+HUAWEI_MODBUS_PROXY_PORT=$(get_required_config 'modbus_proxy_port' '502')
+export HUAWEI_MODBUS_PROXY_PORT
+
+# HTTP API
+HUAWEI_HTTP_API_PORT=$(get_required_config 'http_api_port' '0')
+export HUAWEI_HTTP_API_PORT
+
+# Shared-memory snapshot
+HUAWEI_OUTPUT_SHARED_MEMORY=$(get_required_config 'output_shared_memory' '')
+export HUAWEI_OUTPUT_SHARED_MEMORY
+
+# Fast decode path
+HUAWEI_FAST_DECODE=$(get_required_config 'fast_decode' 'false')
+export HUAWEI_FAST_DECODE
+
+# Unchanged cycles
+HUAWEI_UNCHANGED_CYCLES=$(get_required_config 'unchanged_cycles' 'publish')
+export HUAWEI_UNCHANGED_CYCLES
+
+# Night mode
+HUAWEI_NIGHT_POLL_INTERVAL=$(get_required_config 'night_poll_interval' '0')
+export HUAWEI_NIGHT_POLL_INTERVAL
+
+HUAWEI_LATITUDE=$(get_required_config 'latitude' '')
+export HUAWEI_LATITUDE
+
+HUAWEI_LONGITUDE=$(get_required_config 'longitude' '')
+export HUAWEI_LONGITUDE
+
+# MQTT control
+HUAWEI_MQTT_CONTROL=$(get_required_config 'mqtt_control' 'false')
+export HUAWEI_MQTT_CONTROL
+
+# Bridge diagnostics
+HUAWEI_DIAGNOSTICS_INTERVAL=$(get_required_config 'diagnostics_interval' '0')
+export HUAWEI_DIAGNOSTICS_INTERVAL
+
+# End-to-end tracing
+HUAWEI_TRACING=$(get_required_config 'tracing' 'false')
+export HUAWEI_TRACING
+
+HUAWEI_TRACING_PAYLOAD=$(get_required_config 'tracing_payload' 'false')
+export HUAWEI_TRACING_PAYLOAD
+
+# Event loop monitor
+HUAWEI_LOOP_MONITOR=$(get_required_config 'loop_monitor' 'false')
+export HUAWEI_LOOP_MONITOR
+
+# Flight recorder
+HUAWEI_FLIGHT_RECORDER_CYCLES=$(get_required_config 'flight_recorder_cycles' '10')
+export HUAWEI_FLIGHT_RECORDER_CYCLES
+
+# Log format
+HUAWEI_LOG_FORMAT=$(get_required_config 'log_format' 'text')
+export HUAWEI_LOG_FORMAT
+
 echo "$(date +"%Y-%m-%dT%H:%M:%S") INFO: >> Log level: ${HUAWEI_LOG_LEVEL}"
 
 # Set bashio log level to match
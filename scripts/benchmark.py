@@ -0,0 +1,155 @@
+# scripts/benchmark.py
+
+"""
+Micro-benchmarks for the bridge hot path.
+
+Usage:
+    python scripts/benchmark.py [--iterations N] [serialize] [transform]
+
+serialize:  json.dumps(data) (previous path) vs. the schema-compiled
+            PayloadSerializer (stdlib and, if installed, orjson backend);
+            fails if the default backend is slower than json.dumps
+transform:  transform_data() (reference) vs. the startup-compiled
+            CompiledTransform; time and tracemalloc peak per cycle
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import patch
+
+SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR / "../huawei_solar_modbus_mqtt"))
+
+import bridge.payload_serializer as payload_serializer  # noqa: E402
+from bridge.config.sensors_mqtt import NUMERIC_SENSORS, TEXT_SENSORS  # noqa: E402
+from bridge.payload_serializer import UNIT_PRECISION, PayloadSerializer  # noqa: E402
+from bridge.sentinels import SentinelTable  # noqa: E402
+from bridge.transform import CompiledTransform, transform_data  # noqa: E402
+from huawei_solar.registers import REGISTERS  # noqa: E402
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8")  # type: ignore[attr-defined]
+
+
+def build_payload(seed: int = 42) -> dict:
+    """Realistic full payload: scaled register values for every sensor."""
+    rng = random.Random(seed)
+    data: dict = {}
+    for sensor in NUMERIC_SENSORS:
+        precision = UNIT_PRECISION.get(sensor.get("unit_of_measurement", ""), 0)
+        if precision:
+            data[sensor["key"]] = rng.randint(0, 500_000) / 10**precision
+        else:
+            data[sensor["key"]] = rng.randint(-5000, 5000)
+    for sensor in TEXT_SENSORS:
+        data[sensor["key"]] = "On-grid"
+    data["last_update"] = 1_700_000_000
+    return data
+
+
+def report(name: str, seconds: float, iterations: int, baseline: float | None = None) -> None:
+    per_call = seconds / iterations * 1e6
+    ratio = f"  ({baseline / seconds:.2f}x)" if baseline else ""
+    print(f"  {name:<28} {per_call:8.2f} µs/call{ratio}")
+
+
+def bench_serialize(iterations: int) -> bool:
+    data = build_payload()
+    serializer = PayloadSerializer.from_sensor_config()
+
+    print(f"serialize ({len(data)} keys, {iterations} iterations)")
+    baseline = timeit.timeit(lambda: json.dumps(data).encode(), number=iterations)
+    report("json.dumps", baseline, iterations)
+
+    with patch.object(payload_serializer, "orjson", None):
+        stdlib = timeit.timeit(lambda: serializer.dumps(data), number=iterations)
+        size = len(serializer.dumps(data))
+    report("compiled (json)", stdlib, iterations, baseline)
+
+    if payload_serializer.orjson is not None:
+        fast = timeit.timeit(lambda: serializer.dumps(data), number=iterations)
+        report("compiled (orjson)", fast, iterations, baseline)
+    else:
+        fast = stdlib
+        print("  compiled (orjson)            not installed")
+
+    print(f"  payload size: {len(json.dumps(data))} → {size} bytes")
+    print(f"  default backend: {serializer.backend} ({baseline / fast:.2f}x vs. json.dumps)")
+    if fast > baseline:
+        print("  ⚠️ default backend is slower than json.dumps (is orjson installed?)")
+        return False
+    return True
+
+
+def build_register_results(seed: int = 42) -> dict:
+    """Library Result objects for every mapped register, as returned by read_registers()."""
+    from bridge.config.mappings import REGISTER_MAPPING
+
+    rng = random.Random(seed)
+    results: dict = {}
+    for name in REGISTER_MAPPING:
+        definition = REGISTERS[name]
+        if definition.format.endswith("s"):
+            raw: object = b"SUN2000-10KTL"
+        elif isinstance(definition.unit, dict):
+            raw = next(iter(definition.unit))
+        elif isinstance(definition.unit, type) and hasattr(definition.unit, "__members__"):
+            raw = next(iter(definition.unit)).value  # type: ignore[attr-defined]
+        else:
+            raw = rng.randint(0, 5000)
+        results[name] = definition.decode((raw,))
+    return results
+
+
+def peak_alloc(func: Callable[[], object]) -> int:
+    """Peak traced memory (bytes) of a single call."""
+    func()  # warm-up
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - base
+
+
+def bench_transform(iterations: int) -> bool:
+    data = build_register_results()
+    compiled = CompiledTransform(sentinels=SentinelTable())
+
+    with patch("bridge.transform.get_sentinel_table", return_value=SentinelTable()):
+        print(f"transform ({len(data)} registers, {iterations} iterations)")
+        baseline = timeit.timeit(lambda: transform_data(data), number=iterations)
+        report("transform_data", baseline, iterations)
+        baseline_alloc = peak_alloc(lambda: transform_data(data))
+
+    fast = timeit.timeit(lambda: compiled(data), number=iterations)
+    report("CompiledTransform", fast, iterations, baseline)
+    print(f"  peak alloc per cycle: {baseline_alloc} → {peak_alloc(lambda: compiled(data))} bytes")
+    return True
+
+
+BENCHMARKS = {"serialize": bench_serialize, "transform": bench_transform}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("benchmarks", nargs="*", choices=[[], *BENCHMARKS], help="default: all")
+    args = parser.parse_args()
+
+    ok = True
+    for name in args.benchmarks or BENCHMARKS:
+        ok = BENCHMARKS[name](args.iterations) and ok
+        print()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
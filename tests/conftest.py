@@ -13,10 +13,13 @@ import pytest
 addon_path = Path(__file__).parent.parent / "huawei_solar_modbus_mqtt"
 sys.path.insert(0, str(addon_path))
 
+from bridge.latency import reset_latency_recorder  # noqa: E402
+from bridge.metrics import reset_metrics  # noqa: E402
+from bridge.resources import reset_resource_monitor  # noqa: E402
 from bridge.total_increasing_filter import reset_filter  # noqa: E402
 
 # ---------------------------------------------------------------------------
-# Autouse: Filter-Singleton vor/nach jedem Test zurücksetzen
+# Autouse: Filter-, Metrik-, Latenz- und Ressourcen-Singleton vor/nach jedem Test zurücksetzen
 # ---------------------------------------------------------------------------
 
 
@@ -24,8 +27,14 @@ from bridge.total_increasing_filter import reset_filter  # noqa: E402
 def reset_singletons():
     """Reset singleton instances before each test."""
     reset_filter()
+    reset_metrics()
+    reset_latency_recorder()
+    reset_resource_monitor()
     yield
     reset_filter()
+    reset_metrics()
+    reset_latency_recorder()
+    reset_resource_monitor()
 
 
 # ---------------------------------------------------------------------------
@@ -37,19 +46,45 @@ def reset_singletons():
 def mock_config():
     config = Mock()
     config.log_level = "INFO"
+    config.log_format = "text"
     config.modbus_host = "192.168.1.100"
     config.modbus_port = 502
     config.modbus_auto_detect_slave_id = False
     config.slave_id = 1
+    config.modbus_proxy = False
+    config.modbus_proxy_port = 502
     config.mqtt_host = "localhost"
     config.mqtt_port = 1883
     config.mqtt_topic = "huawei-solar"
     config.mqtt_user = None
     config.mqtt_password = None
+    config.mqtt_data_qos = 1
+    config.mqtt_data_retain = True
+    config.mqtt_retained_snapshot_interval = 0
+    config.mqtt_status_keepalive = 0
+    config.mqtt_binary_payload = False
+    config.output_influx = ""
+    config.output_ndjson_file = ""
+    config.output_unix_socket = ""
+    config.output_shared_memory = ""
+    config.output_queue_size = 100
+    config.output_file_max_mb = 10
+    config.http_api_port = 0
     config.poll_interval = 30
     config.status_timeout = 180
     config.enable_batching = True
     config.batch_max_gap = 50
+    config.fast_decode = False
+    config.unchanged_cycles = "publish"
+    config.night_poll_interval = 0
+    config.latitude = None
+    config.longitude = None
+    config.mqtt_control = False
+    config.diagnostics_interval = 0
+    config.tracing = False
+    config.tracing_payload = False
+    config.loop_monitor = False
+    config.flight_recorder_cycles = 0
     return config
 
 
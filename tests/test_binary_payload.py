@@ -0,0 +1,248 @@
+# tests/test_binary_payload.py
+
+"""Tests für den binären MessagePack-Payload."""
+
+import struct
+from unittest.mock import patch
+
+import bridge.binary_payload as binary_module
+import pytest
+from bridge.binary_payload import (
+    BINARY_MAGIC,
+    BINARY_SCHEMA_VERSION,
+    HEADER_SIZE,
+    BinaryPayloadEncoder,
+    compute_schema_id,
+    decode_binary_payload,
+    packb,
+    unpackb,
+)
+from bridge.payload_serializer import PayloadSerializer
+
+SENSORS = [
+    {"key": "power", "unit_of_measurement": "W"},
+    {"key": "energy", "unit_of_measurement": "kWh"},
+    {"key": "status"},
+]
+
+
+@pytest.fixture(params=["builtin", "msgpack"])
+def backend(request):
+    """Eingebauter Encoder und (falls installiert) das msgpack Paket."""
+    if request.param == "msgpack":
+        pytest.importorskip("msgpack")
+        yield
+    else:
+        with patch.object(binary_module, "msgpack", None):
+            yield
+
+
+# ---------------------------------------------------------------------------
+# TestMessagePack
+# ---------------------------------------------------------------------------
+
+
+class TestMessagePack:
+    """MessagePack Round-Trip und Kodierung nach Spezifikation."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            None,
+            True,
+            False,
+            0,
+            127,
+            128,
+            255,
+            65535,
+            65536,
+            2**32,
+            -1,
+            -32,
+            -33,
+            -129,
+            -40000,
+            -(2**31) - 1,
+            1.5,
+            -0.25,
+            "",
+            "x" * 31,
+            "x" * 32,
+            "Ü" * 200,
+            "y" * 70000,
+            list(range(20)),
+            {"a": 1, "b": [None, "c"]},
+            {str(i): i for i in range(20)},
+        ],
+    )
+    def test_round_trip(self, backend, value):
+        assert unpackb(packb(value)) == value
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            (None, b"\xc0"),
+            (True, b"\xc3"),
+            (5, b"\x05"),
+            (-1, b"\xff"),
+            (200, b"\xcc\xc8"),
+            (-200, b"\xd1\xff\x38"),
+            ("ab", b"\xa2ab"),
+            ([1, 2], b"\x92\x01\x02"),
+            ({"a": 1}, b"\x81\xa1a\x01"),
+            (1.0, b"\xcb" + struct.pack(">d", 1.0)),
+        ],
+    )
+    def test_builtin_encoding_matches_spec(self, value, expected):
+        with patch.object(binary_module, "msgpack", None):
+            assert packb(value) == expected
+
+    def test_unknown_types_encoded_as_string(self):
+        with patch.object(binary_module, "msgpack", None):
+            assert unpackb(packb(object)) == str(object)
+
+    def test_truncated_data_raises(self):
+        with patch.object(binary_module, "msgpack", None):
+            with pytest.raises(ValueError):
+                unpackb(b"\xa5ab")
+
+
+# ---------------------------------------------------------------------------
+# TestInterop
+# ---------------------------------------------------------------------------
+
+# Grenzwerte der Spezifikation: jeweils letzter Wert einer Breite und erster der nächsten
+SPEC_EDGE_CASES = [
+    0x7F,
+    0x80,
+    0xFF,
+    0x100,
+    0xFFFF,
+    0x10000,
+    0xFFFFFFFF,
+    0x100000000,
+    2**64 - 1,
+    -1,
+    -32,
+    -33,
+    -128,
+    -129,
+    -32768,
+    -32769,
+    -(2**31),
+    -(2**31) - 1,
+    -(2**63),
+    0.1,
+    -1e300,
+    float("inf"),
+    "a" * 31,
+    "a" * 32,
+    "a" * 255,
+    "a" * 256,
+    "a" * 65535,
+    "a" * 65536,
+    "€" * 11,
+    list(range(15)),
+    list(range(16)),
+    list(range(65536)),
+    {str(i): i for i in range(15)},
+    {str(i): i for i in range(16)},
+    {str(i): None for i in range(65536)},
+]
+
+
+class TestInterop:
+    """Eingebauter Codec gegen das msgpack Paket (dev-Dependency)."""
+
+    @pytest.fixture
+    def msgpack(self):
+        return pytest.importorskip("msgpack")
+
+    @pytest.mark.parametrize("value", SPEC_EDGE_CASES)
+    def test_builtin_bytes_match_msgpack(self, msgpack, value):
+        expected = msgpack.packb(value, use_bin_type=True)
+        with patch.object(binary_module, "msgpack", None):
+            assert packb(value) == expected
+
+    @pytest.mark.parametrize("value", SPEC_EDGE_CASES)
+    def test_builtin_decodes_msgpack_output(self, msgpack, value):
+        raw = msgpack.packb(value, use_bin_type=True)
+        with patch.object(binary_module, "msgpack", None):
+            assert unpackb(raw) == value
+
+    @pytest.mark.parametrize("value", [1.5, -0.25, float("inf")])
+    def test_builtin_decodes_float32(self, msgpack, value):
+        raw = msgpack.packb(value, use_single_float=True)
+        assert raw[0] == 0xCA
+        with patch.object(binary_module, "msgpack", None):
+            assert unpackb(raw) == value
+
+    def test_msgpack_reads_builtin_payload(self, msgpack):
+        encoder = BinaryPayloadEncoder(PayloadSerializer(SENSORS))
+        with patch.object(binary_module, "msgpack", None):
+            raw = encoder.encode({"power": -4500, "energy": 12.3456, "status": "Übertemperatur", "extra": 70000})
+        assert msgpack.unpackb(raw[HEADER_SIZE:], raw=False) == [
+            [-4500, 12.35, "Übertemperatur", None],
+            {"extra": 70000},
+        ]
+
+
+# ---------------------------------------------------------------------------
+# TestBinaryPayload
+# ---------------------------------------------------------------------------
+
+
+class TestBinaryPayload:
+    """Versionierter Header + positionaler Body."""
+
+    def _encoder(self):
+        return BinaryPayloadEncoder(PayloadSerializer(SENSORS))
+
+    def test_header_layout(self):
+        encoder = self._encoder()
+        raw = encoder.encode({"power": 1})
+        magic, version, fmt, schema_id = struct.unpack(">2sBBI", raw[:HEADER_SIZE])
+        assert (magic, version, fmt) == (BINARY_MAGIC, BINARY_SCHEMA_VERSION, 1)
+        assert schema_id == compute_schema_id(["power", "energy", "status", "last_update"])
+
+    def test_schema_document(self):
+        schema = self._encoder().schema()
+        assert schema["version"] == BINARY_SCHEMA_VERSION
+        assert schema["format"] == "msgpack"
+        assert schema["keys"] == ["power", "energy", "status", "last_update"]
+        assert schema["schema_id"] == compute_schema_id(schema["keys"])
+
+    def test_round_trip_with_rounding_and_extras(self, backend):
+        encoder = self._encoder()
+        raw = encoder.encode({"energy": 12.3456, "power": 4500.4, "last_update": 1_700_000_000, "extra": "x"})
+        decoded = decode_binary_payload(raw, encoder.keys)
+        assert decoded == {"power": 4500, "energy": 12.35, "last_update": 1_700_000_000, "extra": "x"}
+
+    def test_missing_keys_encoded_as_nil(self):
+        encoder = self._encoder()
+        body = unpackb(encoder.encode({"status": "On-grid"})[HEADER_SIZE:])
+        assert body == [[None, None, "On-grid", None], {}]
+
+    def test_smaller_than_json(self):
+        import json
+
+        data = {"power": 4500, "energy": 12.35, "status": "On-grid", "last_update": 1_700_000_000}
+        assert len(self._encoder().encode(data)) < len(json.dumps(data))
+
+    def test_schema_mismatch_rejected(self):
+        raw = self._encoder().encode({"power": 1})
+        with pytest.raises(ValueError, match="Schema mismatch"):
+            decode_binary_payload(raw, ["power", "energy"])
+
+    @pytest.mark.parametrize(
+        "raw,match",
+        [
+            (b"HB", "shorter"),
+            (b"XX\x01\x01\x00\x00\x00\x00\x90", "magic"),
+            (b"HB\x09\x01\x00\x00\x00\x00\x90", "version"),
+        ],
+    )
+    def test_invalid_header_rejected(self, raw, match):
+        with pytest.raises(ValueError, match=match):
+            decode_binary_payload(raw, [])
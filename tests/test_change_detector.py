@@ -0,0 +1,220 @@
+# tests/test_change_detector.py
+
+"""Tests für die Erkennung unveränderter Cycles (change_detector.py)."""
+
+import time
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.change_detector import RawChangeDetector, attach_change_detector
+from bridge.main import main_once, reset_state, start_change_detector
+from huawei_solar import AsyncHuaweiSolarClient
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU
+
+
+class _Inverter:
+    """Real client whose execute() answers every read from a word map (default 0)."""
+
+    def __init__(self):
+        self.words: dict[int, int] = {}
+        self.client = AsyncHuaweiSolarClient(MagicMock(), unit_id=1)
+        self.client.execute = self.execute  # type: ignore[method-assign]
+
+    async def execute(self, pdu):
+        return b"".join(self.words.get(pdu.start_address + i, 0).to_bytes(2, "big") for i in range(pdu.quantity))
+
+
+@pytest.fixture
+def detector() -> RawChangeDetector:
+    return RawChangeDetector()
+
+
+@pytest.fixture(autouse=True)
+def clean_state() -> Iterator[None]:
+    reset_state()
+    yield
+    reset_state()
+
+
+def _cycle(detector: RawChangeDetector, *responses: bytes) -> bool:
+    detector.begin_cycle()
+    for start, response in enumerate(responses):
+        detector.record(start * 100, len(response) // 2, response)
+    unchanged: bool = detector.end_cycle()
+    return unchanged
+
+
+# ---------------------------------------------------------------------------
+# TestDetector
+# ---------------------------------------------------------------------------
+
+
+class TestDetector:
+    """Vergleich der Rohantworten zwischen zwei Cycles."""
+
+    def test_first_cycle_is_changed(self, detector):
+        assert _cycle(detector, b"\x00\x01") is False
+
+    def test_identical_responses_are_unchanged(self, detector):
+        _cycle(detector, b"\x00\x01", b"\x00\x02")
+        assert _cycle(detector, b"\x00\x01", b"\x00\x02") is True
+        assert detector.get_stats() == {
+            "cycles": 2,
+            "unchanged_cycles": 1,
+            "changed_batches": 2,
+            "unchanged_batches": 2,
+        }
+
+    def test_single_changed_batch_marks_cycle_changed(self, detector):
+        _cycle(detector, b"\x00\x01", b"\x00\x02")
+        assert _cycle(detector, b"\x00\x01", b"\x00\x03") is False
+
+    def test_missing_batch_marks_cycle_changed(self, detector):
+        _cycle(detector, b"\x00\x01", b"\x00\x02")
+        assert _cycle(detector, b"\x00\x01") is False
+
+    def test_empty_cycle_is_changed(self, detector):
+        _cycle(detector)
+        assert _cycle(detector) is False
+
+    def test_aborted_cycle_forces_next_full_cycle(self, detector):
+        _cycle(detector, b"\x00\x01")
+        detector.begin_cycle()  # z.B. Exception, kein end_cycle()
+        assert _cycle(detector, b"\x00\x01") is False
+
+    def test_invalidate(self, detector):
+        _cycle(detector, b"\x00\x01")
+        detector.invalidate()
+        assert _cycle(detector, b"\x00\x01") is False
+
+    def test_records_outside_cycle_ignored(self, detector):
+        _cycle(detector, b"\x00\x01")
+        detector.record(999, 1, b"\xff\xff")  # z.B. Modbus-Proxy zwischen zwei Cycles
+        assert _cycle(detector, b"\x00\x01") is True
+
+
+# ---------------------------------------------------------------------------
+# TestAttach
+# ---------------------------------------------------------------------------
+
+
+class TestAttach:
+    """Wrapping von client.execute."""
+
+    @pytest.mark.asyncio
+    async def test_reads_recorded_and_passed_through(self, detector):
+        inverter = _Inverter()
+        inverter.words[32080] = 1234
+        attach_change_detector(inverter.client, detector)
+
+        detector.begin_cycle()
+        raw = await inverter.client.execute(RawReadHoldingRegistersPDU(32080, quantity=2))
+        assert raw == b"\x04\xd2\x00\x00"
+        detector.end_cycle()
+
+        detector.begin_cycle()
+        await inverter.client.execute(RawReadHoldingRegistersPDU(32080, quantity=2))
+        assert detector.end_cycle() is True
+
+    def test_not_attached_for_publish_policy(self, mock_config):
+        mock_config.unchanged_cycles = "publish"
+        inverter = _Inverter()
+        assert start_change_detector(inverter.client, mock_config) is None
+        assert inverter.client.execute == inverter.execute
+
+
+# ---------------------------------------------------------------------------
+# TestMainOnce
+# ---------------------------------------------------------------------------
+
+
+class TestMainOnce:
+    """Kurzschluss unveränderter Cycles in main_once()."""
+
+    @pytest.fixture
+    def inverter(self, mock_config):
+        mock_config.fast_decode = True
+        mock_config.status_timeout = 180
+        return _Inverter()
+
+    async def _run(self, inverter, mock_config, cycle_num):
+        with (
+            patch("bridge.main.publish_data", new_callable=AsyncMock) as publish,
+            patch("bridge.main.publish_status", new_callable=AsyncMock) as status,
+        ):
+            await main_once(inverter.client, mock_config, cycle_num)
+        return publish, status
+
+    @pytest.mark.asyncio
+    async def test_skip_sends_nothing_until_values_change(self, inverter, mock_config):
+        mock_config.unchanged_cycles = "skip"
+        start_change_detector(inverter.client, mock_config)
+
+        publish, _ = await self._run(inverter, mock_config, 1)
+        publish.assert_awaited_once()
+
+        publish, status = await self._run(inverter, mock_config, 2)
+        publish.assert_not_awaited()
+        status.assert_not_awaited()
+        assert main_module._state.unchanged_streak == 1
+
+        inverter.words[32080] = 1
+        publish, _ = await self._run(inverter, mock_config, 3)
+        publish.assert_awaited_once()
+        assert main_module._state.unchanged_streak == 0
+
+    @pytest.mark.asyncio
+    async def test_keepalive_refreshes_status_only(self, inverter, mock_config):
+        mock_config.unchanged_cycles = "keepalive"
+        start_change_detector(inverter.client, mock_config)
+        await self._run(inverter, mock_config, 1)
+        main_module._state.last_success = 0.0
+
+        publish, status = await self._run(inverter, mock_config, 2)
+
+        publish.assert_not_awaited()
+        status.assert_awaited_once_with("online", mock_config.mqtt_topic, force=True)
+        assert main_module._state.last_success > 0
+
+    @pytest.mark.asyncio
+    async def test_full_publish_after_status_timeout(self, inverter, mock_config):
+        mock_config.unchanged_cycles = "skip"
+        start_change_detector(inverter.client, mock_config)
+        await self._run(inverter, mock_config, 1)
+        main_module._state.last_full_publish = time.time() - mock_config.status_timeout
+
+        publish, _ = await self._run(inverter, mock_config, 2)
+        publish.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unpublished_cycle_not_treated_as_baseline(self, inverter, mock_config):
+        mock_config.unchanged_cycles = "skip"
+        start_change_detector(inverter.client, mock_config)
+        with (
+            patch("bridge.main.publish_data", new_callable=AsyncMock, side_effect=ConnectionError("down")),
+            patch("bridge.main.is_mqtt_connected", return_value=False),
+        ):
+            await main_once(inverter.client, mock_config, 1)
+
+        publish, _ = await self._run(inverter, mock_config, 2)
+        publish.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [ConnectionError("broker refused"), TimeoutError("no PUBACK")])
+    async def test_failed_publish_while_connected_is_resent(self, inverter, mock_config, error):
+        mock_config.unchanged_cycles = "skip"
+        start_change_detector(inverter.client, mock_config)
+        await self._run(inverter, mock_config, 1)
+
+        inverter.words[32080] = 1
+        with (
+            patch("bridge.main.publish_data", new_callable=AsyncMock, side_effect=error),
+            patch("bridge.main.is_mqtt_connected", return_value=True),
+            pytest.raises(type(error)),
+        ):
+            await main_once(inverter.client, mock_config, 2)
+
+        publish, _ = await self._run(inverter, mock_config, 3)  # gleiche Werte wie Cycle 2
+        publish.assert_awaited_once()
@@ -240,6 +240,178 @@ class TestConfigManagerValidation:
             )
             assert any("batch_max_gap" in err for err in config.validate())
 
+    def test_publish_policy_defaults_are_valid(self, tmp_path):
+        config = _make_config(tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t"})
+        assert config.mqtt_data_qos == 1
+        assert config.mqtt_data_retain is True
+        assert config.mqtt_retained_snapshot_interval == 0
+        assert config.mqtt_status_keepalive == 0
+        assert config.mqtt_binary_payload is False
+        assert config.validate() == []
+
+    def test_output_sinks_default_off(self, tmp_path):
+        config = _make_config(tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t"})
+        assert config.output_influx == ""
+        assert config.output_ndjson_file == ""
+        assert config.output_unix_socket == ""
+        assert config.output_shared_memory == ""
+        assert config.output_queue_size == 100
+        assert config.output_file_max_mb == 10
+
+    @pytest.mark.parametrize(
+        "key,value",
+        [
+            ("output_influx", "http://influx:8086"),
+            ("output_ndjson_file", "relative/data.ndjson"),
+            ("output_unix_socket", "data.sock"),
+            ("output_shared_memory", "shm/snapshot"),
+            ("output_queue_size", 0),
+            ("output_file_max_mb", -1),
+        ],
+    )
+    def test_invalid_output_sink_option_produces_error(self, tmp_path, key, value):
+        config = _make_config(
+            tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t", key: value}
+        )
+        assert any(key in err for err in config.validate())
+
+    def test_modbus_proxy_default_off(self, tmp_path):
+        config = _make_config(tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t"})
+        assert config.modbus_proxy is False
+        assert config.modbus_proxy_port == 502
+
+    def test_fast_decode_default_off(self, tmp_path):
+        config = _make_config(tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t"})
+        assert config.fast_decode is False
+
+    def test_unchanged_cycles_default_publish(self, tmp_path):
+        config = _make_config(tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t"})
+        assert config.unchanged_cycles == "publish"
+
+    def test_invalid_unchanged_cycles_produces_error(self, tmp_path):
+        config = _make_config(
+            tmp_path,
+            {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t", "unchanged_cycles": "drop"},
+        )
+        assert any("unchanged_cycles" in e for e in config.validate())
+
+    def test_log_format_default_text(self, tmp_path):
+        config = _make_config(tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t"})
+        assert config.log_format == "text"
+
+    def test_invalid_log_format_produces_error(self, tmp_path):
+        config = _make_config(
+            tmp_path,
+            {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t", "log_format": "xml"},
+        )
+        assert any("log_format" in e for e in config.validate())
+
+    def test_mqtt_control_default_off(self, tmp_path):
+        config = _make_config(tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t"})
+        assert config.mqtt_control is False
+
+    def test_night_mode_default_off(self, tmp_path):
+        config = _make_config(tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t"})
+        assert config.night_poll_interval == 0
+        assert config.latitude is None
+        assert config.longitude is None
+        assert config.validate() == []
+
+    @pytest.mark.parametrize(
+        "extra,fragment",
+        [
+            ({"night_poll_interval": 20}, "night_poll_interval"),  # nicht länger als poll_interval
+            ({"night_poll_interval": 120}, "night_poll_interval"),  # > status_timeout / 2
+            ({"latitude": 52.5}, "together"),
+            ({"latitude": 95.0, "longitude": 13.4}, "latitude must be"),
+        ],
+    )
+    def test_invalid_night_mode_produces_error(self, tmp_path, extra, fragment):
+        config = _make_config(
+            tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t", **extra}
+        )
+        assert any(fragment in e for e in config.validate())
+
+    def test_http_api_disabled_by_default(self, tmp_path):
+        config = _make_config(tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t"})
+        assert config.http_api_port == 0
+
+    def test_invalid_http_api_port_produces_error(self, tmp_path):
+        config = _make_config(
+            tmp_path, {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "t", "http_api_port": -1}
+        )
+        assert any("http_api_port" in err for err in config.validate())
+
+    @pytest.mark.parametrize("interval,valid", [(0, True), (60, True), (3600, True), (30, False), (7200, False)])
+    def test_diagnostics_interval_range(self, tmp_path, interval, valid):
+        config = _make_config(
+            tmp_path,
+            {
+                "modbus_host": "192.168.1.100",
+                "mqtt_host": "localhost",
+                "mqtt_topic": "t",
+                "diagnostics_interval": interval,
+            },
+        )
+        assert config.diagnostics_interval == interval
+        assert any("diagnostics_interval" in err for err in config.validate()) is not valid
+
+    @pytest.mark.parametrize("cycles,valid", [(0, True), (10, True), (100, True), (-1, False), (101, False)])
+    def test_flight_recorder_cycles_range(self, tmp_path, cycles, valid):
+        config = _make_config(
+            tmp_path,
+            {
+                "modbus_host": "192.168.1.100",
+                "mqtt_host": "localhost",
+                "mqtt_topic": "t",
+                "flight_recorder_cycles": cycles,
+            },
+        )
+        assert any("flight_recorder_cycles" in err for err in config.validate()) is not valid
+
+    @pytest.mark.parametrize("tracing,payload,valid", [(False, False, True), (True, True, True), (False, True, False)])
+    def test_tracing_payload_requires_tracing(self, tmp_path, tracing, payload, valid):
+        config = _make_config(
+            tmp_path,
+            {
+                "modbus_host": "192.168.1.100",
+                "mqtt_host": "localhost",
+                "mqtt_topic": "t",
+                "tracing": tracing,
+                "tracing_payload": payload,
+            },
+        )
+        assert any("tracing_payload" in err for err in config.validate()) is not valid
+
+    def test_invalid_modbus_proxy_port_produces_error(self, tmp_path):
+        config = _make_config(
+            tmp_path,
+            {
+                "modbus_host": "192.168.1.100",
+                "mqtt_host": "localhost",
+                "mqtt_topic": "t",
+                "modbus_proxy": True,
+                "modbus_proxy_port": 70000,
+            },
+        )
+        assert any("modbus_proxy_port" in err for err in config.validate())
+
+    @pytest.mark.parametrize(
+        "key,value",
+        [
+            ("mqtt_data_qos", 3),
+            ("mqtt_retained_snapshot_interval", -1),
+            ("mqtt_retained_snapshot_interval", 3601),
+            ("mqtt_status_keepalive", 4000),
+        ],
+    )
+    def test_invalid_publish_policy_produces_error(self, tmp_path, key, value):
+        config = _make_config(
+            tmp_path,
+            {"modbus_host": "192.168.1.100", "mqtt_host": "localhost", "mqtt_topic": "test", key: value},
+        )
+        assert any(key in err for err in config.validate())
+
 
 # ---------------------------------------------------------------------------
 # TestConfigManagerEnvParsing
@@ -498,14 +670,40 @@ class TestConfigManagerConsistency:
             ("HUAWEI_MODBUS_AUTO_DETECT_SLAVE_ID", "modbus_auto_detect_slave_id", "false", False),
             ("HUAWEI_MODBUS_AUTO_DETECT_SLAVE_ID", "modbus_auto_detect_slave_id", "true", True),
             ("HUAWEI_SLAVE_ID", "slave_id", "42", 42),
+            ("HUAWEI_MODBUS_PROXY", "modbus_proxy", "true", True),
+            ("HUAWEI_MODBUS_PROXY_PORT", "modbus_proxy_port", "1502", 1502),
             ("HUAWEI_MQTT_HOST", "mqtt_host", "mqtt.test", "mqtt.test"),
             ("HUAWEI_MQTT_PORT", "mqtt_port", "1884", 1884),
             ("HUAWEI_MQTT_USER", "mqtt_user", "testuser", "testuser"),
             ("HUAWEI_MQTT_PASSWORD", "mqtt_password", "testpass", "testpass"),
             ("HUAWEI_MQTT_TOPIC", "mqtt_topic", "test", "test"),
             ("HUAWEI_LOG_LEVEL", "log_level", "DEBUG", "DEBUG"),
+            ("HUAWEI_LOG_FORMAT", "log_format", "json", "json"),
             ("HUAWEI_STATUS_TIMEOUT", "status_timeout", "120", 120),
             ("HUAWEI_POLL_INTERVAL", "poll_interval", "45", 45),
+            ("HUAWEI_MQTT_DATA_QOS", "mqtt_data_qos", "0", 0),
+            ("HUAWEI_MQTT_DATA_RETAIN", "mqtt_data_retain", "false", False),
+            ("HUAWEI_MQTT_RETAINED_SNAPSHOT_INTERVAL", "mqtt_retained_snapshot_interval", "300", 300),
+            ("HUAWEI_MQTT_STATUS_KEEPALIVE", "mqtt_status_keepalive", "600", 600),
+            ("HUAWEI_MQTT_BINARY_PAYLOAD", "mqtt_binary_payload", "true", True),
+            ("HUAWEI_OUTPUT_INFLUX", "output_influx", "udp://influx:8089", "udp://influx:8089"),
+            ("HUAWEI_OUTPUT_NDJSON_FILE", "output_ndjson_file", "/share/d.ndjson", "/share/d.ndjson"),
+            ("HUAWEI_OUTPUT_UNIX_SOCKET", "output_unix_socket", "/share/d.sock", "/share/d.sock"),
+            ("HUAWEI_OUTPUT_SHARED_MEMORY", "output_shared_memory", "/dev/shm/h", "/dev/shm/h"),
+            ("HUAWEI_OUTPUT_QUEUE_SIZE", "output_queue_size", "500", 500),
+            ("HUAWEI_OUTPUT_FILE_MAX_MB", "output_file_max_mb", "50", 50),
+            ("HUAWEI_HTTP_API_PORT", "http_api_port", "0", 0),
+            ("HUAWEI_FAST_DECODE", "fast_decode", "true", True),
+            ("HUAWEI_UNCHANGED_CYCLES", "unchanged_cycles", "keepalive", "keepalive"),
+            ("HUAWEI_NIGHT_POLL_INTERVAL", "night_poll_interval", "90", 90),
+            ("HUAWEI_LATITUDE", "latitude", "52.52", 52.52),
+            ("HUAWEI_LONGITUDE", "longitude", "", None),
+            ("HUAWEI_MQTT_CONTROL", "mqtt_control", "true", True),
+            ("HUAWEI_DIAGNOSTICS_INTERVAL", "diagnostics_interval", "300", 300),
+            ("HUAWEI_TRACING", "tracing", "true", True),
+            ("HUAWEI_TRACING_PAYLOAD", "tracing_payload", "true", True),
+            ("HUAWEI_LOOP_MONITOR", "loop_monitor", "true", True),
+            ("HUAWEI_FLIGHT_RECORDER_CYCLES", "flight_recorder_cycles", "25", 25),
         ],
     )
     def test_individual_env_mapping(self, monkeypatch, tmp_path, env_var, dict_key, test_value, expected):
@@ -0,0 +1,242 @@
+# tests/test_control.py
+
+"""Tests für die MQTT-Steuerung (control.py, main.start_control)."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.control import CONTROL_COMMANDS, DEFAULT_FORCIBLE_DURATION, ControlQueue
+from bridge.modbus_scheduler import Priority, _priority
+from huawei_solar.exceptions import WriteException
+from huawei_solar.register_values import StorageForcibleChargeDischarge, StorageForcibleChargeDischargeTargetMode
+
+
+def _queue(readback=5000) -> tuple[ControlQueue, MagicMock, AsyncMock, MagicMock]:
+    client = MagicMock()
+    client.set = AsyncMock(return_value=True)
+    client.get = AsyncMock(return_value=MagicMock(value=readback))
+    publish_state, on_written = AsyncMock(), MagicMock()
+    return ControlQueue(client, publish_state, on_written), client, publish_state, on_written
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# ---------------------------------------------------------------------------
+# TestParsing
+# ---------------------------------------------------------------------------
+
+
+class TestParsing:
+    """Payload → Register-Writes."""
+
+    @pytest.mark.parametrize("payload", ["2500", "2500.0", '{"power": 2500}', " 2500\n"])
+    def test_power_limit(self, payload):
+        writes = CONTROL_COMMANDS["max_charge_power"].parse(payload)
+        assert writes == [("storage_maximum_charging_power", 2500)]
+
+    def test_forcible_charge_sequence(self):
+        writes = CONTROL_COMMANDS["forcible_charge"].parse('{"power": 3000, "duration": 30}')
+        assert writes == [
+            ("storage_forcible_charge_discharge_setting_mode", StorageForcibleChargeDischargeTargetMode.TIME),
+            ("storage_forced_charging_and_discharging_period", 30),
+            ("storage_forcible_charge_power", 3000),
+            ("forcible_charge_discharge_write", StorageForcibleChargeDischarge.CHARGE),
+        ]
+
+    def test_forcible_default_duration(self):
+        writes = CONTROL_COMMANDS["forcible_discharge"].parse("1000")
+        assert ("storage_forced_charging_and_discharging_period", DEFAULT_FORCIBLE_DURATION) in writes
+
+    @pytest.mark.parametrize(
+        "command,payload",
+        [
+            ("max_charge_power", ""),
+            ("max_charge_power", "-1"),
+            ("max_charge_power", "abc"),
+            ("max_charge_power", "{broken"),
+            ("max_charge_power", "inf"),
+            ("max_charge_power", "nan"),
+            ("max_charge_power", "1e999"),
+            ("forcible_charge", '{"power": 1e999}'),
+            ("max_discharge_power", "[1, 2]"),
+            ("forcible_charge", "0"),
+            ("forcible_charge", '{"power": 1000, "duration": 5000}'),
+        ],
+    )
+    def test_invalid_payload(self, command, payload):
+        with pytest.raises(ValueError):
+            CONTROL_COMMANDS[command].parse(payload)
+
+
+# ---------------------------------------------------------------------------
+# TestExecute
+# ---------------------------------------------------------------------------
+
+
+class TestExecute:
+    """Schreiben, Readback, Ergebnis-Topic."""
+
+    @pytest.mark.asyncio
+    async def test_success_reads_back_and_reports(self):
+        queue, client, publish_state, on_written = _queue(readback=2500)
+        priorities: list[Priority] = []
+
+        def record_priority(*_: object) -> bool:
+            priorities.append(_priority.get())
+            return True
+
+        client.set.side_effect = record_priority
+
+        state = await queue.execute("max_charge_power", "2500")
+
+        client.set.assert_awaited_once_with("storage_maximum_charging_power", 2500)
+        client.get.assert_awaited_once_with("storage_maximum_charging_power")
+        assert priorities == [Priority.CONTROL]
+        assert state["ok"] is True and state["value"] == 2500
+        publish_state.assert_awaited_once_with("max_charge_power", state)
+        on_written.assert_called_once()
+        assert _priority.get() == Priority.POLL
+
+    @pytest.mark.asyncio
+    async def test_enum_readback_as_lowercase_name(self):
+        queue, _, _, _ = _queue(readback=StorageForcibleChargeDischarge.STOP)
+        state = await queue.execute("forcible_stop", "")
+        assert state["value"] == "stop"
+
+    @pytest.mark.asyncio
+    async def test_invalid_payload_not_written(self):
+        queue, client, publish_state, on_written = _queue()
+        state = await queue.execute("max_charge_power", "lots")
+
+        client.set.assert_not_awaited()
+        on_written.assert_not_called()
+        assert state["ok"] is False and "power" in state["error"]
+        assert queue.get_stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unconfirmed_write_stops_sequence(self):
+        queue, client, _, on_written = _queue()
+        client.set.return_value = False
+
+        state = await queue.execute("forcible_charge", "2000")
+
+        assert client.set.await_count == 1
+        client.get.assert_not_awaited()
+        on_written.assert_not_called()
+        assert state["ok"] is False
+        assert queue.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_exception_reported(self):
+        queue, client, _, _ = _queue()
+        client.set.side_effect = WriteException("permission denied")
+
+        state = await queue.execute("max_discharge_power", "1000")
+
+        assert state == {"ok": False, "error": "WriteException: permission denied"}
+
+
+# ---------------------------------------------------------------------------
+# TestQueue
+# ---------------------------------------------------------------------------
+
+
+class TestQueue:
+    """Coalescing und Topic-Handling."""
+
+    def test_unknown_command_rejected(self):
+        queue, _, _, _ = _queue()
+        assert queue.submit("self_destruct", "1") is False
+        assert queue.get_stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_repeats_coalesced_latest_wins(self):
+        queue, client, _, _ = _queue()
+        with patch("bridge.control.subscribe_command") as subscribe, patch("bridge.control.unsubscribe_command"):
+            for value in ("1000", "2000", "3000"):
+                queue.submit("max_charge_power", value)
+            queue.start("t/control")
+            await _settle()
+            await queue.stop()
+
+        subscribe.assert_called_once()
+        assert subscribe.call_args[0][0] == "t/control/+"
+        client.set.assert_awaited_once_with("storage_maximum_charging_power", 3000)
+        stats = queue.get_stats()
+        assert stats["received"] == 3 and stats["coalesced"] == 2 and stats["executed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_notify_from_other_thread(self):
+        queue, client, _, _ = _queue()
+        with patch("bridge.control.subscribe_command") as subscribe, patch("bridge.control.unsubscribe_command"):
+            queue.start("t/control")
+            handler = subscribe.call_args[0][1]
+            await asyncio.to_thread(handler, "t/control/max_discharge_power", b"1500")
+            await _settle()
+            await queue.stop()
+
+        client.set.assert_awaited_once_with("storage_maximum_discharging_power", 1500)
+
+    @pytest.mark.asyncio
+    async def test_non_finite_payload_does_not_stop_queue(self):
+        queue, client, publish_state, _ = _queue()
+        with patch("bridge.control.subscribe_command"), patch("bridge.control.unsubscribe_command"):
+            queue.start("t/control")
+            queue.submit("max_charge_power", "inf")
+            await _settle()
+            queue.submit("max_discharge_power", "1500")
+            await _settle()
+            assert queue._task is not None and not queue._task.done()
+            await queue.stop()
+
+        client.set.assert_awaited_once_with("storage_maximum_discharging_power", 1500)
+        assert publish_state.await_args_list[0].args[1]["ok"] is False
+        assert queue.get_stats()["rejected"] == 1 and queue.get_stats()["executed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_does_not_stop_queue(self):
+        queue, client, _, _ = _queue()
+        client.set.side_effect = [RuntimeError("bug"), True]
+        with patch("bridge.control.subscribe_command"), patch("bridge.control.unsubscribe_command"):
+            queue.start("t/control")
+            queue.submit("max_charge_power", "1000")
+            await _settle()
+            queue.submit("max_charge_power", "2000")
+            await _settle()
+            await queue.stop()
+
+        assert client.set.await_count == 2
+        assert queue.get_stats()["failed"] == 1 and queue.get_stats()["executed"] == 1
+
+
+# ---------------------------------------------------------------------------
+# TestStartControl
+# ---------------------------------------------------------------------------
+
+
+class TestStartControl:
+    """Opt-in über mqtt_control."""
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self):
+        main_module.reset_state()
+        yield
+        main_module.reset_state()
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, mock_config):
+        assert main_module.start_control(MagicMock(), mock_config) is None
+
+    @pytest.mark.asyncio
+    async def test_enabled_subscribes_control_topic(self, mock_config):
+        mock_config.mqtt_control = True
+        with patch("bridge.control.subscribe_command") as subscribe, patch("bridge.control.unsubscribe_command"):
+            control = main_module.start_control(MagicMock(), mock_config)
+            assert control is not None
+            assert subscribe.call_args[0][0] == f"{mock_config.mqtt_topic}/control/+"
+            await main_module.stop_control()
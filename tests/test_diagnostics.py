@@ -0,0 +1,174 @@
+# tests/test_diagnostics.py
+
+"""Tests für die Selbstdiagnose der Bridge (diagnostics.py, main.publish_diagnostics)."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.config.sensors_mqtt import DIAGNOSTIC_SENSORS
+from bridge.diagnostics import BridgeDiagnostics
+from bridge.metrics import get_metrics
+from bridge.resources import rss_bytes
+from bridge.total_increasing_filter import get_filter
+
+
+@pytest.fixture(autouse=True)
+def reset_main_state():
+    main_module.reset_state()
+    yield
+    main_module.reset_state()
+
+
+# ---------------------------------------------------------------------------
+# TestCollect
+# ---------------------------------------------------------------------------
+
+
+class TestCollect:
+    """Zusammenfassung pro Fenster."""
+
+    def test_means_and_max_jitter(self):
+        diagnostics = BridgeDiagnostics(60)
+        diagnostics.observe_cycle({"modbus": 1.0, "mqtt": 0.02, "total": 1.2})
+        diagnostics.observe_cycle({"modbus": 2.0, "mqtt": 0.04, "total": 2.2})
+        diagnostics.observe_cycle({"modbus": 3.0})  # unveränderter Cycle: nur Modbus
+        diagnostics.observe_lateness(0.5)
+        diagnostics.observe_lateness(-0.1)
+
+        payload = diagnostics.collect()
+
+        assert payload["cycle_duration"] == 1.7
+        assert payload["modbus_read"] == 2.0
+        assert payload["mqtt_latency"] == 0.03
+        assert payload["poll_jitter"] == 0.5
+
+    def test_window_resets_after_collect(self):
+        diagnostics = BridgeDiagnostics(60)
+        diagnostics.observe_cycle({"modbus": 1.0, "mqtt": 0.02, "total": 1.2})
+        diagnostics.collect()
+
+        payload = diagnostics.collect()
+        assert payload["cycle_duration"] is None
+        assert payload["poll_jitter"] is None
+        assert payload["fallback_reads"] == 0
+
+    def test_counter_deltas(self):
+        diagnostics = BridgeDiagnostics(60)
+        get_metrics().fallback_reads.inc(amount=4)
+        get_metrics().plan_batches.set(3)
+        get_filter().filter({"energy_yield_accumulated": 100.0})
+        get_filter().filter({"energy_yield_accumulated": 90.0})
+
+        payload = diagnostics.collect(now=diagnostics._window_start + 1800)
+
+        assert payload["fallback_reads"] == 4
+        assert payload["batch_count"] == 3
+        assert payload["filter_events"] == 2.0  # 1 Ereignis in 30 min
+
+    def test_due_after_interval(self):
+        diagnostics = BridgeDiagnostics(60)
+        start = diagnostics._window_start
+        assert not diagnostics.due(start + 59)
+        assert diagnostics.due(start + 60)
+
+    def test_rss_reported(self):
+        assert (rss_bytes() or 0) > 0
+        assert BridgeDiagnostics(60).collect()["rss"] is not None
+
+    def test_process_sampled_once_per_window(self):
+        diagnostics = BridgeDiagnostics(60)
+        process = {
+            "rss": 64 * 2**20,
+            "cpu_user": diagnostics._cpu_base + 3.0,
+            "cpu_system": 3.0,
+            "threads": 5,
+            "fds": 12,
+            "gc_collections": 0,
+            "gc_uncollectable": 0,
+        }
+        with patch("bridge.diagnostics.sample", return_value=process) as mock_sample:
+            payload = diagnostics.collect(now=diagnostics._window_start + 60)
+
+        mock_sample.assert_called_once_with()
+        assert payload["rss"] == 64.0
+        assert payload["cpu"] == 10.0  # 6 s CPU in 60 s
+        assert (payload["threads"], payload["fds"]) == (5, 12)
+
+    def test_sensor_templates_match_payload_keys(self):
+        keys = set(BridgeDiagnostics(60).collect())
+        for sensor in DIAGNOSTIC_SENSORS:
+            assert sensor["entity_category"] == "diagnostic"
+            assert sensor["value_template"].split("value_json.")[1].split(" ")[0] in keys
+
+
+# ---------------------------------------------------------------------------
+# TestPublish
+# ---------------------------------------------------------------------------
+
+
+class TestPublish:
+    """Anbindung in main.py."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, mock_config):
+        with patch("bridge.main.publish_json", new_callable=AsyncMock) as publish:
+            await main_module.publish_diagnostics(mock_config)
+        publish.assert_not_awaited()
+        assert main_module.get_diagnostics(mock_config) is None
+
+    @pytest.mark.asyncio
+    async def test_published_retained_when_due(self, mock_config):
+        mock_config.diagnostics_interval = 60
+        diagnostics = main_module.get_diagnostics(mock_config)
+        assert diagnostics is not None
+        diagnostics._window_start -= 60
+
+        with patch("bridge.main.publish_json", new_callable=AsyncMock) as publish:
+            await main_module.publish_diagnostics(mock_config)
+            await main_module.publish_diagnostics(mock_config)  # neues Fenster, noch nicht fällig
+
+        (call,) = publish.await_args_list
+        topic, payload = call.args
+        assert topic == f"{mock_config.mqtt_topic}/diagnostics"
+        assert set(payload) >= {"cycle_duration", "poll_jitter", "rss"}
+        assert call.kwargs == {"retain": True}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [TimeoutError("no answer"), ConnectionRefusedError("refused")])
+    async def test_published_when_cycle_fails(self, mock_client, mock_config, error):
+        mock_config.diagnostics_interval = 60
+        diagnostics = main_module.get_diagnostics(mock_config)
+        assert diagnostics is not None
+        diagnostics._window_start -= 60
+
+        with (
+            patch("bridge.main.main_once", side_effect=error),
+            patch("bridge.main.publish_status", new_callable=AsyncMock),
+            patch("bridge.main.publish_json", new_callable=AsyncMock) as publish,
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            main_module._state.config = mock_config
+            await main_module.run_main_cycle(mock_client, mock_config, 1)
+
+        (call,) = publish.await_args_list
+        assert call.args[0] == f"{mock_config.mqtt_topic}/diagnostics"
+
+    @pytest.mark.asyncio
+    async def test_lateness_measured_against_schedule(self, mock_client, mock_config):
+        mock_config.diagnostics_interval = 60
+        with (
+            patch("bridge.main.main_once", new_callable=AsyncMock),
+            patch("bridge.main.publish_status", new_callable=AsyncMock),
+            patch("bridge.main.publish_json", new_callable=AsyncMock),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+            patch("bridge.main.time.time", return_value=1000.0),
+        ):
+            main_module._state.config = mock_config
+            await main_module.run_main_cycle(mock_client, mock_config, 1)
+            assert main_module._state.next_cycle_due == 1000.0 + mock_config.poll_interval
+            main_module._state.next_cycle_due = 1000.0 - 2.5  # nächster Start 2.5s zu spät
+            await main_module.run_main_cycle(mock_client, mock_config, 2)
+
+        assert main_module._state.diagnostics is not None
+        assert main_module._state.diagnostics._lateness == [2.5]
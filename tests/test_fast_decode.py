@@ -0,0 +1,234 @@
+# tests/test_fast_decode.py
+
+"""Tests für den Fast-Decode-Pfad (rohe Batches → MQTT-Keys)."""
+
+import random
+from enum import Enum
+from typing import Any, cast
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bridge.config.registers import ESSENTIAL_REGISTERS
+from bridge.fast_decode import FastDecoder, compile_batch, read_batch
+from bridge.main import read_registers, read_registers_fast
+from bridge.sentinels import SentinelTable
+from bridge.transform import transform_data, transform_values
+from huawei_solar import AsyncHuaweiSolarClient
+from huawei_solar.exceptions import ConnectionInterruptedException, ReadException
+from huawei_solar.registers import REGISTERS as LIBRARY_REGISTERS
+from tmodbus.exceptions import IllegalDataAddressError, ModbusConnectionError
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU
+
+# Library-Dict ist auf RegisterName typisiert, die Tests greifen per Name (str) zu
+REGISTERS = cast(dict[str, Any], LIBRARY_REGISTERS)
+
+
+class _SimulatedInverter:
+    """Real AsyncHuaweiSolarClient whose execute() answers from a word map."""
+
+    def __init__(self, words: dict[int, int]):
+        self.words = words
+        self.requests: list[tuple[int, int]] = []
+        self.fail_at: set[int] = set()
+        self.client = AsyncHuaweiSolarClient(MagicMock(), unit_id=1)
+        self.client.execute = self.execute  # type: ignore[method-assign]
+
+    async def execute(self, pdu):
+        assert isinstance(pdu, RawReadHoldingRegistersPDU)
+        self.requests.append((pdu.start_address, pdu.quantity))
+        if pdu.start_address in self.fail_at:
+            raise IllegalDataAddressError(pdu.function_code)
+        return b"".join(self.words.get(pdu.start_address + i, 0).to_bytes(2, "big") for i in range(pdu.quantity))
+
+
+def _valid_enum_word(definition) -> int | None:
+    unit = definition.unit
+    if isinstance(unit, dict):
+        return int(next(iter(unit)))
+    if isinstance(unit, type) and issubclass(unit, Enum):
+        return int(next(iter(unit)).value)
+    return None
+
+
+def _random_words(seed: int) -> dict[int, int]:
+    """Random register contents, enum registers set to a value the library knows."""
+    rng = random.Random(seed)
+    words: dict[int, int] = {}
+    for name in ESSENTIAL_REGISTERS:
+        definition = REGISTERS[name]
+        for offset in range(definition.length):
+            words[definition.register + offset] = rng.choice((rng.randrange(65536), rng.randrange(200), 0xFFFF, 0x7FFF))
+        if (value := _valid_enum_word(definition)) is not None:
+            words[definition.register] = value
+    return words
+
+
+def _without_timestamp(data: dict) -> dict:
+    return {k: v for k, v in data.items() if k != "last_update"}
+
+
+# ---------------------------------------------------------------------------
+# TestCompile
+# ---------------------------------------------------------------------------
+
+
+class TestCompile:
+    """Struct-Format und Feldtabelle aus den Library-Definitionen."""
+
+    def test_plans_cover_all_mapped_registers(self):
+        decoder = FastDecoder(ESSENTIAL_REGISTERS)
+        names = [name for plan in decoder.plans for name in plan.names]
+        assert sorted(names + decoder.unknown) == sorted(ESSENTIAL_REGISTERS)
+        assert all(plan.quantity <= 125 for plan in decoder.plans)
+
+    def test_gap_becomes_pad_bytes(self):
+        plan = compile_batch(["active_power", "power_factor"], REGISTERS)
+        active, pf = REGISTERS["active_power"], REGISTERS["power_factor"]
+        gap = pf.register - (active.register + active.length)
+        assert plan.struct.format == f">{active.format}{'x' * 2 * gap}{pf.format}"
+        assert plan.quantity == pf.register + pf.length - active.register
+        assert [f.index for f in plan.fields] == [0, 1]
+
+    def test_gain_and_sentinels_taken_from_library(self):
+        plan = compile_batch(["power_factor"], REGISTERS)
+        (field,) = plan.fields
+        assert field.gain == REGISTERS["power_factor"].gain == 1000
+        assert REGISTERS["power_factor"].invalid_value in field.sentinels
+        assert field.definition is None
+
+    def test_enum_string_and_timestamp_use_library_decode(self):
+        decoder = FastDecoder(ESSENTIAL_REGISTERS)
+        library = {f.key for plan in decoder.plans for f in plan.fields if f.definition is not None}
+        assert {"model_name", "inverter_status", "startup_time"} <= library
+        assert "power_active" not in library
+
+    def test_unsorted_batch_rejected(self):
+        with pytest.raises(ValueError, match="increasing"):
+            compile_batch(["power_factor", "active_power"], REGISTERS)
+
+
+# ---------------------------------------------------------------------------
+# TestEquivalence
+# ---------------------------------------------------------------------------
+
+
+class TestEquivalence:
+    """Fast Path liefert exakt dieselben Werte wie read_registers + transform_data."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", range(5))
+    async def test_same_output_as_library_path(self, seed):
+        inverter = _SimulatedInverter(_random_words(seed))
+
+        regular_sentinels, fast_sentinels = SentinelTable(), SentinelTable()
+
+        with patch("bridge.transform.get_sentinel_table", return_value=regular_sentinels):
+            regular = transform_data(await read_registers(inverter.client))
+        decoder = FastDecoder(ESSENTIAL_REGISTERS, sentinels=fast_sentinels)
+        fast = transform_values(await read_registers_fast(inverter.client, decoder))
+
+        assert _without_timestamp(fast) == _without_timestamp(regular)
+        assert fast_sentinels.get_stats() == regular_sentinels.get_stats()
+        assert fast_sentinels.get_stats()
+
+    def test_type_sentinels_dropped_and_counted(self):
+        sentinels = SentinelTable()
+        decoder = FastDecoder([], sentinels=sentinels)
+        plan = compile_batch(["active_power", "power_factor"], REGISTERS, sentinels)
+        out: dict = {}
+
+        decoder.decode(plan, plan.struct.pack(2**31 - 1, 500), out)
+        assert out == {"power_factor": 0.5}
+
+        out.clear()
+        decoder.decode(plan, plan.struct.pack(32767, -(2**15)), out)
+        assert out == {"power_active": 32767}  # I32: 32767 ist ein gültiger Wert
+        assert sentinels.get_stats() == {"active_power": 1, "power_factor": 1}
+
+    def test_negative_values_and_gain(self):
+        plan = compile_batch(["active_power", "power_factor"], REGISTERS)
+        out: dict = {}
+        FastDecoder([]).decode(plan, memoryview(plan.struct.pack(-1500, -990)), out)
+        assert out == {"power_active": -1500, "power_factor": -0.99}
+
+    def test_unknown_enum_value_skipped(self):
+        plan = compile_batch(["device_status"], REGISTERS)
+        out: dict = {}
+        FastDecoder([]).decode(plan, plan.struct.pack(0x1234), out)
+        assert out == {}
+
+
+# ---------------------------------------------------------------------------
+# TestRead
+# ---------------------------------------------------------------------------
+
+
+class TestRead:
+    """Raw-Read pro Batch und Fallback."""
+
+    @pytest.mark.asyncio
+    async def test_one_request_per_batch(self):
+        inverter = _SimulatedInverter(_random_words(0))
+        decoder = FastDecoder(ESSENTIAL_REGISTERS)
+
+        await read_registers_fast(inverter.client, decoder)
+
+        assert inverter.requests == [(plan.start, plan.quantity) for plan in decoder.plans]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_single_reads(self):
+        inverter = _SimulatedInverter(_random_words(1))
+        decoder = FastDecoder(ESSENTIAL_REGISTERS)
+        failing = decoder.plans[-1]
+        inverter.fail_at.add(failing.start)
+
+        data = await read_registers_fast(inverter.client, decoder)
+
+        reference = transform_data(await read_registers(inverter.client, enable_batching=False))
+        assert _without_timestamp(transform_values(data)) == _without_timestamp(reference)
+        assert len(inverter.requests) > len(decoder.plans)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error,expected",
+        [
+            (IllegalDataAddressError(3), ReadException),
+            (ModbusConnectionError("gone"), ConnectionInterruptedException),
+        ],
+    )
+    async def test_errors_mapped_like_get_multiple(self, error, expected):
+        plan = compile_batch(["active_power"], REGISTERS)
+        client = MagicMock()
+        client.execute.side_effect = error
+        with pytest.raises(expected):
+            await read_batch(client, plan)
+
+    @pytest.mark.asyncio
+    async def test_short_response_rejected(self):
+        plan = compile_batch(["active_power"], REGISTERS)
+        client = MagicMock()
+
+        async def short(_pdu):
+            return b"\x00\x01"
+
+        client.execute = short
+        with pytest.raises(ReadException, match="expected 4 bytes"):
+            await read_batch(client, plan)
+
+    @pytest.mark.asyncio
+    async def test_main_once_uses_fast_path_when_enabled(self, mock_config):
+        from bridge.main import main_once, reset_state
+
+        reset_state()
+        mock_config.fast_decode = True
+        with (
+            patch("bridge.main.read_registers_fast", return_value={"power_active": 4500}) as fast,
+            patch("bridge.main.read_registers") as regular,
+            patch("bridge.main.publish_data") as publish,
+        ):
+            await main_once(MagicMock(), mock_config, 1)
+
+        fast.assert_called_once()
+        regular.assert_not_called()
+        assert publish.call_args[0][0]["power_active"] == 4500
+        reset_state()
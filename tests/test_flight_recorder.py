@@ -0,0 +1,246 @@
+# tests/test_flight_recorder.py
+
+"""Tests für den Flugschreiber (flight_recorder.py)."""
+
+import asyncio
+import json
+import logging
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.config.registers import ESSENTIAL_REGISTERS
+from bridge.flight_recorder import FlightRecorder, attach_flight_recorder, filter_decisions
+from huawei_solar import AsyncHuaweiSolarClient
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU
+
+
+@pytest.fixture(autouse=True)
+def reset_main_state():
+    main_module.reset_state()
+    yield
+    main_module.reset_state()
+
+
+def _client(execute) -> AsyncHuaweiSolarClient:
+    client = AsyncHuaweiSolarClient(MagicMock(), unit_id=1)
+    client.execute = execute  # type: ignore[method-assign]
+    return client
+
+
+# ---------------------------------------------------------------------------
+# TestRingBuffer
+# ---------------------------------------------------------------------------
+
+
+class TestRingBuffer:
+    """Begrenzter Puffer und Inhalt pro Cycle."""
+
+    def test_keeps_last_cycles(self, tmp_path):
+        recorder = FlightRecorder(cycles=3, directory=tmp_path)
+        for seq in range(1, 6):
+            recorder.begin_cycle(seq)
+            recorder.end_cycle()
+
+        snapshot = recorder.snapshot("test")
+        assert [cycle["seq"] for cycle in snapshot["cycles"]] == [3, 4, 5]
+        assert recorder.get_stats()["cycles"] == 3
+
+    def test_filter_decisions(self):
+        transformed = {"energy_yield_accumulated": 90.0, "power_active": 500}
+        published = {"energy_yield_accumulated": 100.0, "power_active": 500, "battery_charge_total": 7.0}
+        assert filter_decisions(transformed, published) == {
+            "energy_yield_accumulated": [90.0, 100.0],
+            "battery_charge_total": [None, 7.0],
+        }
+
+    def test_plan_errors_do_not_break_snapshot(self, tmp_path):
+        recorder = FlightRecorder(directory=tmp_path, plan=Mock(side_effect=RuntimeError("no plan")))
+        recorder.begin_cycle(1)
+        assert recorder.snapshot("test")["plan"] is None
+
+    @pytest.mark.asyncio
+    async def test_requests_recorded_only_during_cycle(self, tmp_path):
+        async def execute(pdu):
+            if pdu.start_address == 1:
+                raise TimeoutError("no answer")
+            return b"\x04\xd2"
+
+        recorder = FlightRecorder(directory=tmp_path)
+        client = _client(execute)
+        attach_flight_recorder(client, recorder)
+
+        await client.execute(RawReadHoldingRegistersPDU(32080, quantity=1))  # außerhalb eines Cycles
+        record = recorder.begin_cycle(1)
+        assert await client.execute(RawReadHoldingRegistersPDU(32080, quantity=1)) == b"\x04\xd2"
+        with pytest.raises(TimeoutError):
+            await client.execute(RawReadHoldingRegistersPDU(1, quantity=2))
+        recorder.end_cycle()
+
+        assert [request[:2] for request in record.requests] == [[32080, 1], [1, 2]]
+        requests = record.to_dict()["requests"]
+        assert requests[0][3:] == ["04d2", None]
+        assert requests[1][3:] == [None, "TimeoutError: no answer"]
+
+
+# ---------------------------------------------------------------------------
+# TestDump
+# ---------------------------------------------------------------------------
+
+
+class TestDump:
+    """Kompaktes JSON nach DUMP_DIR."""
+
+    @pytest.mark.asyncio
+    async def test_dump_writes_compact_json(self, tmp_path, caplog):
+        recorder = FlightRecorder(directory=tmp_path, plan=lambda: [["power_active", "power_input"]])
+        record = recorder.begin_cycle(7)
+        record.values = {"power_active": 4500}
+        record.fail(TimeoutError("read timed out"))
+        recorder.end_cycle()
+
+        with caplog.at_level(logging.INFO, logger="huawei.flight_recorder"):
+            path = await recorder.dump("error:timeout")
+
+        assert path is not None and path.parent == tmp_path
+        text = path.read_text()
+        assert ", " not in text and ": " not in text.replace("TimeoutError: read", "")
+        document = json.loads(text)
+        assert document["reason"] == "error:timeout"
+        assert document["plan"] == [["power_active", "power_input"]]
+        [cycle] = document["cycles"]
+        assert cycle["seq"] == 7
+        assert cycle["values"] == {"power_active": 4500}
+        assert cycle["error"][-1].startswith("TimeoutError: read timed out")
+        assert "Flight recorder (error:timeout)" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_empty_buffer_not_dumped(self, tmp_path):
+        assert await FlightRecorder(directory=tmp_path).dump("request") is None
+        assert not list(tmp_path.iterdir())
+
+    @pytest.mark.asyncio
+    async def test_keeps_latest_dumps(self, tmp_path):
+        recorder = FlightRecorder(directory=tmp_path, keep=2)
+        recorder.begin_cycle(1)
+        for _ in range(4):
+            await recorder.dump("request")
+            await asyncio.sleep(0.002)  # eindeutige Dateinamen
+        assert len(list(tmp_path.glob("flight-*.json"))) == 2
+        assert recorder.get_stats()["dumps"] == 4
+
+    @pytest.mark.asyncio
+    async def test_unwritable_directory_logged(self, tmp_path, caplog):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        recorder = FlightRecorder(directory=blocker / "sub")
+        recorder.begin_cycle(1)
+        with caplog.at_level(logging.ERROR, logger="huawei.flight_recorder"):
+            assert await recorder.dump("request") is None
+        assert "could not be written" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_mqtt_request_dumps(self, tmp_path):
+        recorder = FlightRecorder(directory=tmp_path)
+        recorder.begin_cycle(1)
+        with patch("bridge.flight_recorder.subscribe_command"):
+            recorder.start("huawei-solar/flight_recorder")
+        recorder.notify("huawei-solar/flight_recorder", b"")
+        await asyncio.sleep(0)  # call_soon_threadsafe
+        with patch("bridge.flight_recorder.unsubscribe_command"):
+            await recorder.stop()  # wartet auf den laufenden Dump
+        assert recorder.get_stats()["dumps"] == 1
+
+
+# ---------------------------------------------------------------------------
+# TestMainIntegration
+# ---------------------------------------------------------------------------
+
+
+class TestMainIntegration:
+    """Anbindung in main_once() / run_main_cycle()."""
+
+    @pytest.mark.asyncio
+    async def test_cycle_recorded(self, tmp_path, mock_client, mock_config):
+        recorder = main_module._state.flight_recorder = FlightRecorder(directory=tmp_path)
+        main_module._state.config = mock_config
+        with (
+            patch("bridge.main.read_registers", return_value={"power_active": 4500}),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})),
+            patch("bridge.main.publish_data", new_callable=AsyncMock),
+            patch("bridge.main.publish_status", new_callable=AsyncMock),
+            patch("bridge.main.log_cycle_summary"),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            await main_module.run_main_cycle(mock_client, mock_config, 3)
+
+        [cycle] = recorder.snapshot("test")["cycles"]
+        assert cycle["seq"] == 3
+        assert cycle["values"] == cycle["payload"] == {"power_active": 4500}
+        assert cycle["filtered"] == {}
+        assert set(cycle["timings"]) >= {"modbus", "total"}
+        assert recorder.current is None
+
+    @pytest.mark.asyncio
+    async def test_history_differs_per_cycle(self, tmp_path, mock_client, mock_config):
+        recorder = main_module._state.flight_recorder = FlightRecorder(directory=tmp_path)
+        main_module._state.config = mock_config
+        data: dict = {}
+        out: dict = {}
+
+        def read(*_args, **_kwargs):  # Read-Pfad und Transform verwenden ihre Dicts wieder
+            return data
+
+        def transform(values):
+            out["power_active"] = values["power_active"]
+            return out
+
+        with (
+            patch("bridge.main.read_registers", side_effect=read),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(side_effect=transform)),
+            patch("bridge.main.publish_data", new_callable=AsyncMock),
+            patch("bridge.main.publish_status", new_callable=AsyncMock),
+            patch("bridge.main.log_cycle_summary"),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            for seq, power in enumerate((1000, 2000, 3000), start=1):
+                data["power_active"] = power
+                await main_module.run_main_cycle(mock_client, mock_config, seq)
+
+        path = await recorder.dump("request")
+        assert path is not None
+        cycles = json.loads(path.read_text())["cycles"]
+        assert [cycle["values"]["power_active"] for cycle in cycles] == [1000, 2000, 3000]
+        assert [cycle["payload"]["power_active"] for cycle in cycles] == [1000, 2000, 3000]
+
+    @pytest.mark.asyncio
+    async def test_dumped_on_first_error_of_a_type(self, tmp_path, mock_client, mock_config):
+        recorder = main_module._state.flight_recorder = FlightRecorder(directory=tmp_path)
+        main_module._state.config = mock_config
+        with (
+            patch("bridge.main.main_once", side_effect=TimeoutError("read timed out")),
+            patch("bridge.main.publish_status", new_callable=AsyncMock),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            await main_module.run_main_cycle(mock_client, mock_config, 1)
+            await main_module.run_main_cycle(mock_client, mock_config, 2)  # gleicher Typ: kein zweiter Dump
+            await recorder.stop()
+
+        [dump] = tmp_path.glob("flight-*.json")
+        document = json.loads(dump.read_text())
+        assert document["reason"] == "error:timeout"
+        assert document["cycles"][0]["error"][-1].startswith("TimeoutError")
+
+    def test_disabled_with_zero_cycles(self, mock_config):
+        client = _client(AsyncMock())
+        assert main_module.start_flight_recorder(client, mock_config) is None
+        assert main_module._state.flight_recorder is None
+
+    @pytest.mark.parametrize("fast_decode,enable_batching", [(True, True), (False, True), (False, False)])
+    def test_read_plan_covers_registers(self, mock_config, fast_decode, enable_batching):
+        mock_config.fast_decode = fast_decode
+        mock_config.enable_batching = enable_batching
+        mock_config.batch_max_gap = 50
+        plan = main_module.read_plan(mock_config)
+        assert plan and all(batch for batch in plan)
+        assert {name for batch in plan for name in batch} == set(ESSENTIAL_REGISTERS)
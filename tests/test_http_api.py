@@ -0,0 +1,248 @@
+# tests/test_http_api.py
+
+"""Tests für die eingebettete HTTP API und den Docker-Healthcheck."""
+
+import asyncio
+import json
+import urllib.error
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bridge import healthcheck
+from bridge.config_manager import ConfigManager
+from bridge.http_api import HttpApi
+from bridge.latency import LatencyRecorder
+
+
+async def _request(port: int, raw: bytes) -> tuple[int, dict[str, str], bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), timeout=2)
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split(" ")[1]), headers, body
+
+
+async def _get(port: int, path: str) -> tuple[int, dict[str, str], bytes]:
+    return await _request(port, f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+
+
+@pytest.fixture
+def health() -> dict[str, Any]:
+    return {"alive": True, "cycle": 3}
+
+
+@pytest.fixture
+async def api(health: dict[str, Any]) -> AsyncIterator[HttpApi]:
+    server = HttpApi(lambda: health, host="127.0.0.1", port=0, keepalive=0.05)
+    await server.start()
+    yield server
+    await server.stop()
+
+
+# ---------------------------------------------------------------------------
+# TestEndpoints
+# ---------------------------------------------------------------------------
+
+
+class TestEndpoints:
+    """Snapshot, Health, Fehlerfälle."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_before_first_cycle(self, api):
+        status, _, body = await _get(api.port, "/api/snapshot")
+        assert status == 503
+        assert json.loads(body) == {"error": "no data yet"}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_contains_payload_and_metadata(self, api):
+        api.update({"power_active": 4500, "battery_soc": 85.456}, 7, {"modbus": 1.23456})
+
+        status, headers, body = await _get(api.port, "/api/snapshot")
+        doc = json.loads(body)
+
+        assert status == 200
+        assert headers["Content-Type"] == "application/json"
+        assert int(headers["Content-Length"]) == len(body)
+        assert doc["cycle"] == 7
+        assert doc["timings"] == {"modbus": 1.2346}
+        assert doc["age"] >= 0
+        assert doc["data"]["power_active"] == 4500
+        assert doc["data"]["battery_soc"] == 85.46
+        assert "last_update" in doc["data"]
+
+    @pytest.mark.asyncio
+    async def test_update_does_not_mutate_data(self, api):
+        data = {"power_active": 1}
+        api.update(data, 1)
+        assert data == {"power_active": 1}
+
+    @pytest.mark.asyncio
+    async def test_health_status_follows_alive(self, api, health):
+        status, _, body = await _get(api.port, "/api/health")
+        assert status == 200
+        assert json.loads(body) == {"alive": True, "cycle": 3}
+
+        health["alive"] = False
+        status, _, _ = await _get(api.port, "/api/health?verbose=1")
+        assert status == 503
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "raw,expected",
+        [
+            (b"GET /nope HTTP/1.1\r\n\r\n", 404),
+            (b"POST /api/snapshot HTTP/1.1\r\n\r\n", 405),
+            (b"garbage\r\n\r\n", 400),
+        ],
+    )
+    async def test_error_responses(self, api, raw, expected):
+        status, _, _ = await _request(api.port, raw)
+        assert status == expected
+
+    @pytest.mark.asyncio
+    async def test_metrics_without_provider_not_found(self, api):
+        status, _, _ = await _get(api.port, "/metrics")
+        assert status == 404
+
+    @pytest.mark.asyncio
+    async def test_metrics_openmetrics_exposition(self):
+        server = HttpApi(lambda: {"alive": True}, host="127.0.0.1", port=0, metrics=lambda: b"# EOF\n")
+        await server.start()
+        try:
+            status, headers, body = await _get(server.port, "/metrics")
+        finally:
+            await server.stop()
+
+        assert status == 200
+        assert headers["Content-Type"].startswith("application/openmetrics-text; version=1.0.0")
+        assert body == b"# EOF\n"
+
+    @pytest.mark.asyncio
+    async def test_latency_report_json_and_text(self):
+        recorder = LatencyRecorder()
+        recorder.record_register("power_active", 0.25)
+        server = HttpApi(lambda: {"alive": True}, host="127.0.0.1", port=0, latency=lambda: recorder)
+        await server.start()
+        try:
+            status, _, body = await _get(server.port, "/api/latency")
+            text_status, headers, text = await _get(server.port, "/api/latency.txt")
+        finally:
+            await server.stop()
+
+        assert status == 200
+        assert json.loads(body)["register:power_active"]["count"] == 1
+        assert text_status == 200
+        assert headers["Content-Type"].startswith("text/plain")
+        assert b"register:power_active" in text
+
+    @pytest.mark.asyncio
+    async def test_latency_without_provider_not_found(self, api):
+        status, _, _ = await _get(api.port, "/api/latency")
+        assert status == 404
+
+
+# ---------------------------------------------------------------------------
+# TestServerSentEvents
+# ---------------------------------------------------------------------------
+
+
+class TestServerSentEvents:
+    """SSE Stream."""
+
+    @pytest.mark.asyncio
+    async def test_stream_pushes_current_and_new_snapshots(self, api):
+        api.update({"power_active": 1}, 1)
+        reader, writer = await asyncio.open_connection("127.0.0.1", api.port)
+        writer.write(b"GET /api/events HTTP/1.1\r\n\r\n")
+        await writer.drain()
+
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=2)
+        assert b"200 OK" in head and b"text/event-stream" in head
+
+        first = await asyncio.wait_for(reader.readuntil(b"\n\n"), timeout=2)
+        assert first.startswith(b"event: snapshot\nid: 1\ndata: {")
+
+        api.update({"power_active": 2}, 2)
+        event = await asyncio.wait_for(reader.readuntil(b"\n\n"), timeout=2)
+        while event.startswith(b": keepalive"):
+            event = await asyncio.wait_for(reader.readuntil(b"\n\n"), timeout=2)
+        data = json.loads(event.split(b"data: ", 1)[1])
+        assert data["power_active"] == 2
+        assert api.client_count == 1
+
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_keepalive_on_silence(self, api):
+        reader, writer = await asyncio.open_connection("127.0.0.1", api.port)
+        writer.write(b"GET /api/events HTTP/1.1\r\n\r\n")
+        await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=2)
+        assert await asyncio.wait_for(reader.readuntil(b"\n\n"), timeout=2) == b": keepalive\n\n"
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_open_streams(self):
+        server = HttpApi(lambda: {"alive": True}, host="127.0.0.1", port=0, keepalive=10)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /api/events HTTP/1.1\r\n\r\n")
+        await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=2)
+
+        await asyncio.wait_for(server.stop(), timeout=2)
+        assert await asyncio.wait_for(reader.read(), timeout=2) == b""
+        writer.close()
+
+
+# ---------------------------------------------------------------------------
+# TestHealthcheck
+# ---------------------------------------------------------------------------
+
+
+class TestHealthcheck:
+    """python3 -m bridge.healthcheck"""
+
+    @pytest.mark.asyncio
+    async def test_healthy_and_unhealthy(self, api, health):
+        loop = asyncio.get_running_loop()
+        assert await loop.run_in_executor(None, healthcheck.check, api.port, 2) == 0
+
+        health["alive"] = False
+        assert await loop.run_in_executor(None, healthcheck.check, api.port, 2) == 1
+
+    @pytest.mark.parametrize("running,expected", [(True, 0), (False, 1)])
+    def test_refused_falls_back_to_process_check(self, running, expected):
+        refused = urllib.error.URLError(ConnectionRefusedError())
+        with (
+            patch("bridge.healthcheck.urllib.request.urlopen", side_effect=refused),
+            patch("bridge.healthcheck.subprocess.run", return_value=MagicMock(returncode=0 if running else 1)),
+        ):
+            assert healthcheck.check(1) == expected
+
+    @pytest.mark.parametrize("running,expected", [(True, 0), (False, 1)])
+    def test_disabled_api_uses_process_check(self, running, expected):
+        with (
+            patch("bridge.healthcheck.configured_port", return_value=0),
+            patch("bridge.healthcheck.urllib.request.urlopen") as urlopen,
+            patch("bridge.healthcheck.subprocess.run", return_value=MagicMock(returncode=0 if running else 1)),
+        ):
+            assert healthcheck.check() == expected
+        urlopen.assert_not_called()
+
+    def test_port_read_from_options(self, tmp_path, monkeypatch):
+        options = tmp_path / "options.json"
+        options.write_text('{"http_api_port": 8123}')
+        monkeypatch.setattr("bridge.healthcheck.ConfigManager", lambda: ConfigManager(options))
+        assert healthcheck.configured_port() == 8123
+
+        options.write_text("{broken")
+        assert healthcheck.configured_port() == 0
+
+    def test_timeout_is_unhealthy(self):
+        with patch("bridge.healthcheck.urllib.request.urlopen", side_effect=TimeoutError()):
+            assert healthcheck.check(1) == 1
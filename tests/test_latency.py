@@ -0,0 +1,135 @@
+# tests/test_latency.py
+
+"""Tests für die Latenz-Histogramme (latency.py) und ihre Anbindung in main.py."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bridge.latency import BUCKET_COUNT, LatencyRecorder, LogHistogram, bucket_upper_bound, get_latency_recorder
+from bridge.main import read_registers
+from huawei_solar.exceptions import ReadException
+
+# ---------------------------------------------------------------------------
+# TestLogHistogram
+# ---------------------------------------------------------------------------
+
+
+class TestLogHistogram:
+    """Bucket-Zuordnung und Perzentile."""
+
+    @pytest.mark.parametrize(
+        "seconds,index",
+        [(0.0005, 0), (0.001, 0), (0.0012, 1), (0.002, 2), (0.0021, 3), (1.0, 20), (10_000.0, BUCKET_COUNT - 1)],
+    )
+    def test_bucket_index(self, seconds, index):
+        histogram = LogHistogram()
+        histogram.observe(seconds)
+        assert histogram.buckets[index] == 1
+
+    def test_bucket_bounds(self):
+        assert bucket_upper_bound(0) == 0.001
+        assert bucket_upper_bound(2) == pytest.approx(0.002)
+        assert bucket_upper_bound(BUCKET_COUNT - 1) == float("inf")
+
+    def test_percentiles_within_one_bucket(self):
+        histogram = LogHistogram()
+        for _ in range(90):
+            histogram.observe(0.1)
+        for _ in range(10):
+            histogram.observe(2.0)
+
+        p50 = histogram.percentile(0.5)
+        assert p50 is not None and 0.1 <= p50 <= 0.1 * 2**0.5
+        assert histogram.percentile(0.99) == 2.0  # auf das Maximum gedeckelt
+
+    def test_summary_counts_failures(self):
+        histogram = LogHistogram()
+        histogram.observe(0.5)
+        histogram.observe(1.5, ok=False)
+
+        summary = histogram.summary()
+        assert summary["count"] == 2
+        assert summary["failures"] == 1
+        assert summary["mean"] == 1.0
+        assert summary["max"] == 1.5
+
+    def test_empty_summary(self):
+        assert LogHistogram().summary() == {
+            "count": 0,
+            "failures": 0,
+            "mean": None,
+            "p50": None,
+            "p90": None,
+            "p99": None,
+            "max": None,
+        }
+
+
+# ---------------------------------------------------------------------------
+# TestLatencyRecorder
+# ---------------------------------------------------------------------------
+
+
+class TestLatencyRecorder:
+    """Keys, Sortierung, Text-Report."""
+
+    def test_keys_for_registers_and_batches(self):
+        recorder = LatencyRecorder()
+        recorder.record_register("power_active", 0.2)
+        recorder.record_batch(["a", "b", "c"], 0.3)
+        recorder.record_batch(["d"], 0.1, ok=False)
+
+        assert set(recorder.report()) == {"register:power_active", "batch:a..c", "batch:d"}
+        histogram = recorder.get("batch:d")
+        assert histogram is not None and histogram.failures == 1
+
+    def test_report_slowest_first(self):
+        recorder = LatencyRecorder()
+        recorder.record_register("fast", 0.01)
+        recorder.record_register("slow", 3.0)
+        recorder.record_register("medium", 0.5)
+
+        assert list(recorder.report()) == ["register:slow", "register:medium", "register:fast"]
+        assert [key for key, _ in recorder.slowest(1)] == ["register:slow"]
+
+    def test_format_report(self):
+        recorder = LatencyRecorder()
+        recorder.record_register("power_active", 0.25)
+
+        lines = recorder.format_report().splitlines()
+        assert lines[0].split() == ["key", "count", "fail", "mean", "p50", "p90", "p99", "max"]
+        assert lines[2].split() == [
+            "register:power_active",
+            "1",
+            "0",
+            "250.0ms",
+            "250.0ms",
+            "250.0ms",
+            "250.0ms",
+            "250.0ms",
+        ]
+
+
+# ---------------------------------------------------------------------------
+# TestIntegration
+# ---------------------------------------------------------------------------
+
+
+class TestIntegration:
+    """Anbindung in read_registers()."""
+
+    @pytest.mark.asyncio
+    async def test_read_registers_records_batches_and_fallbacks(self, mock_client):
+        mock_client.get_multiple.side_effect = [[100, 200], ReadException("bad batch")]
+        mock_client.get = AsyncMock(return_value=300)
+        with (
+            patch("bridge.main.ESSENTIAL_REGISTERS", ["reg1", "reg2", "reg3"]),
+            patch("bridge.main.BatchBuilder") as builder,
+        ):
+            builder.return_value.build_batches.return_value = ([["reg1", "reg2"], ["reg3"]], [])
+            await read_registers(mock_client)
+
+        report = get_latency_recorder().report()
+        assert report["batch:reg1..reg2"]["failures"] == 0
+        assert report["batch:reg3"]["failures"] == 1
+        assert report["register:reg3"]["count"] == 1
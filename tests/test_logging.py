@@ -2,12 +2,23 @@
 
 """Tests for logging setup and behavior."""
 
+import io
+import json
 import logging
+from logging.handlers import QueueHandler
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from bridge.logging_utils import get_logger
+from bridge.error_tracker import ConnectionErrorTracker
+from bridge.logging_utils import (
+    JsonFormatter,
+    RateLimitFilter,
+    get_logger,
+    start_queue_logging,
+    stop_queue_logging,
+)
 from bridge.main import TRACE
+from bridge.total_increasing_filter import TotalIncreasingFilter
 
 # ---------------------------------------------------------------------------
 # TestTraceLevelRegistration
@@ -120,3 +131,162 @@ class TestTraceLoggingBehavior:
         logger = get_logger("test")
         logger.trace("🔬 Register read: power_active = 4500")
         assert "🔬" in caplog.text or "TRACE" in caplog.text
+
+
+# ---------------------------------------------------------------------------
+# TestRateLimitFilter
+# ---------------------------------------------------------------------------
+
+
+def _record(msg: str, rate_key: str | None = None) -> logging.LogRecord:
+    record = logging.LogRecord("huawei.test", logging.WARNING, __file__, 1, msg, None, None)
+    if rate_key is not None:
+        record.rate_key = rate_key
+    return record
+
+
+class TestRateLimitFilter:
+    """Wiederholte Meldungen pro rate_key."""
+
+    def test_records_without_key_pass(self):
+        rate_filter = RateLimitFilter(interval=300)
+        assert all(rate_filter.filter(_record("plain")) for _ in range(5))
+
+    def test_repeats_suppressed_and_counted(self):
+        rate_filter = RateLimitFilter(interval=300)
+        with patch("bridge.logging_utils.time.monotonic", side_effect=[0.0, 10.0, 20.0, 301.0]):
+            assert rate_filter.filter(_record("FILTERED a", "filtered:a"))
+            assert not rate_filter.filter(_record("FILTERED a", "filtered:a"))
+            assert not rate_filter.filter(_record("FILTERED a", "filtered:a"))
+            assert rate_filter.get_suppressed() == {"filtered:a": 2}
+
+            record = _record("FILTERED a", "filtered:a")
+            assert rate_filter.filter(record)
+        assert record.msg == "FILTERED a (2 similar suppressed)"
+        assert rate_filter.get_suppressed() == {}
+
+    def test_keys_independent(self):
+        rate_filter = RateLimitFilter(interval=300)
+        assert rate_filter.filter(_record("x", "critical:battery_power"))
+        assert rate_filter.filter(_record("y", "critical:power_active"))
+        assert not rate_filter.filter(_record("x", "critical:battery_power"))
+
+
+# ---------------------------------------------------------------------------
+# TestQueueLogging
+# ---------------------------------------------------------------------------
+
+
+class TestQueueLogging:
+    """Ausgabe über QueueHandler/QueueListener."""
+
+    def test_records_written_by_listener(self):
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        logger = logging.getLogger("test.queue_logging")
+        logger.propagate = False
+        queue_handler = start_queue_logging(logger, handler)
+        try:
+            logger.warning("value %d", 42, extra={"rate_key": "value"})
+            logger.warning("value %d", 43, extra={"rate_key": "value"})  # unterdrückt
+            logger.error("boom", exc_info=ValueError("bad"))
+        finally:
+            stop_queue_logging()
+            logger.removeHandler(queue_handler)
+
+        output = stream.getvalue()
+        assert "WARNING value 42" in output
+        assert "value 43" not in output
+        assert "ValueError: bad" in output
+
+    def test_init_logging_uses_queue_handler(self):
+        from bridge.main import init_logging
+
+        root = logging.getLogger()
+        init_logging("INFO")
+        try:
+            assert [type(handler) for handler in root.handlers] == [QueueHandler]
+        finally:
+            stop_queue_logging()
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+
+
+# ---------------------------------------------------------------------------
+# TestJsonOutput
+# ---------------------------------------------------------------------------
+
+
+class TestJsonOutput:
+    """log_format: json - eine JSON-Zeile pro Record mit den extra= Feldern."""
+
+    def test_record_fields(self):
+        record = logging.LogRecord("huawei.main", logging.WARNING, __file__, 1, "Cycle %.1fs", (3.25,), None)
+        record.cycle = 7
+        record.durations = {"modbus": 2.9}
+        record.rate_key = "cycle"
+
+        line = JsonFormatter().format(record)
+        entry = json.loads(line)
+        assert "\n" not in line and ", " not in line
+        assert entry["level"] == "WARNING"
+        assert entry["logger"] == "huawei.main"
+        assert entry["msg"] == "Cycle 3.2s"
+        assert entry["cycle"] == 7
+        assert entry["durations"] == {"modbus": 2.9}
+        assert "rate_key" not in entry and "args" not in entry
+        assert entry["ts"][:4].isdigit() and "T" in entry["ts"]
+
+    def test_exception_in_single_line(self):
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger("test.json_logging")
+        logger.propagate = False
+        queue_handler = start_queue_logging(logger, handler, JsonFormatter())
+        try:
+            logger.error("boom", exc_info=ValueError("bad"), extra={"cycle": 3, "error_type": "other"})
+        finally:
+            stop_queue_logging()
+            logger.removeHandler(queue_handler)
+
+        [line] = stream.getvalue().splitlines()
+        entry = json.loads(line)
+        assert entry["msg"] == "boom"
+        assert entry["error_type"] == "other"
+        assert entry["exc"].endswith("ValueError: bad")
+
+    def test_init_logging_json(self):
+        from bridge.main import init_logging
+
+        root = logging.getLogger()
+        init_logging("INFO", "json")
+        try:
+            [queue_handler] = root.handlers
+            assert isinstance(queue_handler.formatter, JsonFormatter)
+        finally:
+            stop_queue_logging()
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+
+    def test_error_tracker_fields(self, caplog):
+        tracker = ConnectionErrorTracker(log_interval=60)
+        with caplog.at_level(logging.INFO, logger="huawei.errors"):
+            tracker.track_error("timeout", "no answer")
+            tracker.mark_success()
+
+        first, restored = caplog.records
+        assert (first.error_type, first.count) == ("timeout", 1)
+        assert restored.error_types == ["timeout"]
+        assert restored.count == 1
+
+    def test_filter_fields(self, caplog):
+        total_filter = TotalIncreasingFilter()
+        total_filter.filter({"energy_yield_accumulated": 100.0})
+        with caplog.at_level(logging.WARNING, logger="huawei.filter"):
+            total_filter.filter({"energy_yield_accumulated": 0.0})
+
+        [record] = [r for r in caplog.records if "FILTERED" in r.getMessage()]
+        assert record.register == "energy_yield_accumulated"
+        assert (record.value, record.last) == (0.0, 100.0)
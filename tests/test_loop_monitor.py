@@ -0,0 +1,113 @@
+# tests/test_loop_monitor.py
+
+"""Tests für den Event-Loop-Monitor (loop_monitor.py)."""
+
+import asyncio
+import logging
+import time
+
+import pytest
+from bridge import main as main_module
+from bridge.latency import get_latency_recorder
+from bridge.loop_monitor import LoopMonitor
+from bridge.metrics import get_metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_main_state():
+    main_module.reset_state()
+    yield
+    main_module.reset_state()
+
+
+# ---------------------------------------------------------------------------
+# TestStalls
+# ---------------------------------------------------------------------------
+
+
+class TestStalls:
+    """Slow-Callback-Meldungen von asyncio."""
+
+    def test_keeps_longest_stalls(self):
+        monitor = LoopMonitor(max_stalls=2)
+        for duration in (0.1, 0.4, 0.2, 0.3):
+            monitor.observe_slow_callback(f"<Handle {duration}>", duration)
+
+        stats = monitor.get_stats()
+        assert stats["slow_callbacks"] == 4
+        assert [stall["duration"] for stall in stats["stalls"]] == [0.4, 0.3]
+        assert stats["stalls"][0]["callback"] == "<Handle 0.4>"
+        assert get_metrics().slow_callbacks.get() == 4
+
+    def test_long_stall_logged_as_warning(self, caplog):
+        monitor = LoopMonitor()
+        with caplog.at_level(logging.DEBUG, logger="huawei.loop"):
+            monitor.observe_slow_callback("<Handle short>", 0.06)
+            monitor.observe_slow_callback("<Handle long>", 0.8)
+
+        levels = {r.getMessage().split("by ")[1]: r.levelno for r in caplog.records if r.name == "huawei.loop"}
+        assert levels == {"<Handle short>": logging.DEBUG, "<Handle long>": logging.WARNING}
+
+    @pytest.mark.asyncio
+    async def test_asyncio_warning_diverted(self, caplog):
+        monitor = LoopMonitor()
+        monitor.start()
+        try:
+            with caplog.at_level(logging.WARNING):
+                logging.getLogger("asyncio").warning("Executing %s took %.3f seconds", "<Handle cb()>", 0.2)
+                logging.getLogger("asyncio").warning("Unrelated %s", "message")
+        finally:
+            await monitor.stop()
+
+        assert monitor.get_stats()["stalls"][0]["callback"] == "<Handle cb()>"
+        assert [r.getMessage() for r in caplog.records if r.name == "asyncio"] == ["Unrelated message"]
+
+    @pytest.mark.asyncio
+    async def test_blocking_callback_detected(self):
+        loop = asyncio.get_running_loop()
+        monitor = LoopMonitor(interval=0.01, slow_callback=0.05)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.03)
+            loop.call_soon(time.sleep, 0.12)
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["slow_callbacks"] >= 1
+        assert "sleep" in stats["stalls"][0]["callback"]
+        assert stats["max_lag"] >= 0.05
+        assert get_latency_recorder().get("loop:lag") is not None
+
+
+# ---------------------------------------------------------------------------
+# TestLifecycle
+# ---------------------------------------------------------------------------
+
+
+class TestLifecycle:
+    """Start/Stop und Anbindung in main.py."""
+
+    @pytest.mark.asyncio
+    async def test_stop_restores_debug_and_filter(self):
+        loop = asyncio.get_running_loop()
+        debug = loop.get_debug()
+        monitor = LoopMonitor()
+        monitor.start()
+        assert loop.get_debug()
+
+        await monitor.stop()
+        assert loop.get_debug() == debug
+        assert not logging.getLogger("asyncio").filters
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, mock_config):
+        assert main_module.start_loop_monitor(mock_config) is None
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, mock_config):
+        mock_config.loop_monitor = True
+        assert main_module.start_loop_monitor(mock_config) is main_module._state.loop_monitor
+        await main_module.stop_loop_monitor()
+        assert main_module._state.loop_monitor is None
@@ -7,6 +7,7 @@ import importlib
 import logging
 import sys
 import time
+from contextlib import ExitStack
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import bridge.main as main_module
@@ -28,6 +29,7 @@ from bridge.main import (
     setup_modbus,
 )
 from huawei_solar.exceptions import ReadException
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU
 
 # ---------------------------------------------------------------------------
 # Module-level test data for log_cycle_summary tests
@@ -180,6 +182,49 @@ class TestMain:
         assert mock_disconnect.call_count >= 1
         assert any(call[0][0] == "offline" for call in mock_status.call_args_list)
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error,exit_code", [(asyncio.CancelledError(), None), (RuntimeError("boom"), 1)])
+    async def test_shutdown_runs_once_on_every_exit_path(self, mock_config, mock_client, error, exit_code):
+        """Cancel und fatale Fehler laufen durch denselben _shutdown()."""
+        with (
+            patch("bridge.main.ConfigManager", return_value=mock_config),
+            patch("bridge.main.create_tcp_client", return_value=mock_client),
+            patch("bridge.main.connect_mqtt", new_callable=AsyncMock),
+            patch("bridge.main.publish_discovery_configs", new_callable=AsyncMock),
+            patch("bridge.main.main_once", side_effect=error),
+            patch("bridge.main._shutdown", new_callable=AsyncMock) as mock_shutdown,
+        ):
+            if exit_code is None:
+                await main()
+            else:
+                with pytest.raises(SystemExit) as exc_info:
+                    await main()
+                assert exc_info.value.code == exit_code
+
+        mock_shutdown.assert_awaited_once_with(mock_config)
+
+    @pytest.mark.asyncio
+    async def test_shutdown_stops_services_then_disconnects(self, mock_config):
+        stops = [
+            "stop_mqtt_supervisor",
+            "stop_control",
+            "stop_refresh",
+            "stop_modbus_proxy",
+            "stop_http_api",
+            "stop_loop_monitor",
+            "stop_profiler",
+            "stop_flight_recorder",
+            "stop_output_sinks",
+        ]
+        manager = Mock()
+        with ExitStack() as stack:
+            for name in [*stops, "disconnect_mqtt"]:
+                manager.attach_mock(stack.enter_context(patch(f"bridge.main.{name}", new_callable=AsyncMock)), name)
+            stack.enter_context(patch("bridge.main.publish_status", new_callable=AsyncMock))
+            await main_module._shutdown(mock_config)
+
+        assert [c[0] for c in manager.mock_calls] == [*stops, "disconnect_mqtt"]
+
     @pytest.mark.asyncio
     async def test_timeout_triggers_filter_reset(self, mock_config, mock_client):
         """TimeoutError triggers filter reset and retry."""
@@ -457,6 +502,22 @@ class TestRunMainCycleExceptionHandling:
 
         mock_maybe.assert_called_once()
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("published", [True, False])
+    async def test_online_only_after_publish(self, mock_client, mock_config, published):
+        """A cycle whose publish was skipped neither marks success nor reports online."""
+        main_module._state.config = mock_config
+        main_module._error_tracker.track_error("timeout", "no response")
+        with (
+            patch("bridge.main.main_once", new_callable=AsyncMock, return_value=published),
+            patch("bridge.main.publish_status", new_callable=AsyncMock) as mock_status,
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            await run_main_cycle(mock_client, mock_config, 1)
+
+        assert (mock_status.await_count == 1) is published
+        assert (not main_module._error_tracker.errors) is published
+
 
 # ---------------------------------------------------------------------------
 # TestRecoverableExceptionsSanitized
@@ -507,7 +568,9 @@ class TestMainOnce:
         """Executes read -> transform -> filter -> publish in sequence."""
         with (
             patch("bridge.main.read_registers", return_value={"power_active": 4500}) as mock_read,
-            patch("bridge.main.transform_data", return_value={"power_active": 4500}) as mock_transform,
+            patch(
+                "bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})
+            ) as mock_transform,
             patch("bridge.main.publish_data", new_callable=AsyncMock) as mock_publish,
             patch("bridge.main.log_cycle_summary"),
             patch("bridge.main.get_filter") as mock_get_filter,
@@ -519,10 +582,89 @@ class TestMainOnce:
             await main_once(mock_client, mock_config, 1)
 
             assert mock_read.call_count == 1
-            assert mock_transform.call_count == 1
+            assert mock_transform.return_value.call_count == 1
             assert mock_filter.filter.call_count == 1
             assert mock_publish.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_mqtt_outage_skips_publish_without_raising(self, mock_client, mock_config):
+        """A publish during an MQTT outage is skipped while the supervisor reconnects."""
+        main_module._state.last_success = 0.0
+        with (
+            patch("bridge.main.read_registers", return_value={"power_active": 4500}),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})),
+            patch("bridge.main.publish_data", new_callable=AsyncMock, side_effect=ConnectionError("not connected")),
+            patch("bridge.main.is_mqtt_connected", return_value=False),
+            patch("bridge.main.log_cycle_summary") as mock_summary,
+        ):
+            assert await main_once(mock_client, mock_config, 1) is False
+
+        mock_summary.assert_not_called()
+        assert main_module._state.last_success == 0.0
+
+    @pytest.mark.asyncio
+    async def test_publish_connection_error_while_connected_propagates(self, mock_client, mock_config):
+        with (
+            patch("bridge.main.read_registers", return_value={"power_active": 4500}),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})),
+            patch("bridge.main.publish_data", new_callable=AsyncMock, side_effect=ConnectionError("boom")),
+            patch("bridge.main.is_mqtt_connected", return_value=True),
+        ):
+            with pytest.raises(ConnectionError):
+                await main_once(mock_client, mock_config, 1)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("enabled", [False, True])
+    async def test_binary_payload_published_only_when_enabled(self, mock_client, mock_config, enabled):
+        mock_config.mqtt_binary_payload = enabled
+        with (
+            patch("bridge.main.read_registers", return_value={"power_active": 4500}),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})),
+            patch("bridge.main.publish_data", new_callable=AsyncMock),
+            patch("bridge.main.publish_binary", new_callable=AsyncMock) as mock_binary,
+            patch("bridge.main.log_cycle_summary"),
+        ):
+            await main_once(mock_client, mock_config, 1)
+
+        assert mock_binary.await_count == (1 if enabled else 0)
+        if enabled:
+            assert mock_binary.await_args_list[0].args[1] == mock_config.mqtt_topic
+
+    @pytest.mark.asyncio
+    async def test_output_sinks_receive_snapshot_during_mqtt_outage(self, mock_client, mock_config):
+        sinks = Mock()
+        main_module._state.output_sinks = sinks
+        with (
+            patch("bridge.main.read_registers", return_value={"power_active": 4500}),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})),
+            patch("bridge.main.publish_data", new_callable=AsyncMock, side_effect=ConnectionError("not connected")),
+            patch("bridge.main.is_mqtt_connected", return_value=False),
+            patch("bridge.main.get_filter") as mock_get_filter,
+        ):
+            mock_get_filter.return_value.filter.return_value = {"power_active": 4500}
+            await main_once(mock_client, mock_config, 7)
+
+        sinks.submit.assert_called_once_with({"power_active": 4500}, cycle=7)
+
+    @pytest.mark.asyncio
+    async def test_http_api_receives_snapshot_and_cycle(self, mock_client, mock_config):
+        api = Mock()
+        main_module._state.http_api = api
+        with (
+            patch("bridge.main.read_registers", return_value={"power_active": 4500}),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})),
+            patch("bridge.main.publish_data", new_callable=AsyncMock),
+            patch("bridge.main.log_cycle_summary"),
+            patch("bridge.main.get_filter") as mock_get_filter,
+        ):
+            mock_get_filter.return_value.filter.return_value = {"power_active": 4500}
+            await main_once(mock_client, mock_config, 5)
+
+        data, cycle, timings = api.update.call_args.args
+        assert data == {"power_active": 4500}
+        assert cycle == 5
+        assert set(timings) == {"modbus", "transform", "filter"}
+
     @pytest.mark.asyncio
     async def test_empty_data_skips_publish(self, mock_client, mock_config):
         """Returns early without publishing when read returns empty data."""
@@ -542,7 +684,7 @@ class TestMainOnce:
 
         with (
             patch("bridge.main.read_registers", return_value={"power_active": 4500}),
-            patch("bridge.main.transform_data", return_value={"power_active": 4500}),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})),
             patch("bridge.main.publish_data", new_callable=AsyncMock),
             patch("bridge.main.log_cycle_summary"),
             patch("bridge.main.get_filter") as mock_get_filter,
@@ -569,6 +711,137 @@ class TestMainOnce:
         assert main_module._state.last_success == previous_success
 
 
+# ---------------------------------------------------------------------------
+# TestMqttReconnect
+# ---------------------------------------------------------------------------
+
+
+class TestMqttReconnect:
+    """Tests for the MQTT supervisor wiring in main."""
+
+    @pytest.mark.asyncio
+    async def test_reconnect_republishes_discovery_and_online_status(self, mock_config):
+        main_module._state.last_success = time.time()
+        with (
+            patch("bridge.main.publish_discovery_configs", new_callable=AsyncMock) as mock_discovery,
+            patch("bridge.main.publish_status", new_callable=AsyncMock) as mock_status,
+        ):
+            await main_module._on_mqtt_reconnected(mock_config)
+
+        mock_discovery.assert_awaited_once_with("huawei-solar", diagnostics=False)
+        mock_status.assert_awaited_once_with("online", "huawei-solar", force=True)
+
+    @pytest.mark.asyncio
+    async def test_reconnect_publishes_offline_while_inverter_failing(self, mock_config):
+        main_module._state.last_success = time.time()
+        main_module._error_tracker.track_error("timeout", "no response")
+        with (
+            patch("bridge.main.publish_discovery_configs", new_callable=AsyncMock),
+            patch("bridge.main.publish_status", new_callable=AsyncMock) as mock_status,
+        ):
+            await main_module._on_mqtt_reconnected(mock_config)
+
+        mock_status.assert_awaited_once_with("offline", "huawei-solar", force=True)
+
+    def test_build_publish_policy_from_config(self, mock_config):
+        mock_config.mqtt_data_qos = 0
+        mock_config.mqtt_data_retain = False
+        mock_config.mqtt_retained_snapshot_interval = 300
+        mock_config.mqtt_status_keepalive = 600
+
+        policy = main_module.build_publish_policy(mock_config)
+
+        assert policy.data.qos == 0
+        assert policy.data.retain is False
+        assert policy.retained_snapshot_interval == 300
+        assert policy.status_keepalive == 600
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop_supervisor(self, mock_config):
+        supervisor = main_module.start_mqtt_supervisor(mock_config)
+        assert main_module._state.mqtt_supervisor is supervisor
+
+        await main_module.stop_mqtt_supervisor()
+        assert main_module._state.mqtt_supervisor is None
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop_output_sinks(self, mock_config, tmp_path):
+        mock_config.output_ndjson_file = str(tmp_path / "data.ndjson")
+        sinks = main_module.start_output_sinks(mock_config)
+        assert main_module._state.output_sinks is sinks
+        assert [w.sink.name for w in sinks.workers] == ["ndjson"]
+
+        await main_module.stop_output_sinks()
+        assert main_module._state.output_sinks is None
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop_http_api(self, mock_config):
+        assert await main_module.start_http_api(mock_config) is None
+
+        mock_config.http_api_port = 1
+        with patch("bridge.main.HttpApi.start", new_callable=AsyncMock, side_effect=OSError("denied")):
+            assert await main_module.start_http_api(mock_config) is None
+
+        with patch("bridge.main.HttpApi.start", new_callable=AsyncMock):
+            api = await main_module.start_http_api(mock_config)
+        assert main_module._state.http_api is api
+        assert api.health()["alive"] is True
+
+        await main_module.stop_http_api()
+        assert main_module._state.http_api is None
+
+    def test_bridge_health_alive_and_inverter_state(self, mock_config):
+        now = time.time()
+        main_module._state.last_cycle = now - 5
+        main_module._state.last_success = now - 5
+        with patch("bridge.main.is_mqtt_connected", return_value=True):
+            health = main_module.bridge_health(mock_config)
+        assert health["alive"] is True
+        assert health["inverter_online"] is True
+        assert health["mqtt_connected"] is True
+
+        main_module._state.last_success = now - mock_config.status_timeout - 1
+        assert main_module.bridge_health(mock_config)["inverter_online"] is False
+        assert main_module.bridge_health(mock_config)["alive"] is True
+
+    def test_bridge_health_detects_stuck_main_loop(self, mock_config):
+        main_module._state.last_cycle = time.time() - max(mock_config.status_timeout, 3 * mock_config.poll_interval) - 1
+        health = main_module.bridge_health(mock_config)
+        assert health["alive"] is False
+        assert health["last_success_age"] is None
+
+    @pytest.mark.asyncio
+    async def test_modbus_proxy_disabled_by_default(self, mock_config):
+        assert await main_module.start_modbus_proxy(MagicMock(), mock_config) is None
+        assert main_module._state.modbus_proxy is None
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop_modbus_proxy(self, mock_config, caplog):
+        mock_config.modbus_proxy = True
+        mock_config.modbus_proxy_port = 0
+        client = MagicMock(unit_id=1)
+        client.execute = AsyncMock(return_value=b"\x00\x07")
+
+        with caplog.at_level(logging.WARNING, logger="huawei.main"):
+            proxy = await main_module.start_modbus_proxy(client, mock_config)
+        assert main_module._state.modbus_proxy is proxy
+        assert "not mapped by the add-on" in caplog.text
+        assert proxy.max_age == mock_config.poll_interval * 2
+
+        await client.execute(RawReadHoldingRegistersPDU(32000, 1))
+        assert proxy.image.read(32000, 1) == [7]
+
+        await main_module.stop_modbus_proxy()
+        assert main_module._state.modbus_proxy is None
+
+    @pytest.mark.asyncio
+    async def test_modbus_proxy_bind_failure_keeps_bridge_running(self, mock_config):
+        mock_config.modbus_proxy = True
+        with patch("bridge.main.ModbusProxy.start", new_callable=AsyncMock, side_effect=OSError("in use")):
+            assert await main_module.start_modbus_proxy(MagicMock(unit_id=1), mock_config) is None
+        assert main_module._state.modbus_proxy is None
+
+
 # ---------------------------------------------------------------------------
 # TestInitLogging
 # ---------------------------------------------------------------------------
@@ -0,0 +1,158 @@
+# tests/test_metrics.py
+
+"""Tests für die OpenMetrics-Registry (metrics.py) und ihre Anbindung in main.py."""
+
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.main import main_once, read_registers, run_main_cycle
+from bridge.metrics import MetricsRegistry, _Metric, get_metrics
+from bridge.total_increasing_filter import get_filter
+from huawei_solar.exceptions import ReadException
+
+
+def _lines(registry: MetricsRegistry) -> list[str]:
+    body: bytes = registry.render()
+    return body.decode().splitlines()
+
+
+@pytest.fixture(autouse=True)
+def reset_main_state() -> Iterator[None]:
+    main_module.reset_state()
+    yield
+    main_module.reset_state()
+
+
+# ---------------------------------------------------------------------------
+# TestExposition
+# ---------------------------------------------------------------------------
+
+
+class TestExposition:
+    """OpenMetrics-Textformat."""
+
+    def test_metric_without_samples_cannot_be_created(self):
+        class Incomplete(_Metric):
+            kind = "gauge"
+
+        with pytest.raises(TypeError, match="samples"):
+            Incomplete("x", "X.")
+
+    def test_counter_rendered_with_total_suffix(self):
+        registry = MetricsRegistry()
+        cycles = registry.counter("x_cycles", "Cycles.", ["result"])
+        cycles.inc("published")
+        cycles.inc("published")
+        cycles.inc("failed")
+
+        assert _lines(registry) == [
+            "# TYPE x_cycles counter",
+            "# HELP x_cycles Cycles.",
+            'x_cycles_total{result="failed"} 1',
+            'x_cycles_total{result="published"} 2',
+            "# EOF",
+        ]
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("x_seconds", "Durations.", ["phase"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "modbus")
+
+        assert _lines(registry)[2:-1] == [
+            'x_seconds_bucket{phase="modbus",le="0.1"} 2',
+            'x_seconds_bucket{phase="modbus",le="1"} 3',
+            'x_seconds_bucket{phase="modbus",le="+Inf"} 4',
+            'x_seconds_count{phase="modbus"} 4',
+            'x_seconds_sum{phase="modbus"} 3.65',
+        ]
+
+    def test_gauge_and_label_escaping(self):
+        registry = MetricsRegistry()
+        registry.gauge("x_info", "Info.", ["name"]).set(1.5, 'a"b\\c')
+        assert _lines(registry)[2] == 'x_info{name="a\\"b\\\\c"} 1.5'
+
+    def test_ends_with_eof_newline(self):
+        assert MetricsRegistry().render() == b"# EOF\n"
+
+    def test_label_count_checked(self):
+        counter = MetricsRegistry().counter("x", "X.", ["a"])
+        with pytest.raises(ValueError):
+            counter.inc()
+
+    def test_duplicate_name_rejected(self):
+        registry = MetricsRegistry()
+        registry.gauge("x", "X.")
+        with pytest.raises(ValueError):
+            registry.counter("x", "X.")
+
+    def test_filter_totals_collected_on_render(self):
+        filter_instance = get_filter()
+        before = filter_instance.get_totals().get("energy_yield_accumulated", 0)
+        filter_instance.filter({"energy_yield_accumulated": 100.0})
+        filter_instance.filter({"energy_yield_accumulated": 50.0})
+        filter_instance.reset_stats()  # 20-Cycle-Summary setzt nur die Log-Statistik zurück
+        filter_instance.reset()  # Verbindungsfehler ebenso
+
+        body = get_metrics().render().decode()
+        assert f'huabus_filtered_values_total{{key="energy_yield_accumulated"}} {before + 1}' in body
+
+
+# ---------------------------------------------------------------------------
+# TestBridgeInstrumentation
+# ---------------------------------------------------------------------------
+
+
+class TestBridgeInstrumentation:
+    """Zähler und Histogramme aus dem Poll-Cycle."""
+
+    @pytest.mark.asyncio
+    async def test_published_cycle_records_phases(self, mock_client, mock_config):
+        with (
+            patch("bridge.main.read_registers", return_value={"power_active": 4500}),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})),
+            patch("bridge.main.publish_data", new_callable=AsyncMock),
+            patch("bridge.main.log_cycle_summary"),
+        ):
+            await main_once(mock_client, mock_config, 1)
+
+        metrics = get_metrics()
+        assert metrics.cycles.get("published") == 1
+        for phase in ("modbus", "transform", "filter", "mqtt", "total"):
+            assert metrics.phase_seconds.count(phase) == 1
+        assert metrics.last_success.get() == main_module._state.last_success
+
+    @pytest.mark.asyncio
+    async def test_failed_cycle_counted_by_error_type(self, mock_client, mock_config):
+        with (
+            patch("bridge.main.main_once", side_effect=TimeoutError()),
+            patch("bridge.main.publish_status", new_callable=AsyncMock),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            main_module._state.config = mock_config
+            await run_main_cycle(mock_client, mock_config, 1)
+
+        metrics = get_metrics()
+        assert metrics.cycles.get("failed") == 1
+        assert metrics.failures.get("timeout") == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_timings_and_fallback_reads(self, mock_client):
+        mock_client.get_multiple.side_effect = [[100, 200], ReadException("bad batch")]
+        mock_client.get = AsyncMock(return_value=300)
+        with (
+            patch("bridge.main.ESSENTIAL_REGISTERS", ["reg1", "reg2", "reg3"]),
+            patch("bridge.main.BatchBuilder") as builder,
+        ):
+            builder.return_value.build_batches.return_value = ([["reg1", "reg2"], ["reg3"]], [])
+            await read_registers(mock_client)
+
+        metrics = get_metrics()
+        assert metrics.batch_seconds.count("1") == 1
+        assert metrics.batch_seconds.count("2") == 0
+        assert metrics.batch_failures.get() == 1
+        assert metrics.fallback_reads.get() == 1
+        assert metrics.plan_batches.get() == 2
+        assert metrics.plan_registers.get() == 3
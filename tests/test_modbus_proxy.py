@@ -0,0 +1,173 @@
+# tests/test_modbus_proxy.py
+
+"""Tests für den lokalen Modbus TCP Proxy."""
+
+import struct
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bridge.modbus_proxy import ModbusProxy, attach_register_image
+from bridge.register_image import RegisterImage
+from tmodbus import create_async_tcp_client
+from tmodbus.exceptions import (
+    GatewayTargetDeviceFailedToRespondError,
+    IllegalDataAddressError,
+    IllegalFunctionError,
+    ModbusConnectionError,
+)
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU, ReadHoldingRegistersPDU
+
+
+class _FakeClient:
+    """Minimal stand-in for AsyncHuaweiSolarClient (execute + for_unit_id)."""
+
+    def __init__(self, unit_id: int = 1):
+        self.unit_id = unit_id
+        self.requests: list[tuple[int, int, int]] = []
+        self.error: Exception | None = None
+        self.other_units: dict[int, _FakeClient] = {}
+        self.image = RegisterImage()
+
+    async def execute(self, pdu):
+        self.requests.append((self.unit_id, pdu.start_address, pdu.quantity))
+        if self.error is not None:
+            raise self.error
+        values = [(pdu.start_address + i) & 0xFFFF for i in range(pdu.quantity)]
+        if isinstance(pdu, RawReadHoldingRegistersPDU):
+            return struct.pack(f">{pdu.quantity}H", *values)
+        return values
+
+    def for_unit_id(self, unit_id):
+        if unit_id == self.unit_id:
+            return self
+        return self.other_units.setdefault(unit_id, _FakeClient(unit_id))
+
+
+@pytest.fixture
+def client() -> _FakeClient:
+    fake = _FakeClient()
+    attach_register_image(fake, fake.image)
+    return fake
+
+
+# ---------------------------------------------------------------------------
+# TestAttachRegisterImage
+# ---------------------------------------------------------------------------
+
+
+class TestAttachRegisterImage:
+    """Recording der Poll-Antworten."""
+
+    @pytest.mark.asyncio
+    async def test_raw_batch_reads_are_recorded(self, client):
+        response = await client.execute(RawReadHoldingRegistersPDU(32000, 4))
+        assert response == struct.pack(">4H", 32000, 32001, 32002, 32003)
+        assert client.image.read(32001, 2) == [32001, 32002]
+
+    @pytest.mark.asyncio
+    async def test_register_list_reads_are_recorded(self, client):
+        await client.execute(ReadHoldingRegistersPDU(100, 2))
+        assert client.image.read(100, 2) == [100, 101]
+
+    @pytest.mark.asyncio
+    async def test_other_pdus_are_not_recorded(self, client):
+        pdu = MagicMock(start_address=5, quantity=1)
+        await client.execute(pdu)
+        assert len(client.image) == 0
+
+
+# ---------------------------------------------------------------------------
+# TestReadHoldingRegisters
+# ---------------------------------------------------------------------------
+
+
+class TestReadHoldingRegisters:
+    """FC03 Handler: Cache, Weiterleitung, Fehler."""
+
+    @pytest.mark.asyncio
+    async def test_cached_range_served_without_inverter_read(self, client):
+        client.image.record(32000, [7, 8, 9])
+        proxy = ModbusProxy(client, client.image)
+
+        assert await proxy.read_holding_registers(1, ReadHoldingRegistersPDU(32001, 2)) == [8, 9]
+        assert client.requests == []
+        assert proxy.get_stats()["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_uncached_range_is_forwarded_and_cached(self, client):
+        proxy = ModbusProxy(client, client.image)
+
+        assert await proxy.read_holding_registers(1, ReadHoldingRegistersPDU(47000, 2)) == [47000, 47001]
+        assert await proxy.read_holding_registers(1, ReadHoldingRegistersPDU(47000, 2)) == [47000, 47001]
+
+        assert client.requests == [(1, 47000, 2)]
+        assert proxy.get_stats() == {"cache_hits": 1, "forwarded": 1, "failed": 0, "cached_registers": 2}
+
+    @pytest.mark.asyncio
+    async def test_stale_range_is_forwarded(self, client):
+        client.image.record(32000, [7], timestamp=0.0)
+        proxy = ModbusProxy(client, client.image, max_age=60)
+
+        assert await proxy.read_holding_registers(1, ReadHoldingRegistersPDU(32000, 1)) == [32000]
+        assert client.requests == [(1, 32000, 1)]
+
+    @pytest.mark.asyncio
+    async def test_other_unit_id_is_forwarded_uncached(self, client):
+        client.image.record(32000, [7])
+        proxy = ModbusProxy(client, client.image)
+
+        assert await proxy.read_holding_registers(16, ReadHoldingRegistersPDU(32000, 1)) == [32000]
+        assert client.other_units[16].requests == [(16, 32000, 1)]
+        assert client.image.read(32000, 1) == [7]
+
+    @pytest.mark.asyncio
+    async def test_modbus_exception_is_passed_through(self, client):
+        client.error = IllegalDataAddressError(3)
+        proxy = ModbusProxy(client, client.image)
+
+        with pytest.raises(IllegalDataAddressError):
+            await proxy.read_holding_registers(1, ReadHoldingRegistersPDU(1, 1))
+        assert proxy.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [ModbusConnectionError("lost"), TimeoutError(), OSError("reset")])
+    async def test_connection_failure_maps_to_gateway_error(self, client, error):
+        client.error = error
+        proxy = ModbusProxy(client, client.image)
+
+        with pytest.raises(GatewayTargetDeviceFailedToRespondError):
+            await proxy.read_holding_registers(1, ReadHoldingRegistersPDU(1, 1))
+
+
+# ---------------------------------------------------------------------------
+# TestProxyServer
+# ---------------------------------------------------------------------------
+
+
+class TestProxyServer:
+    """Ende-zu-Ende über eine echte TCP-Verbindung."""
+
+    @pytest.mark.asyncio
+    async def test_modbus_client_reads_through_proxy(self, client):
+        client.image.record(32000, [7, 8, 9])
+        proxy = ModbusProxy(client, client.image, host="127.0.0.1", port=0)
+        await proxy.start()
+        assert proxy.port != 0
+        tcp_client = create_async_tcp_client("127.0.0.1", proxy.port, unit_id=1, timeout=2, auto_reconnect=False)
+        try:
+            await tcp_client.connect()
+            assert await tcp_client.read_holding_registers(32000, 3) == [7, 8, 9]
+            assert await tcp_client.read_holding_registers(40000, 2) == [40000, 40001]
+            with pytest.raises(IllegalFunctionError):
+                await tcp_client.write_single_register(47086, 1)
+        finally:
+            await tcp_client.disconnect()
+            await proxy.stop()
+
+        assert client.requests == [(1, 40000, 2)]
+        assert proxy.port == 0  # nach stop() wieder der konfigurierte Port
+
+    @pytest.mark.asyncio
+    async def test_port_falls_back_to_configured_before_start(self):
+        proxy = ModbusProxy(AsyncMock(unit_id=1), RegisterImage(), port=1502)
+        assert proxy.port == 1502
@@ -0,0 +1,140 @@
+# tests/test_modbus_scheduler.py
+
+"""Tests für den priorisierten Modbus-Zugriff (modbus_scheduler.py)."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from bridge.modbus_scheduler import ModbusScheduler, Priority, attach_scheduler, modbus_priority
+from huawei_solar import AsyncHuaweiSolarClient
+from tmodbus.pdu.holding_registers import RawReadHoldingRegistersPDU
+
+
+class _Line:
+    """Fake transport call: records the order of granted requests, first one blocks."""
+
+    def __init__(self):
+        self.order: list[str] = []
+        self.release = asyncio.Event()
+
+    def call(self, name: str, block: bool = False):
+        async def run():
+            self.order.append(name)
+            if block:
+                await self.release.wait()
+            return name
+
+        return run
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# ---------------------------------------------------------------------------
+# TestOrdering
+# ---------------------------------------------------------------------------
+
+
+class TestOrdering:
+    """Vergabe der Verbindung nach Priorität, innerhalb einer Priorität FIFO."""
+
+    @pytest.mark.asyncio
+    async def test_control_overtakes_queued_polls(self):
+        scheduler, line = ModbusScheduler(), _Line()
+        running = asyncio.create_task(scheduler.run(line.call("poll-1", block=True), Priority.POLL))
+        await _settle()
+        queued = [
+            asyncio.create_task(scheduler.run(line.call("poll-2"), Priority.POLL)),
+            asyncio.create_task(scheduler.run(line.call("proxy"), Priority.PROXY)),
+            asyncio.create_task(scheduler.run(line.call("poll-3"), Priority.POLL)),
+            asyncio.create_task(scheduler.run(line.call("write"), Priority.CONTROL)),
+        ]
+        await _settle()
+
+        line.release.set()
+        await asyncio.gather(running, *queued)
+
+        assert line.order == ["poll-1", "write", "proxy", "poll-2", "poll-3"]
+        stats = scheduler.get_stats()
+        assert stats["preemptions"] == 2  # proxy und write überholen wartende Polls
+        assert stats["priorities"]["control"]["requests"] == 1
+        assert stats["priorities"]["control"]["waited"] == 1
+        assert stats["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_priority_from_context(self):
+        scheduler, line = ModbusScheduler(), _Line()
+        running = asyncio.create_task(scheduler.run(line.call("poll-1", block=True)))
+        await _settle()
+        poll = asyncio.create_task(scheduler.run(line.call("poll-2")))
+
+        async def write():
+            with modbus_priority(Priority.CONTROL):
+                return await scheduler.run(line.call("write"))
+
+        control = asyncio.create_task(write())
+        await _settle()
+        line.release.set()
+        await asyncio.gather(running, poll, control)
+
+        assert line.order == ["poll-1", "write", "poll-2"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self):
+        scheduler, line = ModbusScheduler(), _Line()
+        running = asyncio.create_task(scheduler.run(line.call("poll-1", block=True)))
+        await _settle()
+        cancelled = asyncio.create_task(scheduler.run(line.call("write"), Priority.CONTROL))
+        poll = asyncio.create_task(scheduler.run(line.call("poll-2")))
+        await _settle()
+
+        cancelled.cancel()
+        await _settle()
+        line.release.set()
+        await asyncio.gather(running, poll)
+
+        assert line.order == ["poll-1", "poll-2"]
+        assert scheduler.get_stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failing_call_releases(self):
+        scheduler = ModbusScheduler()
+
+        async def boom():
+            raise TimeoutError
+
+        with pytest.raises(TimeoutError):
+            await scheduler.run(boom)
+        assert await scheduler.run(_Line().call("next")) == "next"
+
+
+# ---------------------------------------------------------------------------
+# TestAttach
+# ---------------------------------------------------------------------------
+
+
+class TestAttach:
+    """Wrapping von transport.send_and_receive."""
+
+    @pytest.mark.asyncio
+    async def test_all_unit_ids_share_the_scheduler(self):
+        transport = MagicMock()
+        seen: list[int] = []
+
+        async def send_and_receive(unit_id, pdu):
+            seen.append(unit_id)
+            return b"\x00\x00"
+
+        transport.send_and_receive = send_and_receive
+        client = AsyncHuaweiSolarClient(transport, unit_id=1)
+        scheduler = ModbusScheduler()
+        attach_scheduler(client, scheduler)
+
+        await client.execute(RawReadHoldingRegistersPDU(32080, quantity=1))
+        await client.for_unit_id(2).execute(RawReadHoldingRegistersPDU(32080, quantity=1))
+
+        assert seen == [1, 2]
+        assert scheduler.get_stats()["priorities"]["poll"]["requests"] == 2
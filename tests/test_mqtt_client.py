@@ -7,6 +7,7 @@ import logging
 from unittest.mock import MagicMock, patch
 
 import pytest
+from bridge.binary_payload import decode_binary_payload
 from bridge.mqtt_client import (
     _build_sensor_config,
     _get_mqtt_client,
@@ -14,12 +15,20 @@ from bridge.mqtt_client import (
     _load_text_sensors,
     _on_connect,
     _on_disconnect,
+    _on_message,
+    configure_publish_policy,
     connect_mqtt,
     disconnect_mqtt,
+    publish_binary,
     publish_data,
     publish_discovery_configs,
     publish_status,
+    reconnect_mqtt,
+    set_disconnect_callback,
+    subscribe_command,
+    unsubscribe_command,
 )
+from bridge.publish_policy import PublishPolicy, TopicPolicy
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -53,10 +62,17 @@ def reset_mqtt_globals():
     mqtt_module._mqtt_client = None
     mqtt_module._is_connected = False
     mqtt_module._connected_event.clear()
+    mqtt_module._disconnect_callback = None
+    mqtt_module._publish_policy = PublishPolicy()
+    mqtt_module._binary_schema_published = False
+    mqtt_module._command_handlers.clear()
     yield
+    mqtt_module._command_handlers.clear()
     mqtt_module._mqtt_client = None
     mqtt_module._is_connected = False
     mqtt_module._connected_event.clear()
+    mqtt_module._disconnect_callback = None
+    mqtt_module._publish_policy = PublishPolicy()
 
 
 # ---------------------------------------------------------------------------
@@ -93,6 +109,71 @@ class TestCallbacks:
         _on_disconnect(None, None, None, 1)
         assert mqtt_module._is_connected is False
 
+    def test_on_disconnect_unexpected_notifies_callback(self):
+        callback = MagicMock()
+        set_disconnect_callback(callback)
+        _on_disconnect(None, None, None, 1)
+        callback.assert_called_once_with()
+
+    def test_on_disconnect_clean_does_not_notify_callback(self):
+        callback = MagicMock()
+        set_disconnect_callback(callback)
+        _on_disconnect(None, None, None, 0)
+        callback.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# TestCommandTopics
+# ---------------------------------------------------------------------------
+
+
+class TestCommandTopics:
+    """Command-Topics: Subscribe, Dispatch, Re-Subscribe nach Reconnect."""
+
+    def test_subscribed_immediately_when_connected(self):
+        import bridge.mqtt_client as mqtt_module
+
+        client = MagicMock()
+        mqtt_module._mqtt_client = client
+        mqtt_module._is_connected = True
+
+        subscribe_command("test/huawei/refresh", MagicMock())
+
+        client.subscribe.assert_called_once_with("test/huawei/refresh", qos=1)
+
+    def test_resubscribed_on_every_connect(self):
+        client = MagicMock()
+        subscribe_command("test/huawei/refresh", MagicMock())
+
+        _on_connect(client, None, None, 0)
+
+        client.subscribe.assert_called_once_with("test/huawei/refresh", qos=1)
+
+    def test_message_dispatched_by_topic_with_wildcards(self):
+        refresh, write = MagicMock(), MagicMock()
+        subscribe_command("test/huawei/refresh", refresh)
+        subscribe_command("test/huawei/set/+", write)
+
+        _on_message(None, None, MagicMock(topic="test/huawei/set/max_charge_power", payload=b"2500"))
+
+        write.assert_called_once_with("test/huawei/set/max_charge_power", b"2500")
+        refresh.assert_not_called()
+
+    def test_unsubscribe_removes_handler(self):
+        import bridge.mqtt_client as mqtt_module
+
+        client = MagicMock()
+        mqtt_module._mqtt_client = client
+        mqtt_module._is_connected = True
+        handler = MagicMock()
+        subscribe_command("test/huawei/refresh", handler)
+
+        unsubscribe_command("test/huawei/refresh")
+        _on_message(None, None, MagicMock(topic="test/huawei/refresh", payload=b""))
+
+        client.unsubscribe.assert_called_once_with("test/huawei/refresh")
+        handler.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # TestClientCreation
@@ -131,6 +212,12 @@ class TestClientCreation:
             _get_mqtt_client()
             mock_mqtt_client.will_set.assert_called_once_with("test/huawei/status", "offline", qos=1, retain=True)
 
+    def test_get_mqtt_client_disables_paho_auto_reconnect(self, mock_mqtt_client, mqtt_env_vars):
+        with patch("bridge.mqtt_client.mqtt.Client") as mock_client:
+            mock_client.return_value = mock_mqtt_client
+            _get_mqtt_client()
+            assert mock_client.call_args.kwargs["reconnect_on_failure"] is False
+
 
 # ---------------------------------------------------------------------------
 # TestConnect
@@ -174,6 +261,52 @@ class TestConnect:
                     await connect_mqtt()
 
 
+# ---------------------------------------------------------------------------
+# TestReconnect
+# ---------------------------------------------------------------------------
+
+
+class TestReconnect:
+    """Einzelner Reconnect-Versuch (vom MqttSupervisor getrieben)."""
+
+    @pytest.mark.asyncio
+    async def test_reconnect_restarts_loop_and_restores_lwt(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+
+        def set_connected(*args):
+            mqtt_module._connected_event.set()
+
+        mock_mqtt_client.reconnect.side_effect = set_connected
+        await reconnect_mqtt()
+
+        mock_mqtt_client.loop_stop.assert_called_once()
+        mock_mqtt_client.will_set.assert_called_once_with("test/huawei/status", "offline", qos=1, retain=True)
+        mock_mqtt_client.reconnect.assert_called_once()
+        mock_mqtt_client.loop_start.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_reconnect_propagates_socket_error(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mock_mqtt_client.reconnect.side_effect = ConnectionRefusedError()
+
+        with pytest.raises(OSError):
+            await reconnect_mqtt()
+        mock_mqtt_client.loop_start.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_reconnect_raises_on_missing_connack(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        with patch.object(mqtt_module._connected_event, "wait", return_value=False):
+            with pytest.raises(ConnectionError, match="MQTT reconnect timeout"):
+                await reconnect_mqtt()
+
+
 # ---------------------------------------------------------------------------
 # TestDisconnect
 # ---------------------------------------------------------------------------
@@ -241,6 +374,11 @@ class TestSensorConfig:
         )
         assert config["enabled_by_default"] is False
 
+    def test_sensor_config_with_sub_topic(self):
+        config = _build_sensor_config({"name": "Diag", "key": "diag", "topic": "diagnostics"}, "test/topic", {})
+        assert config["state_topic"] == "test/topic/diagnostics"
+        assert config["availability_topic"] == "test/topic/status"
+
 
 # ---------------------------------------------------------------------------
 # TestPublishing
@@ -267,6 +405,42 @@ class TestPublishing:
         assert payload["battery_soc"] == 85.5
         assert "last_update" in payload
 
+    @pytest.mark.asyncio
+    async def test_http_snapshot_matches_published_payload(self, mock_mqtt_client, mqtt_env_vars):
+        """Auch über eine Sekundengrenze hinweg identisch mit dem HTTP-Snapshot."""
+        import bridge.mqtt_client as mqtt_module
+        from bridge.http_api import HttpApi
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+        data = {"power_active": 4500, "last_update": 1_700_000_000.95}
+
+        api = HttpApi(dict)
+        with patch("bridge.http_api.time.time", return_value=1_700_000_000.99):
+            api.update(data, 1)
+        with patch("bridge.mqtt_client.time.time", return_value=1_700_000_001.2):
+            await publish_data(dict(data), "test/topic")
+
+        assert mock_mqtt_client.publish.call_args[0][1] == api._payload
+        assert json.loads(api._payload)["last_update"] == 1_700_000_000
+
+    @pytest.mark.asyncio
+    async def test_publish_data_uses_compiled_serializer(self, mock_mqtt_client, mqtt_env_vars):
+        """Payload folgt der Sensor-Reihenfolge und rundet pro Einheit."""
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+
+        await publish_data({"battery_soc": 85.50000000000001, "power_active": 4500.4}, "test/topic")
+
+        raw = mock_mqtt_client.publish.call_args[0][1]
+        assert isinstance(raw, bytes)
+        payload = json.loads(raw)
+        assert list(payload) == ["power_active", "battery_soc", "last_update"]
+        assert payload["power_active"] == 4500
+        assert payload["battery_soc"] == 85.5
+
     @pytest.mark.asyncio
     async def test_publish_data_raises_when_not_connected(self):
         import bridge.mqtt_client as mqtt_module
@@ -313,6 +487,70 @@ class TestPublishing:
 
         mock_mqtt_client.publish.assert_called_once_with("test/topic/status", "online", qos=1, retain=True)
 
+    @pytest.mark.asyncio
+    async def test_publish_status_deduplicates_repeated_status(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+
+        await publish_status("online", "test/topic")
+        await publish_status("online", "test/topic")
+        await publish_status("offline", "test/topic")
+
+        assert [c.args[1] for c in mock_mqtt_client.publish.call_args_list] == ["online", "offline"]
+
+    @pytest.mark.asyncio
+    async def test_publish_status_force_bypasses_deduplication(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+
+        await publish_status("online", "test/topic")
+        await publish_status("online", "test/topic", force=True)
+
+        assert mock_mqtt_client.publish.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_status_publish_is_retried_next_time(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+        mock_mqtt_client.publish.side_effect = [Exception("timeout"), MagicMock()]
+
+        await publish_status("online", "test/topic")
+        await publish_status("online", "test/topic")
+
+        assert mock_mqtt_client.publish.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_publish_data_qos0_skips_puback_wait(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+        configure_publish_policy(PublishPolicy(data=TopicPolicy(qos=0, retain=False)))
+
+        await publish_data({"power_input": 4500}, "test/topic")
+
+        assert mock_mqtt_client.publish.call_args.kwargs == {"qos": 0, "retain": False}
+        mock_mqtt_client.publish.return_value.wait_for_publish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_publish_data_marks_trace(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+        from bridge.tracing import CycleTrace
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+        trace = CycleTrace(1)
+
+        await publish_data({"power_input": 4500}, "test/topic", trace=trace)
+
+        assert list(trace.marks) == ["start", "serialize", "publish", "ack"]
+
     @pytest.mark.asyncio
     async def test_publish_status_skips_when_not_connected(self, mock_mqtt_client):
         import bridge.mqtt_client as mqtt_module
@@ -355,6 +593,25 @@ class TestDiscovery:
                 await publish_discovery_configs("test/topic")
                 assert mock_mqtt_client.publish.call_count >= 2
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("diagnostics", [False, True])
+    async def test_diagnostic_sensors_only_when_enabled(self, mock_mqtt_client, mqtt_env_vars, diagnostics):
+        import bridge.mqtt_client as mqtt_module
+        from bridge.config.sensors_mqtt import DIAGNOSTIC_SENSORS
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+
+        with (
+            patch("bridge.mqtt_client._load_numeric_sensors", return_value=[]),
+            patch("bridge.mqtt_client._load_text_sensors", return_value=[]),
+        ):
+            await publish_discovery_configs("test/topic", diagnostics=diagnostics)
+
+        topics = [c.args[0] for c in mock_mqtt_client.publish.call_args_list]
+        diagnostic_topics = [t for t in topics if "/bridge_" in t]
+        assert len(diagnostic_topics) == (len(DIAGNOSTIC_SENSORS) if diagnostics else 0)
+
     @pytest.mark.asyncio
     async def test_publish_discovery_skips_when_not_connected(self, mock_mqtt_client):
         import bridge.mqtt_client as mqtt_module
@@ -364,6 +621,68 @@ class TestDiscovery:
         mock_mqtt_client.publish.assert_not_called()
 
 
+# ---------------------------------------------------------------------------
+# TestBinaryPublishing
+# ---------------------------------------------------------------------------
+
+
+class TestBinaryPublishing:
+    """Optionaler MessagePack-Payload."""
+
+    @pytest.mark.asyncio
+    async def test_publishes_schema_once_then_payload(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+
+        await publish_binary({"power_active": 4500}, "test/topic")
+        await publish_binary({"power_active": 4600}, "test/topic")
+
+        topics = [c.args[0] for c in mock_mqtt_client.publish.call_args_list]
+        assert topics == ["test/topic/binary/schema", "test/topic/binary", "test/topic/binary"]
+
+        schema_call = mock_mqtt_client.publish.call_args_list[0]
+        assert schema_call.kwargs == {"qos": 1, "retain": True}
+        schema = json.loads(schema_call.args[1])
+
+        data_call = mock_mqtt_client.publish.call_args_list[2]
+        assert data_call.kwargs["retain"] is False
+        assert decode_binary_payload(data_call.args[1], schema["keys"]) == {"power_active": 4600}
+
+    @pytest.mark.asyncio
+    async def test_schema_republished_after_reconnect(self, mock_mqtt_client, mqtt_env_vars):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+        await publish_binary({"power_active": 1}, "t")
+
+        mock_mqtt_client.reconnect.side_effect = lambda: mqtt_module._connected_event.set()
+        await reconnect_mqtt()
+        await publish_binary({"power_active": 2}, "t")
+
+        topics = [c.args[0] for c in mock_mqtt_client.publish.call_args_list]
+        assert topics.count("t/binary/schema") == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_is_logged_not_raised(self, mock_mqtt_client, mqtt_env_vars, caplog):
+        import bridge.mqtt_client as mqtt_module
+
+        mqtt_module._mqtt_client = mock_mqtt_client
+        mqtt_module._is_connected = True
+        mock_mqtt_client.publish.side_effect = RuntimeError("broker gone")
+
+        with caplog.at_level(logging.WARNING):
+            await publish_binary({"power_active": 1}, "t")
+        assert "Binary publish failed" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_skipped_when_not_connected(self, mock_mqtt_client):
+        await publish_binary({"power_active": 1}, "t")
+        mock_mqtt_client.publish.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # TestSensorLoaders
 # ---------------------------------------------------------------------------
@@ -0,0 +1,133 @@
+# tests/test_mqtt_supervisor.py
+
+"""Tests für den MQTT Connection Supervisor."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, patch
+
+import bridge.mqtt_client as mqtt_module
+import pytest
+from bridge.mqtt_supervisor import MqttSupervisor, compute_backoff
+
+
+@pytest.fixture(autouse=True)
+def reset_disconnect_callback():
+    yield
+    mqtt_module._disconnect_callback = None
+
+
+async def _wait_for(predicate, timeout: float = 1.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.001)
+
+
+# ---------------------------------------------------------------------------
+# TestBackoff
+# ---------------------------------------------------------------------------
+
+
+class TestBackoff:
+    """Exponentielles Backoff mit Jitter."""
+
+    @pytest.mark.parametrize("attempt", [0, 1, 2, 5, 10, 50])
+    def test_delay_within_bounds(self, attempt):
+        for _ in range(50):
+            delay = compute_backoff(attempt, min_delay=1.0, max_delay=120.0)
+            assert 1.0 <= delay <= min(120.0, 2**attempt)
+
+    def test_ceiling_capped_at_max_delay(self):
+        with patch("bridge.mqtt_supervisor.random.uniform", side_effect=lambda a, b: b):
+            assert compute_backoff(30, min_delay=1.0, max_delay=60.0) == 60.0
+
+    def test_ceiling_grows_exponentially(self):
+        with patch("bridge.mqtt_supervisor.random.uniform", side_effect=lambda a, b: b):
+            assert [compute_backoff(n, min_delay=1.0, max_delay=120.0) for n in range(4)] == [1.0, 2.0, 4.0, 8.0]
+
+
+# ---------------------------------------------------------------------------
+# TestSupervisor
+# ---------------------------------------------------------------------------
+
+
+class TestSupervisor:
+    """Reconnect-Ablauf nach unerwartetem Disconnect."""
+
+    @pytest.mark.asyncio
+    async def test_start_registers_disconnect_callback(self):
+        supervisor = MqttSupervisor()
+        supervisor.start()
+        try:
+            assert mqtt_module._disconnect_callback == supervisor.notify_disconnect
+        finally:
+            await supervisor.stop()
+        assert mqtt_module._disconnect_callback is None
+
+    @pytest.mark.asyncio
+    async def test_reconnects_and_calls_on_reconnect(self):
+        on_reconnect = AsyncMock()
+        supervisor = MqttSupervisor(on_reconnect=on_reconnect, min_delay=0.001, max_delay=0.001)
+
+        with patch("bridge.mqtt_supervisor.reconnect_mqtt", new_callable=AsyncMock) as mock_reconnect:
+            supervisor.start()
+            supervisor.notify_disconnect()
+            await _wait_for(lambda: on_reconnect.await_count == 1)
+            await supervisor.stop()
+
+        mock_reconnect.assert_awaited_once()
+        stats = supervisor.get_stats()
+        assert stats["reconnect_count"] == 1
+        assert stats["failed_attempts"] == 0
+        assert stats["outage_active"] is False
+        assert stats["last_outage_duration"] is not None
+
+    @pytest.mark.asyncio
+    async def test_retries_until_reconnect_succeeds(self):
+        supervisor = MqttSupervisor(min_delay=0.001, max_delay=0.001)
+
+        with patch(
+            "bridge.mqtt_supervisor.reconnect_mqtt",
+            new_callable=AsyncMock,
+            side_effect=[OSError("refused"), ConnectionError("timeout"), None],
+        ) as mock_reconnect:
+            supervisor.start()
+            supervisor.notify_disconnect()
+            await _wait_for(lambda: supervisor.get_stats()["reconnect_count"] == 1)
+            await supervisor.stop()
+
+        assert mock_reconnect.await_count == 3
+        assert supervisor.get_stats()["failed_attempts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_notify_from_foreign_thread(self):
+        """paho ruft den Callback aus seinem Netzwerk-Thread auf."""
+        supervisor = MqttSupervisor(min_delay=0.001, max_delay=0.001)
+
+        with patch("bridge.mqtt_supervisor.reconnect_mqtt", new_callable=AsyncMock):
+            supervisor.start()
+            thread = threading.Thread(target=mqtt_module._on_disconnect, args=(None, None, None, 7))
+            thread.start()
+            thread.join()
+            await _wait_for(lambda: supervisor.get_stats()["reconnect_count"] == 1)
+            await supervisor.stop()
+
+    @pytest.mark.asyncio
+    async def test_on_reconnect_failure_is_logged_not_raised(self, caplog):
+        on_reconnect = AsyncMock(side_effect=RuntimeError("boom"))
+        supervisor = MqttSupervisor(on_reconnect=on_reconnect, min_delay=0.001, max_delay=0.001)
+
+        with patch("bridge.mqtt_supervisor.reconnect_mqtt", new_callable=AsyncMock):
+            supervisor.start()
+            supervisor.notify_disconnect()
+            await _wait_for(lambda: on_reconnect.await_count == 1)
+            await asyncio.sleep(0)
+            assert supervisor._task is not None and not supervisor._task.done()
+            await supervisor.stop()
+
+        assert "Post-reconnect publish failed" in caplog.text
+
+    def test_notify_without_start_is_noop(self):
+        MqttSupervisor().notify_disconnect()  # Should not raise
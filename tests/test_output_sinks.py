@@ -0,0 +1,319 @@
+# tests/test_output_sinks.py
+
+"""Tests für die zusätzlichen Output-Sinks."""
+
+import asyncio
+import json
+import logging
+import socket
+
+import pytest
+from bridge.output_sinks import (
+    InfluxLineSink,
+    NdjsonFileSink,
+    OutputSink,
+    OutputSinks,
+    SinkWorker,
+    UnixSocketSink,
+    build_output_sinks,
+    to_line_protocol,
+    to_ndjson,
+)
+
+TS = 1_700_000_000.0
+
+
+class _RecordingSink(OutputSink):
+    name = "recording"
+
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.received: list[dict] = []
+        self.cycles: list[int] = []
+        self.closed = False
+
+    async def write(self, data, timestamp, cycle=0):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise OSError("disk full")
+        self.received.append(dict(data))
+        self.cycles.append(cycle)
+
+    async def close(self):
+        self.closed = True
+
+
+async def _wait_for(predicate, timeout: float = 1.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.005)
+
+
+# ---------------------------------------------------------------------------
+# TestEncoding
+# ---------------------------------------------------------------------------
+
+
+class TestEncoding:
+    """Line Protocol und NDJSON."""
+
+    def test_line_protocol_fields_tags_and_timestamp(self):
+        line = to_line_protocol(
+            {"power_active": 4500, "battery_soc": 85.56, "inverter_status": 'On "grid"', "last_update": 1},
+            TS,
+            tags={"topic": "huawei solar"},
+        )
+        assert line == (
+            'huawei_solar,topic=huawei\\ solar power_active=4500.0,battery_soc=85.56,inverter_status="On \\"grid\\"" '
+            "1700000000000000000"
+        )
+
+    def test_line_protocol_skips_none_and_non_finite(self):
+        line = to_line_protocol({"a": None, "b": float("nan"), "c": True, "d": ["x", "y"]}, TS)
+        assert line == 'huawei_solar c=true,d="x, y" 1700000000000000000'
+
+    def test_line_protocol_empty_snapshot(self):
+        assert to_line_protocol({"last_update": 1}, TS) == ""
+
+    def test_ndjson_adds_last_update(self):
+        line = to_ndjson({"power_active": 1}, TS)
+        assert line.endswith(b"\n")
+        assert json.loads(line) == {"power_active": 1, "last_update": 1_700_000_000}
+
+
+# ---------------------------------------------------------------------------
+# TestSinkWorker
+# ---------------------------------------------------------------------------
+
+
+class TestSinkWorker:
+    """Queue pro Sink, Failure Isolation."""
+
+    @pytest.mark.asyncio
+    async def test_delivers_in_order(self):
+        sink = _RecordingSink()
+        worker = SinkWorker(sink)
+        worker.start()
+        for i in range(3):
+            worker.submit((TS, 1, {"n": i}))
+        await _wait_for(lambda: len(sink.received) == 3)
+        await worker.stop()
+
+        assert [d["n"] for d in sink.received] == [0, 1, 2]
+        assert worker.get_stats()["written"] == 3
+        assert sink.closed
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self):
+        sink = _RecordingSink()
+        worker = SinkWorker(sink, queue_size=2)
+        for i in range(5):
+            worker.submit((TS, 1, {"n": i}))
+        worker.start()
+        await _wait_for(lambda: len(sink.received) == 2)
+        await worker.stop()
+
+        assert [d["n"] for d in sink.received] == [3, 4]
+        assert worker.get_stats()["dropped"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_and_logged_once(self, caplog):
+        caplog.set_level(logging.INFO, logger="huawei.sinks")
+        sink = _RecordingSink(fail=True)
+        worker = SinkWorker(sink)
+        worker.start()
+        worker.submit((TS, 1, {"n": 1}))
+        worker.submit((TS, 1, {"n": 2}))
+        await _wait_for(lambda: worker.get_stats()["failed"] == 2)
+
+        sink.fail = False
+        worker.submit((TS, 1, {"n": 3}))
+        await _wait_for(lambda: worker.get_stats()["written"] == 1)
+        await worker.stop()
+
+        assert caplog.text.count("Output sink 'recording' failed") == 1
+        assert "recovered" in caplog.text
+        assert worker.get_stats()["last_error"] == "OSError: disk full"
+
+    @pytest.mark.asyncio
+    async def test_bridge_cycle_reaches_sink(self):
+        sink = _RecordingSink()
+        sinks = OutputSinks([sink])
+        sinks.start()
+        sinks.submit({"power_active": 1}, TS, cycle=17)
+        await _wait_for(lambda: sink.cycles == [17])
+        await sinks.stop()
+
+    @pytest.mark.asyncio
+    async def test_failing_sink_does_not_affect_others(self):
+        good, bad = _RecordingSink(), _RecordingSink(fail=True)
+        bad.name = "bad"
+        sinks = OutputSinks([bad, good])
+        sinks.start()
+        sinks.submit({"power_active": 1}, TS)
+        await _wait_for(lambda: len(good.received) == 1)
+        await sinks.stop()
+
+        stats = sinks.get_stats()
+        assert stats["recording"]["written"] == 1
+        assert stats["bad"]["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_submit_never_blocks_on_slow_sink(self):
+        slow = _RecordingSink(delay=10)
+        sinks = OutputSinks([slow], queue_size=1)
+        sinks.start()
+        for _ in range(100):
+            sinks.submit({"x": 1}, TS)
+        await sinks.workers[0].stop(drain_timeout=0.01)
+
+    @pytest.mark.asyncio
+    async def test_submit_copies_snapshot(self):
+        sink = _RecordingSink()
+        sinks = OutputSinks([sink])
+        data = {"power_active": 1}
+        sinks.submit(data, TS)
+        data["power_active"] = 2
+        sinks.start()
+        await _wait_for(lambda: len(sink.received) == 1)
+        await sinks.stop()
+        assert sink.received == [{"power_active": 1}]
+
+
+# ---------------------------------------------------------------------------
+# TestBuiltinSinks
+# ---------------------------------------------------------------------------
+
+
+class TestBuiltinSinks:
+    """Datei, UDP und Unix Socket."""
+
+    @pytest.mark.asyncio
+    async def test_ndjson_file_appends_lines(self, tmp_path):
+        path = tmp_path / "sub" / "data.ndjson"
+        sink = NdjsonFileSink(path)
+        await sink.write({"power_active": 1}, TS)
+        await sink.write({"power_active": 2}, TS)
+        await sink.close()
+
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)["power_active"] for line in lines] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_ndjson_file_rotates_at_max_bytes(self, tmp_path):
+        path = tmp_path / "data.ndjson"
+        line_size = len(to_ndjson({"power_active": 0}, TS))
+        sink = NdjsonFileSink(path, max_bytes=2 * line_size)
+        for value in range(9):
+            await sink.write({"power_active": value}, TS)
+        await sink.close()
+
+        def values(p):
+            return [json.loads(line)["power_active"] for line in p.read_text().splitlines()]
+
+        assert values(path) == [8]
+        assert values(tmp_path / "data.ndjson.1") == [6, 7]
+        assert values(tmp_path / "data.ndjson.3") == [2, 3]
+        assert not (tmp_path / "data.ndjson.4").exists()
+
+    @pytest.mark.asyncio
+    async def test_rotation_accounts_for_existing_file(self, tmp_path):
+        path = tmp_path / "data.ndjson"
+        path.write_bytes(b"x" * 100)
+        sink = NdjsonFileSink(path, max_bytes=120)
+        await sink.write({"power_active": 1}, TS)
+        await sink.close()
+
+        assert (tmp_path / "data.ndjson.1").read_bytes() == b"x" * 100
+        assert json.loads(path.read_text())["power_active"] == 1
+
+    @pytest.mark.asyncio
+    async def test_influx_file_target(self, tmp_path):
+        path = tmp_path / "influx.lp"
+        sink = InfluxLineSink(f"file://{path}")
+        await sink.open()
+        await sink.write({"power_active": 1}, TS)
+        await sink.close()
+        assert path.read_text() == "huawei_solar power_active=1.0 1700000000000000000\n"
+
+    @pytest.mark.asyncio
+    async def test_influx_udp_target(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.settimeout(2)
+        port = receiver.getsockname()[1]
+        try:
+            sink = InfluxLineSink(f"udp://127.0.0.1:{port}", tags={"topic": "t"})
+            await sink.open()
+            await sink.write({"power_active": 1}, TS)
+            datagram = await asyncio.get_running_loop().run_in_executor(None, receiver.recv, 4096)
+            await sink.close()
+        finally:
+            receiver.close()
+        assert datagram == b"huawei_solar,topic=t power_active=1.0 1700000000000000000\n"
+
+    @pytest.mark.parametrize("target", ["http://influx:8086", "udp://influx", "influx:8089"])
+    def test_influx_invalid_target(self, target):
+        with pytest.raises(ValueError):
+            InfluxLineSink(target)
+
+    @pytest.mark.asyncio
+    async def test_unix_socket_streams_to_clients(self, tmp_path):
+        path = tmp_path / "data.sock"
+        sink = UnixSocketSink(path)
+        await sink.open()
+        try:
+            reader, writer = await asyncio.open_unix_connection(str(path))
+            await _wait_for(lambda: sink.client_count == 1)
+            await sink.write({"power_active": 7}, TS)
+            line = await asyncio.wait_for(reader.readline(), timeout=1)
+            assert json.loads(line)["power_active"] == 7
+
+            writer.close()
+            await _wait_for(lambda: sink.client_count == 0)
+        finally:
+            await sink.close()
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_unix_socket_without_clients_is_noop(self, tmp_path):
+        sink = UnixSocketSink(tmp_path / "data.sock")
+        await sink.open()
+        await sink.write({"power_active": 1}, TS)
+        await sink.close()
+
+
+# ---------------------------------------------------------------------------
+# TestBuildOutputSinks
+# ---------------------------------------------------------------------------
+
+
+class TestBuildOutputSinks:
+    """Sinks aus der Konfiguration."""
+
+    def test_nothing_configured(self, mock_config):
+        assert not build_output_sinks(mock_config)
+
+    def test_all_configured(self, mock_config, tmp_path):
+        mock_config.output_influx = "udp://influx:8089"
+        mock_config.output_ndjson_file = str(tmp_path / "d.ndjson")
+        mock_config.output_unix_socket = str(tmp_path / "d.sock")
+        mock_config.output_shared_memory = str(tmp_path / "d.shm")
+        mock_config.output_queue_size = 5
+
+        sinks = build_output_sinks(mock_config)
+        assert [w.sink.name for w in sinks.workers] == ["influx", "ndjson", "unix", "shm"]
+        assert sinks.workers[0].sink.tags == {"topic": mock_config.mqtt_topic}
+        assert all(w._queue.maxsize == 5 for w in sinks.workers)
+
+    def test_file_max_size_is_passed_to_file_sinks(self, mock_config, tmp_path):
+        mock_config.output_influx = f"file://{tmp_path / 'influx.lp'}"
+        mock_config.output_ndjson_file = str(tmp_path / "d.ndjson")
+        mock_config.output_file_max_mb = 2
+
+        sinks = build_output_sinks(mock_config)
+        assert [w.sink._file.max_bytes for w in sinks.workers] == [2 * 2**20, 2 * 2**20]
@@ -0,0 +1,142 @@
+# tests/test_payload_serializer.py
+
+"""Tests für den schema-kompilierten Payload-Serializer."""
+
+import json
+from enum import IntEnum
+from unittest.mock import patch
+
+import bridge.payload_serializer as serializer_module
+import pytest
+from bridge.config.sensors_mqtt import NUMERIC_SENSORS, TEXT_SENSORS
+from bridge.payload_serializer import UNIT_PRECISION, PayloadSerializer, get_serializer, reset_serializer
+
+SENSORS = [
+    {"key": "power", "unit_of_measurement": "W"},
+    {"key": "energy", "unit_of_measurement": "kWh"},
+    {"key": "voltage", "unit_of_measurement": "V"},
+    {"key": "factor", "unit_of_measurement": ""},
+    {"key": "custom", "unit_of_measurement": "kWh", "precision": 0},
+    {"key": "status"},
+]
+
+
+class _Mode(IntEnum):
+    AUTO = 2
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request):
+    """Beide Backends prüfen - orjson nur wenn installiert."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        yield
+    else:
+        with patch.object(serializer_module, "orjson", None):
+            yield
+
+
+# ---------------------------------------------------------------------------
+# TestCompile
+# ---------------------------------------------------------------------------
+
+
+class TestCompile:
+    """Kompilieren aus dem Sensor-Schema."""
+
+    def test_key_order_follows_schema_then_trailing(self):
+        s = PayloadSerializer(SENSORS)
+        assert s.key_order == ["power", "energy", "voltage", "factor", "custom", "status", "last_update"]
+
+    def test_precision_from_unit_and_override(self):
+        s = PayloadSerializer(SENSORS)
+        assert s.precision("power") == 0
+        assert s.precision("energy") == 2
+        assert s.precision("voltage") == 1
+        assert s.precision("factor") == 3
+        assert s.precision("custom") == 0
+        assert s.precision("status") is None
+        assert s.precision("unknown") is None
+
+    def test_duplicate_keys_compiled_once(self):
+        s = PayloadSerializer([*SENSORS, {"key": "power", "unit_of_measurement": "kWh"}])
+        assert s.key_order.count("power") == 1
+        assert s.precision("power") == 0
+
+    def test_all_configured_units_have_precision(self):
+        """Neue Einheiten in sensors_mqtt.py brauchen einen UNIT_PRECISION Eintrag."""
+        units = {s["unit_of_measurement"] for s in NUMERIC_SENSORS if "unit_of_measurement" in s}
+        assert units <= UNIT_PRECISION.keys()
+
+    def test_singleton_compiled_from_sensor_config(self):
+        reset_serializer()
+        s = get_serializer()
+        assert s is get_serializer()
+        assert s.key_order[: len(NUMERIC_SENSORS)] == [x["key"] for x in NUMERIC_SENSORS]
+        assert len(s.key_order) == len({x["key"] for x in NUMERIC_SENSORS + TEXT_SENSORS}) + 1
+        reset_serializer()
+
+
+# ---------------------------------------------------------------------------
+# TestDumps
+# ---------------------------------------------------------------------------
+
+
+class TestDumps:
+    """Serialisierung - identisch für beide Backends."""
+
+    def test_rounds_floats_per_unit(self, backend):
+        s = PayloadSerializer(SENSORS)
+        raw = s.dumps({"power": 4500.6, "energy": 12.345678, "voltage": 230.14999, "factor": 0.99949, "custom": 7.6})
+        assert json.loads(raw) == {"power": 4501, "energy": 12.35, "voltage": 230.1, "factor": 0.999, "custom": 8}
+
+    @pytest.mark.parametrize("value", [0.125, -0.125, 1234.5678, -17.005, 1e-9, 99999.999])
+    def test_rounding_matches_builtin_round(self, value):
+        s = PayloadSerializer(SENSORS)
+        assert s.normalize({"energy": value})["energy"] == round(value, 2)
+        assert s.normalize({"factor": value})["factor"] == round(value, 3)
+
+    def test_integers_pass_through(self, backend):
+        s = PayloadSerializer(SENSORS)
+        assert json.loads(s.dumps({"energy": 12, "power": -300})) == {"power": -300, "energy": 12}
+
+    def test_output_is_compact_and_ordered(self, backend):
+        s = PayloadSerializer(SENSORS)
+        raw = s.dumps({"last_update": 1, "status": "Standby", "power": 5})
+        assert raw == b'{"power":5,"status":"Standby","last_update":1}'
+
+    def test_unknown_keys_appended_in_insertion_order(self, backend):
+        s = PayloadSerializer(SENSORS)
+        raw = s.dumps({"zeta": 1.23456, "power": 1, "alpha": "x"})
+        assert list(json.loads(raw)) == ["power", "zeta", "alpha"]
+        assert json.loads(raw)["zeta"] == 1.23456
+
+    def test_non_scalar_values(self, backend):
+        s = PayloadSerializer(SENSORS)
+        data = {"status": ["Grid-connected", "Off"], "power": True, "factor": None, "mode": _Mode.AUTO}
+        assert json.loads(s.dumps(data)) == {
+            "status": ["Grid-connected", "Off"],
+            "power": True,
+            "factor": None,
+            "mode": 2,
+        }
+
+    def test_strings_are_escaped_utf8(self, backend):
+        s = PayloadSerializer(SENSORS)
+        raw = s.dumps({"status": 'Übertemperatur "A"'})
+        assert json.loads(raw) == {"status": 'Übertemperatur "A"'}
+        assert "Ü".encode() in raw
+
+    def test_does_not_mutate_input(self, backend):
+        s = PayloadSerializer(SENSORS)
+        data = {"energy": 1.23456}
+        s.dumps(data)
+        assert data == {"energy": 1.23456}
+
+    def test_non_finite_floats_become_null(self, backend):
+        s = PayloadSerializer(SENSORS)
+        raw = s.dumps({"power": float("nan"), "energy": float("inf"), "extra": float("-inf")})
+        assert raw == b'{"power":null,"energy":null,"extra":null}'
+
+    def test_empty_payload(self, backend):
+        assert PayloadSerializer(SENSORS).dumps({}) == b"{}"
@@ -0,0 +1,150 @@
+# tests/test_poll_policy.py
+
+"""Tests für das adaptive Poll-Intervall (poll_policy.py)."""
+
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.poll_policy import IDLE_CYCLES, SUN_MARGIN, PollPolicy, sun_times
+
+BERLIN = (52.52, 13.405)
+NIGHT = {"inverter_status": "Standby: no irradiation", "power_input": 0, "battery_power": 0}
+MIDNIGHT = datetime(2026, 6, 21, 0, 0, tzinfo=UTC).timestamp()
+
+
+def _idle(policy: PollPolicy, cycles: int = IDLE_CYCLES) -> None:
+    for _ in range(cycles):
+        policy.observe(NIGHT)
+
+
+# ---------------------------------------------------------------------------
+# TestSunTimes
+# ---------------------------------------------------------------------------
+
+
+class TestSunTimes:
+    """NOAA-Näherung für Sonnenauf- und -untergang."""
+
+    @pytest.mark.parametrize(
+        "day,sunrise,sunset",
+        [
+            (date(2026, 6, 21), (2, 43), (19, 33)),  # Berlin Sommer: 04:43 / 21:33 CEST
+            (date(2026, 12, 21), (7, 15), (14, 54)),  # Berlin Winter: 08:15 / 15:54 CET
+        ],
+    )
+    def test_berlin(self, day, sunrise, sunset):
+        times = sun_times(day, *BERLIN)
+        assert times is not None
+        for actual, (hour, minute) in zip(times, (sunrise, sunset), strict=True):
+            expected = datetime(day.year, day.month, day.day, hour, minute, tzinfo=UTC)
+            assert abs(actual - expected) < timedelta(minutes=5)
+
+    def test_polar_day_has_no_sunrise(self):
+        assert sun_times(date(2026, 6, 21), 78.2, 15.6) is None
+
+
+# ---------------------------------------------------------------------------
+# TestIdleDetection
+# ---------------------------------------------------------------------------
+
+
+class TestIdleDetection:
+    """Nachtmodus aus Inverter-Zustand (ohne Koordinaten)."""
+
+    def test_disabled_by_default(self):
+        policy = PollPolicy(30)
+        _idle(policy)
+        assert policy.interval(MIDNIGHT) == 30
+
+    def test_night_after_consecutive_idle_cycles(self):
+        policy = PollPolicy(30, night_poll_interval=90)
+        _idle(policy, IDLE_CYCLES - 1)
+        assert policy.interval(MIDNIGHT) == 30
+        _idle(policy, 1)
+        assert policy.interval(MIDNIGHT) == 90
+        assert policy.night is True
+
+    @pytest.mark.parametrize(
+        "change",
+        [{"power_input": 150}, {"battery_power": -800}, {"inverter_status": "On-grid"}],
+    )
+    def test_any_power_change_snaps_back(self, change):
+        policy = PollPolicy(30, night_poll_interval=90)
+        _idle(policy)
+        assert policy.interval(MIDNIGHT) == 90
+
+        policy.observe({**NIGHT, **change})
+
+        assert policy.interval(MIDNIGHT) == 30
+        assert policy.night is False
+
+    def test_missing_pv_value_is_not_idle(self):
+        policy = PollPolicy(30, night_poll_interval=90)
+        for _ in range(IDLE_CYCLES):
+            policy.observe({"inverter_status": "Standby: no irradiation"})
+        assert policy.interval(MIDNIGHT) == 30
+
+    def test_repeat_counts_unchanged_cycles(self):
+        policy = PollPolicy(30, night_poll_interval=90)
+        policy.observe(NIGHT)
+        for _ in range(IDLE_CYCLES - 1):
+            policy.repeat()
+        assert policy.interval(MIDNIGHT) == 90
+
+
+# ---------------------------------------------------------------------------
+# TestSunrise
+# ---------------------------------------------------------------------------
+
+
+class TestSunrise:
+    """Sonnenstand mit konfigurierter Position."""
+
+    def test_daylight_keeps_fast_rate(self):
+        policy = PollPolicy(30, night_poll_interval=90, latitude=BERLIN[0], longitude=BERLIN[1])
+        _idle(policy)
+        noon = datetime(2026, 6, 21, 11, 0, tzinfo=UTC).timestamp()
+        assert policy.interval(noon) == 30
+
+    def test_last_wait_before_sunrise_is_shortened(self):
+        policy = PollPolicy(30, night_poll_interval=90, latitude=BERLIN[0], longitude=BERLIN[1])
+        _idle(policy)
+        times = sun_times(date(2026, 6, 21), *BERLIN)
+        assert times is not None
+        sunrise, _ = times
+        now = (sunrise - SUN_MARGIN - timedelta(seconds=50)).timestamp()
+
+        assert policy.interval(now) == pytest.approx(50, abs=0.01)
+        assert policy.interval(MIDNIGHT) == 90
+
+
+# ---------------------------------------------------------------------------
+# TestMainIntegration
+# ---------------------------------------------------------------------------
+
+
+class TestMainIntegration:
+    """run_main_cycle() wartet das Intervall der Policy ab."""
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self) -> Iterator[None]:
+        main_module.reset_state()
+        yield
+        main_module.reset_state()
+
+    @pytest.mark.asyncio
+    async def test_wait_uses_night_interval(self, mock_client, mock_config):
+        mock_config.night_poll_interval = 90
+        policy = main_module.get_poll_policy(mock_config)
+        _idle(policy)
+
+        with (
+            patch("bridge.main.main_once", new_callable=AsyncMock),
+            patch("bridge.main.asyncio.sleep", new_callable=AsyncMock) as sleep,
+        ):
+            await main_module.run_main_cycle(mock_client, mock_config, 1)
+
+        assert sleep.await_args_list[-1].args[0] == pytest.approx(90, abs=1)
@@ -0,0 +1,188 @@
+# tests/test_profiler.py
+
+"""Tests für den Cycle-Profiler (profiler.py) und seine Anbindung in main.py."""
+
+import asyncio
+import logging
+import pstats
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.profiler import DEFAULT_CYCLES, MAX_CYCLES, CycleProfiler
+
+
+@pytest.fixture(autouse=True)
+def reset_main_state():
+    main_module.reset_state()
+    yield
+    main_module.reset_state()
+
+
+def _busy(n: int = 50_000) -> int:
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+async def _profiled_cycle(profiler: CycleProfiler) -> None:
+    profiler.begin_cycle()
+    _busy()
+    await asyncio.sleep(0.01)
+    await profiler.end_cycle()
+
+
+# ---------------------------------------------------------------------------
+# TestRequests
+# ---------------------------------------------------------------------------
+
+
+class TestRequests:
+    """Auslösen per Signal-Handler und MQTT-Payload."""
+
+    @pytest.mark.parametrize(
+        "payload,cycles",
+        [("", DEFAULT_CYCLES), (" 3 ", 3), ("0", 1), ("100000", MAX_CYCLES)],
+    )
+    def test_payload_cycle_count(self, tmp_path, payload, cycles):
+        profiler = CycleProfiler(directory=tmp_path)
+        assert profiler.request_payload(payload)
+        assert profiler.pending == cycles
+
+    def test_invalid_payload_rejected(self, tmp_path):
+        profiler = CycleProfiler(directory=tmp_path)
+        assert not profiler.request_payload("lots")
+        assert profiler.pending == 0
+
+    def test_second_request_ignored(self, tmp_path):
+        profiler = CycleProfiler(directory=tmp_path)
+        assert profiler.request(2)
+        assert not profiler.request(5)
+        assert profiler.pending == 2
+
+    def test_idle_cycle_is_noop(self, tmp_path):
+        profiler = CycleProfiler(directory=tmp_path)
+        profiler.begin_cycle()
+        assert not profiler.active
+
+
+# ---------------------------------------------------------------------------
+# TestSession
+# ---------------------------------------------------------------------------
+
+
+class TestSession:
+    """Profil über N Cycles, Ausgabe-Dateien, Aufräumen."""
+
+    @pytest.mark.asyncio
+    async def test_writes_pstats_and_collapsed_stacks(self, tmp_path, caplog):
+        profiler = CycleProfiler(directory=tmp_path, sample_interval=0.001)
+        profiler.request(2)
+
+        with caplog.at_level(logging.INFO, logger="huawei.profiler"):
+            await _profiled_cycle(profiler)
+            assert profiler.active
+            await _profiled_cycle(profiler)
+
+        assert not profiler.active
+        [pstats_file] = tmp_path.glob("profile-*.pstats")
+        functions = {function for _file, _line, function in pstats.Stats(str(pstats_file)).stats}  # type: ignore[attr-defined]
+        assert "_busy" in functions
+
+        lines = pstats_file.with_suffix(".collapsed").read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0 and ";" in stack
+
+        assert profiler.get_stats()["sessions"] == 1
+        assert "Profile of 2 cycles" in caplog.text
+        assert "_busy" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_summary_computed_off_the_event_loop(self, tmp_path):
+        profiler = CycleProfiler(directory=tmp_path)
+        profiler.request(1)
+        threads = []
+
+        def record_thread(profile, limit):
+            threads.append(threading.current_thread())
+            return []
+
+        with patch("bridge.profiler.summarize", side_effect=record_thread):
+            await _profiled_cycle(profiler)
+
+        assert threads and threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_keeps_latest_profiles(self, tmp_path):
+        profiler = CycleProfiler(directory=tmp_path, keep=1)
+        for _ in range(2):
+            profiler.request(1)
+            await _profiled_cycle(profiler)
+
+        assert len(list(tmp_path.glob("profile-*.pstats"))) == 1
+        assert len(list(tmp_path.glob("profile-*.collapsed"))) == 1
+        assert str(next(tmp_path.glob("*.pstats"))) == profiler.get_stats()["last_profile"]
+
+    @pytest.mark.asyncio
+    async def test_stop_writes_running_session(self, tmp_path):
+        profiler = CycleProfiler(directory=tmp_path)
+        profiler.start()
+        profiler.request(10)
+        await _profiled_cycle(profiler)
+
+        await profiler.stop()
+
+        assert not profiler.active
+        assert len(list(tmp_path.glob("profile-*.pstats"))) == 1
+
+    @pytest.mark.asyncio
+    async def test_unwritable_directory_logged(self, tmp_path, caplog):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        profiler = CycleProfiler(directory=blocker / "profiles")
+        profiler.request(1)
+
+        with caplog.at_level(logging.ERROR, logger="huawei.profiler"):
+            await _profiled_cycle(profiler)
+
+        assert "could not be written" in caplog.text
+        assert not profiler.active
+
+
+# ---------------------------------------------------------------------------
+# TestMainIntegration
+# ---------------------------------------------------------------------------
+
+
+class TestMainIntegration:
+    """Profiler-Hooks in run_main_cycle()."""
+
+    @pytest.mark.asyncio
+    async def test_cycle_profiled_also_on_error(self, tmp_path, mock_client, mock_config):
+        profiler = CycleProfiler(directory=tmp_path)
+        profiler.request(1)
+        main_module._state.profiler = profiler
+        main_module._state.config = mock_config
+
+        with (
+            patch("bridge.main.main_once", side_effect=TimeoutError()),
+            patch("bridge.main.publish_status", new_callable=AsyncMock),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            await main_module.run_main_cycle(mock_client, mock_config, 1)
+
+        assert profiler.get_stats()["sessions"] == 1
+        assert not profiler.active
+
+    @pytest.mark.asyncio
+    async def test_start_subscribes_command_topic(self, mock_config):
+        with patch("bridge.profiler.subscribe_command") as subscribe:
+            profiler = main_module.start_profiler(mock_config)
+        try:
+            subscribe.assert_called_once_with(f"{mock_config.mqtt_topic}/profile", profiler.notify)
+        finally:
+            await main_module.stop_profiler()
+        assert main_module._state.profiler is None
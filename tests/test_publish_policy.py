@@ -0,0 +1,73 @@
+# tests/test_publish_policy.py
+
+"""Tests für die MQTT Publish-Policy."""
+
+from unittest.mock import patch
+
+from bridge.publish_policy import PublishPolicy, TopicPolicy
+
+# ---------------------------------------------------------------------------
+# TestStatusDeduplication
+# ---------------------------------------------------------------------------
+
+
+class TestStatusDeduplication:
+    """Status nur bei Zustandswechsel (plus optionalem Keepalive)."""
+
+    def test_first_status_is_due(self):
+        assert PublishPolicy().status_due("online") is True
+
+    def test_repeated_status_is_suppressed(self):
+        policy = PublishPolicy()
+        policy.mark_status("online")
+        assert policy.status_due("online") is False
+
+    def test_transition_is_due(self):
+        policy = PublishPolicy()
+        policy.mark_status("online")
+        assert policy.status_due("offline") is True
+
+    def test_keepalive_repeats_status_after_interval(self):
+        policy = PublishPolicy(status_keepalive=60)
+        with patch("bridge.publish_policy.time.monotonic", return_value=1000.0):
+            policy.mark_status("online")
+        with patch("bridge.publish_policy.time.monotonic", return_value=1030.0):
+            assert policy.status_due("online") is False
+        with patch("bridge.publish_policy.time.monotonic", return_value=1060.0):
+            assert policy.status_due("online") is True
+
+    def test_reset_status_forces_next_publish(self):
+        policy = PublishPolicy()
+        policy.mark_status("online")
+        policy.reset_status()
+        assert policy.status_due("online") is True
+
+
+# ---------------------------------------------------------------------------
+# TestDataFlags
+# ---------------------------------------------------------------------------
+
+
+class TestDataFlags:
+    """QoS/Retain für das Daten-Topic."""
+
+    def test_default_is_retained_qos1(self):
+        assert PublishPolicy().data_flags() == TopicPolicy(qos=1, retain=True)
+
+    def test_non_retained_without_snapshot(self):
+        policy = PublishPolicy(data=TopicPolicy(qos=0, retain=False))
+        assert policy.data_flags() == TopicPolicy(qos=0, retain=False)
+        assert policy.data_flags() == TopicPolicy(qos=0, retain=False)
+
+    def test_periodic_retained_snapshot(self):
+        policy = PublishPolicy(data=TopicPolicy(qos=0, retain=False), retained_snapshot_interval=300)
+        with patch("bridge.publish_policy.time.monotonic", return_value=1000.0):
+            assert policy.data_flags() == TopicPolicy(qos=1, retain=True)
+        with patch("bridge.publish_policy.time.monotonic", return_value=1010.0):
+            assert policy.data_flags() == TopicPolicy(qos=0, retain=False)
+        with patch("bridge.publish_policy.time.monotonic", return_value=1300.0):
+            assert policy.data_flags() == TopicPolicy(qos=1, retain=True)
+
+    def test_snapshot_interval_ignored_when_data_retained(self):
+        policy = PublishPolicy(data=TopicPolicy(qos=0, retain=True), retained_snapshot_interval=10)
+        assert policy.data_flags() == TopicPolicy(qos=0, retain=True)
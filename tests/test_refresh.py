@@ -0,0 +1,200 @@
+# tests/test_refresh.py
+
+"""Tests für den On-Demand Refresh (refresh.py, main.refresh_registers)."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.config.registers import ESSENTIAL_REGISTERS, REGISTER_GROUPS
+from bridge.refresh import RefreshController
+
+
+def _controller(min_interval: float = 0.0) -> tuple[RefreshController, AsyncMock]:
+    callback = AsyncMock()
+    return RefreshController(callback, min_interval=min_interval), callback
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# ---------------------------------------------------------------------------
+# TestGroups
+# ---------------------------------------------------------------------------
+
+
+class TestGroups:
+    """Register-Gruppen und Payload-Parsing."""
+
+    @pytest.mark.parametrize("group", sorted(REGISTER_GROUPS))
+    def test_groups_are_subsets_of_essential_registers(self, group):
+        assert set(REGISTER_GROUPS[group]) <= set(ESSENTIAL_REGISTERS)
+
+    def test_empty_payload_means_all(self):
+        controller, _ = _controller()
+        assert controller.request("") is True
+        assert controller.registers(controller._pending) == ESSENTIAL_REGISTERS
+
+    def test_multiple_groups_in_register_order(self):
+        controller, _ = _controller()
+        controller.request(" Power , battery")
+        names = controller.registers(controller._pending)
+        assert set(names) == set(REGISTER_GROUPS["power"]) | set(REGISTER_GROUPS["battery"])
+        assert names == sorted(names, key=ESSENTIAL_REGISTERS.index)
+
+    def test_unknown_group_rejected(self):
+        controller, _ = _controller()
+        assert controller.request("power,solar") is False
+        assert controller._pending == set()
+        assert controller.get_stats()["rejected"] == 1
+
+
+# ---------------------------------------------------------------------------
+# TestScheduling
+# ---------------------------------------------------------------------------
+
+
+class TestScheduling:
+    """Coalescing und Rate-Limit."""
+
+    @pytest.mark.asyncio
+    async def test_requests_before_run_are_coalesced(self):
+        controller, callback = _controller()
+        with patch("bridge.refresh.subscribe_command"), patch("bridge.refresh.unsubscribe_command"):
+            controller.request("power")
+            controller.request("battery")
+            controller.start("t/refresh")
+            await _settle()
+            await controller.stop()
+
+        callback.assert_awaited_once()
+        names, requested_at = callback.await_args_list[-1].args
+        assert set(names) == set(REGISTER_GROUPS["power"]) | set(REGISTER_GROUPS["battery"])
+        assert requested_at <= time.time()
+        assert controller.get_stats() == {"requests": 2, "rejected": 0, "coalesced": 1, "refreshes": 1, "failed": 0}
+
+    @pytest.mark.asyncio
+    async def test_rate_limited(self):
+        controller, callback = _controller(min_interval=60)
+        with (
+            patch("bridge.refresh.subscribe_command"),
+            patch("bridge.refresh.unsubscribe_command"),
+        ):
+            controller.start("t/refresh")
+            controller.request("power")
+            await _settle()
+            controller.request("power")
+            await _settle()
+            await controller.stop()
+
+        callback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failure_counted_and_task_keeps_running(self):
+        controller, callback = _controller()
+        callback.side_effect = [ConnectionError("gone"), None]
+        with patch("bridge.refresh.subscribe_command"), patch("bridge.refresh.unsubscribe_command"):
+            controller.start("t/refresh")
+            controller.request()
+            await _settle()
+            controller.request()
+            await _settle()
+            await controller.stop()
+
+        assert controller.get_stats()["failed"] == 1
+        assert controller.get_stats()["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_notify_from_other_thread(self):
+        controller, callback = _controller()
+        with patch("bridge.refresh.subscribe_command") as subscribe, patch("bridge.refresh.unsubscribe_command"):
+            controller.start("t/refresh")
+            handler = subscribe.call_args[0][1]
+            await asyncio.to_thread(handler, "t/refresh", b"pv")
+            await _settle()
+            await controller.stop()
+
+        assert set(callback.await_args_list[-1].args[0]) == set(REGISTER_GROUPS["pv"])
+
+
+# ---------------------------------------------------------------------------
+# TestRefreshRegisters
+# ---------------------------------------------------------------------------
+
+
+class TestRefreshRegisters:
+    """Out-of-cycle Read in main.py."""
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self):
+        main_module.reset_state()
+        yield
+        main_module.reset_state()
+
+    @pytest.mark.asyncio
+    async def test_merges_into_last_snapshot_and_publishes(self, mock_config):
+        stale = time.time() - 60
+        main_module._state.last_data = {"power_active": 100, "battery_soc": 50.0, "last_update": stale}
+        sinks = main_module._state.output_sinks = MagicMock()
+        with (
+            patch("bridge.main.read_registers_fast", return_value={"battery_soc": 55.0}) as read,
+            patch("bridge.main.publish_data", new_callable=AsyncMock) as publish,
+        ):
+            await main_module.refresh_registers(MagicMock(), mock_config, REGISTER_GROUPS["battery"], time.time())
+
+        assert read.call_args[0][1].plans
+        published = publish.await_args_list[-1].args[0]
+        assert published["power_active"] == 100
+        assert published["battery_soc"] == 55.0
+        assert published["last_update"] > stale
+        assert sinks.submit.call_args[0][0]["last_update"] > stale
+        assert main_module._state.last_data == published
+
+    @pytest.mark.asyncio
+    async def test_coalesced_with_cycle_started_after_request(self, mock_config):
+        main_module._state.last_data = {"power_active": 100}
+        requested_at = time.time()
+        main_module._state.last_read_started = requested_at + 1
+        with (
+            patch("bridge.main.read_registers_fast") as read,
+            patch("bridge.main.publish_data", new_callable=AsyncMock) as publish,
+        ):
+            await main_module.refresh_registers(MagicMock(), mock_config, ["active_power"], requested_at)
+
+        read.assert_not_called()
+        publish.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_waits_for_running_cycle(self, mock_config):
+        main_module._state.last_data = {"power_active": 100}
+        order: list[str] = []
+
+        async def cycle_read():
+            async with main_module._state.read_lock:
+                await asyncio.sleep(0.01)
+                order.append("cycle")
+
+        async def refresh_read(*_args, **_kwargs):
+            order.append("refresh")
+            return {}
+
+        with (
+            patch("bridge.main.read_registers_fast", side_effect=refresh_read),
+            patch("bridge.main.publish_data", new_callable=AsyncMock),
+        ):
+            cycle = asyncio.create_task(cycle_read())
+            await asyncio.sleep(0)
+            await main_module.refresh_registers(MagicMock(), mock_config, ["active_power"], time.time())
+            await cycle
+
+        assert order == ["cycle", "refresh"]
+
+    @pytest.mark.asyncio
+    async def test_skipped_before_first_snapshot(self, mock_config):
+        with patch("bridge.main.read_registers_fast") as read:
+            await main_module.refresh_registers(MagicMock(), mock_config, ["active_power"], time.time())
+        read.assert_not_called()
@@ -0,0 +1,87 @@
+# tests/test_register_image.py
+
+"""Tests für das In-Memory Register-Abbild."""
+
+import struct
+
+from bridge.register_image import RegisterImage, to_words
+
+# ---------------------------------------------------------------------------
+# TestToWords
+# ---------------------------------------------------------------------------
+
+
+class TestToWords:
+    """Konvertierung von Modbus-Antworten."""
+
+    def test_big_endian_bytes(self):
+        assert list(to_words(struct.pack(">3H", 1, 0x1234, 0xFFFF))) == [1, 0x1234, 0xFFFF]
+
+    def test_register_list(self):
+        assert list(to_words([5, 6])) == [5, 6]
+
+
+# ---------------------------------------------------------------------------
+# TestRegisterImage
+# ---------------------------------------------------------------------------
+
+
+class TestRegisterImage:
+    """Record/Read über Blöcke."""
+
+    def test_read_within_block(self):
+        image = RegisterImage()
+        image.record(32000, list(range(10)), timestamp=100.0)
+        assert image.read(32002, 3, now=100.0) == [2, 3, 4]
+        assert len(image) == 10
+
+    def test_read_outside_or_partially_cached_returns_none(self):
+        image = RegisterImage()
+        image.record(32000, [1, 2, 3], timestamp=100.0)
+        assert image.read(31999, 2, now=100.0) is None
+        assert image.read(32002, 2, now=100.0) is None
+        assert image.read(40000, 1, now=100.0) is None
+
+    def test_read_spans_adjacent_blocks(self):
+        image = RegisterImage()
+        image.record(10, [1, 2], timestamp=100.0)
+        image.record(12, [3, 4], timestamp=100.0)
+        assert image.read(11, 3, now=100.0) == [2, 3, 4]
+
+    def test_gap_between_blocks_is_a_miss(self):
+        image = RegisterImage()
+        image.record(10, [1, 2], timestamp=100.0)
+        image.record(13, [4], timestamp=100.0)
+        assert image.read(10, 4, now=100.0) is None
+
+    def test_stale_block_is_a_miss(self):
+        image = RegisterImage()
+        image.record(10, [1, 2], timestamp=100.0)
+        image.record(12, [3, 4], timestamp=150.0)
+        assert image.read(12, 2, max_age=30, now=160.0) == [3, 4]
+        assert image.read(10, 4, max_age=30, now=160.0) is None
+        assert image.read(10, 4, now=160.0) == [1, 2, 3, 4]
+
+    def test_newer_block_replaces_overlapping_blocks(self):
+        image = RegisterImage()
+        image.record(10, [1, 1, 1, 1], timestamp=100.0)
+        image.record(20, [9], timestamp=100.0)
+        image.record(12, [2, 2, 2], timestamp=110.0)
+
+        assert [(b.start, list(b.words)) for b in image.blocks()] == [(12, [2, 2, 2]), (20, [9])]
+        assert image.read(10, 2, now=110.0) is None
+        assert image.read(12, 3, now=110.0) == [2, 2, 2]
+
+    def test_same_range_is_updated_in_place(self):
+        image = RegisterImage()
+        image.record(10, [1], timestamp=100.0)
+        image.record(10, [2], timestamp=101.0)
+        assert image.read(10, 1, now=101.0) == [2]
+        assert len(image) == 1
+
+    def test_clear(self):
+        image = RegisterImage()
+        image.record(10, [1])
+        image.clear()
+        assert image.read(10, 1) is None
+        assert len(image) == 0
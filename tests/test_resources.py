@@ -0,0 +1,161 @@
+# tests/test_resources.py
+
+"""Tests für die Ressourcen-Telemetrie (resources.py)."""
+
+import logging
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.metrics import get_metrics
+from bridge.resources import (
+    LEAK_THRESHOLDS,
+    ResourceMonitor,
+    ResourceSample,
+    format_sample,
+    get_resource_monitor,
+    monotonic_growth,
+    sample,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_main_state():
+    main_module.reset_state()
+    yield
+    main_module.reset_state()
+
+
+def _fake_sample(rss: int, threads: int = 5, fds: int | None = 10) -> ResourceSample:
+    return {
+        "rss": rss,
+        "cpu_user": 1.0,
+        "cpu_system": 0.5,
+        "threads": threads,
+        "fds": fds,
+        "gc_collections": 100,
+        "gc_uncollectable": 0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# TestSample
+# ---------------------------------------------------------------------------
+
+
+class TestSample:
+    """Einzelnes Sample aus /proc bzw. resource."""
+
+    def test_sample_fields(self):
+        current = sample()
+        assert (current["rss"] or 0) > 0
+        assert current["threads"] >= 1
+        assert current["cpu_user"] + current["cpu_system"] > 0
+        assert current["gc_collections"] >= 0
+
+    def test_format_sample_without_proc(self):
+        line = format_sample(_fake_sample(rss=64 * 2**20, fds=None))
+        assert "RSS 64.0 MiB" in line
+        assert "n/a fds" in line
+
+    def test_cycle_cpu(self):
+        monitor = ResourceMonitor()
+        assert monitor.cycle_finished() is None
+        monitor.cycle_started()
+        sum(range(100_000))
+        used = monitor.cycle_finished()
+        assert used is not None and used >= 0
+        assert monitor.cycle_finished() is None
+
+    def test_sample_only_after_interval(self):
+        monitor = ResourceMonitor(interval=60)
+        assert monitor.maybe_sample(now=1000.0) is not None
+        assert monitor.maybe_sample(now=1030.0) is None
+        assert monitor.maybe_sample(now=1060.0) is not None
+        assert monitor.last is not None
+
+
+# ---------------------------------------------------------------------------
+# TestLeakDetection
+# ---------------------------------------------------------------------------
+
+
+class TestLeakDetection:
+    """Monotones Wachstum über das Leck-Fenster."""
+
+    @pytest.mark.parametrize(
+        "values,expected",
+        [
+            ([1, 2, 3, 30], True),
+            ([1, 2, 3, 4], False),  # zu wenig Zuwachs
+            ([1, 30, 20, 40], False),  # fällt zwischendurch
+            ([5], False),
+            ([1, 1, 1, 30], True),  # Plateaus unterbrechen die Monotonie nicht
+        ],
+    )
+    def test_monotonic_growth(self, values, expected):
+        assert monotonic_growth(values, threshold=10) is expected
+
+    def _run(self, monitor: ResourceMonitor, rss_values: list[int]) -> None:
+        for i, rss in enumerate(rss_values):
+            with patch("bridge.resources.sample", return_value=_fake_sample(rss)):
+                monitor.maybe_sample(now=1000.0 + i * 300)
+
+    def test_warns_once_and_recovers(self, caplog):
+        monitor = ResourceMonitor(interval=60, leak_interval=300, leak_window=4)
+        step = LEAK_THRESHOLDS["rss"]
+        with caplog.at_level(logging.INFO, logger="huawei.resources"):
+            self._run(monitor, [int(100 * 2**20 + i * step) for i in range(6)])
+            assert monitor.suspected == {"rss"}
+            assert sum("Possible rss leak" in r.message for r in caplog.records) == 1
+
+            with patch("bridge.resources.sample", return_value=_fake_sample(50 * 2**20)):
+                monitor.maybe_sample(now=1000.0 + 6 * 300)
+
+        assert monitor.suspected == set()
+        assert any("no longer growing" in r.message for r in caplog.records)
+
+    def test_no_warning_before_window_full(self, caplog):
+        monitor = ResourceMonitor(interval=60, leak_interval=300, leak_window=12)
+        with caplog.at_level(logging.WARNING, logger="huawei.resources"):
+            self._run(monitor, [int(i * 2**30) for i in range(5)])
+        assert monitor.suspected == set()
+        assert not caplog.records
+
+    def test_missing_values_never_suspected(self):
+        monitor = ResourceMonitor(interval=60, leak_interval=300, leak_window=3)
+        for i in range(4):
+            with patch("bridge.resources.sample", return_value=_fake_sample(0, fds=None if i == 1 else i * 100)):
+                monitor.maybe_sample(now=1000.0 + i * 300)
+        assert "fds" not in monitor.suspected
+
+
+# ---------------------------------------------------------------------------
+# TestExport
+# ---------------------------------------------------------------------------
+
+
+class TestExport:
+    """Metriken und Anbindung in main.py."""
+
+    def test_metrics_collected_on_render(self):
+        get_resource_monitor()._suspected.add("threads")
+        body = get_metrics().render().decode()
+        assert "huabus_process_resident_memory_bytes " in body
+        assert 'huabus_process_cpu_seconds_total{mode="user"}' in body
+        assert "huabus_process_threads " in body
+        assert 'huabus_resource_leak_suspected{resource="threads"} 1' in body
+        assert 'huabus_resource_leak_suspected{resource="rss"} 0' in body
+
+    @pytest.mark.asyncio
+    async def test_cycle_cpu_observed(self, mock_client, mock_config):
+        with (
+            patch("bridge.main.main_once", new_callable=AsyncMock),
+            patch("bridge.main.publish_status", new_callable=AsyncMock),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            main_module._state.config = mock_config
+            await main_module.run_main_cycle(mock_client, mock_config, 1)
+
+        assert get_metrics().cycle_cpu_seconds.count() == 1
+        assert get_resource_monitor().last is not None
@@ -0,0 +1,111 @@
+# tests/test_sentinels.py
+
+"""Tests für die typ-bewusste Platzhalter-Tabelle (sentinels.py)."""
+
+from datetime import datetime
+from typing import Any, cast
+from unittest.mock import Mock
+
+import pytest
+from bridge.sentinels import RAW_SENTINELS, SentinelTable, get_sentinel_table, reset_sentinel_table
+from bridge.transform import get_register_value
+from huawei_solar.registers import REGISTERS as LIBRARY_REGISTERS
+
+# Library-Dict ist auf RegisterName typisiert, die Tests greifen per Name (str) zu
+REGISTERS = cast(dict[str, Any], LIBRARY_REGISTERS)
+
+
+def _result(value: Any) -> Mock:
+    result = Mock()
+    result.value = value
+    return result
+
+
+@pytest.fixture
+def table() -> SentinelTable:
+    return SentinelTable()
+
+
+# ---------------------------------------------------------------------------
+# TestCompile
+# ---------------------------------------------------------------------------
+
+
+class TestCompile:
+    """Tabelle aus Registertyp und Gain."""
+
+    @pytest.mark.parametrize(
+        "name,fmt",
+        [
+            ("active_power", "i"),
+            ("pv_01_voltage", "h"),
+            ("storage_state_of_capacity", "H"),
+            ("storage_total_charge", "I"),
+        ],
+    )
+    def test_raw_sentinels_follow_register_type(self, table, name, fmt):
+        assert REGISTERS[name].format == fmt
+        assert table.raw_sentinels(name) == RAW_SENTINELS[fmt]
+
+    def test_decoded_sentinels_are_scaled_by_gain(self, table):
+        assert REGISTERS["pv_01_voltage"].gain == 10
+        assert table.decoded["pv_01_voltage"] == {3276.7, -3276.8}
+
+    def test_strings_and_ignore_invalid_have_no_entry(self, table):
+        assert "model_name" not in table.raw
+        assert REGISTERS["alarm_1"].invalid_value is None
+        assert "alarm_1" not in table.raw
+        assert table.raw_sentinels("alarm_1") == frozenset()
+
+    def test_enum_registers_only_checked_raw(self, table):
+        assert table.raw_sentinels("device_status") == RAW_SENTINELS["H"]
+        assert "device_status" not in table.decoded
+
+
+# ---------------------------------------------------------------------------
+# TestGetRegisterValue
+# ---------------------------------------------------------------------------
+
+
+class TestGetRegisterValue:
+    """Extraktion im Library-Pfad (transform_data)."""
+
+    def test_32bit_sentinel_rejected(self, table):
+        # Library ersetzt nur 0x7FFFFFFF, das Minimum kommt als Zahl durch
+        assert get_register_value("active_power", _result(-(2**31)), table) is None
+        assert table.get_stats() == {"active_power": 1}
+
+    def test_scaled_32767_is_a_valid_value(self, table):
+        assert get_register_value("storage_total_charge", _result(32767.0), table) == 32767.0
+        assert get_register_value("active_power", _result(32767), table) == 32767
+        assert table.get_stats() == {}
+
+    def test_library_none_counted(self, table):
+        assert get_register_value("active_power", _result(None), table) is None
+        assert get_register_value("active_power", None, table) is None  # nicht gelesen: nicht gezählt
+        assert table.get_stats() == {"active_power": 1}
+
+    def test_datetime_and_enums_pass_through(self, table):
+        assert get_register_value("startup_time", _result(datetime(2026, 1, 2, 3, 4)), table) == "2026-01-02T03:04:00"
+        assert get_register_value("device_status", _result("On-grid"), table) == "On-grid"
+
+    def test_unknown_register_falls_back_to_literals(self, table):
+        assert get_register_value("not_a_register", _result(65535), table) is None
+        assert get_register_value("not_a_register", _result(4500), table) == 4500
+        assert table.get_stats() == {}
+
+
+# ---------------------------------------------------------------------------
+# TestSingleton
+# ---------------------------------------------------------------------------
+
+
+class TestSingleton:
+    """Modul-Instanz und Reset."""
+
+    def test_reset_keeps_table_and_clears_counters(self):
+        table = get_sentinel_table()
+        table.reject("active_power")
+        reset_sentinel_table()
+        assert get_sentinel_table() is table
+        assert table.get_stats() == {}
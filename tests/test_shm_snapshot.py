@@ -0,0 +1,144 @@
+# tests/test_shm_snapshot.py
+
+"""Tests für den Shared-Memory Snapshot (Writer, Reader, Sink)."""
+
+import math
+import struct
+
+import pytest
+from bridge.config.mappings import REGISTER_MAPPING
+from bridge.output_sinks import SharedMemorySink
+from bridge.shm_reader import SEQ, SEQ_OFFSET, SnapshotReader, layout_id
+from bridge.shm_snapshot import SharedMemorySnapshot, default_layout
+
+KEYS = ["power_active", "battery_soc", "energy_yield_day"]
+TS = 1_700_000_000.5
+
+
+# ---------------------------------------------------------------------------
+# TestLayout
+# ---------------------------------------------------------------------------
+
+
+class TestLayout:
+    """Layout aus REGISTER_MAPPING."""
+
+    def test_default_layout_is_numeric_mapping_in_order(self):
+        keys = default_layout()
+        assert keys[0] == next(iter(REGISTER_MAPPING.values()))
+        assert len(keys) == len(set(keys))
+        assert "inverter_status" not in keys
+        assert "model_name" not in keys
+        assert set(keys) <= set(REGISTER_MAPPING.values())
+
+    def test_file_describes_itself(self, tmp_path):
+        path = tmp_path / "snap"
+        writer = SharedMemorySnapshot(path, KEYS)
+        with SnapshotReader(path) as reader:
+            assert reader.keys == KEYS
+            assert reader.count == 3
+            assert reader.layout_id == layout_id(KEYS) == writer.layout_id
+            assert reader.sequence == 0
+            with pytest.raises(LookupError):
+                reader.read()
+        writer.close()
+
+    def test_invalid_file_rejected(self, tmp_path):
+        path = tmp_path / "snap"
+        path.write_bytes(b"XXXX" + bytes(60))
+        with pytest.raises(ValueError, match="magic"):
+            SnapshotReader(path)
+
+
+# ---------------------------------------------------------------------------
+# TestReadWrite
+# ---------------------------------------------------------------------------
+
+
+class TestReadWrite:
+    """Seqlock und Werte."""
+
+    def test_roundtrip(self, tmp_path):
+        path = tmp_path / "snap"
+        writer = SharedMemorySnapshot(path, KEYS)
+        writer.write({"power_active": 4500, "battery_soc": 85.5, "inverter_status": "On-grid"}, TS, cycle=7)
+
+        with SnapshotReader(path) as reader:
+            snap = reader.read()
+        writer.close()
+
+        assert snap.values == {"power_active": 4500.0, "battery_soc": 85.5}
+        assert snap.timestamp == TS
+        assert snap.cycle == 7
+        assert snap.seq == 2
+
+    def test_missing_values_reset_to_nan(self, tmp_path):
+        path = tmp_path / "snap"
+        writer = SharedMemorySnapshot(path, KEYS)
+        with SnapshotReader(path) as reader:
+            writer.write({"power_active": 1, "battery_soc": 2}, TS)
+            writer.write({"power_active": 3}, TS)
+            assert reader.read().values == {"power_active": 3.0}
+            raw = struct.unpack_from("<3d", reader.buffer, reader.values_offset)
+            assert math.isnan(raw[1])
+        writer.close()
+
+    def test_reader_sees_live_updates_through_same_mapping(self, tmp_path):
+        path = tmp_path / "snap"
+        writer = SharedMemorySnapshot(path, KEYS)
+        with SnapshotReader(path) as reader:
+            for cycle in range(1, 4):
+                writer.write({"power_active": cycle}, TS, cycle)
+                assert reader.read().values["power_active"] == cycle
+            assert reader.sequence == 6
+        writer.close()
+
+    def test_write_in_progress_is_not_returned(self, tmp_path):
+        path = tmp_path / "snap"
+        writer = SharedMemorySnapshot(path, KEYS)
+        writer.write({"power_active": 1}, TS)
+        SEQ.pack_into(writer._mmap, SEQ_OFFSET, 3)  # simulierter Writer mitten im Update
+
+        with SnapshotReader(path) as reader:
+            with pytest.raises(TimeoutError):
+                reader.read(retries=5)
+        writer.close()
+
+    def test_recreate_replaces_file_atomically(self, tmp_path):
+        path = tmp_path / "snap"
+        old = SharedMemorySnapshot(path, KEYS)
+        reader = SnapshotReader(path)
+        new = SharedMemorySnapshot(path, ["power_active"])
+
+        assert reader.keys == KEYS
+        with SnapshotReader(path) as fresh:
+            assert fresh.keys == ["power_active"]
+        assert not (tmp_path / "snap.tmp").exists()
+        reader.close()
+        old.close()
+        new.close()
+
+
+# ---------------------------------------------------------------------------
+# TestSharedMemorySink
+# ---------------------------------------------------------------------------
+
+
+class TestSharedMemorySink:
+    """Einbindung als Output Sink."""
+
+    @pytest.mark.asyncio
+    async def test_sink_writes_snapshots(self, tmp_path):
+        path = tmp_path / "sub" / "snap"
+        sink = SharedMemorySink(path)
+        await sink.open()
+        await sink.write({"power_active": 4500, "battery_soc": 50}, TS, 41)
+        await sink.write({"power_active": 4600}, TS + 30, 42)
+
+        with SnapshotReader(path) as reader:
+            snap = reader.read()
+        await sink.close()
+
+        assert snap.values == {"power_active": 4600.0}
+        assert snap.cycle == 42
+        assert snap.timestamp == TS + 30
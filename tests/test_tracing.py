@@ -0,0 +1,118 @@
+# tests/test_tracing.py
+
+"""Tests für das Cycle-Tracing (tracing.py) und seine Anbindung in main_once."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from bridge import main as main_module
+from bridge.latency import get_latency_recorder
+from bridge.main import main_once
+from bridge.metrics import get_metrics
+from bridge.tracing import CycleTrace, record_trace
+
+
+@pytest.fixture(autouse=True)
+def reset_main_state():
+    main_module.reset_state()
+    yield
+    main_module.reset_state()
+
+
+def _trace(marks: dict[str, float], response_at: float | None = None) -> CycleTrace:
+    trace = CycleTrace(7)
+    trace.marks = {"start": 100.0, **marks}
+    trace.response_at = response_at
+    return trace
+
+
+# ---------------------------------------------------------------------------
+# TestCycleTrace
+# ---------------------------------------------------------------------------
+
+
+class TestCycleTrace:
+    """Stufen, Phasen-Timings, Ende-zu-Ende."""
+
+    def test_stages_are_deltas_between_marks(self):
+        trace = _trace({"modbus": 101.5, "transform": 101.6, "filter": 101.65})
+        assert trace.stages() == pytest.approx({"modbus": 1.5, "transform": 0.1, "filter": 0.05})
+
+    def test_timings_for_log_and_metrics(self):
+        trace = _trace(
+            {"modbus": 101.0, "transform": 101.1, "filter": 101.2, "output": 101.3, "ack": 101.5, "done": 101.6}
+        )
+        assert trace.timings() == pytest.approx(
+            {"modbus": 1.0, "transform": 0.1, "filter": 0.1, "mqtt": 0.3, "total": 1.6}
+        )
+
+    def test_timings_before_publish(self):
+        assert set(_trace({"modbus": 101.0, "transform": 101.1}).timings()) == {"modbus", "transform"}
+
+    def test_end_to_end_prefers_ack(self):
+        assert _trace({"publish": 102.0, "ack": 102.5}, response_at=100.5).end_to_end() == 2.0
+        assert _trace({"publish": 102.0}, response_at=100.5).end_to_end() == 1.5  # QoS 0
+        assert _trace({"publish": 102.0}).end_to_end() is None
+
+    def test_only_first_response_kept(self):
+        trace = CycleTrace(1)
+        trace.response()
+        first = trace.response_at
+        trace.response()
+        assert trace.response_at == first
+        assert trace.read_time is not None
+
+    def test_record_trace(self):
+        record_trace(_trace({"modbus": 101.0, "publish": 101.2}, response_at=100.5))
+
+        report = get_latency_recorder().report("trace:")
+        assert set(report) == {"trace:modbus", "trace:publish", "trace:end_to_end"}
+        assert report["trace:end_to_end"]["max"] == pytest.approx(0.7)
+        assert get_metrics().trace_seconds.count("end_to_end") == 1
+
+
+# ---------------------------------------------------------------------------
+# TestMainOnce
+# ---------------------------------------------------------------------------
+
+
+class TestMainOnce:
+    """Tracing im Poll-Cycle."""
+
+    async def _run(self, mock_client, mock_config):
+        async def read(*_args, trace=None, **_kwargs):
+            if trace is not None:
+                trace.response()
+            return {"power_active": 4500}
+
+        with (
+            patch("bridge.main.read_registers", side_effect=read),
+            patch("bridge.main.get_compiled_transform", return_value=Mock(return_value={"power_active": 4500})),
+            patch("bridge.main.publish_data", new_callable=AsyncMock) as publish,
+            patch("bridge.main.log_cycle_summary"),
+        ):
+            await main_once(mock_client, mock_config, 5)
+        return publish
+
+    @pytest.mark.asyncio
+    async def test_disabled_passes_no_trace(self, mock_client, mock_config):
+        publish = await self._run(mock_client, mock_config)
+
+        assert publish.await_args.kwargs == {"trace": None}
+        assert "trace_seq" not in publish.await_args.args[0]
+        assert get_latency_recorder().report("trace:") == {}
+        assert get_metrics().phase_seconds.count("total") == 1
+
+    @pytest.mark.asyncio
+    async def test_enabled_records_stages_and_payload_fields(self, mock_client, mock_config):
+        mock_config.tracing = True
+        mock_config.tracing_payload = True
+
+        publish = await self._run(mock_client, mock_config)
+
+        data = publish.await_args.args[0]
+        assert data["trace_seq"] == 5
+        assert isinstance(data["trace_read_ts"], float)
+        trace = publish.await_args.kwargs["trace"]
+        assert list(trace.marks) == ["start", "modbus", "transform", "filter", "output", "done"]
+        assert "trace:done" in get_latency_recorder().report("trace:")
@@ -2,12 +2,24 @@
 
 """Tests for transform.py - Data transformation functions."""
 
+import random
+import struct
 import time
 from datetime import datetime
-from unittest.mock import Mock
+from enum import Enum
+from typing import Any
+from unittest.mock import Mock, patch
 
 import pytest
-from bridge.transform import _cleanup_result, get_value, transform_data
+from bridge.config.mappings import CRITICAL_DEFAULTS, REGISTER_MAPPING
+from bridge.sentinels import SentinelTable
+from bridge.transform import CompiledTransform, _cleanup_result, get_compiled_transform, get_value, transform_data
+from huawei_solar.registers import REGISTERS
+
+
+def _without_timestamp(data: dict) -> dict:
+    return {k: v for k, v in data.items() if k != "last_update"}
+
 
 # ---------------------------------------------------------------------------
 # TestGetValue
@@ -154,3 +166,78 @@ class TestTransformData:
 
         assert len(result) == 1
         assert "last_update" in result
+
+
+# ---------------------------------------------------------------------------
+# TestCompiledTransform
+# ---------------------------------------------------------------------------
+
+
+def _library_results(seed: int) -> dict[str, Any]:
+    """Result-Objekte wie von read_registers(): zufällige Rohwerte durch die Library dekodiert."""
+    rng = random.Random(seed)
+    results: dict[str, Any] = {}
+    for name in REGISTER_MAPPING:
+        definition = REGISTERS[name]
+        fmt = definition.format
+        if fmt.endswith("s"):
+            raw = rng.choice([b"SUN2000-10KTL", b"HV2150012345\x00\x00"])
+        else:
+            bits = struct.calcsize(fmt) * 8
+            low, high = (-(2 ** (bits - 1)), 2 ** (bits - 1) - 1) if fmt.islower() else (0, 2**bits - 1)
+            raw = rng.choice([rng.randint(low, high), rng.randint(0, 500), high, low, 32767])
+        if isinstance(definition.unit, dict):
+            raw = rng.choice(list(definition.unit))
+        elif isinstance(definition.unit, type) and issubclass(definition.unit, Enum):
+            raw = rng.choice(list(definition.unit)).value
+        if rng.random() < 0.1:
+            results[name] = None  # nicht gelesen
+        else:
+            results[name] = definition.decode((raw,))
+    return results
+
+
+class TestCompiledTransform:
+    """Vorkompilierte Pipeline liefert dieselben Werte wie transform_data()."""
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_same_output_and_counts_as_transform_data(self, seed):
+        data = _library_results(seed)
+        reference_sentinels, compiled_sentinels = SentinelTable(), SentinelTable()
+
+        with patch("bridge.transform.get_sentinel_table", return_value=reference_sentinels):
+            expected = transform_data(data)
+        actual = CompiledTransform(sentinels=compiled_sentinels)(data)
+
+        expected.pop("last_update")
+        actual.pop("last_update")
+        assert actual == expected
+        assert compiled_sentinels.get_stats() == reference_sentinels.get_stats()
+
+    def test_output_dict_is_reused(self):
+        transform = CompiledTransform(sentinels=SentinelTable())
+        first = transform(_library_results(1))
+        first_keys = len(first)
+        second = transform({})
+
+        assert second is first
+        assert first_keys > len(second)
+        assert set(second) == set(CRITICAL_DEFAULTS) | {"last_update"}
+
+    def test_unknown_register_uses_get_value(self):
+        transform = CompiledTransform(mapping={"activepower": "power_active", "x": "y"}, defaults={})
+        mock_active = Mock()
+        mock_active.value = 65535
+        mock_other = Mock()
+        mock_other.value = 12
+        assert _without_timestamp(transform({"activepower": mock_active, "x": mock_other})) == {"y": 12}
+
+    def test_finish_applies_defaults_in_place(self):
+        transform = CompiledTransform(defaults={"battery_power": 0})
+        values = {"power_active": 1}
+        assert transform.finish(values) is values
+        assert values["battery_power"] == 0
+        assert "last_update" in values
+
+    def test_singleton(self):
+        assert get_compiled_transform() is get_compiled_transform()